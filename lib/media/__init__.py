@@ -1,23 +1,46 @@
 # ABOUTME: Media generation utilities for keynote decks.
 # ABOUTME: Supports Gemini image generation (nano-banana), Veo video, and image search.
 
-from .nano_banana import NanoBananaClient, ImageResult
-from .veo import VeoClient, VideoResult
-from .image_search import ImageSearchClient, SearchResult, search_images
-from .model_mediated import ImageAcquisitionTools, get_tools_for_deck
+from __future__ import annotations
 
-__all__ = [
+import importlib
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from .nano_banana import NanoBananaClient, ImageResult
+    from .veo import VeoClient, VideoResult
+    from .image_search import ImageSearchClient, SearchResult, search_images
+    from .model_mediated import ImageAcquisitionTools, get_tools_for_deck
+
+# Exports resolve on first attribute access (PEP 562) so `search` never loads
+# the video client and `video` never loads the search clients.
+_EXPORTS = {
     # Image generation
-    "NanoBananaClient",
-    "ImageResult",
+    "NanoBananaClient": "nano_banana",
+    "ImageResult": "nano_banana",
     # Video generation
-    "VeoClient",
-    "VideoResult",
+    "VeoClient": "veo",
+    "VideoResult": "veo",
     # Image search
-    "ImageSearchClient",
-    "SearchResult",
-    "search_images",
+    "ImageSearchClient": "image_search",
+    "SearchResult": "image_search",
+    "search_images": "image_search",
     # Model-mediated tools (Claude decides, tools execute)
-    "ImageAcquisitionTools",
-    "get_tools_for_deck",
-]
+    "ImageAcquisitionTools": "model_mediated",
+    "get_tools_for_deck": "model_mediated",
+}
+
+__all__ = list(_EXPORTS)
+
+
+def __getattr__(name: str):
+    module_name = _EXPORTS.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(f".{module_name}", __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__() -> list[str]:
+    return sorted(set(globals()) | set(__all__))
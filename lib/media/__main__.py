@@ -0,0 +1,163 @@
+# ABOUTME: Unified media CLI: python -m lib.media <command> [...].
+# ABOUTME: Dispatches to the subsystem module for each command and imports nothing else.
+
+from __future__ import annotations
+
+import importlib
+import json
+import sys
+from pathlib import Path
+from typing import Optional
+
+# command -> (module, help). Modules are imported only when their command runs.
+COMMANDS = {
+    "generate": ("model_mediated", "Generate an image with Gemini"),
+    "edit": ("model_mediated", "Edit an image with Gemini (HYBRID mode)"),
+    "search": ("model_mediated", "Search stock photo sources"),
+    "download": ("model_mediated", "Download a selected image with attribution"),
+    "promote": ("model_mediated", "Regenerate chosen draft images at final quality"),
+    "video": ("veo", "Generate a video with Veo"),
+    "resume": ("veo_queue", "Resume a deck's unfinished Veo tasks"),
+    "build": ("build", "Regenerate a deck's stale prompt-file assets"),
+    "pipeline": ("pipeline", "Run a deck's dependency-aware media job graph"),
+    "normalize": ("normalize", "Resize/transcode a deck's images into srcset variants"),
+    "dupes": ("phash_index", "Find near-duplicate images across decks"),
+    "store": ("asset_store", "Manage the shared content-addressed asset store"),
+    "palette": ("palette", "Score images against a deck's brand palette"),
+    "diff": ("pixel_diff", "Report which slide screenshots visually changed"),
+    "serve": ("deck_server", "Serve decks for preview and review (threaded, cached)"),
+    "batch": (None, "Run a JSON/JSONL file of commands in one warm process"),
+}
+
+# Modules whose main() expects the command name as its first argument
+_SUBCOMMAND_MODULES = {"model_mediated"}
+
+USAGE = """usage: python3 -m lib.media <command> [args...]
+
+Commands:
+{commands}
+
+Run `python3 -m lib.media <command> --help` for command options.
+"""
+
+
+def _usage() -> str:
+    width = max(len(name) for name in COMMANDS)
+    lines = [f"  {name.ljust(width)}  {help_text}" for name, (_, help_text) in COMMANDS.items()]
+    return USAGE.format(commands="\n".join(lines))
+
+
+def _load(module_name: str):
+    return importlib.import_module(f".{module_name}", __package__)
+
+
+def dispatch(command: str, argv: list[str]) -> int:
+    """Run one command with its remaining arguments."""
+    module_name, _ = COMMANDS[command]
+    if module_name is None:
+        return run_batch(argv)
+
+    module = _load(module_name)
+    if module_name in _SUBCOMMAND_MODULES:
+        return module.main([command, *argv])
+    return module.main(argv)
+
+
+def _read_batch(path: Path) -> list[list[str]]:
+    text = path.read_text()
+    if text.lstrip().startswith("["):
+        entries = json.loads(text)
+    else:
+        entries = [json.loads(line) for line in text.splitlines() if line.strip()]
+
+    for i, entry in enumerate(entries, 1):
+        if not isinstance(entry, list) or not entry or entry[0] not in COMMANDS or entry[0] == "batch":
+            raise ValueError(f"Batch entry {i} must be an argv list starting with a command: {entry!r}")
+    return [[str(arg) for arg in entry] for entry in entries]
+
+
+def run_batch(argv: list[str]) -> int:
+    """
+    Run a batch file of commands, sharing warm tools between entries.
+
+    Each entry is an argv list, e.g. ["generate", "prompt", "out.png", "--slide", "3"].
+    The file is either a JSON array of entries or JSONL (one entry per line).
+    """
+    import argparse
+
+    parser = argparse.ArgumentParser(prog="python3 -m lib.media batch", description=COMMANDS["batch"][1])
+    parser.add_argument("file", type=Path, help="JSON or JSONL batch file")
+    parser.add_argument("--keep-going", action="store_true", help="Continue after a failed entry")
+    args = parser.parse_args(argv)
+
+    try:
+        entries = _read_batch(args.file)
+    except (OSError, ValueError) as e:
+        print(f"Error: {e}")
+        return 1
+
+    tools_cache: dict = {}
+    failures = 0
+
+    for i, entry in enumerate(entries, 1):
+        command, rest = entry[0], entry[1:]
+        print(f"[{i}/{len(entries)}] {command} {' '.join(rest)[:80]}")
+        try:
+            if COMMANDS[command][0] == "model_mediated":
+                exit_code = _run_media_entry(command, rest, tools_cache)
+            else:
+                exit_code = dispatch(command, rest)
+        except SystemExit as e:
+            exit_code = e.code if isinstance(e.code, int) else 2
+        except Exception as e:
+            print(f"Error: {e}")
+            exit_code = 1
+
+        if exit_code:
+            failures += 1
+            if not args.keep_going:
+                print(f"Stopping after failed entry {i}")
+                return exit_code
+
+    print(f"Batch complete: {len(entries) - failures}/{len(entries)} succeeded")
+    return 1 if failures else 0
+
+
+def _run_media_entry(command: str, rest: list[str], tools_cache: dict) -> int:
+    model_mediated = _load("model_mediated")
+    args = model_mediated.build_parser().parse_args([command, *rest])
+
+    def tools_for(deck: Optional[Path]):
+        key = str(Path(deck).resolve()) if deck else None
+        if key not in tools_cache:
+            tools_cache[key] = (
+                model_mediated.get_tools_for_deck(deck) if deck
+                else model_mediated.ImageAcquisitionTools()
+            )
+        tools = tools_cache[key]
+        # Share clients another entry already created instead of building new ones
+        for other in tools_cache.values():
+            tools._generator = tools._generator or other._generator
+            tools._searcher = tools._searcher or other._searcher
+        return tools
+
+    return model_mediated.run_command(args, tools_for=tools_for)
+
+
+def main(argv: Optional[list[str]] = None) -> int:
+    argv = list(sys.argv[1:] if argv is None else argv)
+    if not argv or argv[0] in ("-h", "--help"):
+        print(_usage())
+        return 0 if argv else 2
+
+    command, rest = argv[0], argv[1:]
+    if command not in COMMANDS:
+        print(f"Unknown command: {command}\n")
+        print(_usage())
+        return 2
+
+    return dispatch(command, rest)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
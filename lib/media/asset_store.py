@@ -0,0 +1,319 @@
+# ABOUTME: Optional content-addressed asset store (sha256-named blobs) shared across decks.
+# ABOUTME: Decks hardlink blobs into resources/assets; GC is driven by each deck's link manifest.
+
+from __future__ import annotations
+
+import argparse
+import errno
+import hashlib
+import json
+import os
+import shutil
+import sys
+import tempfile
+import threading
+from contextlib import contextmanager
+from pathlib import Path
+from typing import BinaryIO, Optional
+
+STORE_DIR = ".media-store"
+STORE_ENV = "KEYNOTE_MEDIA_STORE"
+LINKS_FILE = "asset-links.json"
+LINKS_VERSION = 1
+
+_CHUNK = 1 << 20
+
+# Blobs (and therefore every hardlinked deck file) are read-only so an in-place
+# write to one deck's asset cannot silently change another deck's.
+_BLOB_MODE = 0o444
+
+
+def deck_for_path(path: Path | str) -> Optional[Path]:
+    """The deck directory containing path (the parent of its resources/ folder)."""
+    for parent in Path(path).resolve().parents:
+        if parent.name == "resources":
+            return parent.parent
+    return None
+
+
+def replace_bytes(data: bytes, dest: Path | str) -> Path:
+    """Write dest through a temp sibling and os.replace(), never through an existing inode."""
+    dest = Path(dest)
+    with _replacing(dest) as f:
+        f.write(data)
+    return dest
+
+
+def replace_stream(stream: BinaryIO, dest: Path | str) -> Path:
+    """replace_bytes() for a stream (e.g. an HTTP response), copied in chunks."""
+    dest = Path(dest)
+    with _replacing(dest) as f:
+        shutil.copyfileobj(stream, f, _CHUNK)
+    return dest
+
+
+@contextmanager
+def _replacing(dest: Path):
+    # A deck file adopted into the store is a hardlink to a shared, read-only
+    # blob; writing it in place would change (or fail on) every deck's copy.
+    dest.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = dest.with_name(f".{dest.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+    try:
+        with tmp_path.open("wb") as f:
+            yield f
+        os.replace(tmp_path, dest)
+    except BaseException:
+        tmp_path.unlink(missing_ok=True)
+        raise
+
+
+def _file_sha256(path: Path) -> str:
+    digest = hashlib.sha256()
+    with path.open("rb") as f:
+        for chunk in iter(lambda: f.read(_CHUNK), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+class AssetStore:
+    """
+    sha256-addressed blobs under decks/.media-store/objects/ab/<sha256><ext>.
+
+    Writing an asset stores its bytes once and hardlinks the deck path to the
+    blob (copying when the filesystem cannot link), so decks stay
+    self-contained folders that serve and export as before. Linked files are
+    read-only; writers replace them (replace_bytes / replace_stream) rather
+    than editing in place. Every link is recorded in the deck's
+    resources/materials/asset-links.json; gc() removes blobs no deck manifest
+    references. Because deck files are hardlinks or copies, collecting a blob
+    never removes a deck's bytes.
+    """
+
+    def __init__(self, root: Path | str):
+        self.root = Path(root)
+        self.objects_dir = self.root / "objects"
+        self._lock = threading.Lock()
+
+    @classmethod
+    def for_deck(cls, deck_path: Path | str) -> Optional["AssetStore"]:
+        """The store for a deck, if enabled ($KEYNOTE_MEDIA_STORE or an existing decks/.media-store)."""
+        configured = os.environ.get(STORE_ENV)
+        if configured:
+            return cls(configured)
+        root = Path(deck_path).resolve().parent / STORE_DIR
+        return cls(root) if root.is_dir() else None
+
+    # Blobs
+
+    def blob_path(self, sha256: str, suffix: str = "") -> Path:
+        return self.objects_dir / sha256[:2] / f"{sha256}{suffix.lower()}"
+
+    def put_bytes(self, data: bytes, suffix: str = "") -> Path:
+        """Store bytes (once) and return the blob path."""
+        blob = self.blob_path(hashlib.sha256(data).hexdigest(), suffix)
+        if not blob.exists():
+            blob.parent.mkdir(parents=True, exist_ok=True)
+            fd, tmp_name = tempfile.mkstemp(dir=blob.parent, prefix=".incoming-")
+            with os.fdopen(fd, "wb") as f:
+                f.write(data)
+            os.chmod(tmp_name, _BLOB_MODE)
+            os.replace(tmp_name, blob)
+        return blob
+
+    def put_stream(self, stream: BinaryIO, suffix: str = "") -> Path:
+        """Store a stream (e.g. an HTTP response) without holding it in memory."""
+        self.objects_dir.mkdir(parents=True, exist_ok=True)
+        digest = hashlib.sha256()
+        fd, tmp_name = tempfile.mkstemp(dir=self.objects_dir, prefix=".incoming-")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                for chunk in iter(lambda: stream.read(_CHUNK), b""):
+                    digest.update(chunk)
+                    f.write(chunk)
+            blob = self.blob_path(digest.hexdigest(), suffix)
+            if blob.exists():
+                os.unlink(tmp_name)
+            else:
+                blob.parent.mkdir(parents=True, exist_ok=True)
+                os.chmod(tmp_name, _BLOB_MODE)
+                os.replace(tmp_name, blob)
+        except BaseException:
+            if os.path.exists(tmp_name):
+                os.unlink(tmp_name)
+            raise
+        return blob
+
+    def put_file(self, path: Path | str) -> Path:
+        path = Path(path)
+        with path.open("rb") as f:
+            return self.put_stream(f, path.suffix)
+
+    # Deck links
+
+    def link(self, blob: Path, dest: Path | str) -> Path:
+        """Atomically point dest at blob (hardlink, or copy across filesystems) and record it."""
+        dest = Path(dest)
+        dest.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = dest.with_name(f".{dest.name}.{os.getpid()}.{threading.get_ident()}.link")
+        try:
+            os.link(blob, tmp_path)
+        except OSError as e:
+            if e.errno not in (errno.EXDEV, errno.EPERM, errno.EMLINK, errno.ENOTSUP):
+                raise
+            shutil.copyfile(blob, tmp_path)
+        os.replace(tmp_path, dest)
+        self._record_link(dest, blob)
+        return dest
+
+    def write_bytes(self, data: bytes, dest: Path | str) -> Path:
+        dest = Path(dest)
+        return self.link(self.put_bytes(data, dest.suffix), dest)
+
+    def write_stream(self, stream: BinaryIO, dest: Path | str) -> Path:
+        dest = Path(dest)
+        return self.link(self.put_stream(stream, dest.suffix), dest)
+
+    def adopt(self, deck_path: Path | str) -> tuple[int, int]:
+        """Move a deck's existing assets into the store; returns (files, bytes deduplicated)."""
+        deck_path = Path(deck_path)
+        files = saved = 0
+        for path in sorted((deck_path / "resources" / "assets").rglob("*")):
+            if not path.is_file() or path.name.startswith("."):
+                continue
+            sha256 = _file_sha256(path)
+            blob = self.blob_path(sha256, path.suffix)
+            if blob.exists():
+                if not os.path.samefile(blob, path):
+                    saved += path.stat().st_size
+            else:
+                blob = self.put_file(path)
+            if not os.path.samefile(blob, path):
+                self.link(blob, path)
+            else:
+                self._record_link(path, blob)
+            files += 1
+        return files, saved
+
+    def _record_link(self, dest: Path, blob: Path) -> None:
+        deck = deck_for_path(dest)
+        if deck is None:
+            return
+        links_path = deck / "resources" / "materials" / LINKS_FILE
+        with self._lock:
+            links = _load_links(links_path)
+            links[dest.resolve().relative_to(deck.resolve()).as_posix()] = {
+                "sha256": blob.name.split(".", 1)[0],
+                "blob": blob.name,
+            }
+            _save_links(links_path, links)
+
+    # Garbage collection
+
+    def referenced(self, decks_root: Path | str) -> set[str]:
+        """Blob names still referenced by a deck file whose content matches its manifest entry."""
+        names = set()
+        for links_path in Path(decks_root).glob(f"*/resources/materials/{LINKS_FILE}"):
+            deck = links_path.parents[2]
+            links = _load_links(links_path)
+            live = {}
+            for rel, entry in links.items():
+                dest = deck / rel
+                blob = self.blob_path(entry["sha256"], Path(entry["blob"]).suffix)
+                if not dest.exists():
+                    continue
+                # Replaced files (new generation written without the store) no longer reference the blob
+                if blob.exists() and os.path.samefile(dest, blob):
+                    same = True
+                else:
+                    same = _file_sha256(dest) == entry["sha256"]
+                if same:
+                    live[rel] = entry
+                    names.add(entry["blob"])
+            if live != links:
+                with self._lock:
+                    _save_links(links_path, live)
+        return names
+
+    def gc(self, decks_root: Path | str, dry_run: bool = False) -> tuple[int, int]:
+        """Delete unreferenced blobs; returns (blobs, bytes) removed."""
+        keep = self.referenced(decks_root)
+        removed = freed = 0
+        for blob in self.objects_dir.glob("*/*"):
+            if blob.name.startswith(".") or blob.name in keep:
+                continue
+            removed += 1
+            freed += blob.stat().st_size
+            if not dry_run:
+                blob.unlink()
+        return removed, freed
+
+    def usage(self) -> tuple[int, int]:
+        """(blobs, bytes) currently stored."""
+        blobs = [b for b in self.objects_dir.glob("*/*") if not b.name.startswith(".")]
+        return len(blobs), sum(b.stat().st_size for b in blobs)
+
+
+def _load_links(links_path: Path) -> dict:
+    if links_path.exists():
+        data = json.loads(links_path.read_text())
+        if data.get("version") == LINKS_VERSION:
+            return data["links"]
+    return {}
+
+
+def _save_links(links_path: Path, links: dict) -> None:
+    links_path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = links_path.with_name(f".{links_path.name}.{os.getpid()}.tmp")
+    tmp_path.write_text(json.dumps({"version": LINKS_VERSION, "links": links}, indent=2, sort_keys=True))
+    os.replace(tmp_path, links_path)
+
+
+def _mb(size: int) -> str:
+    return f"{size / 1_000_000:.1f} MB"
+
+
+def main(argv: Optional[list[str]] = None) -> int:
+    parser = argparse.ArgumentParser(
+        prog="python3 -m lib.media store",
+        description="Manage the shared content-addressed asset store",
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog=f"""
+The store lives in <decks>/{STORE_DIR} (or ${STORE_ENV}). Once it exists,
+deck tools write new assets into it and hardlink them into the deck.
+
+Examples:
+  python3 -m lib.media store adopt decks/skill-demo decks/example-pitch
+  python3 -m lib.media store status
+  python3 -m lib.media store gc --dry-run
+        """
+    )
+    parser.add_argument("action", choices=["adopt", "status", "gc"])
+    parser.add_argument("decks", nargs="*", type=Path, help="Decks to adopt")
+    parser.add_argument("--root", type=Path, help="Decks root (default: the repo's decks/, or $KEYNOTE_DECKS_ROOT)")
+    parser.add_argument("--dry-run", action="store_true", help="gc: report without deleting")
+    args = parser.parse_args(argv)
+
+    if args.root is None:
+        from .local_library import default_decks_root
+        args.root = default_decks_root()
+    store = AssetStore(os.environ.get(STORE_ENV) or args.root / STORE_DIR)
+
+    if args.action == "adopt":
+        if not args.decks:
+            print("Error: adopt needs at least one deck")
+            return 1
+        for deck in args.decks:
+            files, saved = store.adopt(deck)
+            print(f"  {deck}: {files} file(s), {_mb(saved)} deduplicated")
+    elif args.action == "gc":
+        removed, freed = store.gc(args.root, dry_run=args.dry_run)
+        verb = "Would remove" if args.dry_run else "Removed"
+        print(f"{verb} {removed} unreferenced blob(s), {_mb(freed)}")
+
+    blobs, size = store.usage()
+    print(f"Store {store.root}: {blobs} blob(s), {_mb(size)}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
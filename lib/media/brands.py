@@ -0,0 +1,55 @@
+# ABOUTME: Reads shared brand profiles (decks/brands.js) for Python media tools.
+# ABOUTME: Resolves a deck's entity to its tokens and mediaPromptPrefix.
+
+from __future__ import annotations
+
+import json
+import re
+from pathlib import Path
+from typing import Optional
+
+_ASSIGNMENT = re.compile(r"window\.KEYNOTE_BRANDS\s*=\s*(\{.*?\n\});", re.S)
+_LINE_COMMENT = re.compile(r"^\s*//.*$", re.M)
+_BARE_KEY = re.compile(r"^(\s*)([A-Za-z_$][\w$]*)\s*:", re.M)
+_TRAILING_COMMA = re.compile(r",(\s*[}\]])")
+
+
+def load_brands(brands_path: Path | str) -> dict:
+    """
+    Parse the KEYNOTE_BRANDS object literal from brands.js.
+
+    The file is a plain object literal (bare keys, trailing commas), so it is
+    normalized to JSON rather than evaluated.
+    """
+    text = Path(brands_path).read_text()
+    match = _ASSIGNMENT.search(text)
+    if not match:
+        raise ValueError(f"No window.KEYNOTE_BRANDS object in {brands_path}")
+
+    literal = _LINE_COMMENT.sub("", match.group(1))
+    literal = _BARE_KEY.sub(r'\1"\2":', literal)
+    literal = _TRAILING_COMMA.sub(r"\1", literal)
+    return json.loads(literal)
+
+
+def find_brands_file(deck_path: Path | str) -> Optional[Path]:
+    """brands.js lives next to the deck folders (decks/brands.js)."""
+    candidate = Path(deck_path).resolve().parent / "brands.js"
+    return candidate if candidate.exists() else None
+
+
+def deck_entity(deck_path: Path | str) -> Optional[str]:
+    """Entity id from the deck's deck.json, if present."""
+    deck_json = Path(deck_path) / "deck.json"
+    if not deck_json.exists():
+        return None
+    return json.loads(deck_json.read_text()).get("entity")
+
+
+def brand_for_deck(deck_path: Path | str) -> dict:
+    """Brand profile for a deck's entity, or {} when none is configured."""
+    entity = deck_entity(deck_path)
+    brands_file = find_brands_file(deck_path)
+    if not entity or not brands_file:
+        return {}
+    return load_brands(brands_file).get(entity, {})
@@ -0,0 +1,334 @@
+# ABOUTME: Incremental media build for a deck's prompt files.
+# ABOUTME: Hashes each asset's inputs into a manifest and regenerates only stale or missing outputs.
+
+from __future__ import annotations
+
+import argparse
+import hashlib
+import json
+import os
+import sys
+import time
+from dataclasses import dataclass, field
+from datetime import datetime
+from pathlib import Path
+from typing import Optional
+
+MANIFEST_VERSION = 1
+
+# resources/prompts/build.json (optional) maps prompt files to outputs:
+# {
+#   "defaults": {"temperature": 1.0, "model": "gemini-2.5-flash-image", "brand": "..."},
+#   "assets": {
+#     "slide3-solution.txt": {
+#       "output": "resources/assets/slide3-solution.png",
+#       "inputs": ["resources/assets/base-photo.jpg"],
+#       "temperature": 0.8,
+#       "slide": 3
+#     }
+#   }
+# }
+# Paths are relative to the deck. Prompts without an entry build to
+# resources/assets/<stem>.png with the defaults.
+MAPPING_FILE = "build.json"
+
+
+@dataclass
+class AssetSpec:
+    """One buildable asset: a prompt file plus everything that shapes its output."""
+    name: str
+    prompt_path: Path
+    output_path: Path
+    model: str
+    temperature: float
+    brand_context: str
+    inputs: list[Path] = field(default_factory=list)
+    slide: Optional[int] = None
+
+    @property
+    def mode(self) -> str:
+        return "edit" if self.inputs else "generate"
+
+
+@dataclass
+class BuildPlan:
+    """Assets split by whether they need regeneration, with the reason for each."""
+    stale: list[tuple[AssetSpec, str, str]] = field(default_factory=list)  # (spec, digest, reason)
+    fresh: list[AssetSpec] = field(default_factory=list)
+    # Existing outputs the manifest has never recorded: kept as they are and
+    # recorded with the current input hash, so only later edits rebuild them
+    adopted: list[tuple[AssetSpec, str]] = field(default_factory=list)  # (spec, digest)
+
+
+class DeckMediaBuild:
+    """
+    Make a deck's generated assets up to date.
+
+    Each asset's input hash covers prompt text, brand context, model,
+    temperature, mode, and input image contents. Input files are re-hashed
+    only when their size or mtime changes, so an unchanged rebuild is a
+    handful of stat() calls and one manifest read.
+    """
+
+    def __init__(self, deck_path: Path | str):
+        self.deck_path = Path(deck_path)
+        self.prompts_dir = self.deck_path / "resources" / "prompts"
+        self.manifest_path = self.deck_path / "resources" / "materials" / "media-build-manifest.json"
+        self.manifest = self._load_manifest()
+        self._tools: dict[str, object] = {}
+
+    # Spec discovery
+
+    def specs(self) -> list[AssetSpec]:
+        """All prompt files with their resolved build settings."""
+        mapping = self._load_mapping()
+        defaults = mapping.get("defaults", {})
+        entries = mapping.get("assets", {})
+        default_brand = defaults.get("brand")
+        if default_brand is None:
+            default_brand = self._deck_brand_context()
+
+        specs = []
+        for prompt_path in sorted(self.prompts_dir.glob("*.txt")):
+            entry = {**defaults, **entries.get(prompt_path.name, {})}
+            output = entry.get("output") or f"resources/assets/{prompt_path.stem}.png"
+            specs.append(AssetSpec(
+                name=prompt_path.name,
+                prompt_path=prompt_path,
+                output_path=self.deck_path / output,
+                model=entry.get("model") or _default_model(),
+                temperature=float(entry.get("temperature", 1.0)),
+                brand_context=entry.get("brand", default_brand),
+                inputs=[self.deck_path / p for p in entry.get("inputs", [])],
+                slide=entry.get("slide"),
+            ))
+        return specs
+
+    def _load_mapping(self) -> dict:
+        mapping_path = self.prompts_dir / MAPPING_FILE
+        if not mapping_path.exists():
+            return {}
+        return json.loads(mapping_path.read_text())
+
+    def _deck_brand_context(self) -> str:
+        from .brands import brand_for_deck
+
+        try:
+            return brand_for_deck(self.deck_path).get("mediaPromptPrefix", "")
+        except (OSError, ValueError):
+            return ""
+
+    # Hashing
+
+    def input_digest(self, spec: AssetSpec) -> str:
+        """Stable hash of everything that determines the asset's output."""
+        payload = {
+            "prompt": self._file_digest(spec.prompt_path),
+            "brand": spec.brand_context,
+            "model": spec.model,
+            "temperature": spec.temperature,
+            "mode": spec.mode,
+            "inputs": [self._file_digest(p) for p in spec.inputs],
+        }
+        return hashlib.sha256(json.dumps(payload, sort_keys=True).encode("utf-8")).hexdigest()
+
+    def _file_digest(self, path: Path) -> str:
+        """sha256 of a file, reusing the manifest's value while size and mtime match."""
+        key = self._rel(path)
+        stat = path.stat()
+        cached = self.manifest["files"].get(key)
+        if cached and cached["size"] == stat.st_size and cached["mtime_ns"] == stat.st_mtime_ns:
+            return cached["sha256"]
+
+        digest = hashlib.sha256()
+        with path.open("rb") as f:
+            for chunk in iter(lambda: f.read(1 << 20), b""):
+                digest.update(chunk)
+        self.manifest["files"][key] = {
+            "size": stat.st_size,
+            "mtime_ns": stat.st_mtime_ns,
+            "sha256": digest.hexdigest(),
+        }
+        return digest.hexdigest()
+
+    # Planning + building
+
+    def plan(self, force: bool = False, only: Optional[list[str]] = None) -> BuildPlan:
+        plan = BuildPlan()
+        for spec in self.specs():
+            if only and spec.name not in only and spec.prompt_path.stem not in only:
+                continue
+            missing_inputs = [p for p in spec.inputs if not p.exists()]
+            if missing_inputs:
+                raise FileNotFoundError(f"{spec.name}: input not found: {missing_inputs[0]}")
+
+            digest = self.input_digest(spec)
+            entry = self.manifest["assets"].get(self._rel(spec.output_path))
+            if force:
+                reason = "forced"
+            elif not spec.output_path.exists():
+                reason = "output missing"
+            elif not entry:
+                plan.adopted.append((spec, digest))
+                continue
+            elif entry["input_hash"] != digest:
+                reason = "inputs changed"
+            else:
+                plan.fresh.append(spec)
+                continue
+            plan.stale.append((spec, digest, reason))
+        return plan
+
+    def adopt(self, plan: BuildPlan) -> None:
+        """Record adopted outputs as built from their current inputs."""
+        for spec, digest in plan.adopted:
+            self._record(spec, digest, adopted=True)
+
+    def _record(self, spec: AssetSpec, digest: str, adopted: bool = False) -> None:
+        entry = {
+            "prompt_file": self._rel(spec.prompt_path),
+            "input_hash": digest,
+            "model": spec.model,
+            "temperature": spec.temperature,
+            "inputs": [self._rel(p) for p in spec.inputs],
+            "built_at": datetime.now().isoformat(),
+        }
+        if adopted:
+            entry["adopted"] = True
+        self.manifest["assets"][self._rel(spec.output_path)] = entry
+
+    def build(self, plan: BuildPlan, out=sys.stdout) -> int:
+        """Regenerate stale assets; returns the number of failures."""
+        failures = 0
+        for spec, digest, reason in plan.stale:
+            print(f"  building {spec.name} -> {self._rel(spec.output_path)} ({reason})", file=out)
+            try:
+                self._generate(spec)
+            except Exception as e:
+                failures += 1
+                print(f"  failed {spec.name}: {e}", file=out)
+                continue
+
+            self._record(spec, digest)
+            # Persist per asset so an interrupted build keeps finished work
+            self.save_manifest()
+        return failures
+
+    def _generate(self, spec: AssetSpec) -> None:
+        tools = self._tools_for_model(spec.model)
+        prompt = spec.prompt_path.read_text()
+        reasoning = f"media build: {spec.name}"
+        if spec.inputs:
+            tools.edit_image(
+                prompt=prompt,
+                input_path=spec.inputs[0],
+                reference_paths=spec.inputs[1:],
+                output_path=spec.output_path,
+                brand_context=spec.brand_context,
+                slide_number=spec.slide,
+                reasoning=reasoning,
+                temperature=spec.temperature,
+            )
+        else:
+            tools.generate(
+                prompt=prompt,
+                output_path=spec.output_path,
+                brand_context=spec.brand_context,
+                slide_number=spec.slide,
+                reasoning=reasoning,
+                temperature=spec.temperature,
+            )
+
+    def _tools_for_model(self, model: str):
+        if model not in self._tools:
+            from .model_mediated import get_tools_for_deck
+            from .nano_banana import NanoBananaClient
+
+            self._tools[model] = get_tools_for_deck(self.deck_path, generator=NanoBananaClient(model=model))
+        return self._tools[model]
+
+    # Manifest
+
+    def _load_manifest(self) -> dict:
+        if self.manifest_path.exists():
+            data = json.loads(self.manifest_path.read_text())
+            if data.get("version") == MANIFEST_VERSION:
+                return data
+        return {"version": MANIFEST_VERSION, "assets": {}, "files": {}}
+
+    def save_manifest(self) -> None:
+        self.manifest_path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.manifest_path.with_suffix(".json.tmp")
+        tmp_path.write_text(json.dumps(self.manifest, indent=2, sort_keys=True))
+        os.replace(tmp_path, self.manifest_path)
+
+    def _rel(self, path: Path) -> str:
+        try:
+            return str(Path(path).resolve().relative_to(self.deck_path.resolve()))
+        except ValueError:
+            return str(path)
+
+
+def _default_model() -> str:
+    from .nano_banana import NanoBananaClient
+
+    return os.environ.get("NANO_BANANA_IMAGE_MODEL", NanoBananaClient.DEFAULT_MODEL)
+
+
+def main(argv: Optional[list[str]] = None) -> int:
+    parser = argparse.ArgumentParser(
+        prog="python3 -m lib.media build",
+        description="Bring a deck's generated assets up to date",
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog="""
+Reads resources/prompts/*.txt (plus optional resources/prompts/build.json) and
+regenerates only assets whose inputs changed or whose outputs are missing.
+Outputs that already exist but were never built (a deck's first build) are
+adopted as up to date; use --force to regenerate them anyway.
+
+Examples:
+  python3 -m lib.media build decks/my-pitch
+  python3 -m lib.media build decks/my-pitch --dry-run
+  python3 -m lib.media build decks/my-pitch --only slide3-solution --force
+        """
+    )
+    parser.add_argument("deck", type=Path, help="Deck directory")
+    parser.add_argument("--dry-run", action="store_true", help="Show what would be rebuilt")
+    parser.add_argument("--force", action="store_true", help="Rebuild even if up to date")
+    parser.add_argument("--only", nargs="+", help="Prompt names (file or stem) to consider")
+    args = parser.parse_args(argv)
+
+    if not (args.deck / "resources" / "prompts").is_dir():
+        print(f"Error: No resources/prompts directory in {args.deck}")
+        return 1
+
+    start = time.perf_counter()
+    builder = DeckMediaBuild(args.deck)
+    try:
+        plan = builder.plan(force=args.force, only=args.only)
+    except (FileNotFoundError, ValueError) as e:
+        print(f"Error: {e}")
+        return 1
+
+    if args.dry_run:
+        for spec, _, reason in plan.stale:
+            print(f"  would build {spec.name} ({reason})")
+        for spec, _ in plan.adopted:
+            print(f"  would adopt existing {spec.name}")
+        builder.save_manifest()  # keep refreshed file hashes
+        print(f"{len(plan.stale)} stale, {len(plan.fresh)} up to date, {len(plan.adopted)} to adopt")
+        return 0
+
+    builder.adopt(plan)
+    builder.save_manifest()
+    failures = builder.build(plan) if plan.stale else 0
+    builder.save_manifest()
+    elapsed_ms = (time.perf_counter() - start) * 1000
+    built = len(plan.stale) - failures
+    print(f"Built {built}, up to date {len(plan.fresh)}, adopted {len(plan.adopted)}, "
+          f"failed {failures} ({elapsed_ms:.0f}ms)")
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
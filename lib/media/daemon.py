@@ -0,0 +1,402 @@
+# ABOUTME: Long-running media daemon that keeps acquisition clients and caches warm.
+# ABOUTME: Serves model_mediated CLI commands over a Unix socket; the CLI forwards transparently.
+
+from __future__ import annotations
+
+import argparse
+import io
+import json
+import os
+import socket
+import socketserver
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+import traceback
+from collections import OrderedDict
+from pathlib import Path
+from typing import Optional
+
+SOCKET_ENV = "KEYNOTE_MEDIA_SOCKET"
+DISABLE_ENV = "KEYNOTE_MEDIA_NO_DAEMON"
+
+# Search results are stable for minutes; repeated queries while iterating on
+# a slide should not spend API quota.
+SEARCH_CACHE_SIZE = 128
+SEARCH_CACHE_TTL = 15 * 60
+
+
+def log_path(socket_path: Path) -> Path:
+    """Daemon log next to its socket; warnings outside any request land here."""
+    return socket_path.with_name(socket_path.name + ".log")
+
+
+def default_socket_path() -> Path:
+    """Socket path from $KEYNOTE_MEDIA_SOCKET, else a per-user temp path."""
+    env_path = os.environ.get(SOCKET_ENV)
+    if env_path:
+        return Path(env_path)
+    return Path(tempfile.gettempdir()) / f"keynote-media-{os.getuid()}.sock"
+
+
+class DaemonError(Exception):
+    """Error talking to the media daemon."""
+    pass
+
+
+# Client side
+
+def request(
+    message: dict,
+    socket_path: Optional[Path] = None,
+    timeout: Optional[float] = None,
+) -> dict:
+    """Send one JSON request to the daemon and return its JSON response."""
+    socket_path = Path(socket_path or default_socket_path())
+    try:
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+            sock.settimeout(timeout)
+            sock.connect(str(socket_path))
+            sock.sendall(json.dumps(message).encode("utf-8") + b"\n")
+            with sock.makefile("rb") as stream:
+                line = stream.readline()
+    except OSError as e:
+        raise DaemonError(f"Daemon unavailable at {socket_path}: {e}") from e
+
+    if not line:
+        raise DaemonError("Daemon closed connection without a response")
+    return json.loads(line.decode("utf-8"))
+
+
+def is_running(socket_path: Optional[Path] = None) -> bool:
+    """True when a daemon answers on the socket."""
+    try:
+        return request({"op": "ping"}, socket_path, timeout=2).get("ok", False)
+    except DaemonError:
+        return False
+
+
+def forward(argv: list[str], socket_path: Optional[Path] = None) -> Optional[dict]:
+    """
+    Run a model_mediated command in the daemon if one is running.
+
+    Returns:
+        Response dict (exit_code, stdout, stderr), or None when the command
+        should run in-process (no daemon, or KEYNOTE_MEDIA_NO_DAEMON set).
+    """
+    if os.environ.get(DISABLE_ENV):
+        return None
+    socket_path = Path(socket_path or default_socket_path())
+    if not socket_path.exists():
+        return None
+    try:
+        return request({"op": "run", "argv": argv, "cwd": os.getcwd()}, socket_path)
+    except DaemonError:
+        return None
+
+
+# Server side
+
+class CachingSearchClient:
+    """Wraps ImageSearchClient with an in-memory TTL cache for search()."""
+
+    def __init__(self, client, max_entries: int = SEARCH_CACHE_SIZE, ttl: float = SEARCH_CACHE_TTL):
+        self._client = client
+        self._max_entries = max_entries
+        self._ttl = ttl
+        self._cache: OrderedDict[str, tuple[float, list]] = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def search(self, query: str, **kwargs) -> list:
+        key = json.dumps([query, kwargs], sort_keys=True, default=str)
+        now = time.monotonic()
+        with self._lock:
+            cached = self._cache.get(key)
+            if cached and now - cached[0] < self._ttl:
+                self._cache.move_to_end(key)
+                self.hits += 1
+                return list(cached[1])
+            self.misses += 1
+
+        results = self._client.search(query, **kwargs)
+
+        with self._lock:
+            self._cache[key] = (now, results)
+            self._cache.move_to_end(key)
+            while len(self._cache) > self._max_entries:
+                self._cache.popitem(last=False)
+        return list(results)
+
+    def __getattr__(self, name):
+        # download(), available_sources, ... go straight to the wrapped client
+        return getattr(self._client, name)
+
+
+class MediaDaemon:
+    """Holds warm clients shared across requests."""
+
+    def __init__(self):
+        self.started_at = time.time()
+        self.requests = 0
+        self._lock = threading.Lock()
+        self._generator = None
+        self._searcher = None
+        self._decks: set[str] = set()
+
+    def _shared_generator(self):
+        with self._lock:
+            if self._generator is None:
+                from .nano_banana import NanoBananaClient
+                self._generator = NanoBananaClient()
+            return self._generator
+
+    def _shared_searcher(self):
+        with self._lock:
+            if self._searcher is None:
+                from .image_search import ImageSearchClient
+                self._searcher = CachingSearchClient(ImageSearchClient())
+            return self._searcher
+
+    def tools_for(self, deck: Optional[Path]):
+        """
+        Fresh tools for one request, bound to the shared warm clients.
+
+        Only the HTTP clients are shared. Everything the tools read from the
+        deck is re-read per request (cheap file reads), so results match the
+        one-shot CLI after edits and concurrent requests never share a tools
+        object.
+        """
+        from .model_mediated import ImageAcquisitionTools, get_tools_for_deck
+
+        # Bound lazily so an unconfigured provider only fails the commands that need it
+        clients = {
+            "generator": _LazyClient(self._shared_generator),
+            "searcher": _LazyClient(self._shared_searcher),
+        }
+        if not deck:
+            return ImageAcquisitionTools(**clients)
+        deck = Path(deck).resolve()
+        with self._lock:
+            self._decks.add(str(deck))
+        return get_tools_for_deck(deck, **clients)
+
+    def run(self, argv: list[str], cwd: str) -> dict:
+        """Run a model_mediated command with output captured."""
+        from .model_mediated import build_parser, run_command
+
+        stdout = io.StringIO()
+        stderr = io.StringIO()
+        _relay.stream = stderr
+        try:
+            args = build_parser().parse_args(argv)
+            _absolutize_paths(args, Path(cwd))
+            exit_code = run_command(args, out=stdout, tools_for=self.tools_for)
+        except SystemExit as e:  # argparse errors
+            exit_code = e.code if isinstance(e.code, int) else 2
+        except Exception as e:
+            stderr.write(f"Error: {e}\n")
+            stderr.write(traceback.format_exc())
+            exit_code = 1
+        finally:
+            _relay.stream = None
+
+        with self._lock:
+            self.requests += 1
+        return {"exit_code": exit_code, "stdout": stdout.getvalue(), "stderr": stderr.getvalue()}
+
+    def status(self) -> dict:
+        searcher = self._searcher
+        return {
+            "ok": True,
+            "pid": os.getpid(),
+            "uptime": round(time.time() - self.started_at, 1),
+            "requests": self.requests,
+            "decks": sorted(self._decks),
+            "generator_warm": self._generator is not None,
+            "searcher_warm": searcher is not None,
+            "search_cache": {
+                "hits": searcher.hits,
+                "misses": searcher.misses,
+            } if searcher else None,
+        }
+
+
+class _LazyClient:
+    """Resolves a shared client on first attribute access."""
+
+    def __init__(self, factory):
+        self._factory = factory
+
+    def __getattr__(self, name):
+        return getattr(self._factory(), name)
+
+
+class _StderrRelay(threading.local):
+    """
+    sys.stderr for the daemon: writes made while a request runs on this
+    thread (tool warnings, warnings.warn, logging) go back to that request's
+    client; anything else goes to the daemon's own stderr (its log file).
+    """
+
+    stream: Optional[io.StringIO] = None
+
+    def __init__(self, fallback):
+        self._fallback = fallback
+
+    def write(self, text: str) -> int:
+        return (self.stream or self._fallback).write(text)
+
+    def flush(self) -> None:
+        (self.stream or self._fallback).flush()
+
+    def __getattr__(self, name):
+        return getattr(self._fallback, name)
+
+
+_relay = _StderrRelay(sys.stderr)
+
+
+def _absolute(value, cwd: Path):
+    if isinstance(value, Path):
+        return value if value.is_absolute() else cwd / value
+    if isinstance(value, (list, tuple)):
+        return type(value)(_absolute(item, cwd) for item in value)
+    return value
+
+
+def _absolutize_paths(args: argparse.Namespace, cwd: Path) -> None:
+    """Resolve relative Path arguments (also inside lists) against the caller's working directory."""
+    for name, value in vars(args).items():
+        setattr(args, name, _absolute(value, cwd))
+
+
+class _RequestHandler(socketserver.StreamRequestHandler):
+
+    def handle(self):
+        line = self.rfile.readline()
+        if not line:
+            return
+        try:
+            message = json.loads(line.decode("utf-8"))
+        except json.JSONDecodeError as e:
+            self._reply({"ok": False, "error": f"Bad request: {e}"})
+            return
+
+        daemon: MediaDaemon = self.server.daemon
+        op = message.get("op")
+        if op == "ping":
+            self._reply(daemon.status())
+        elif op == "run":
+            self._reply(daemon.run(message.get("argv", []), message.get("cwd", os.getcwd())))
+        elif op == "shutdown":
+            self._reply({"ok": True})
+            threading.Thread(target=self.server.shutdown, daemon=True).start()
+        else:
+            self._reply({"ok": False, "error": f"Unknown op: {op}"})
+
+    def _reply(self, payload: dict) -> None:
+        self.wfile.write(json.dumps(payload).encode("utf-8") + b"\n")
+
+
+class _Server(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    daemon_threads = True
+
+
+def serve(socket_path: Optional[Path] = None) -> None:
+    """Run the daemon in the foreground until shutdown."""
+    socket_path = Path(socket_path or default_socket_path())
+    if socket_path.exists():
+        if is_running(socket_path):
+            raise DaemonError(f"Daemon already running at {socket_path}")
+        socket_path.unlink()  # Stale socket from a crashed daemon
+
+    socket_path.parent.mkdir(parents=True, exist_ok=True)
+    server = _Server(str(socket_path), _RequestHandler)
+    server.daemon = MediaDaemon()
+    os.chmod(socket_path, 0o600)
+    sys.stderr = _relay
+
+    print(f"Media daemon listening on {socket_path} (pid {os.getpid()})", flush=True)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        if socket_path.exists():
+            socket_path.unlink()
+
+
+def start(socket_path: Optional[Path] = None, wait: float = 10.0) -> dict:
+    """Start a detached daemon and wait until it answers."""
+    socket_path = Path(socket_path or default_socket_path())
+    if is_running(socket_path):
+        return request({"op": "ping"}, socket_path)
+
+    package_root = Path(__file__).resolve().parents[2]
+    socket_path.parent.mkdir(parents=True, exist_ok=True)
+    with open(log_path(socket_path), "ab") as log:
+        subprocess.Popen(
+            [sys.executable, "-m", "lib.media.daemon", "serve", "--socket", str(socket_path)],
+            cwd=package_root,
+            stdin=subprocess.DEVNULL,
+            stdout=log,
+            stderr=subprocess.STDOUT,
+            start_new_session=True,
+        )
+
+    deadline = time.monotonic() + wait
+    while time.monotonic() < deadline:
+        if is_running(socket_path):
+            return request({"op": "ping"}, socket_path)
+        time.sleep(0.05)
+    raise DaemonError(f"Daemon did not start within {wait}s")
+
+
+def main(argv: Optional[list[str]] = None) -> int:
+    parser = argparse.ArgumentParser(
+        prog="python3 -m lib.media.daemon",
+        description="Warm media daemon for model_mediated CLI commands",
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog="""
+Examples:
+  # Start in the background; later CLI calls are forwarded automatically
+  python3 -m lib.media.daemon start
+
+  # Check warm clients and cache stats
+  python3 -m lib.media.daemon status
+
+  # Warnings outside a request are logged next to the socket
+  tail -f /tmp/keynote-media-$(id -u).sock.log
+
+  # Stop it
+  python3 -m lib.media.daemon stop
+        """
+    )
+    parser.add_argument("action", choices=["start", "serve", "status", "stop"])
+    parser.add_argument("--socket", type=Path, help=f"Socket path (default: ${SOCKET_ENV} or temp dir)")
+    args = parser.parse_args(argv)
+
+    try:
+        if args.action == "serve":
+            serve(args.socket)
+        elif args.action == "start":
+            status = start(args.socket)
+            print(f"Media daemon running (pid {status['pid']}) on {args.socket or default_socket_path()}")
+        elif args.action == "status":
+            print(json.dumps(request({"op": "ping"}, args.socket, timeout=5), indent=2))
+        elif args.action == "stop":
+            request({"op": "shutdown"}, args.socket, timeout=5)
+            print("Media daemon stopped")
+    except DaemonError as e:
+        print(f"Error: {e}")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,321 @@
+# ABOUTME: Threaded static server for deck preview and review with ETags, byte ranges and compression.
+# ABOUTME: Starts on an ephemeral port with a /__ready endpoint so review scripts need not sleep.
+
+from __future__ import annotations
+
+import argparse
+import email.utils
+import gzip
+import json
+import os
+import re
+import sys
+import threading
+from collections import OrderedDict
+from functools import partial
+from http import HTTPStatus
+from http.server import SimpleHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Optional
+
+READY_PATH = "/__ready"
+CHUNK_SIZE = 256 * 1024
+
+# Sibling files tried before the original, in preference order
+PRECOMPRESSED = [("br", ".br"), ("gzip", ".gz")]
+# Text types gzipped on the fly when no sibling exists; images and video are
+# already compressed and are sent as-is (ETags spare the re-transfer)
+COMPRESSIBLE_TYPES = re.compile(r"^(text/|application/(javascript|json|xml)|image/svg\+xml)")
+# Bodies larger than this are not gzipped in memory
+MAX_GZIP_BYTES = 8 * 1024 * 1024
+GZIP_CACHE_SIZE = 64
+
+_RANGE = re.compile(r"^bytes=(\d*)-(\d*)$")
+
+
+def etag_for(stat: os.stat_result) -> str:
+    """Validator from size and mtime; cheap for multi-megabyte assets."""
+    return f'"{stat.st_size:x}-{stat.st_mtime_ns:x}"'
+
+
+def parse_range(header: str, size: int) -> Optional[tuple[int, int]]:
+    """
+    Inclusive (start, end) for a single "bytes=" range, or None when the
+    header is not one satisfiable range. Multiple ranges are not supported.
+    """
+    match = _RANGE.match(header.strip())
+    if not match or (not match.group(1) and not match.group(2)):
+        return None
+    start, end = match.group(1), match.group(2)
+    if not start:
+        length = int(end)
+        if length == 0:
+            return None
+        return max(0, size - length), size - 1
+    first = int(start)
+    last = min(int(end), size - 1) if end else size - 1
+    if first >= size or first > last:
+        return None
+    return first, last
+
+
+class _GzipCache:
+    """Small LRU of gzipped bodies keyed by (path, etag)."""
+
+    def __init__(self, size: int = GZIP_CACHE_SIZE):
+        self.size = size
+        self._entries: OrderedDict[tuple[str, str], bytes] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, path: str, etag: str) -> bytes:
+        key = (path, etag)
+        with self._lock:
+            if key in self._entries:
+                self._entries.move_to_end(key)
+                return self._entries[key]
+        with open(path, "rb") as f:
+            body = gzip.compress(f.read(), compresslevel=6, mtime=0)
+        with self._lock:
+            self._entries[key] = body
+            while len(self._entries) > self.size:
+                self._entries.popitem(last=False)
+        return body
+
+
+class DeckRequestHandler(SimpleHTTPRequestHandler):
+    """
+    Static files with ETag/If-None-Match, single byte ranges (video
+    seeking), precompressed .br/.gz siblings and on-the-fly gzip for text.
+    Directories fall back to the standard index.html/listing behaviour.
+    """
+
+    protocol_version = "HTTP/1.1"
+    gzip_cache: _GzipCache
+
+    def log_message(self, format, *args):
+        pass  # Keep CLI output clean
+
+    def do_GET(self):
+        self._serve(send_body=True)
+
+    def do_HEAD(self):
+        self._serve(send_body=False)
+
+    def _serve(self, send_body: bool) -> None:
+        try:
+            if self.path.split("?", 1)[0] == READY_PATH:
+                self._send_bytes(HTTPStatus.OK, b'{"ok": true}', "application/json", send_body)
+                return
+
+            path = self.translate_path(self.path)
+            if os.path.isdir(path) or not os.path.isfile(path):
+                # Redirects, index.html, listings and 404s
+                f = self.send_head()
+                if f:
+                    try:
+                        if send_body:
+                            self.copyfile(f, self.wfile)
+                    finally:
+                        f.close()
+                return
+            self._send_file(path, send_body)
+        except (BrokenPipeError, ConnectionResetError):
+            pass  # The page navigated away mid-transfer
+
+    def _send_bytes(self, status: int, body: bytes, content_type: str, send_body: bool) -> None:
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        self.send_header("Cache-Control", "no-store")
+        self.end_headers()
+        if send_body:
+            self.wfile.write(body)
+
+    def _accepted_encodings(self) -> set[str]:
+        """Codings the client accepts; q=0 explicitly refuses one."""
+        accepted = set()
+        for token in self.headers.get("Accept-Encoding", "").split(","):
+            coding, *params = [part.strip().lower() for part in token.split(";")]
+            q = 1.0
+            for param in params:
+                if param.startswith("q="):
+                    try:
+                        q = float(param[2:])
+                    except ValueError:
+                        q = 0.0
+            if coding and q > 0:
+                accepted.add(coding)
+        return accepted
+
+    def _variant(self, path: str, accepted: set[str]) -> tuple[str, Optional[str]]:
+        """(file to send, Content-Encoding) honouring Accept-Encoding."""
+        source_mtime = os.stat(path).st_mtime_ns
+        for encoding, suffix in PRECOMPRESSED:
+            candidate = path + suffix
+            if encoding in accepted and os.path.isfile(candidate) and os.stat(candidate).st_mtime_ns >= source_mtime:
+                return candidate, encoding
+        return path, None
+
+    def _send_file(self, path: str, send_body: bool) -> None:
+        content_type = self.guess_type(path)
+        accepted = self._accepted_encodings()
+        send_path, encoding = self._variant(path, accepted)
+        stat = os.stat(send_path)
+        etag = etag_for(stat)
+        gzip_on_the_fly = (
+            encoding is None
+            and "gzip" in accepted
+            and COMPRESSIBLE_TYPES.match(content_type)
+            and 0 < stat.st_size <= MAX_GZIP_BYTES
+            and not self.headers.get("Range")
+        )
+        if gzip_on_the_fly:
+            encoding = "gzip"
+            etag = etag[:-1] + '-gz"'
+
+        if etag in [tag.strip() for tag in self.headers.get("If-None-Match", "").split(",")]:
+            self.send_response(HTTPStatus.NOT_MODIFIED)
+            self._validators(etag, stat, encoding)
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+            return
+
+        if gzip_on_the_fly:
+            body = self.gzip_cache.get(send_path, etag)
+            self.send_response(HTTPStatus.OK)
+            self.send_header("Content-Type", content_type)
+            self._validators(etag, stat, encoding)
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            if send_body:
+                self.wfile.write(body)
+            return
+
+        size = stat.st_size
+        start, end, status = 0, size - 1, HTTPStatus.OK
+        range_header = self.headers.get("Range")
+        if_range = self.headers.get("If-Range")
+        if range_header and encoding is None and (not if_range or if_range.strip() == etag):
+            byte_range = parse_range(range_header, size)
+            if byte_range is None:
+                self.send_response(HTTPStatus.REQUESTED_RANGE_NOT_SATISFIABLE)
+                self.send_header("Content-Range", f"bytes */{size}")
+                self.send_header("Content-Length", "0")
+                self.end_headers()
+                return
+            start, end = byte_range
+            status = HTTPStatus.PARTIAL_CONTENT
+
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self._validators(etag, stat, encoding)
+        if status == HTTPStatus.PARTIAL_CONTENT:
+            self.send_header("Content-Range", f"bytes {start}-{end}/{size}")
+        self.send_header("Content-Length", str(end - start + 1 if size else 0))
+        self.end_headers()
+        if send_body and size:
+            with open(send_path, "rb") as f:
+                f.seek(start)
+                remaining = end - start + 1
+                while remaining > 0:
+                    chunk = f.read(min(CHUNK_SIZE, remaining))
+                    if not chunk:
+                        break
+                    self.wfile.write(chunk)
+                    remaining -= len(chunk)
+
+    def _validators(self, etag: str, stat: os.stat_result, encoding: Optional[str]) -> None:
+        self.send_header("ETag", etag)
+        self.send_header("Last-Modified", email.utils.formatdate(stat.st_mtime, usegmt=True))
+        # Revalidate every load: decks change while being reviewed, and a 304 is cheap
+        self.send_header("Cache-Control", "no-cache")
+        self.send_header("Accept-Ranges", "bytes")
+        self.send_header("Vary", "Accept-Encoding")
+        if encoding:
+            self.send_header("Content-Encoding", encoding)
+
+
+class DeckServer:
+    """
+    Threaded static server over a directory (default: the repo root, so
+    decks are at /decks/<name>/index.html). port=0 picks a free port; read
+    .port or .url after start().
+    """
+
+    def __init__(self, root: Path | str = ".", host: str = "127.0.0.1", port: int = 0):
+        self.root = Path(root).resolve()
+        self.host = host
+        self.port = port
+        self._server: Optional[ThreadingHTTPServer] = None
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def url(self) -> str:
+        host = "localhost" if self.host in ("127.0.0.1", "0.0.0.0", "") else self.host
+        return f"http://{host}:{self.port}"
+
+    def start(self) -> "DeckServer":
+        if self._server:
+            return self
+        handler = type("Handler", (DeckRequestHandler,), {"gzip_cache": _GzipCache()})
+        self._server = ThreadingHTTPServer((self.host, self.port), partial(handler, directory=str(self.root)))
+        self.port = self._server.server_address[1]
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def serve_forever(self) -> None:
+        self.start()
+        self._thread.join()
+
+    def stop(self) -> None:
+        if self._server:
+            self._server.shutdown()
+            self._server.server_close()
+            self._server = None
+
+    def __enter__(self) -> "DeckServer":
+        return self.start()
+
+    def __exit__(self, *exc) -> None:
+        self.stop()
+
+
+def main(argv: Optional[list[str]] = None) -> int:
+    parser = argparse.ArgumentParser(
+        prog="python3 -m lib.media serve",
+        description="Serve decks for preview and review (threaded, ETag, Range, gzip/br).",
+        epilog=(
+            "examples:\n"
+            "  python3 -m lib.media serve                 # repo root on a free port\n"
+            "  python3 -m lib.media serve . --port 8921 --host 0.0.0.0\n"
+            "  python3 -m lib.media serve --json          # one JSON line with the URL once listening"
+        ),
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+    )
+    parser.add_argument("root", nargs="?", default=".", type=Path, help="Directory to serve (default: .)")
+    parser.add_argument("--host", default="127.0.0.1", help="Bind address (default: 127.0.0.1)")
+    parser.add_argument("--port", type=int, default=0, help="Port (default: 0, any free port)")
+    parser.add_argument("--json", action="store_true", help="Announce the URL as a JSON line")
+    args = parser.parse_args(argv)
+
+    if not args.root.is_dir():
+        print(f"Error: not a directory: {args.root}", file=sys.stderr)
+        return 1
+
+    server = DeckServer(args.root, args.host, args.port).start()
+    if args.json:
+        print(json.dumps({"url": server.url, "port": server.port, "ready": server.url + READY_PATH}), flush=True)
+    else:
+        print(f"Serving {server.root} at {server.url}/", flush=True)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.stop()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,15 +1,16 @@
 #!/usr/bin/env python3
-# ABOUTME: CLI for generating images and videos for keynote decks.
-# ABOUTME: Uses nano-banana (Gemini) for images and Veo for videos.
+# ABOUTME: Prompt-file CLI for generating deck images.
+# ABOUTME: Thin front end over the unified `python -m lib.media generate` command.
 
 from __future__ import annotations
 
 import argparse
 import sys
 from pathlib import Path
-from typing import Optional
+from typing import TYPE_CHECKING, Optional
 
-from .nano_banana import NanoBananaClient, ImageResult
+if TYPE_CHECKING:
+    from .nano_banana import ImageResult
 
 
 def generate_deck_image(
@@ -28,15 +29,18 @@ def generate_deck_image(
     Returns:
         ImageResult with generated image
     """
+    from .nano_banana import NanoBananaClient
+
     client = NanoBananaClient()
     result = client.generate_image(prompt, temperature=temperature)
     result.save(output_path)
     return result
 
 
-def main():
+def main(argv: Optional[list[str]] = None) -> int:
+    """Prompt-file front end for `python -m lib.media generate`."""
     parser = argparse.ArgumentParser(
-        description="Generate images/videos for keynote decks",
+        description="Generate images for keynote decks (see also: python -m lib.media --help)",
         formatter_class=argparse.RawDescriptionHelpFormatter,
         epilog="""
 Examples:
@@ -73,22 +77,19 @@ Examples:
         help="Generation temperature (0.0-2.0, default 1.0)"
     )
 
-    args = parser.parse_args()
+    args = parser.parse_args(argv)
 
     # Get prompt
     if args.prompt_file:
         if not args.prompt_file.exists():
             print(f"Error: Prompt file not found: {args.prompt_file}")
-            sys.exit(1)
+            return 1
         prompt = args.prompt_file.read_text()
     elif args.prompt:
         prompt = args.prompt
     else:
         print("Error: Must provide --prompt or --prompt-file")
-        sys.exit(1)
-
-    # Ensure output directory exists
-    args.output.parent.mkdir(parents=True, exist_ok=True)
+        return 1
 
     print(f"Generating image...")
     print(f"  Prompt: {prompt[:100]}{'...' if len(prompt) > 100 else ''}")
@@ -96,18 +97,17 @@ Examples:
     print(f"  Temperature: {args.temperature}")
     print()
 
-    try:
-        result = generate_deck_image(
-            prompt=prompt,
-            output_path=args.output,
-            temperature=args.temperature,
-        )
-        print(f"Success! Saved {result.mime_type} to {args.output}")
+    from .model_mediated import main as media_main
 
+    try:
+        return media_main([
+            "generate", prompt, str(args.output),
+            "--temperature", str(args.temperature),
+        ])
     except Exception as e:
         print(f"Error: {e}")
-        sys.exit(1)
+        return 1
 
 
 if __name__ == "__main__":
-    main()
+    sys.exit(main())
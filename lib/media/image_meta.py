@@ -0,0 +1,185 @@
+# ABOUTME: Header-only image metadata reader for PNG, JPEG, WebP, and GIF.
+# ABOUTME: Reports format, dimensions, and byte size without decoding pixels (or fetching whole files).
+
+from __future__ import annotations
+
+import io
+import struct
+import urllib.error
+import urllib.request
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import BinaryIO, Optional
+
+MIME_TYPES = {
+    "png": "image/png",
+    "jpeg": "image/jpeg",
+    "webp": "image/webp",
+    "gif": "image/gif",
+}
+
+# Enough for PNG/GIF/WebP headers and for JPEGs whose SOF follows a typical EXIF block
+PROBE_BYTES = 64 * 1024
+
+# Start-of-frame markers carry the dimensions (C4 = DHT, C8 = JPG, CC = DAC are not frames)
+_JPEG_SOF = {0xC0, 0xC1, 0xC2, 0xC3, 0xC5, 0xC6, 0xC7, 0xC9, 0xCA, 0xCB, 0xCD, 0xCE, 0xCF}
+# Markers without a length field
+_JPEG_STANDALONE = {0x01, 0xD8, *range(0xD0, 0xD8)}
+
+
+class ImageMetaError(ValueError):
+    """Bytes are not a recognized image or the header is truncated."""
+    pass
+
+
+@dataclass(frozen=True)
+class ImageMeta:
+    """What the image header says, independent of file name or claimed MIME type."""
+    format: str  # png | jpeg | webp | gif
+    width: int
+    height: int
+    size: Optional[int] = None  # Total bytes, when known
+
+    @property
+    def mime_type(self) -> str:
+        return MIME_TYPES[self.format]
+
+    def to_dict(self) -> dict:
+        return {**asdict(self), "mime_type": self.mime_type}
+
+
+def sniff_format(head: bytes) -> Optional[str]:
+    """Image format from magic bytes, or None."""
+    if head.startswith(b"\x89PNG\r\n\x1a\n"):
+        return "png"
+    if head.startswith(b"\xff\xd8\xff"):
+        return "jpeg"
+    if head[:4] == b"RIFF" and head[8:12] == b"WEBP":
+        return "webp"
+    if head[:6] in (b"GIF87a", b"GIF89a"):
+        return "gif"
+    return None
+
+
+def read_stream(stream: BinaryIO, size: Optional[int] = None) -> ImageMeta:
+    """Parse dimensions from a binary stream, reading only header bytes."""
+    head = stream.read(32)
+    fmt = sniff_format(head)
+    if fmt is None:
+        raise ImageMetaError("Not a PNG, JPEG, WebP, or GIF image")
+
+    if fmt == "png":
+        # IHDR is always the first chunk
+        width, height = _unpack(">II", head, 16)
+    elif fmt == "gif":
+        width, height = _unpack("<HH", head, 6)
+    elif fmt == "webp":
+        width, height = _webp_size(head)
+    else:
+        stream.seek(2)
+        width, height = _jpeg_size(stream)
+
+    return ImageMeta(format=fmt, width=width, height=height, size=size)
+
+
+def read_bytes(data: bytes) -> ImageMeta:
+    """Metadata for an in-memory image (generated results, downloaded payloads)."""
+    return read_stream(io.BytesIO(data), size=len(data))
+
+
+def read_file(path: Path | str) -> ImageMeta:
+    """Metadata for an image file; reads only its header."""
+    path = Path(path)
+    with path.open("rb") as f:
+        return read_stream(f, size=path.stat().st_size)
+
+
+def probe_url(url: str, timeout: int = 15) -> Optional[ImageMeta]:
+    """
+    Metadata for a remote image from its first PROBE_BYTES bytes (HTTP Range).
+
+    Servers that ignore Range still only have PROBE_BYTES read. Returns None
+    when the URL fails or the header does not fit in the probe.
+    """
+    req = urllib.request.Request(url, headers={
+        "Range": f"bytes=0-{PROBE_BYTES - 1}",
+        "User-Agent": "Mozilla/5.0",  # Some sites block default urllib agent
+    })
+    try:
+        with urllib.request.urlopen(req, timeout=timeout) as response:
+            head = response.read(PROBE_BYTES)
+            size = _total_size(response.headers)
+    except (urllib.error.URLError, OSError, ValueError):
+        return None
+
+    try:
+        return read_stream(io.BytesIO(head), size=size)
+    except ImageMetaError:
+        return None
+
+
+def _total_size(headers) -> Optional[int]:
+    content_range = headers.get("Content-Range", "")  # bytes 0-65535/1234567
+    if "/" in content_range and not content_range.endswith("*"):
+        return int(content_range.rsplit("/", 1)[1])
+    length = headers.get("Content-Length")
+    return int(length) if length and not content_range else None
+
+
+def _unpack(fmt: str, data: bytes, offset: int) -> tuple:
+    try:
+        return struct.unpack_from(fmt, data, offset)
+    except struct.error as e:
+        raise ImageMetaError("Truncated image header") from e
+
+
+def _webp_size(head: bytes) -> tuple[int, int]:
+    chunk = head[12:16]
+    if chunk == b"VP8 ":
+        # Lossy: 14-bit sizes after the keyframe start code
+        width, height = _unpack("<HH", head, 26)
+        return width & 0x3FFF, height & 0x3FFF
+    if chunk == b"VP8L":
+        (bits,) = _unpack("<I", head, 21)
+        return (bits & 0x3FFF) + 1, ((bits >> 14) & 0x3FFF) + 1
+    if chunk == b"VP8X":
+        # Extended: 24-bit canvas size minus one
+        if len(head) < 30:
+            raise ImageMetaError("Truncated image header")
+        width = int.from_bytes(head[24:27], "little") + 1
+        height = int.from_bytes(head[27:30], "little") + 1
+        return width, height
+    raise ImageMetaError(f"Unknown WebP chunk {chunk!r}")
+
+
+def _jpeg_size(stream: BinaryIO) -> tuple[int, int]:
+    """Walk JPEG segments, skipping their bodies, until a start-of-frame marker."""
+    while True:
+        byte = stream.read(1)
+        if not byte:
+            raise ImageMetaError("Truncated JPEG: no start-of-frame marker")
+        if byte != b"\xff":
+            continue
+        marker = stream.read(1)
+        while marker == b"\xff":  # Fill bytes
+            marker = stream.read(1)
+        if not marker:
+            raise ImageMetaError("Truncated JPEG: no start-of-frame marker")
+
+        code = marker[0]
+        if code in _JPEG_STANDALONE:
+            continue
+        if code == 0xD9:
+            raise ImageMetaError("JPEG ended before a start-of-frame marker")
+
+        length_bytes = stream.read(2)
+        if len(length_bytes) < 2:
+            raise ImageMetaError("Truncated JPEG segment")
+        (length,) = struct.unpack(">H", length_bytes)
+        if code in _JPEG_SOF:
+            frame = stream.read(5)
+            if len(frame) < 5:
+                raise ImageMetaError("Truncated JPEG frame header")
+            height, width = struct.unpack(">xHH", frame)
+            return width, height
+        stream.seek(length - 2, io.SEEK_CUR)
@@ -5,20 +5,28 @@ from __future__ import annotations
 
 import json
 import os
+import sys
+import threading
 import urllib.request
 import urllib.error
 import urllib.parse
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass, asdict
 from pathlib import Path
-from typing import Optional
+from typing import TYPE_CHECKING, Optional
 from datetime import datetime
 
+from .image_meta import ImageMetaError, probe_url, read_bytes
+
+if TYPE_CHECKING:
+    from .asset_store import AssetStore
+
 
 @dataclass
 class SearchResult:
     """Result from image search."""
     id: str
-    source: str  # 'unsplash' | 'pexels' | 'google'
+    source: str  # 'local' | 'unsplash' | 'pexels' | 'google'
     url: str  # Full-size download URL
     thumbnail_url: str  # Preview URL
     description: str
@@ -28,6 +36,8 @@ class SearchResult:
     height: int
     license: str
     photo_page_url: str  # Link to original page for attribution
+    rank_score: Optional[float] = None  # Set by search(rank=...): weighted pre-rank score
+    rank_breakdown: Optional[dict] = None  # Component scores behind rank_score
 
     def to_dict(self) -> dict:
         return asdict(self)
@@ -253,9 +263,16 @@ class GoogleImageSearchClient:
 class ImageSearchClient:
     """Unified client for multiple image search sources."""
 
-    def __init__(self):
+    def __init__(self, decks_root: Optional[Path] = None):
         self._clients: dict[str, object] = {}
 
+        # Assets other decks already licensed or generated; searched first, free
+        try:
+            from .local_library import LocalLibraryClient
+            self._clients["local"] = LocalLibraryClient(decks_root)
+        except ValueError:
+            pass
+
         # Initialize available clients
         try:
             self._clients["unsplash"] = UnsplashClient()
@@ -274,8 +291,14 @@ class ImageSearchClient:
 
         if not self._clients:
             raise ValueError(
-                "No image search APIs configured. Set at least one of: "
-                "UNSPLASH_ACCESS_KEY, PEXELS_API_KEY, or GOOGLE_CUSTOM_SEARCH_KEY"
+                "No image search sources available: no local deck library and no APIs configured. "
+                "Set at least one of: UNSPLASH_ACCESS_KEY, PEXELS_API_KEY, or GOOGLE_CUSTOM_SEARCH_KEY"
+            )
+        if list(self._clients) == ["local"]:
+            print(
+                "Warning: no stock image APIs configured; searching only the local deck library. "
+                "Set UNSPLASH_ACCESS_KEY, PEXELS_API_KEY, or GOOGLE_CUSTOM_SEARCH_KEY for stock photos.",
+                file=sys.stderr,
             )
 
     @property
@@ -290,6 +313,8 @@ class ImageSearchClient:
         per_page: int = 10,
         orientation: Optional[str] = None,  # landscape | portrait | square
         min_width: int = 1600,
+        rank: Optional[int] = None,
+        frame: Optional[str] = None,
     ) -> list[SearchResult]:
         """
         Search across multiple sources.
@@ -299,10 +324,13 @@ class ImageSearchClient:
             sources: Which sources to search (default: all available)
             per_page: Results per source
             orientation: Image orientation filter
-            min_width: Minimum image width
+            min_width: Minimum image width for stock sources
+            rank: Return only the top `rank` results, best first, with
+                rank_score/rank_breakdown (see search_rank.rank_results)
+            frame: Target frame for ranking, e.g. "16:9" (default: from orientation)
 
         Returns:
-            Combined results from all sources
+            Combined results from all sources (ranked when rank is given)
         """
         sources = sources or self.available_sources
         all_results = []
@@ -313,11 +341,19 @@ class ImageSearchClient:
 
             client = self._clients[source]
             try:
+                if source == "local":
+                    # Assets a deck already uses were sized for a slide; the
+                    # stock width and orientation filters would drop them all
+                    all_results.extend(client.search(query, per_page=per_page))
+                    continue
                 if source == "google":
                     results = client.search(query, per_page=per_page)
                 else:
                     results = client.search(query, per_page=per_page, orientation=orientation)
 
+                # Sources without dimensions (Google often) get a header probe first
+                fill_dimensions(results)
+
                 # Filter by minimum width
                 results = [r for r in results if r.width >= min_width]
                 all_results.extend(results)
@@ -326,6 +362,10 @@ class ImageSearchClient:
                 print(f"Warning: {source} search failed: {e}")
                 continue
 
+        if rank is not None:
+            from .search_rank import frame_for, rank_results
+
+            return rank_results(all_results, query, top_k=rank, frame=frame or frame_for(orientation))
         return all_results
 
     def download(
@@ -334,6 +374,7 @@ class ImageSearchClient:
         output_path: Path,
         credits_file: Optional[Path] = None,
         slide_number: Optional[int] = None,
+        store: Optional[AssetStore] = None,
     ) -> Path:
         """
         Download image and track attribution.
@@ -343,6 +384,7 @@ class ImageSearchClient:
             output_path: Where to save the image
             credits_file: Optional path to image-credits.json
             slide_number: Optional slide number for attribution
+            store: Optional shared asset store to write through
 
         Returns:
             Path to downloaded image
@@ -352,11 +394,21 @@ class ImageSearchClient:
 
         client = self._clients[result.source]
         image_bytes = client.download(result)
+        try:
+            read_bytes(image_bytes)
+        except ImageMetaError as e:
+            # Usually an HTML error or login page served in place of the image
+            raise ImageSearchError(f"{result.source} download is not an image ({e}): {result.url}") from e
 
         # Save image
+        from .asset_store import replace_bytes
+
         output_path = Path(output_path)
         output_path.parent.mkdir(parents=True, exist_ok=True)
-        output_path.write_bytes(image_bytes)
+        if store:
+            store.write_bytes(image_bytes, output_path)
+        else:
+            replace_bytes(image_bytes, output_path)
 
         # Track attribution
         if credits_file:
@@ -377,8 +429,36 @@ class ImageSearchClient:
         slide_number: Optional[int],
     ) -> None:
         """Add attribution to credits file."""
-        credits_file = Path(credits_file)
+        add_attribution(credits_file, output_path, result, slide_number)
+
+
+def fill_dimensions(results: list[SearchResult], max_workers: int = 8) -> list[SearchResult]:
+    """Fill width/height for results that lack them by probing image headers in parallel."""
+    missing = [r for r in results if r.width <= 0 or r.height <= 0]
+    if not missing:
+        return results
 
+    with ThreadPoolExecutor(max_workers=min(max_workers, len(missing))) as pool:
+        for result, meta in zip(missing, pool.map(lambda r: probe_url(r.url), missing)):
+            if meta:
+                result.width, result.height = meta.width, meta.height
+    return results
+
+
+# Parallel downloads (pipeline scheduler, daemon) share one credits file per deck
+_credits_lock = threading.Lock()
+
+
+def add_attribution(
+    credits_file: Path,
+    output_path: Path,
+    result: SearchResult,
+    slide_number: Optional[int] = None,
+) -> None:
+    """Append an attribution record to a deck's image-credits.json."""
+    credits_file = Path(credits_file)
+
+    with _credits_lock:
         # Load existing credits
         if credits_file.exists():
             data = json.loads(credits_file.read_text())
@@ -423,32 +503,3 @@ def search_images(
     """
     client = ImageSearchClient()
     return client.search(query, sources=sources, per_page=per_page, orientation=orientation)
-
-
-if __name__ == "__main__":
-    import sys
-
-    if len(sys.argv) < 2:
-        print("Usage: python image_search.py <query> [output_path]")
-        print("\nConfigured sources will be used automatically.")
-        sys.exit(1)
-
-    query = sys.argv[1]
-    output = Path(sys.argv[2]) if len(sys.argv) > 2 else None
-
-    print(f"Searching for: {query}")
-    client = ImageSearchClient()
-    print(f"Available sources: {client.available_sources}")
-
-    results = client.search(query, per_page=5)
-    print(f"\nFound {len(results)} results:\n")
-
-    for i, r in enumerate(results, 1):
-        print(f"{i}. [{r.source}] {r.description[:60]}...")
-        print(f"   {r.width}x{r.height} by {r.photographer}")
-        print(f"   {r.thumbnail_url}\n")
-
-    if output and results:
-        print(f"Downloading first result to {output}...")
-        client.download(results[0], output)
-        print("Done!")
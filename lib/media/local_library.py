@@ -0,0 +1,283 @@
+# ABOUTME: Local asset library: BM25 search over assets every deck already has.
+# ABOUTME: Indexes image-credits.json, work-run records, and filenames; exposed as the "local" search source.
+
+from __future__ import annotations
+
+import json
+import math
+import os
+import re
+import threading
+from collections import Counter
+from pathlib import Path
+from typing import Optional
+
+from .image_meta import ImageMetaError, read_file
+from .image_search import SearchResult
+
+INDEX_DIR = ".media-index"
+INDEX_FILE = "library.json"
+INDEX_VERSION = 1
+IMAGE_SUFFIXES = {".png", ".jpg", ".jpeg", ".webp", ".gif"}
+DECKS_ROOT_ENV = "KEYNOTE_DECKS_ROOT"
+
+# BM25 parameters (standard Robertson/Sparck Jones defaults)
+_K1 = 1.2
+_B = 0.75
+
+_TOKEN = re.compile(r"[a-z0-9]+")
+_STOPWORDS = {
+    "a", "an", "and", "are", "as", "at", "be", "by", "for", "from", "in", "into", "is",
+    "it", "of", "on", "or", "png", "jpg", "jpeg", "webp", "the", "this", "to", "with",
+}
+
+
+def tokenize(text: str) -> list[str]:
+    """Lowercase word tokens with stopwords dropped and plural -s folded."""
+    tokens = []
+    for token in _TOKEN.findall(text.lower()):
+        if token in _STOPWORDS or len(token) < 2:
+            continue
+        if len(token) > 3 and token.endswith("s") and not token.endswith("ss"):
+            token = token[:-1]
+        tokens.append(token)
+    return tokens
+
+
+class LocalLibrary:
+    """
+    Inverted index over every deck's resources/assets images.
+
+    Each asset's document combines its filename, its image-credits.json
+    entry (source, photographer, license), and the prompts, search queries,
+    and reasoning of work runs that produced it. The index persists in
+    decks/.media-index/library.json; refresh() rebuilds only decks whose
+    credits, work runs, or assets changed (detected by stat), so a search
+    costs a directory scan plus an in-memory BM25 lookup.
+    """
+
+    def __init__(self, decks_root: Path | str):
+        self.decks_root = Path(decks_root)
+        self.index_path = self.decks_root / INDEX_DIR / INDEX_FILE
+        self._lock = threading.Lock()
+        self.decks = self._load()
+        self._build_postings()
+
+    # Indexing
+
+    def refresh(self) -> int:
+        """Re-index changed decks; returns how many were rebuilt."""
+        with self._lock:
+            rebuilt = 0
+            present = set()
+            for deck in sorted(p for p in self.decks_root.iterdir() if (p / "resources").is_dir()):
+                present.add(deck.name)
+                signature = _deck_signature(deck)
+                cached = self.decks.get(deck.name)
+                if cached and cached["signature"] == signature:
+                    continue
+                self.decks[deck.name] = {"signature": signature, "docs": _deck_documents(deck)}
+                rebuilt += 1
+
+            removed = [name for name in self.decks if name not in present]
+            for name in removed:
+                del self.decks[name]
+
+            if rebuilt or removed:
+                self._build_postings()
+                self._save()
+            return rebuilt
+
+    def _build_postings(self) -> None:
+        self._docs: dict[str, dict] = {}
+        self._postings: dict[str, dict[str, int]] = {}
+        for deck_name, deck in self.decks.items():
+            for rel, doc in deck["docs"].items():
+                doc_id = f"{deck_name}/{rel}"
+                self._docs[doc_id] = doc
+                for term, count in doc["terms"].items():
+                    self._postings.setdefault(term, {})[doc_id] = count
+        lengths = [doc["length"] for doc in self._docs.values()]
+        self._avg_length = (sum(lengths) / len(lengths)) if lengths else 0.0
+
+    # Querying
+
+    def search(self, query: str, limit: int = 10) -> list[tuple[str, float, dict]]:
+        """(doc id, BM25 score, document) for the best matches."""
+        with self._lock:
+            total = len(self._docs)
+            scores: Counter = Counter()
+            for term in set(tokenize(query)):
+                postings = self._postings.get(term)
+                if not postings:
+                    continue
+                idf = math.log(1 + (total - len(postings) + 0.5) / (len(postings) + 0.5))
+                for doc_id, tf in postings.items():
+                    norm = 1 - _B + _B * self._docs[doc_id]["length"] / (self._avg_length or 1)
+                    scores[doc_id] += idf * tf * (_K1 + 1) / (tf + _K1 * norm)
+            return [(doc_id, score, self._docs[doc_id]) for doc_id, score in scores.most_common(limit)]
+
+    # Persistence
+
+    def _load(self) -> dict:
+        if self.index_path.exists():
+            data = json.loads(self.index_path.read_text())
+            if data.get("version") == INDEX_VERSION:
+                return data["decks"]
+        return {}
+
+    def _save(self) -> None:
+        self.index_path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.index_path.with_name(f".{INDEX_FILE}.{os.getpid()}.tmp")
+        tmp_path.write_text(json.dumps({"version": INDEX_VERSION, "decks": self.decks}))
+        os.replace(tmp_path, self.index_path)
+
+
+def _deck_signature(deck: Path) -> list:
+    """Stat fingerprint of everything a deck's documents are built from."""
+    materials = deck / "resources" / "materials"
+    paths = [materials / "image-credits.json"]
+    paths += sorted((materials / "work-runs").glob("*.json"))
+    paths += sorted((deck / "resources" / "assets").glob("*"))
+    signature = []
+    for path in paths:
+        try:
+            stat = path.stat()
+        except FileNotFoundError:
+            continue
+        signature.append([path.name, stat.st_size, stat.st_mtime_ns])
+    return signature
+
+
+def _asset_key(deck: Path, output_path: str) -> Optional[str]:
+    """Map a recorded output path (relative to any cwd, or absolute) to the deck's asset."""
+    if not output_path:
+        return None
+    candidate = deck / "resources" / "assets" / Path(output_path).name
+    return f"resources/assets/{candidate.name}" if candidate.exists() else None
+
+
+def _deck_documents(deck: Path) -> dict:
+    assets_dir = deck / "resources" / "assets"
+    docs: dict[str, dict] = {}
+    for path in sorted(assets_dir.glob("*")):
+        if path.suffix.lower() not in IMAGE_SUFFIXES or not path.is_file():
+            continue
+        try:
+            meta = read_file(path)
+        except (ImageMetaError, OSError):
+            continue
+        docs[f"resources/assets/{path.name}"] = {
+            "text": [path.stem.replace("-", " ").replace("_", " ")],
+            "width": meta.width,
+            "height": meta.height,
+            "source": "",
+            "photographer": "Unknown",
+            "photographer_url": "",
+            "photo_url": "",
+            "license": "",
+        }
+
+    credits_file = deck / "resources" / "materials" / "image-credits.json"
+    if credits_file.exists():
+        for credit in json.loads(credits_file.read_text()).get("images", []):
+            doc = docs.get(_asset_key(deck, credit.get("file", "")))
+            if doc is None:
+                continue
+            doc.update(
+                source=credit.get("source", ""),
+                photographer=credit.get("photographer", "Unknown"),
+                photographer_url=credit.get("photographer_url", ""),
+                photo_url=credit.get("photo_url", ""),
+                license=credit.get("license", ""),
+            )
+            doc["text"].append(f"{credit.get('source', '')} {credit.get('photographer', '')}")
+
+    for record_path in sorted((deck / "resources" / "materials" / "work-runs").glob("*.json")):
+        try:
+            record = json.loads(record_path.read_text())
+        except json.JSONDecodeError:
+            continue
+        doc = docs.get(_asset_key(deck, record.get("output_path") or ""))
+        if doc is None:
+            continue
+        selected = record.get("selected_result") or {}
+        doc["text"].extend(filter(None, [
+            record.get("prompt"),
+            record.get("search_query"),
+            record.get("reasoning"),
+            selected.get("description"),
+        ]))
+        if record.get("action") in ("GENERATE", "HYBRID") and not doc["license"]:
+            doc["source"] = doc["source"] or "gemini"
+            doc["license"] = "Generated"
+
+    for doc in docs.values():
+        tokens = tokenize(" ".join(doc["text"]))
+        doc["terms"] = dict(Counter(tokens))
+        doc["length"] = len(tokens)
+        doc["description"] = max(doc.pop("text"), key=len)[:200]
+    return docs
+
+
+def default_decks_root() -> Path:
+    """$KEYNOTE_DECKS_ROOT, else the repo's decks/ folder (independent of the working directory)."""
+    configured = os.environ.get(DECKS_ROOT_ENV)
+    if configured:
+        return Path(configured)
+    return Path(__file__).resolve().parents[2] / "decks"
+
+
+class LocalLibraryClient:
+    """Search client for assets other decks already have (no API key, no quota)."""
+
+    def __init__(self, decks_root: Optional[Path | str] = None):
+        self.decks_root = Path(decks_root) if decks_root else default_decks_root()
+        if not self.decks_root.is_dir():
+            raise ValueError(f"Decks root not found: {self.decks_root}")
+        self.library = LocalLibrary(self.decks_root)
+
+    def search(
+        self,
+        query: str,
+        per_page: int = 10,
+        orientation: Optional[str] = None,  # landscape | portrait | square(ish)
+    ) -> list[SearchResult]:
+        """BM25-ranked assets from every deck."""
+        self.library.refresh()
+        results = []
+        for doc_id, _score, doc in self.library.search(query, limit=per_page * 3):
+            if orientation and not _matches_orientation(doc["width"], doc["height"], orientation):
+                continue
+            path = (self.decks_root / doc_id).resolve()
+            results.append(SearchResult(
+                id=doc_id,
+                source="local",
+                url=path.as_uri(),
+                thumbnail_url=path.as_uri(),
+                description=doc["description"],
+                photographer=doc["photographer"],
+                photographer_url=doc["photographer_url"],
+                width=doc["width"],
+                height=doc["height"],
+                license=doc["license"] or "Local asset (verify)",
+                photo_page_url=doc["photo_url"] or path.as_uri(),
+            ))
+            if len(results) >= per_page:
+                break
+        return results
+
+    def download(self, result: SearchResult) -> bytes:
+        """Read the asset from the deck that already has it."""
+        return (self.decks_root / result.id).read_bytes()
+
+
+def _matches_orientation(width: int, height: int, orientation: str) -> bool:
+    if not width or not height:
+        return True
+    ratio = width / height
+    if orientation == "landscape":
+        return ratio > 1.1
+    if orientation == "portrait":
+        return ratio < 0.9
+    return 0.9 <= ratio <= 1.1
@@ -3,14 +3,19 @@
 
 from __future__ import annotations
 
+import argparse
 import json
+import sys
 from dataclasses import dataclass, asdict
 from datetime import datetime
 from pathlib import Path
-from typing import Optional, Literal
+from typing import TYPE_CHECKING, Callable, Optional, Literal, TextIO
 
-from .nano_banana import NanoBananaClient, ImageResult
-from .image_search import ImageSearchClient, SearchResult
+if TYPE_CHECKING:
+    from .nano_banana import NanoBananaClient, ImageResult
+    from .image_search import ImageSearchClient, SearchResult
+    from .phash_index import PerceptualIndex
+    from .asset_store import AssetStore
 
 
 @dataclass
@@ -18,7 +23,7 @@ class WorkRunRecord:
     """Record of an image acquisition for auditability."""
     timestamp: str
     slide: Optional[int]
-    action: str  # GENERATE | SEARCH | HYBRID
+    action: str  # GENERATE | SEARCH | HYBRID | VIDEO
     prompt: str
     brand_context: str
     reasoning: str
@@ -26,6 +31,12 @@ class WorkRunRecord:
     search_results_count: Optional[int] = None
     selected_result: Optional[dict] = None
     output_path: Optional[str] = None
+    node: Optional[dict] = None  # Pipeline node (id, op, needs, status, error, duration_ms)
+    output_meta: Optional[dict] = None  # Header metadata (format, width, height, size, mime_type)
+    duplicates: Optional[list[dict]] = None  # Near-identical existing assets (path, distance)
+    palette: Optional[dict] = None  # Brand-palette conformance (score, dominant colors, attempts)
+    draft: Optional[dict] = None  # Draft tier output: model plus what promote() replays (temperature, inputs)
+    promoted_from: Optional[str] = None  # Draft work-run file this final-quality output replaced
 
 
 class ImageAcquisitionTools:
@@ -40,11 +51,43 @@ class ImageAcquisitionTools:
         self,
         work_runs_dir: Optional[Path] = None,
         credits_file: Optional[Path] = None,
+        generator: Optional[NanoBananaClient] = None,
+        searcher: Optional[ImageSearchClient] = None,
+        phash_index: Optional[PerceptualIndex] = None,
+        store: Optional[AssetStore] = None,
+        palette: Optional[dict[str, tuple[int, int, int]]] = None,
+        palette_retries: int = 1,
+        on_work_run: Optional[Callable[[WorkRunRecord], None]] = None,
     ):
-        self.generator = NanoBananaClient()
-        self.searcher = ImageSearchClient()
+        # Clients are created on first use so a search-only session does not
+        # need a Gemini key (and vice versa). Long-lived callers such as the
+        # media daemon pass shared, already-warm clients in.
+        self._generator = generator
+        self._searcher = searcher
         self.work_runs_dir = work_runs_dir
         self.credits_file = credits_file
+        self.phash_index = phash_index
+        self.store = store
+        self.palette = palette
+        self.palette_retries = palette_retries
+        # Receives each record in place of work_runs_dir (the pipeline folds
+        # them into its own node records)
+        self.on_work_run = on_work_run
+        self._phash_refreshed = False
+
+    @property
+    def generator(self) -> NanoBananaClient:
+        if self._generator is None:
+            from .nano_banana import NanoBananaClient
+            self._generator = NanoBananaClient()
+        return self._generator
+
+    @property
+    def searcher(self) -> ImageSearchClient:
+        if self._searcher is None:
+            from .image_search import ImageSearchClient
+            self._searcher = ImageSearchClient()
+        return self._searcher
 
     def generate(
         self,
@@ -53,6 +96,10 @@ class ImageAcquisitionTools:
         brand_context: str = "",
         slide_number: Optional[int] = None,
         reasoning: str = "",
+        temperature: float = 1.0,
+        palette_threshold: Optional[float] = None,
+        draft: bool = False,
+        promoted_from: Optional[str] = None,
     ) -> ImageResult:
         """
         Generate an image with Gemini.
@@ -66,6 +113,12 @@ class ImageAcquisitionTools:
             brand_context: Brand guidelines to prepend
             slide_number: For logging
             reasoning: Model's reasoning for choosing GENERATE
+            temperature: Randomness (0.0-2.0)
+            palette_threshold: Regenerate (palette_retries times) when brand-palette
+                conformance scores below this (0-1); drafts are scored but not retried
+            draft: Use the generator's draft tier and log the output as a draft
+                for promote() to regenerate at final quality
+            promoted_from: Draft work-run file being promoted (set by promote())
 
         Returns:
             ImageResult with generated image
@@ -74,12 +127,19 @@ class ImageAcquisitionTools:
         if brand_context:
             full_prompt = f"{brand_context}\n\n{prompt}"
 
-        result = self.generator.generate_image(full_prompt)
+        result = self.generator.generate_image(full_prompt, temperature=temperature, draft=draft)
+        result, palette = self._conform_to_palette(
+            result,
+            lambda hint: self.generator.generate_image(f"{full_prompt}\n\n{hint}", temperature=temperature),
+            None if draft else palette_threshold,
+        )
+        duplicates = self.find_duplicates(result.bytes, exclude=output_path)
 
         # Save
         output_path = Path(output_path)
         output_path.parent.mkdir(parents=True, exist_ok=True)
-        result.save(output_path)
+        result.save(output_path, store=self.store)
+        self._index_output(output_path)
 
         # Log
         self._log_work_run(WorkRunRecord(
@@ -90,6 +150,11 @@ class ImageAcquisitionTools:
             brand_context=brand_context,
             reasoning=reasoning,
             output_path=str(output_path),
+            output_meta=_output_meta(result),
+            duplicates=duplicates or None,
+            palette=palette,
+            draft=_draft_info(result, temperature, palette_threshold) if draft else None,
+            promoted_from=promoted_from,
         ))
 
         return result
@@ -100,6 +165,8 @@ class ImageAcquisitionTools:
         sources: Optional[list[str]] = None,
         per_page: int = 10,
         orientation: str = "landscape",
+        rank: Optional[int] = None,
+        frame: Optional[str] = None,
     ) -> list[SearchResult]:
         """
         Search for images across stock photo sources.
@@ -112,6 +179,9 @@ class ImageAcquisitionTools:
             sources: Which sources to search (default: all available)
             per_page: Results per source
             orientation: landscape | portrait | square
+            rank: Pre-rank and keep the top `rank` results, so the model
+                reviews a short list (each carries rank_breakdown)
+            frame: Target frame for ranking, e.g. "16:9"
 
         Returns:
             List of SearchResult for model to review and select from
@@ -121,6 +191,8 @@ class ImageAcquisitionTools:
             sources=sources,
             per_page=per_page,
             orientation=orientation,
+            rank=rank,
+            frame=frame,
         )
 
     def download_selected(
@@ -149,13 +221,16 @@ class ImageAcquisitionTools:
             Path to downloaded image
         """
         output_path = Path(output_path)
+        duplicates = self.find_duplicates(result, exclude=output_path)
 
         path = self.searcher.download(
             result,
             output_path,
             credits_file=self.credits_file,
             slide_number=slide_number,
+            store=self.store,
         )
+        self._index_output(path)
 
         # Log
         self._log_work_run(WorkRunRecord(
@@ -174,10 +249,103 @@ class ImageAcquisitionTools:
                 "photographer": result.photographer,
             },
             output_path=str(path),
+            output_meta=_output_meta(path),
+            duplicates=duplicates or None,
         ))
 
         return path
 
+    def download_url(
+        self,
+        url: str,
+        output_path: Path,
+        source: str = "unknown",
+        photographer: str = "Unknown",
+        photo_url: Optional[str] = None,
+        slide_number: Optional[int] = None,
+        reasoning: str = "",
+        search_query: str = "",
+    ) -> Path:
+        """
+        Download an image the model already picked, by URL.
+
+        Unlike download_selected this needs no configured search client, so it
+        works for any source URL. Attribution goes to the credits file.
+
+        Args:
+            url: Image URL
+            output_path: Where to save
+            source: Source name for attribution (unsplash, pexels, google, ...)
+            photographer: Photographer name for attribution
+            photo_url: Original photo page (defaults to url)
+            slide_number: For attribution tracking
+            reasoning: Model's reasoning for selection
+            search_query: Original query (for logging)
+
+        Returns:
+            Path to downloaded image
+        """
+        import urllib.request
+        from .image_search import SearchResult, add_attribution
+
+        output_path = Path(output_path)
+        output_path.parent.mkdir(parents=True, exist_ok=True)
+
+        from .asset_store import replace_bytes
+        from .image_meta import ImageMetaError, read_bytes
+
+        req = urllib.request.Request(url)
+        req.add_header("User-Agent", "Mozilla/5.0")
+        with urllib.request.urlopen(req, timeout=60) as response:
+            image_bytes = response.read()
+        try:
+            meta = read_bytes(image_bytes)
+        except ImageMetaError as e:
+            raise ValueError(f"Download is not an image ({e}): {url}") from e
+        duplicates = self.find_duplicates(image_bytes, exclude=output_path)
+        if self.store:
+            self.store.write_bytes(image_bytes, output_path)
+        else:
+            replace_bytes(image_bytes, output_path)
+        self._index_output(output_path)
+
+        result = SearchResult(
+            id=url,
+            source=source,
+            url=url,
+            thumbnail_url=url,
+            description="",
+            photographer=photographer,
+            photographer_url="",
+            width=meta.width,
+            height=meta.height,
+            license=f"{source.title()} License",
+            photo_page_url=photo_url or url,
+        )
+        if self.credits_file:
+            add_attribution(self.credits_file, output_path, result, slide_number)
+
+        self._log_work_run(WorkRunRecord(
+            timestamp=datetime.now().isoformat(),
+            slide=slide_number,
+            action="SEARCH",
+            prompt=f"Search: {search_query}" if search_query else f"Download: {url}",
+            brand_context="",
+            reasoning=reasoning,
+            search_query=search_query or None,
+            selected_result={
+                "id": result.id,
+                "source": result.source,
+                "description": result.description,
+                "photographer": result.photographer,
+            },
+            output_path=str(output_path),
+            output_meta=_output_meta(output_path),
+            duplicates=duplicates or None,
+        ))
+
+        return output_path
+
     def edit_image(
         self,
         prompt: str,
@@ -186,6 +354,11 @@ class ImageAcquisitionTools:
         brand_context: str = "",
         slide_number: Optional[int] = None,
         reasoning: str = "",
+        temperature: float = 0.2,
+        reference_paths: Optional[list[Path]] = None,
+        palette_threshold: Optional[float] = None,
+        draft: bool = False,
+        promoted_from: Optional[str] = None,
     ) -> ImageResult:
         """
         Edit an existing image with Gemini.
@@ -200,6 +373,12 @@ class ImageAcquisitionTools:
             brand_context: Brand guidelines
             slide_number: For logging
             reasoning: Model's reasoning
+            temperature: Randomness (0.0-2.0, default 0.2 for edits)
+            reference_paths: Extra reference images sent after the base image
+            palette_threshold: Redo the edit (palette_retries times) when brand-palette
+                conformance scores below this (0-1); drafts are scored but not retried
+            draft: Use the generator's draft tier and log the output as a draft
+            promoted_from: Draft work-run file being promoted (set by promote())
 
         Returns:
             ImageResult with edited image
@@ -210,13 +389,24 @@ class ImageAcquisitionTools:
         if brand_context:
             full_prompt = f"{brand_context}\n\n{prompt}"
 
-        base_input = ImageInput.from_file(input_path)
-        result = self.generator.edit_image(full_prompt, [base_input])
+        inputs = [ImageInput.from_file(p) for p in [input_path, *(reference_paths or [])]]
+        result = self.generator.edit_image(full_prompt, inputs, temperature=temperature, draft=draft)
+        result, palette = self._conform_to_palette(
+            result,
+            lambda hint: self.generator.edit_image(f"{full_prompt}\n\n{hint}", inputs, temperature=temperature),
+            None if draft else palette_threshold,
+        )
+        # The base image is expected to be close; only report other matches
+        duplicates = [
+            d for d in self.find_duplicates(result.bytes, exclude=output_path)
+            if d["path"] not in {self._index_key(p) for p in [input_path, *(reference_paths or [])]}
+        ]
 
         # Save
         output_path = Path(output_path)
         output_path.parent.mkdir(parents=True, exist_ok=True)
-        result.save(output_path)
+        result.save(output_path, store=self.store)
+        self._index_output(output_path)
 
         # Log
         self._log_work_run(WorkRunRecord(
@@ -227,45 +417,248 @@ class ImageAcquisitionTools:
             brand_context=brand_context,
             reasoning=reasoning,
             output_path=str(output_path),
+            output_meta=_output_meta(result),
+            duplicates=duplicates or None,
+            palette=palette,
+            draft=_draft_info(
+                result, temperature, palette_threshold,
+                inputs=[input_path, *(reference_paths or [])],
+            ) if draft else None,
+            promoted_from=promoted_from,
         ))
 
         return result
 
+    def pending_drafts(self) -> dict[Path, tuple[Path, dict]]:
+        """
+        Outputs whose latest work run is still a draft.
+
+        Returns:
+            Resolved output path -> (work-run file, record), oldest first
+        """
+        if not self.work_runs_dir or not self.work_runs_dir.is_dir():
+            return {}
+
+        runs = []
+        for record_path in self.work_runs_dir.glob("image-*.json"):
+            try:
+                record = json.loads(record_path.read_text())
+            except (OSError, json.JSONDecodeError):
+                continue
+            if record.get("output_path"):
+                runs.append((record.get("timestamp", ""), record_path.name, record_path, record))
+
+        latest: dict[Path, tuple[Path, dict]] = {}
+        for _, _, record_path, record in sorted(runs, key=lambda run: run[:2]):
+            latest[Path(record["output_path"]).resolve()] = (record_path, record)
+        return {output: run for output, run in latest.items() if run[1].get("draft")}
+
+    def promote(
+        self,
+        outputs: Optional[list[Path]] = None,
+        slides: Optional[list[int]] = None,
+    ) -> list[Path]:
+        """
+        Regenerate chosen drafts at final quality, in the order they were drafted.
+
+        Each draft is replayed (same prompt, brand context, temperature, and
+        inputs) with the final model, overwriting the draft output. The new
+        work run records promoted_from so the draft is no longer pending.
+
+        Args:
+            outputs: Draft output paths to promote
+            slides: Promote every pending draft on these slides
+
+        Returns:
+            Promoted output paths
+        """
+        if not self.work_runs_dir:
+            raise ValueError("promote needs a deck's work-run log (use get_tools_for_deck)")
+
+        wanted = {Path(p).resolve() for p in outputs or []}
+        promoted = []
+        for output, (record_path, record) in self.pending_drafts().items():
+            if output not in wanted and record.get("slide") not in (slides or []):
+                continue
+            info = record["draft"]
+            common = dict(
+                prompt=record["prompt"],
+                output_path=Path(record["output_path"]),
+                brand_context=record.get("brand_context", ""),
+                slide_number=record.get("slide"),
+                reasoning=record.get("reasoning", ""),
+                temperature=info.get("temperature", 1.0),
+                palette_threshold=info.get("palette_threshold"),
+                promoted_from=record_path.name,
+            )
+            if record["action"] == "HYBRID":
+                inputs = [Path(p) for p in info.get("inputs", [])]
+                if not inputs:
+                    raise ValueError(f"Draft {record_path.name} has no recorded edit inputs")
+                self.edit_image(input_path=inputs[0], reference_paths=inputs[1:], **common)
+            else:
+                self.generate(**common)
+            promoted.append(output)
+        return promoted
+
+    def _conform_to_palette(
+        self,
+        result: ImageResult,
+        regenerate: Callable[[str], ImageResult],
+        threshold: Optional[float],
+    ) -> tuple[ImageResult, Optional[dict]]:
+        """Score result against the brand palette; retry with a palette hint below threshold."""
+        if not self.palette:
+            return result, None
+        from .palette import check_palette, palette_hint
+
+        try:
+            report = check_palette(result.bytes, self.palette)
+            attempts = [report.score]
+            if threshold is not None:
+                for _ in range(self.palette_retries):
+                    if report.score >= threshold:
+                        break
+                    retry = regenerate(palette_hint(self.palette))
+                    retry_report = check_palette(retry.bytes, self.palette)
+                    attempts.append(retry_report.score)
+                    if retry_report.score > report.score:
+                        result, report = retry, retry_report
+        except (ImportError, OSError, ValueError):
+            return result, None  # NumPy/Pillow missing or undecodable output: skip the check
+        return result, {**report.to_dict(), "threshold": threshold, "attempts": attempts}
+
+    def find_duplicates(
+        self,
+        source: SearchResult | Path | bytes,
+        exclude: Optional[Path] = None,
+    ) -> list[dict]:
+        """
+        Existing deck assets that look like source.
+
+        Call this before downloading a search result (its thumbnail is
+        compared) or with generated bytes. Returns [] when no perceptual
+        index is configured or NumPy/Pillow are not installed.
+
+        Args:
+            source: SearchResult, image path, or image bytes
+            exclude: Path to ignore (usually the output being replaced)
+
+        Returns:
+            Matches as dicts with path (relative to decks/), distance, dhash_distance
+        """
+        if self.phash_index is None:
+            return []
+
+        import urllib.error
+
+        try:
+            if not self._phash_refreshed:
+                self.phash_index.refresh()
+                self._phash_refreshed = True
+            if hasattr(source, "thumbnail_url"):
+                import urllib.request
+
+                req = urllib.request.Request(source.thumbnail_url, headers={"User-Agent": "Mozilla/5.0"})
+                with urllib.request.urlopen(req, timeout=15) as response:
+                    source = response.read()
+            matches = self.phash_index.lookup(source, exclude=exclude)
+        except (ImportError, OSError, urllib.error.URLError):
+            return []
+        return [m.to_dict() for m in matches]
+
+    def _index_output(self, path: Path) -> None:
+        if self.phash_index is None:
+            return
+        try:
+            self.phash_index.add(path)
+        except (ImportError, OSError):
+            pass
+
+    def _index_key(self, path: Path) -> Optional[str]:
+        return self.phash_index._key(Path(path)) if self.phash_index else None
+
     def _log_work_run(self, record: WorkRunRecord) -> None:
         """Log work run to file for auditability."""
+        if self.on_work_run:
+            self.on_work_run(record)
+            return
         if not self.work_runs_dir:
             return
 
         self.work_runs_dir.mkdir(parents=True, exist_ok=True)
-        filename = f"image-{record.timestamp.replace(':', '-').replace('.', '-')}.json"
-        path = self.work_runs_dir / filename
-        path.write_text(json.dumps(asdict(record), indent=2))
-
-
-def get_tools_for_deck(deck_path: Path) -> ImageAcquisitionTools:
+        stem = f"image-{record.timestamp.replace(':', '-').replace('.', '-')}"
+        payload = json.dumps(asdict(record), indent=2)
+
+        # Concurrent callers (pipeline nodes) can share a timestamp; never overwrite
+        for attempt in range(100):
+            suffix = f"-{attempt}" if attempt else ""
+            try:
+                with (self.work_runs_dir / f"{stem}{suffix}.json").open("x") as f:
+                    f.write(payload)
+                return
+            except FileExistsError:
+                continue
+
+
+def _draft_info(
+    result: ImageResult,
+    temperature: float,
+    palette_threshold: Optional[float],
+    inputs: Optional[list[Path]] = None,
+) -> dict:
+    """What a draft work run needs for promote() to replay it at final quality."""
+    info = {"model": result.model, "temperature": temperature, "palette_threshold": palette_threshold}
+    if inputs is not None:
+        info["inputs"] = [str(p) for p in inputs]
+    return info
+
+
+def _output_meta(output) -> Optional[dict]:
+    """Header metadata for a saved result or file, for the work-run record."""
+    from .image_meta import ImageMetaError, read_file
+
+    try:
+        meta = output.meta if hasattr(output, "meta") else read_file(output)
+    except (ImageMetaError, OSError):
+        return None
+    return meta.to_dict()
+
+
+def get_tools_for_deck(deck_path: Path, **clients) -> ImageAcquisitionTools:
     """
     Get image acquisition tools configured for a specific deck.
 
     Args:
         deck_path: Path to deck directory
+        **clients: Optional shared `generator` / `searcher` clients, `phash_index`, `store`, `palette`
 
     Returns:
         Configured ImageAcquisitionTools instance
     """
+    from .asset_store import AssetStore
+    from .palette import palette_for_deck
+    from .phash_index import PerceptualIndex
+
     deck_path = Path(deck_path)
+    clients.setdefault("palette", palette_for_deck(deck_path) or None)
+    clients.setdefault("phash_index", PerceptualIndex.for_deck(deck_path))
+    clients.setdefault("store", AssetStore.for_deck(deck_path))
     return ImageAcquisitionTools(
         work_runs_dir=deck_path / "resources" / "materials" / "work-runs",
         credits_file=deck_path / "resources" / "materials" / "image-credits.json",
+        **clients,
     )
 
 
-# CLI for direct tool invocation
 
-if __name__ == "__main__":
-    import sys
-    import argparse
 
+# CLI for direct tool invocation
+
+def build_parser() -> argparse.ArgumentParser:
+    """Build the argument parser shared by the CLI and the media daemon."""
     parser = argparse.ArgumentParser(
+        prog="python3 -m lib.media.model_mediated",
         description="Image acquisition tools for keynote decks",
         formatter_class=argparse.RawDescriptionHelpFormatter,
         epilog="""
@@ -281,6 +674,13 @@ Examples:
 
   # Edit an image (HYBRID mode)
   python3 -m lib.media.model_mediated edit "Add blue gradient overlay" input.jpg output.jpg --brand "Tech aesthetic"
+
+  # Explore with drafts, then regenerate the keepers at final quality
+  python3 -m lib.media.model_mediated generate "Hero skyline" decks/my-pitch/resources/assets/hero.png --deck decks/my-pitch --draft
+  python3 -m lib.media.model_mediated promote --deck decks/my-pitch decks/my-pitch/resources/assets/hero.png
+
+Commands are forwarded to the media daemon when it is running
+(python3 -m lib.media.daemon start). Set KEYNOTE_MEDIA_NO_DAEMON=1 to run in-process.
         """
     )
 
@@ -291,8 +691,13 @@ Examples:
     gen_parser.add_argument("prompt", help="Generation prompt")
     gen_parser.add_argument("output", type=Path, help="Output path")
     gen_parser.add_argument("--brand", default="", help="Brand context")
+    gen_parser.add_argument("--temperature", "-t", type=float, default=1.0, help="Generation temperature (0.0-2.0)")
     gen_parser.add_argument("--slide", type=int, help="Slide number")
     gen_parser.add_argument("--deck", type=Path, help="Deck path for logging")
+    gen_parser.add_argument("--palette-threshold", type=float,
+                            help="With --deck: regenerate once if brand-palette conformance is below this (0-1)")
+    gen_parser.add_argument("--draft", action="store_true",
+                            help="Use the draft model (NANO_BANANA_DRAFT_MODEL) and log the output as a draft")
 
     # Search command
     search_parser = subparsers.add_parser("search", help="Search for images")
@@ -300,6 +705,9 @@ Examples:
     search_parser.add_argument("--sources", nargs="+", help="Sources to search")
     search_parser.add_argument("--count", type=int, default=10, help="Results per source")
     search_parser.add_argument("--orientation", default="landscape", help="Image orientation")
+    search_parser.add_argument("--top", type=int, metavar="K",
+                               help="Pre-rank results (frame fit, resolution, license, relevance, source mix) and show the best K")
+    search_parser.add_argument("--frame", help="Target frame for --top, e.g. 16:9 (default: from --orientation)")
 
     # Download command
     dl_parser = subparsers.add_parser("download", help="Download search result")
@@ -319,86 +727,142 @@ Examples:
     edit_parser.add_argument("--brand", default="", help="Brand context")
     edit_parser.add_argument("--slide", type=int, help="Slide number")
     edit_parser.add_argument("--deck", type=Path, help="Deck path for logging")
+    edit_parser.add_argument("--palette-threshold", type=float,
+                             help="With --deck: redo the edit once if brand-palette conformance is below this (0-1)")
+    edit_parser.add_argument("--draft", action="store_true",
+                             help="Use the draft model (NANO_BANANA_DRAFT_MODEL) and log the output as a draft")
+
+    # Promote command (draft -> final)
+    promote_parser = subparsers.add_parser("promote", help="Regenerate chosen drafts at final quality")
+    promote_parser.add_argument("outputs", nargs="*", type=Path, help="Draft output paths to promote")
+    promote_parser.add_argument("--deck", type=Path, required=True, help="Deck whose work runs list the drafts")
+    promote_parser.add_argument("--slide", type=int, action="append", help="Promote every draft on this slide")
 
-    args = parser.parse_args()
+    return parser
 
+
+def _default_tools_for(deck: Optional[Path]) -> ImageAcquisitionTools:
+    return get_tools_for_deck(deck) if deck else ImageAcquisitionTools()
+
+
+def run_command(
+    args: argparse.Namespace,
+    out: TextIO = sys.stdout,
+    tools_for: Callable[[Optional[Path]], ImageAcquisitionTools] = _default_tools_for,
+) -> int:
+    """
+    Execute a parsed CLI command.
+
+    Args:
+        args: Namespace from build_parser()
+        out: Stream for command output
+        tools_for: Returns tools for a deck path (None when no deck given)
+
+    Returns:
+        Process exit code
+    """
     if args.command == "generate":
-        tools = get_tools_for_deck(args.deck) if args.deck else ImageAcquisitionTools()
+        tools = tools_for(args.deck)
         result = tools.generate(
             prompt=args.prompt,
             output_path=args.output,
             brand_context=args.brand,
             slide_number=args.slide,
+            temperature=args.temperature,
+            palette_threshold=args.palette_threshold,
+            draft=args.draft,
         )
-        print(f"Generated: {args.output} ({result.mime_type})")
+        tier = f", draft via {result.model}" if args.draft else ""
+        print(f"Generated: {args.output} ({result.mime_type}{tier})", file=out)
 
     elif args.command == "search":
-        tools = ImageAcquisitionTools()
+        tools = tools_for(None)
         results = tools.search(
             query=args.query,
             sources=args.sources,
             per_page=args.count,
             orientation=args.orientation,
+            rank=args.top,
+            frame=args.frame,
         )
-        print(f"Found {len(results)} results:\n")
+        heading = f"Top {len(results)} ranked results" if args.top is not None else f"Found {len(results)} results"
+        print(f"{heading}:\n", file=out)
         for i, r in enumerate(results):
-            print(f"{i+1}. [{r.source}] {r.description[:60]}...")
-            print(f"   Size: {r.width}x{r.height}")
-            print(f"   Photographer: {r.photographer}")
-            print(f"   Photo page: {r.photo_page_url}")
-            print(f"   Download URL: {r.url}")
-            print(f"   Thumbnail: {r.thumbnail_url}")
-            print()
+            print(f"{i+1}. [{r.source}] {r.description[:60]}...", file=out)
+            if r.rank_score is not None:
+                from .search_rank import describe
+                print(f"   Score: {describe(r)}", file=out)
+            print(f"   Size: {r.width}x{r.height}", file=out)
+            print(f"   Photographer: {r.photographer}", file=out)
+            print(f"   Photo page: {r.photo_page_url}", file=out)
+            print(f"   Download URL: {r.url}", file=out)
+            print(f"   Thumbnail: {r.thumbnail_url}", file=out)
+            print(file=out)
 
     elif args.command == "download":
-        import urllib.request
-
-        # Download the image directly
-        output_path = Path(args.output)
-        output_path.parent.mkdir(parents=True, exist_ok=True)
-
-        print(f"Downloading from {args.url}...")
-        req = urllib.request.Request(args.url)
-        req.add_header("User-Agent", "Mozilla/5.0")
-        with urllib.request.urlopen(req, timeout=60) as response:
-            output_path.write_bytes(response.read())
-
-        # Track attribution if deck specified
-        if args.deck:
-            import json
-            from datetime import datetime
-
-            credits_file = Path(args.deck) / "resources" / "materials" / "image-credits.json"
-            credits_file.parent.mkdir(parents=True, exist_ok=True)
-
-            # Load or create credits
-            if credits_file.exists():
-                data = json.loads(credits_file.read_text())
-            else:
-                data = {"images": []}
-
-            data["images"].append({
-                "file": str(output_path),
-                "source": args.source,
-                "photographer": args.photographer,
-                "photographer_url": "",
-                "photo_url": args.photo_url or args.url,
-                "license": f"{args.source.title()} License",
-                "slide": args.slide,
-                "downloaded_at": datetime.now().isoformat(),
-            })
-
-            credits_file.write_text(json.dumps(data, indent=2))
-
-        print(f"Downloaded to: {output_path}")
+        tools = tools_for(args.deck)
+        print(f"Downloading from {args.url}...", file=out)
+        path = tools.download_url(
+            url=args.url,
+            output_path=args.output,
+            source=args.source,
+            photographer=args.photographer,
+            photo_url=args.photo_url,
+            slide_number=args.slide,
+        )
+        print(f"Downloaded to: {path}", file=out)
 
     elif args.command == "edit":
-        tools = get_tools_for_deck(args.deck) if args.deck else ImageAcquisitionTools()
+        tools = tools_for(args.deck)
         result = tools.edit_image(
             prompt=args.prompt,
             input_path=args.input,
             output_path=args.output,
             brand_context=args.brand,
             slide_number=args.slide,
+            palette_threshold=args.palette_threshold,
+            draft=args.draft,
         )
-        print(f"Edited: {args.output} ({result.mime_type})")
+        tier = f", draft via {result.model}" if args.draft else ""
+        print(f"Edited: {args.output} ({result.mime_type}{tier})", file=out)
+
+    elif args.command == "promote":
+        tools = tools_for(args.deck)
+        if not args.outputs and not args.slide:
+            drafts = tools.pending_drafts()
+            print(f"{len(drafts)} draft(s) pending promotion:", file=out)
+            for output, (record_path, record) in drafts.items():
+                print(f"  slide {record.get('slide')}  {output}  ({record['draft'].get('model')}, {record_path.name})", file=out)
+            return 0
+        try:
+            promoted = tools.promote(outputs=args.outputs, slides=args.slide)
+        except ValueError as e:
+            print(f"Error: {e}", file=out)
+            return 1
+        for output in promoted:
+            print(f"Promoted: {output}", file=out)
+        if not promoted:
+            print("No matching drafts (run `promote --deck <deck>` to list them)", file=out)
+            return 1
+
+    return 0
+
+
+def main(argv: Optional[list[str]] = None) -> int:
+    """CLI entry point; forwards to the media daemon when one is running."""
+    argv = list(sys.argv[1:] if argv is None else argv)
+    args = build_parser().parse_args(argv)
+
+    from . import daemon
+
+    response = daemon.forward(argv)
+    if response is not None:
+        sys.stdout.write(response.get("stdout", ""))
+        sys.stderr.write(response.get("stderr", ""))
+        return int(response.get("exit_code", 1))
+
+    return run_command(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
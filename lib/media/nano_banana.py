@@ -9,8 +9,14 @@ import os
 import urllib.request
 import urllib.error
 from dataclasses import dataclass
+from functools import cached_property
 from pathlib import Path
-from typing import Optional
+from typing import TYPE_CHECKING, Optional
+
+from .image_meta import ImageMeta, ImageMetaError, read_bytes, read_file
+
+if TYPE_CHECKING:
+    from .asset_store import AssetStore
 
 
 def _load_api_key() -> str:
@@ -29,12 +35,21 @@ class ImageResult:
     """Result from image generation."""
     bytes: bytes
     mime_type: str
+    model: Optional[str] = None  # Model that produced the image
+
+    @cached_property
+    def meta(self) -> ImageMeta:
+        """Format, dimensions, and size from the image header (no decode)."""
+        return read_bytes(self.bytes)
+
+    def save(self, path: Path | str, store: Optional[AssetStore] = None) -> Path:
+        """Save image to file (via the shared asset store when one is given)."""
+        from .asset_store import replace_bytes
 
-    def save(self, path: Path | str) -> Path:
-        """Save image to file."""
         path = Path(path)
-        path.write_bytes(self.bytes)
-        return path
+        if store:
+            return store.write_bytes(self.bytes, path)
+        return replace_bytes(self.bytes, path)
 
 
 @dataclass(frozen=True)
@@ -43,19 +58,27 @@ class ImageInput:
     bytes: bytes
     mime_type: str
 
+    @cached_property
+    def meta(self) -> ImageMeta:
+        """Format, dimensions, and size from the image header (no decode)."""
+        return read_bytes(self.bytes)
+
     @classmethod
     def from_file(cls, path: Path | str) -> "ImageInput":
-        """Load image from file."""
+        """Load image from file, taking the MIME type from its header."""
         path = Path(path)
-        mime_types = {
-            ".jpg": "image/jpeg",
-            ".jpeg": "image/jpeg",
-            ".png": "image/png",
-            ".webp": "image/webp",
-            ".gif": "image/gif",
-        }
-        suffix = path.suffix.lower()
-        mime_type = mime_types.get(suffix, "image/jpeg")
+        try:
+            mime_type = read_file(path).mime_type
+        except ImageMetaError:
+            # Unrecognized header: fall back to the extension
+            mime_types = {
+                ".jpg": "image/jpeg",
+                ".jpeg": "image/jpeg",
+                ".png": "image/png",
+                ".webp": "image/webp",
+                ".gif": "image/gif",
+            }
+            mime_type = mime_types.get(path.suffix.lower(), "image/jpeg")
         return cls(bytes=path.read_bytes(), mime_type=mime_type)
 
 
@@ -65,7 +88,14 @@ class NanoBananaError(Exception):
 
 
 class NanoBananaClient:
-    """Client for Gemini image generation (nano-banana)."""
+    """
+    Client for Gemini image generation (nano-banana).
+
+    Draft requests (draft=True) use the draft tier: NANO_BANANA_DRAFT_MODEL
+    (a faster/cheaper model) and, when NANO_BANANA_DRAFT_IMAGE_SIZE is set,
+    a smaller imageConfig.imageSize for models that accept one. Without
+    either, drafts use the final model and differ only in how they are logged.
+    """
 
     BASE_URL = "https://generativelanguage.googleapis.com/v1beta/models"
     DEFAULT_MODEL = "gemini-2.5-flash-image"
@@ -74,15 +104,24 @@ class NanoBananaClient:
         self,
         api_key: Optional[str] = None,
         model: Optional[str] = None,
+        draft_model: Optional[str] = None,
+        draft_image_size: Optional[str] = None,
     ):
         self.api_key = api_key or _load_api_key()
         self.model = model or os.environ.get("NANO_BANANA_IMAGE_MODEL", self.DEFAULT_MODEL)
+        self.draft_model = draft_model or os.environ.get("NANO_BANANA_DRAFT_MODEL") or self.model
+        self.draft_image_size = draft_image_size or os.environ.get("NANO_BANANA_DRAFT_IMAGE_SIZE")
+
+    def model_for(self, draft: bool = False) -> str:
+        """Model name used for a draft or final request."""
+        return self.draft_model if draft else self.model
 
     def generate_image(
         self,
         prompt: str,
         temperature: float = 1.0,
         aspect_ratio: Optional[str] = None,
+        draft: bool = False,
     ) -> ImageResult:
         """
         Generate an image from a text prompt.
@@ -91,6 +130,7 @@ class NanoBananaClient:
             prompt: Text description of the image to generate
             temperature: Randomness (0.0-2.0, default 1.0)
             aspect_ratio: Optional aspect ratio hint in prompt
+            draft: Use the draft tier (faster model / smaller output)
 
         Returns:
             ImageResult with generated image bytes
@@ -111,13 +151,14 @@ class NanoBananaClient:
             }
         }
 
-        return self._make_request(payload)
+        return self._make_request(payload, draft)
 
     def edit_image(
         self,
         prompt: str,
         inputs: list[ImageInput],
         temperature: float = 0.2,
+        draft: bool = False,
     ) -> ImageResult:
         """
         Edit or transform existing images based on a prompt.
@@ -126,6 +167,7 @@ class NanoBananaClient:
             prompt: Text description of the desired edit
             inputs: List of input images to edit/reference
             temperature: Randomness (0.0-2.0, default 0.2 for edits)
+            draft: Use the draft tier (faster model / smaller output)
 
         Returns:
             ImageResult with generated image bytes
@@ -155,11 +197,14 @@ class NanoBananaClient:
             }
         }
 
-        return self._make_request(payload)
+        return self._make_request(payload, draft)
 
-    def _make_request(self, payload: dict) -> ImageResult:
+    def _make_request(self, payload: dict, draft: bool = False) -> ImageResult:
         """Make API request and extract image result."""
-        url = f"{self.BASE_URL}/{self.model}:generateContent"
+        model = self.model_for(draft)
+        if draft and self.draft_image_size:
+            payload["generationConfig"]["imageConfig"] = {"imageSize": self.draft_image_size}
+        url = f"{self.BASE_URL}/{model}:generateContent"
 
         headers = {
             "Content-Type": "application/json",
@@ -179,9 +224,9 @@ class NanoBananaClient:
             raise NanoBananaError(f"Network error: {e.reason}") from e
 
         # Extract image from response
-        return self._extract_image(result)
+        return self._extract_image(result, model)
 
-    def _extract_image(self, response: dict) -> ImageResult:
+    def _extract_image(self, response: dict, model: Optional[str] = None) -> ImageResult:
         """Extract image data from API response."""
         try:
             candidates = response.get("candidates", [])
@@ -196,7 +241,7 @@ class NanoBananaClient:
                 if inline_data:
                     image_data = base64.b64decode(inline_data["data"])
                     mime_type = inline_data.get("mimeType", inline_data.get("mime_type", "image/png"))
-                    return ImageResult(bytes=image_data, mime_type=mime_type)
+                    return ImageResult(bytes=image_data, mime_type=mime_type, model=model)
 
             # Check if there's text explaining why no image
             for part in parts:
@@ -262,19 +307,3 @@ def edit_image(
         result.save(output_path)
 
     return result
-
-
-if __name__ == "__main__":
-    # Simple test
-    import sys
-
-    if len(sys.argv) < 2:
-        print("Usage: python nano_banana.py <prompt> [output_path]")
-        sys.exit(1)
-
-    prompt = sys.argv[1]
-    output = Path(sys.argv[2]) if len(sys.argv) > 2 else Path("output.png")
-
-    print(f"Generating image for: {prompt[:50]}...")
-    result = generate_image(prompt, output)
-    print(f"Saved to: {output} ({result.mime_type})")
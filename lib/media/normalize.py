@@ -0,0 +1,356 @@
+# ABOUTME: Post-acquisition image normalization: resize to slide sizes, transcode, strip metadata.
+# ABOUTME: Emits AVIF/WebP/JPEG srcset variants per asset and can rewrite deck <img> tags to use them.
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import re
+import sys
+import time
+from dataclasses import asdict, dataclass, field
+from datetime import datetime
+from pathlib import Path
+from typing import Optional
+
+# Slides render at 1600x900 (export-pdf.js VIEWPORT); 800 covers thumbnails and
+# split layouts, 3200 covers 2x displays.
+DEFAULT_WIDTHS = (800, 1600, 3200)
+SOURCE_SUFFIXES = {".png", ".jpg", ".jpeg", ".webp"}
+VARIANTS_DIR = "variants"
+MANIFEST_FILE = "media-variants.json"
+MANIFEST_VERSION = 1
+DEFAULT_SIZES = "(max-width: 1600px) 100vw, 1600px"
+
+QUALITY = {"avif": 55, "webp": 80, "jpeg": 82}
+MIME_TYPES = {"avif": "image/avif", "webp": "image/webp", "jpeg": "image/jpeg", "png": "image/png"}
+EXTENSIONS = {"avif": ".avif", "webp": ".webp", "jpeg": ".jpg", "png": ".png"}
+
+
+def _require_pillow():
+    try:
+        from PIL import Image, ImageOps
+    except ImportError as e:
+        raise ImportError("Image normalization needs Pillow: pip install Pillow") from e
+    return Image, ImageOps
+
+
+def supported_formats() -> list[str]:
+    """Modern formats this Pillow build can encode, best first."""
+    Image, _ = _require_pillow()
+    Image.init()
+    return [fmt for fmt in ("avif", "webp") if fmt.upper() in Image.SAVE]
+
+
+@dataclass(frozen=True)
+class ImageVariant:
+    """One resized, transcoded rendition of a source image."""
+    path: str
+    width: int
+    height: int
+    format: str
+    bytes: int
+
+
+@dataclass
+class NormalizedImage:
+    """All variants produced for one source image."""
+    source: str
+    width: int
+    height: int
+    source_bytes: int
+    fallback_format: str
+    variants: list[ImageVariant] = field(default_factory=list)
+
+    def by_format(self, fmt: str) -> list[ImageVariant]:
+        return sorted((v for v in self.variants if v.format == fmt), key=lambda v: v.width)
+
+    def srcset(self, fmt: str, prefix: str = "") -> str:
+        return ", ".join(f"{prefix}{v.path} {v.width}w" for v in self.by_format(fmt))
+
+    def fallback(self, target_width: int = 1600) -> ImageVariant:
+        """Fallback variant closest to (but not below, if possible) target_width."""
+        candidates = self.by_format(self.fallback_format)
+        return next((v for v in candidates if v.width >= target_width), candidates[-1])
+
+    @property
+    def variant_bytes(self) -> int:
+        """Bytes a browser fetches for the 1600px fallback rendition."""
+        return self.fallback().bytes
+
+
+def normalize_image(
+    source: Path | str,
+    out_dir: Path | str,
+    widths: tuple[int, ...] = DEFAULT_WIDTHS,
+    formats: Optional[list[str]] = None,
+) -> NormalizedImage:
+    """
+    Decode source once and write each width in each format to out_dir.
+
+    Widths above the source width are clamped (never upscaled). EXIF, XMP,
+    and text chunks are dropped; the ICC profile is kept so colors survive.
+    Transparent images fall back to PNG instead of JPEG.
+    """
+    Image, ImageOps = _require_pillow()
+    source = Path(source)
+    out_dir = Path(out_dir)
+    out_dir.mkdir(parents=True, exist_ok=True)
+    formats = supported_formats() if formats is None else formats
+
+    with Image.open(source) as img:
+        if img.format == "JPEG":
+            # Let libjpeg decode at a reduced scale when originals are huge
+            img.draft("RGB", (max(widths), max(widths)))
+        img = ImageOps.exif_transpose(img)
+        icc_profile = img.info.get("icc_profile")
+        has_alpha = img.mode in ("RGBA", "LA", "PA") or (img.mode == "P" and "transparency" in img.info)
+        img = img.convert("RGBA" if has_alpha else "RGB")
+
+    fallback_format = "png" if has_alpha else "jpeg"
+    targets = sorted({min(w, img.width) for w in widths}, reverse=True)
+    result = NormalizedImage(
+        source=str(source),
+        width=img.width,
+        height=img.height,
+        source_bytes=source.stat().st_size,
+        fallback_format=fallback_format,
+    )
+
+    frame = img
+    for width in targets:
+        height = max(1, round(img.height * width / img.width))
+        # Resize from the previous (larger) frame: cheaper and visually identical
+        frame = frame if frame.width == width else frame.resize((width, height), Image.LANCZOS, reducing_gap=3.0)
+        for fmt in [*formats, fallback_format]:
+            path = out_dir / f"{source.stem}-{width}w{EXTENSIONS[fmt]}"
+            _save(frame, path, fmt, icc_profile)
+            result.variants.append(ImageVariant(
+                path=str(path), width=width, height=height, format=fmt, bytes=path.stat().st_size,
+            ))
+    return result
+
+
+def _save(frame, path: Path, fmt: str, icc_profile: Optional[bytes]) -> None:
+    options: dict = {}
+    if icc_profile:
+        options["icc_profile"] = icc_profile
+    if fmt in QUALITY:
+        options["quality"] = QUALITY[fmt]
+    if fmt == "jpeg":
+        options.update(optimize=True, progressive=True)
+    elif fmt == "png":
+        options["optimize"] = True
+    elif fmt == "webp":
+        options["method"] = 4
+
+    tmp_path = path.with_name(f".{path.name}.tmp")
+    frame.save(tmp_path, format=fmt.upper(), **options)
+    os.replace(tmp_path, path)
+
+
+def picture_html(image: NormalizedImage, img_attrs: str, base: Path, sizes: str = DEFAULT_SIZES) -> str:
+    """<picture> with modern <source>s and an <img> carrying the original attributes."""
+    def rel(path: str) -> str:
+        return Path(os.path.relpath(path, base)).as_posix()
+
+    sources = []
+    for fmt in ("avif", "webp"):
+        variants = image.by_format(fmt)
+        if variants:
+            srcset = ", ".join(f"{rel(v.path)} {v.width}w" for v in variants)
+            sources.append(f'<source type="{MIME_TYPES[fmt]}" srcset="{srcset}" sizes="{sizes}" />')
+
+    fallback = image.by_format(image.fallback_format)
+    fallback_srcset = ", ".join(f"{rel(v.path)} {v.width}w" for v in fallback)
+    img = (f'<img{img_attrs} src="{rel(image.fallback().path)}" '
+           f'srcset="{fallback_srcset}" sizes="{sizes}" />')
+    # display: contents keeps existing .media-frame > img layout rules working
+    return f'<picture data-normalized style="display: contents">{"".join(sources)}{img}</picture>'
+
+
+_IMG_TAG = re.compile(r'<img\b(?P<before>[^>]*?)\s+src="(?P<src>[^"]+)"(?P<after>[^>]*?)\s*/?>', re.S)
+# Generated media the template swaps at runtime: generateForElement sets
+# img.src (a srcset would win) and marks the parent .media-frame ready
+_GENERATED = re.compile(r'\sdata-gen\s*=|\sclass="[^"]*\bgen-media\b')
+
+
+class DeckImageNormalizer:
+    """
+    Normalize every image in a deck's resources/assets into resources/assets/variants.
+
+    Sources are re-encoded only when their size, mtime, or the requested
+    widths/formats change; results are recorded in
+    resources/materials/media-variants.json.
+    """
+
+    def __init__(
+        self,
+        deck_path: Path | str,
+        widths: tuple[int, ...] = DEFAULT_WIDTHS,
+        formats: Optional[list[str]] = None,
+    ):
+        self.deck_path = Path(deck_path)
+        self.assets_dir = self.deck_path / "resources" / "assets"
+        self.variants_dir = self.assets_dir / VARIANTS_DIR
+        self.manifest_path = self.deck_path / "resources" / "materials" / MANIFEST_FILE
+        self.widths = tuple(sorted(widths))
+        self.formats = supported_formats() if formats is None else formats
+        self.manifest = self._load_manifest()
+
+    def sources(self) -> list[Path]:
+        return sorted(
+            p for p in self.assets_dir.glob("*")
+            if p.is_file() and p.suffix.lower() in SOURCE_SUFFIXES
+        )
+
+    def normalize(self, path: Path, force: bool = False) -> tuple[NormalizedImage, bool]:
+        """Normalize one source; returns (result, whether it was re-encoded)."""
+        key = path.relative_to(self.deck_path).as_posix()
+        stat = path.stat()
+        entry = self.manifest["images"].get(key)
+        if (
+            not force and entry
+            and entry["size"] == stat.st_size
+            and entry["mtime_ns"] == stat.st_mtime_ns
+            and entry["widths"] == list(self.widths)
+            and entry["formats"] == self.formats
+            and all((self.deck_path / v["path"]).exists() for v in entry["image"]["variants"])
+        ):
+            return self._from_entry(entry), False
+
+        image = normalize_image(path, self.variants_dir, self.widths, self.formats)
+        stored = asdict(image)
+        stored["source"] = key
+        for variant in stored["variants"]:
+            variant["path"] = Path(variant["path"]).relative_to(self.deck_path).as_posix()
+        self.manifest["images"][key] = {
+            "size": stat.st_size,
+            "mtime_ns": stat.st_mtime_ns,
+            "widths": list(self.widths),
+            "formats": self.formats,
+            "normalized_at": datetime.now().isoformat(),
+            "image": stored,
+        }
+        return self._from_entry(self.manifest["images"][key]), True
+
+    def run(self, force: bool = False, out=sys.stdout) -> list[NormalizedImage]:
+        results = []
+        for path in self.sources():
+            image, encoded = self.normalize(path, force=force)
+            if encoded:
+                print(f"  normalized {image.source}: {_mb(image.source_bytes)} -> "
+                      f"{_mb(image.variant_bytes)} served", file=out)
+            results.append(image)
+        self.save_manifest()
+        return results
+
+    def apply(self, html_path: Path) -> int:
+        """
+        Rewrite <img src="resources/assets/..."> tags to <picture> variants; returns tags rewritten.
+        Generated media (data-gen / .gen-media) keeps its plain <img> so the template can regenerate it.
+        """
+        images = {entry["image"]["source"]: self._from_entry(entry) for entry in self.manifest["images"].values()}
+        count = 0
+
+        def replace(match: re.Match) -> str:
+            nonlocal count
+            image = images.get(match.group("src"))
+            if image is None or _GENERATED.search(" " + match.group("before") + match.group("after")):
+                return match.group(0)
+            count += 1
+            attrs = re.sub(r'\s+(srcset|sizes)="[^"]*"', "", match.group("before") + match.group("after"))
+            return picture_html(image, attrs.rstrip(), html_path.parent)
+
+        html = html_path.read_text()
+        updated = _IMG_TAG.sub(replace, html)
+        if count:
+            tmp_path = html_path.with_name(f".{html_path.name}.tmp")
+            tmp_path.write_text(updated)
+            os.replace(tmp_path, html_path)
+        return count
+
+    def _from_entry(self, entry: dict) -> NormalizedImage:
+        stored = entry["image"]
+        return NormalizedImage(
+            source=stored["source"],
+            width=stored["width"],
+            height=stored["height"],
+            source_bytes=stored["source_bytes"],
+            fallback_format=stored["fallback_format"],
+            variants=[
+                ImageVariant(**{**v, "path": str(self.deck_path / v["path"])})
+                for v in stored["variants"]
+            ],
+        )
+
+    def _load_manifest(self) -> dict:
+        if self.manifest_path.exists():
+            data = json.loads(self.manifest_path.read_text())
+            if data.get("version") == MANIFEST_VERSION:
+                return data
+        return {"version": MANIFEST_VERSION, "images": {}}
+
+    def save_manifest(self) -> None:
+        self.manifest_path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.manifest_path.with_suffix(".json.tmp")
+        tmp_path.write_text(json.dumps(self.manifest, indent=2, sort_keys=True))
+        os.replace(tmp_path, self.manifest_path)
+
+
+def _mb(size: int) -> str:
+    return f"{size / 1_000_000:.2f} MB"
+
+
+def main(argv: Optional[list[str]] = None) -> int:
+    parser = argparse.ArgumentParser(
+        prog="python3 -m lib.media normalize",
+        description="Resize, transcode, and strip metadata from a deck's images",
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog="""
+Writes resources/assets/variants/<name>-<width>w.{avif,webp,jpg} (PNG fallback
+for transparent images) and records them in resources/materials/media-variants.json.
+Only new or changed images are re-encoded. --apply rewrites matching <img> tags
+in the deck's index.html to <picture> elements with srcset variants; generated
+media (data-gen, .gen-media) is left as plain <img> for in-deck regeneration.
+
+Examples:
+  python3 -m lib.media normalize decks/my-pitch
+  python3 -m lib.media normalize decks/my-pitch --apply
+  python3 -m lib.media normalize decks/my-pitch --widths 1280 1920 --formats webp
+        """
+    )
+    parser.add_argument("deck", type=Path, help="Deck directory")
+    parser.add_argument("--widths", type=int, nargs="+", default=list(DEFAULT_WIDTHS), help="Variant widths")
+    parser.add_argument("--formats", nargs="+", choices=["avif", "webp"], help="Modern formats (default: all supported)")
+    parser.add_argument("--force", action="store_true", help="Re-encode even if up to date")
+    parser.add_argument("--apply", action="store_true", help="Rewrite <img> tags in index.html to use variants")
+    args = parser.parse_args(argv)
+
+    if not (args.deck / "resources" / "assets").is_dir():
+        print(f"Error: No resources/assets directory in {args.deck}")
+        return 1
+
+    start = time.perf_counter()
+    try:
+        normalizer = DeckImageNormalizer(args.deck, tuple(args.widths), args.formats)
+        results = normalizer.run(force=args.force)
+    except (ImportError, OSError) as e:
+        print(f"Error: {e}")
+        return 1
+
+    before = sum(r.source_bytes for r in results)
+    after = sum(r.variant_bytes for r in results)
+    elapsed_ms = (time.perf_counter() - start) * 1000
+    print(f"{len(results)} image(s): {_mb(before)} originals -> {_mb(after)} served ({elapsed_ms:.0f}ms)")
+
+    if args.apply:
+        html_path = args.deck / "index.html"
+        rewritten = normalizer.apply(html_path) if html_path.exists() else 0
+        print(f"Rewrote {rewritten} <img> tag(s) in {html_path}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
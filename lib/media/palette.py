@@ -0,0 +1,235 @@
+# ABOUTME: Brand-palette conformance check for generated images (vectorized NumPy, CIELAB).
+# ABOUTME: Scores how much of an image sits near the deck entity's brand tokens and lists dominant colors.
+
+from __future__ import annotations
+
+import argparse
+import io
+import json
+import re
+import sys
+import time
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import Optional
+
+# A pixel conforms when it is within this CIE76 delta-E of a brand color, or is
+# near-neutral (whites, grays, blacks read as paper/ink in every brand).
+DEFAULT_TOLERANCE = 30.0
+NEUTRAL_CHROMA = 12.0
+# Pixels sampled per image; 128px on the long side keeps the check to a few ms
+SAMPLE_SIDE = 128
+DOMINANT_COLORS = 6
+# rgba() tokens below this alpha are overlays (lines, glows), not palette colors
+MIN_ALPHA = 0.5
+
+_HEX = re.compile(r"^#([0-9a-f]{3}|[0-9a-f]{6})$", re.I)
+_RGBA = re.compile(r"^rgba?\(\s*(\d+)\s*,\s*(\d+)\s*,\s*(\d+)\s*(?:,\s*([\d.]+)\s*)?\)$", re.I)
+
+
+def _require_deps():
+    try:
+        import numpy as np
+        from PIL import Image
+    except ImportError as e:
+        raise ImportError("Palette checks need NumPy and Pillow: pip install numpy Pillow") from e
+    return np, Image
+
+
+def parse_color(value: str) -> Optional[tuple[int, int, int]]:
+    """RGB from a #hex or rgb()/rgba() token; None for translucent or non-color values."""
+    value = value.strip()
+    match = _HEX.match(value)
+    if match:
+        digits = match.group(1)
+        if len(digits) == 3:
+            digits = "".join(c * 2 for c in digits)
+        return tuple(int(digits[i:i + 2], 16) for i in (0, 2, 4))
+    match = _RGBA.match(value)
+    if match:
+        alpha = float(match.group(4)) if match.group(4) else 1.0
+        if alpha < MIN_ALPHA:
+            return None
+        return tuple(int(match.group(i)) for i in (1, 2, 3))
+    return None
+
+
+def brand_palette(brand: dict) -> dict[str, tuple[int, int, int]]:
+    """Token name -> RGB for a brand profile's opaque color tokens."""
+    palette = {}
+    for name, value in (brand.get("tokens") or {}).items():
+        rgb = parse_color(str(value))
+        if rgb:
+            palette[name] = rgb
+    return palette
+
+
+def palette_for_deck(deck_path: Path | str) -> dict[str, tuple[int, int, int]]:
+    """Palette of the deck entity's brand profile, or {} when none is configured."""
+    from .brands import brand_for_deck
+
+    try:
+        return brand_palette(brand_for_deck(deck_path))
+    except (OSError, ValueError):
+        return {}
+
+
+def _hex(rgb) -> str:
+    return "#" + "".join(f"{int(round(c)):02x}" for c in rgb)
+
+
+def rgb_to_lab(rgb):
+    """(..., 3) sRGB 0-255 -> CIELAB (D65)."""
+    np, _ = _require_deps()
+    c = np.asarray(rgb, dtype=np.float64) / 255.0
+    linear = np.where(c > 0.04045, ((c + 0.055) / 1.055) ** 2.4, c / 12.92)
+    xyz = linear @ np.array([
+        [0.4124564, 0.2126729, 0.0193339],
+        [0.3575761, 0.7151522, 0.1191920],
+        [0.1804375, 0.0721750, 0.9503041],
+    ]) / np.array([0.95047, 1.0, 1.08883])
+    f = np.where(xyz > (6 / 29) ** 3, np.cbrt(xyz), xyz / (3 * (6 / 29) ** 2) + 4 / 29)
+    return np.stack([
+        116 * f[..., 1] - 16,
+        500 * (f[..., 0] - f[..., 1]),
+        200 * (f[..., 1] - f[..., 2]),
+    ], axis=-1)
+
+
+@dataclass
+class PaletteReport:
+    """How well an image's colors fit a brand palette."""
+    score: float  # Share of pixels (0-1) near a brand color or neutral
+    tolerance: float
+    dominant: list[dict] = field(default_factory=list)  # hex, share, nearest token, delta_e
+    elapsed_ms: float = 0.0
+
+    def to_dict(self) -> dict:
+        return asdict(self)
+
+
+def _sample_pixels(source: Path | str | bytes):
+    np, Image = _require_deps()
+    with Image.open(io.BytesIO(source) if isinstance(source, bytes) else source) as img:
+        img.draft("RGB", (SAMPLE_SIDE, SAMPLE_SIDE))
+        if img.mode != "RGB":
+            img = img.convert("RGB")  # Before reduce(), which rejects P, 1, and I;16 images
+        factor = max(1, min(img.size) // (SAMPLE_SIDE * 2))
+        if factor > 1:
+            img = img.reduce(factor)  # Cheap box reduction before the resample
+        img.thumbnail((SAMPLE_SIDE, SAMPLE_SIDE))
+        return np.asarray(img, dtype=np.uint8).reshape(-1, 3)
+
+
+def check_palette(
+    source: Path | str | bytes,
+    palette: dict[str, tuple[int, int, int]],
+    tolerance: float = DEFAULT_TOLERANCE,
+) -> PaletteReport:
+    """
+    Score an image against a brand palette.
+
+    Pixels are quantized to a 4-bit-per-channel grid (4096 bins) with one
+    bincount; the dominant bins report their mean color, share, and nearest
+    brand token. Conformance is the pixel share within tolerance delta-E of
+    a brand color or below NEUTRAL_CHROMA.
+    """
+    np, _ = _require_deps()
+    start = time.perf_counter()
+    pixels = _sample_pixels(source)
+    names = list(palette)
+    brand_lab = rgb_to_lab(np.array([palette[n] for n in names], dtype=np.float64)) if names else None
+
+    # Quantize: 4 bits per channel -> bin index, then aggregate per bin
+    bins = ((pixels[:, 0] >> 4).astype(np.int32) << 8) | ((pixels[:, 1] >> 4).astype(np.int32) << 4) | (pixels[:, 2] >> 4)
+    counts = np.bincount(bins, minlength=4096)
+    sums = np.stack([np.bincount(bins, weights=pixels[:, i], minlength=4096) for i in range(3)], axis=1)
+    occupied = np.nonzero(counts)[0]
+    means = sums[occupied] / counts[occupied, None]
+    weights = counts[occupied] / len(pixels)
+
+    lab = rgb_to_lab(means)
+    chroma = np.hypot(lab[:, 1], lab[:, 2])
+    if brand_lab is not None:
+        distances = np.linalg.norm(lab[:, None, :] - brand_lab[None, :, :], axis=2)
+        nearest = distances.argmin(axis=1)
+        nearest_distance = distances[np.arange(len(lab)), nearest]
+    else:
+        nearest = np.zeros(len(lab), dtype=np.int64)
+        nearest_distance = np.full(len(lab), np.inf)
+
+    conforming = (nearest_distance <= tolerance) | (chroma < NEUTRAL_CHROMA)
+    score = float(weights[conforming].sum())
+
+    dominant = []
+    for i in np.argsort(-weights)[:DOMINANT_COLORS]:
+        dominant.append({
+            "hex": _hex(means[i]),
+            "share": round(float(weights[i]), 4),
+            "nearest": names[nearest[i]] if names else None,
+            "delta_e": round(float(nearest_distance[i]), 1) if names else None,
+            "neutral": bool(chroma[i] < NEUTRAL_CHROMA),
+        })
+
+    return PaletteReport(
+        score=round(score, 4),
+        tolerance=tolerance,
+        dominant=dominant,
+        elapsed_ms=round((time.perf_counter() - start) * 1000, 2),
+    )
+
+
+def palette_hint(palette: dict[str, tuple[int, int, int]]) -> str:
+    """Prompt suffix naming the brand colors, used when retrying an off-palette image."""
+    colors = ", ".join(_hex(rgb) for rgb in dict.fromkeys(palette.values()))
+    return f"Use only this color palette plus neutrals: {colors}."
+
+
+def main(argv: Optional[list[str]] = None) -> int:
+    parser = argparse.ArgumentParser(
+        prog="python3 -m lib.media palette",
+        description="Score images against a deck's brand palette",
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog="""
+The palette is the deck entity's color tokens in decks/brands.js.
+
+Examples:
+  python3 -m lib.media palette decks/my-pitch/resources/assets/hero.png --deck decks/my-pitch
+  python3 -m lib.media palette decks/my-pitch/resources/assets/*.png --deck decks/my-pitch --json
+        """
+    )
+    parser.add_argument("images", nargs="+", type=Path, help="Images to check")
+    parser.add_argument("--deck", type=Path, required=True, help="Deck whose brand palette to use")
+    parser.add_argument("--tolerance", type=float, default=DEFAULT_TOLERANCE, help="Max delta-E to a brand color")
+    parser.add_argument("--json", action="store_true", help="Print JSON reports")
+    args = parser.parse_args(argv)
+
+    palette = palette_for_deck(args.deck)
+    if not palette:
+        print(f"Error: No brand palette for {args.deck} (deck.json entity + decks/brands.js)")
+        return 1
+
+    reports = {}
+    for image in args.images:
+        try:
+            reports[str(image)] = check_palette(image, palette, args.tolerance)
+        except ImportError as e:
+            print(f"Error: {e}")
+            return 1
+        except (OSError, ValueError) as e:
+            print(f"Warning: {image} not scored: {e}", file=sys.stderr)
+
+    if args.json:
+        print(json.dumps({path: r.to_dict() for path, r in reports.items()}, indent=2))
+        return 0
+
+    for path, report in reports.items():
+        print(f"{report.score:6.1%}  {path}  ({report.elapsed_ms:.1f}ms)")
+        for color in report.dominant:
+            fit = "neutral" if color["neutral"] else f"{color['nearest']} dE {color['delta_e']}"
+            print(f"          {color['hex']}  {color['share']:5.1%}  {fit}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,392 @@
+# ABOUTME: Perceptual-hash index over every deck's resources/assets for near-duplicate detection.
+# ABOUTME: dHash/pHash computed with NumPy on downscaled pixels, looked up through a BK-tree.
+
+from __future__ import annotations
+
+import argparse
+import io
+import json
+import os
+import sys
+import threading
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Optional
+
+INDEX_DIR = ".media-index"
+INDEX_FILE = "phash.json"
+INDEX_VERSION = 1
+IMAGE_SUFFIXES = {".png", ".jpg", ".jpeg", ".webp", ".gif"}
+
+# pHash bits that may differ for two images to count as near-duplicates. Resized
+# and recompressed copies land well under 6; regenerated variants of one prompt
+# typically under 12; unrelated images cluster around 32.
+DEFAULT_THRESHOLD = 10
+
+_HASH_SIZE = 8
+_PHASH_SIZE = 32
+
+
+def _require_deps():
+    try:
+        import numpy as np
+        from PIL import Image
+    except ImportError as e:
+        raise ImportError("Perceptual hashing needs NumPy and Pillow: pip install numpy Pillow") from e
+    return np, Image
+
+
+def available() -> bool:
+    """True when NumPy and Pillow are importable."""
+    try:
+        _require_deps()
+    except ImportError:
+        return False
+    return True
+
+
+# Hashing
+
+
+def _pixels(source: Path | str | bytes):
+    """Decode to a 32x32 grayscale float array, letting the decoder downscale early."""
+    np, Image = _require_deps()
+    with Image.open(io.BytesIO(source) if isinstance(source, bytes) else source) as img:
+        img.draft("L", (_PHASH_SIZE * 4, _PHASH_SIZE * 4))  # JPEG: decode at 1/2..1/8 scale
+        img = img.convert("L")
+        img.thumbnail((_PHASH_SIZE * 4, _PHASH_SIZE * 4))
+        img = img.resize((_PHASH_SIZE, _PHASH_SIZE), Image.LANCZOS)
+        return np.asarray(img, dtype=np.float64)
+
+
+_DCT_CACHE: dict = {}
+
+
+def _dct_matrix(n: int):
+    np, _ = _require_deps()
+    if n not in _DCT_CACHE:
+        k = np.arange(n)[:, None]
+        i = np.arange(n)[None, :]
+        matrix = np.sqrt(2.0 / n) * np.cos(np.pi * (2 * i + 1) * k / (2 * n))
+        matrix[0] /= np.sqrt(2.0)
+        _DCT_CACHE[n] = matrix
+    return _DCT_CACHE[n]
+
+
+def _pack_bits(bits) -> list[int]:
+    """(N, 64) boolean array -> N 64-bit ints."""
+    np, _ = _require_deps()
+    weights = np.left_shift(np.uint64(1), np.arange(63, -1, -1, dtype=np.uint64))
+    return [int(v) for v in (bits.astype(np.uint64) * weights).sum(axis=1, dtype=np.uint64)]
+
+
+def hash_pixels(stack) -> list[tuple[int, int]]:
+    """
+    (dhash, phash) for each 32x32 grayscale image in an (N, 32, 32) stack.
+
+    pHash: 2-D DCT of the whole batch as D @ X @ D.T, keep the low 8x8
+    frequencies, threshold at each image's median (DC term excluded).
+    dHash: 9x8 downscale, compare horizontal neighbours.
+    """
+    np, _ = _require_deps()
+    stack = np.asarray(stack, dtype=np.float64)
+    n = len(stack)
+
+    dct = _dct_matrix(_PHASH_SIZE)
+    low = (dct @ stack @ dct.T)[:, :_HASH_SIZE, :_HASH_SIZE].reshape(n, -1)
+    medians = np.median(low[:, 1:], axis=1, keepdims=True)
+    phashes = _pack_bits(low > medians)
+
+    # Block-average 32x32 down to 8 rows x 9 columns for dHash
+    rows = stack.reshape(n, _HASH_SIZE, _PHASH_SIZE // _HASH_SIZE, _PHASH_SIZE).mean(axis=2)
+    cols = np.stack([
+        rows[:, :, round(j * _PHASH_SIZE / 9):round((j + 1) * _PHASH_SIZE / 9)].mean(axis=2)
+        for j in range(_HASH_SIZE + 1)
+    ], axis=2)
+    dhashes = _pack_bits((cols[:, :, 1:] > cols[:, :, :-1]).reshape(n, -1))
+
+    return list(zip(dhashes, phashes))
+
+
+def image_hashes(source: Path | str | bytes) -> tuple[int, int]:
+    """(dhash, phash) for one image file or in-memory image."""
+    return hash_pixels([_pixels(source)])[0]
+
+
+def hamming(a: int, b: int) -> int:
+    return (a ^ b).bit_count()
+
+
+# Lookup
+
+
+class BKTree:
+    """Burkhard-Keller tree over 64-bit hashes under Hamming distance."""
+
+    def __init__(self):
+        self._root: Optional[list] = None  # [hash, keys, {distance: child}]
+        self._size = 0
+
+    def __len__(self) -> int:
+        return self._size
+
+    def add(self, value: int, key: str) -> None:
+        self._size += 1
+        if self._root is None:
+            self._root = [value, [key], {}]
+            return
+        node = self._root
+        while True:
+            distance = hamming(value, node[0])
+            if distance == 0:
+                node[1].append(key)
+                return
+            child = node[2].get(distance)
+            if child is None:
+                node[2][distance] = [value, [key], {}]
+                return
+            node = child
+
+    def search(self, value: int, threshold: int) -> list[tuple[str, int]]:
+        """All (key, distance) within threshold, nearest first."""
+        if self._root is None:
+            return []
+        found = []
+        pending = [self._root]
+        while pending:
+            node = pending.pop()
+            distance = hamming(value, node[0])
+            if distance <= threshold:
+                found.extend((key, distance) for key in node[1])
+            # Triangle inequality: only children in [d - t, d + t] can match
+            for edge, child in node[2].items():
+                if distance - threshold <= edge <= distance + threshold:
+                    pending.append(child)
+        return sorted(found, key=lambda item: (item[1], item[0]))
+
+
+@dataclass(frozen=True)
+class DuplicateMatch:
+    """An indexed asset perceptually close to the query image."""
+    path: str  # Relative to the decks root
+    distance: int  # pHash Hamming distance
+    dhash_distance: int
+
+    def to_dict(self) -> dict:
+        return {"path": self.path, "distance": self.distance, "dhash_distance": self.dhash_distance}
+
+
+class PerceptualIndex:
+    """
+    Persistent pHash/dHash index over decks/*/resources/assets.
+
+    Stored at decks/.media-index/phash.json. refresh() re-hashes only files
+    whose size or mtime changed, in one vectorized batch, and the BK-tree
+    answers lookups without scanning every entry. Safe to share between
+    threads of one process.
+    """
+
+    def __init__(self, decks_root: Path | str):
+        self.decks_root = Path(decks_root)
+        self.index_path = self.decks_root / INDEX_DIR / INDEX_FILE
+        self._lock = threading.Lock()
+        self.entries = self._load()
+        self._tree = self._build_tree()
+
+    @classmethod
+    def for_deck(cls, deck_path: Path | str) -> "PerceptualIndex":
+        return cls(Path(deck_path).resolve().parent)
+
+    def asset_paths(self) -> list[Path]:
+        return sorted(
+            p for p in self.decks_root.glob("*/resources/assets/*")
+            if p.is_file() and p.suffix.lower() in IMAGE_SUFFIXES
+        )
+
+    def refresh(self) -> tuple[int, int]:
+        """Bring the index up to date with the decks; returns (hashed, removed)."""
+        paths = self.asset_paths()
+        stale = []
+        with self._lock:
+            current = {self._key(p): p for p in paths}
+            removed = [key for key in self.entries if key not in current]
+            for key in removed:
+                del self.entries[key]
+            for key, path in current.items():
+                stat = path.stat()
+                entry = self.entries.get(key)
+                if not entry or entry["size"] != stat.st_size or entry["mtime_ns"] != stat.st_mtime_ns:
+                    stale.append((key, path, stat))
+
+        pixels = []
+        for key, path, stat in stale:
+            try:
+                pixels.append((key, stat, _pixels(path)))
+            except OSError:
+                continue  # Unreadable or not actually an image
+
+        hashes = hash_pixels([p for _, _, p in pixels]) if pixels else []
+        with self._lock:
+            for (key, stat, _), (dhash, phash) in zip(pixels, hashes):
+                self.entries[key] = {
+                    "size": stat.st_size,
+                    "mtime_ns": stat.st_mtime_ns,
+                    "dhash": f"{dhash:016x}",
+                    "phash": f"{phash:016x}",
+                }
+            self._tree = self._build_tree()
+        if pixels or removed:
+            self.save()
+        return len(pixels), len(removed)
+
+    def add(self, path: Path | str) -> None:
+        """Index (or re-index) one asset after it is written."""
+        path = Path(path)
+        dhash, phash = image_hashes(path)
+        stat = path.stat()
+        key = self._key(path)
+        with self._lock:
+            replaced = key in self.entries
+            self.entries[key] = {
+                "size": stat.st_size,
+                "mtime_ns": stat.st_mtime_ns,
+                "dhash": f"{dhash:016x}",
+                "phash": f"{phash:016x}",
+            }
+            if replaced:
+                self._tree = self._build_tree()
+            else:
+                self._tree.add(phash, key)
+        self.save()
+
+    def lookup(
+        self,
+        source: Path | str | bytes,
+        threshold: int = DEFAULT_THRESHOLD,
+        exclude: Optional[Path | str] = None,
+    ) -> list[DuplicateMatch]:
+        """Indexed assets within threshold of an image file or bytes, nearest first."""
+        dhash, phash = image_hashes(source)
+        return self.lookup_hashes(dhash, phash, threshold, exclude)
+
+    def lookup_hashes(
+        self,
+        dhash: int,
+        phash: int,
+        threshold: int = DEFAULT_THRESHOLD,
+        exclude: Optional[Path | str] = None,
+    ) -> list[DuplicateMatch]:
+        excluded = self._key(Path(exclude)) if exclude else None
+        with self._lock:
+            matches = []
+            for key, distance in self._tree.search(phash, threshold):
+                entry = self.entries.get(key)
+                if key == excluded or entry is None:
+                    continue
+                matches.append(DuplicateMatch(
+                    path=key,
+                    distance=distance,
+                    dhash_distance=hamming(dhash, int(entry["dhash"], 16)),
+                ))
+        return matches
+
+    def clusters(self, threshold: int = DEFAULT_THRESHOLD) -> list[list[DuplicateMatch]]:
+        """Groups of indexed assets that are near-duplicates of each other."""
+        seen: set[str] = set()
+        groups = []
+        for key in sorted(self.entries):
+            if key in seen:
+                continue
+            entry = self.entries[key]
+            matches = self.lookup_hashes(int(entry["dhash"], 16), int(entry["phash"], 16), threshold)
+            group = [m for m in matches if m.path not in seen]
+            if len(group) > 1:
+                groups.append(group)
+                seen.update(m.path for m in group)
+        return groups
+
+    def save(self) -> None:
+        with self._lock:
+            payload = json.dumps({"version": INDEX_VERSION, "entries": self.entries}, indent=1, sort_keys=True)
+        self.index_path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.index_path.with_name(f".{INDEX_FILE}.{os.getpid()}.{threading.get_ident()}.tmp")
+        tmp_path.write_text(payload)
+        os.replace(tmp_path, self.index_path)
+
+    def _load(self) -> dict:
+        if self.index_path.exists():
+            data = json.loads(self.index_path.read_text())
+            if data.get("version") == INDEX_VERSION:
+                return data["entries"]
+        return {}
+
+    def _build_tree(self) -> BKTree:
+        tree = BKTree()
+        for key, entry in self.entries.items():
+            tree.add(int(entry["phash"], 16), key)
+        return tree
+
+    def _key(self, path: Path) -> str:
+        try:
+            return path.resolve().relative_to(self.decks_root.resolve()).as_posix()
+        except ValueError:
+            return str(path)
+
+
+def main(argv: Optional[list[str]] = None) -> int:
+    parser = argparse.ArgumentParser(
+        prog="python3 -m lib.media dupes",
+        description="Find near-duplicate images across decks with perceptual hashes",
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog=f"""
+The index lives in <decks>/{INDEX_DIR}/{INDEX_FILE} and is refreshed
+incrementally on every run. Without images, lists duplicate clusters.
+
+Examples:
+  python3 -m lib.media dupes
+  python3 -m lib.media dupes ~/Downloads/candidate.jpg --threshold 6
+        """
+    )
+    parser.add_argument("images", nargs="*", type=Path, help="Images to check against the index")
+    parser.add_argument("--decks", type=Path, help="Decks root (default: the repo's decks/, or $KEYNOTE_DECKS_ROOT)")
+    parser.add_argument("--threshold", type=int, default=DEFAULT_THRESHOLD,
+                        help=f"Max pHash Hamming distance (default: {DEFAULT_THRESHOLD})")
+    args = parser.parse_args(argv)
+
+    if args.decks is None:
+        from .local_library import default_decks_root
+        args.decks = default_decks_root()
+    if not args.decks.is_dir():
+        print(f"Error: Decks root not found: {args.decks}")
+        return 1
+
+    start = time.perf_counter()
+    try:
+        index = PerceptualIndex(args.decks)
+        hashed, removed = index.refresh()
+    except ImportError as e:
+        print(f"Error: {e}")
+        return 1
+    elapsed_ms = (time.perf_counter() - start) * 1000
+    print(f"Indexed {len(index.entries)} asset(s) ({hashed} hashed, {removed} removed, {elapsed_ms:.0f}ms)")
+
+    if args.images:
+        for image in args.images:
+            matches = index.lookup(image, args.threshold, exclude=image)
+            print(f"\n{image}: {len(matches)} match(es)")
+            for match in matches:
+                print(f"  {match.distance:2}  {match.path}")
+        return 0
+
+    groups = index.clusters(args.threshold)
+    for group in groups:
+        print()
+        for match in group:
+            print(f"  {match.distance:2}  {match.path}")
+    print(f"\n{len(groups)} duplicate cluster(s)")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,442 @@
+# ABOUTME: Dependency-aware scheduler for a deck's declarative media job graph.
+# ABOUTME: Runs search/download/generate/edit/video nodes concurrently with per-provider limits.
+
+from __future__ import annotations
+
+import argparse
+import json
+import sys
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from dataclasses import dataclass, field
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Optional
+
+# resources/materials/media-jobs.json:
+# {
+#   "limits": {"gemini": 2, "veo": 2, "search": 4, "download": 4},
+#   "slides": {
+#     "3": [
+#       {"id": "s3-photo", "op": "download", "url": "https://images.unsplash.com/...",
+#        "output": "resources/assets/s3-base.jpg", "source": "unsplash", "photographer": "Jane Doe"},
+#       {"id": "s3-brand", "op": "edit", "input": "@s3-photo", "prompt": "Apply brand overlay",
+#        "output": "resources/assets/s3.png"},
+#       {"id": "s3-motion", "op": "video", "image": "@s3-brand", "prompt": "Slow push in",
+#        "output": "resources/assets/s3.mp4", "model": "veo3_fast"}
+#     ]
+#   }
+# }
+# A string value "@<id>" depends on that node and is replaced by its output
+# (a deck path, or a SearchResult for a search node with "select").
+# "needs": [...] adds ordering-only dependencies. Paths are relative to the deck.
+# A search node with "top": K keeps the K best pre-ranked results (so "select": 0
+# takes the top-ranked one).
+# "draft": true on a generate/edit node (or `pipeline --draft` for all of them)
+# uses the draft image model; `python3 -m lib.media promote` finalizes keepers.
+JOBS_FILE = "media-jobs.json"
+
+OPS = {
+    # op -> (provider, work-run action)
+    "search": ("search", "SEARCH"),
+    "download": ("download", "SEARCH"),
+    "generate": ("gemini", "GENERATE"),
+    "edit": ("gemini", "HYBRID"),
+    "video": ("veo", "VIDEO"),
+}
+
+DEFAULT_LIMITS = {"gemini": 2, "veo": 2, "search": 4, "download": 4}
+
+
+class PipelineError(Exception):
+    """Invalid job graph."""
+    pass
+
+
+@dataclass
+class JobNode:
+    """One operation in the job graph."""
+    id: str
+    op: str
+    slide: Optional[int]
+    params: dict
+    needs: list[str] = field(default_factory=list)
+    status: str = "pending"  # pending | running | done | failed | skipped
+    output: Any = None
+    error: Optional[str] = None
+    duration_ms: Optional[int] = None
+    results_count: Optional[int] = None
+    work_run: Any = None  # The tools' own record: output_meta, duplicates, palette
+
+    @property
+    def provider(self) -> str:
+        return OPS[self.op][0]
+
+
+def load_graph(jobs: dict) -> dict[str, JobNode]:
+    """Build and validate nodes from a jobs document."""
+    nodes: dict[str, JobNode] = {}
+    for slide_key, entries in jobs.get("slides", {}).items():
+        slide = int(slide_key) if str(slide_key).isdigit() else None
+        for entry in entries:
+            entry = dict(entry)
+            node_id = entry.pop("id", None)
+            op = entry.pop("op", None)
+            if not node_id:
+                raise PipelineError(f"Slide {slide_key}: node without id")
+            if node_id in nodes:
+                raise PipelineError(f"Duplicate node id: {node_id}")
+            if op not in OPS:
+                raise PipelineError(f"{node_id}: unknown op {op!r} (expected one of {', '.join(OPS)})")
+            needs = list(entry.pop("needs", []))
+            needs += [v[1:] for v in entry.values() if isinstance(v, str) and v.startswith("@")]
+            nodes[node_id] = JobNode(id=node_id, op=op, slide=slide, params=entry, needs=list(dict.fromkeys(needs)))
+
+    for node in nodes.values():
+        for dep in node.needs:
+            if dep not in nodes:
+                raise PipelineError(f"{node.id}: depends on unknown node {dep!r}")
+            if nodes[dep].op == "search" and "select" not in nodes[dep].params and _references(node, dep):
+                raise PipelineError(f"{node.id}: search node {dep!r} needs \"select\" to feed another node")
+    _check_acyclic(nodes)
+    return nodes
+
+
+def _references(node: JobNode, dep: str) -> bool:
+    return any(v == f"@{dep}" for v in node.params.values())
+
+
+def _check_acyclic(nodes: dict[str, JobNode]) -> None:
+    state: dict[str, int] = {}  # 1 = visiting, 2 = done
+
+    def visit(node_id: str, trail: list[str]) -> None:
+        if state.get(node_id) == 2:
+            return
+        if state.get(node_id) == 1:
+            raise PipelineError(f"Dependency cycle: {' -> '.join(trail + [node_id])}")
+        state[node_id] = 1
+        for dep in nodes[node_id].needs:
+            visit(dep, trail + [node_id])
+        state[node_id] = 2
+
+    for node_id in nodes:
+        visit(node_id, [])
+
+
+class PipelineScheduler:
+    """
+    Executes a job graph: independent branches run concurrently and a node
+    starts as soon as all of its dependencies are done. Each provider has its
+    own concurrency limit. Every node is logged as a work run.
+    """
+
+    def __init__(
+        self,
+        deck_path: Path | str,
+        nodes: dict[str, JobNode],
+        limits: Optional[dict[str, int]] = None,
+        tools=None,
+        veo_client=None,
+        draft: bool = False,
+    ):
+        from .model_mediated import ImageAcquisitionTools, get_tools_for_deck
+
+        # Absolute, so "@id" outputs passed on as inputs are not re-joined to the deck
+        self.deck_path = Path(deck_path).resolve()
+        self.nodes = nodes
+        self.limits = {**DEFAULT_LIMITS, **(limits or {})}
+        self._semaphores = {p: threading.Semaphore(max(1, n)) for p, n in self.limits.items()}
+        self._veo_client = veo_client
+        self.draft = draft
+
+        # Node records are written through the deck's tools; execution uses a
+        # twin that hands its records back to the running node instead of
+        # writing them, so each node produces exactly one record.
+        self.log_tools = tools or get_tools_for_deck(self.deck_path)
+        self._captured = threading.local()
+        self.exec_tools = ImageAcquisitionTools(
+            work_runs_dir=None,
+            credits_file=self.log_tools.credits_file,
+            generator=self.log_tools._generator,
+            searcher=self.log_tools._searcher,
+            phash_index=self.log_tools.phash_index,
+            store=self.log_tools.store,
+            palette=self.log_tools.palette,
+            on_work_run=self._capture,
+        )
+        self._client_lock = threading.Lock()
+
+    @property
+    def veo_client(self):
+        with self._client_lock:
+            if self._veo_client is None:
+                from .veo import VeoClient
+                self._veo_client = VeoClient()
+            return self._veo_client
+
+    def run(self, on_update=None) -> dict[str, JobNode]:
+        """Run every node; failed nodes mark their dependents as skipped."""
+        pending = dict(self.nodes)
+        running: dict[Future, JobNode] = {}
+
+        with ThreadPoolExecutor(max_workers=max(1, sum(self.limits.values()))) as pool:
+            while pending or running:
+                for node in list(pending.values()):
+                    deps = [self.nodes[d] for d in node.needs]
+                    if any(d.status in ("failed", "skipped") for d in deps):
+                        node.status = "skipped"
+                        node.error = "dependency did not complete: " + ", ".join(
+                            d.id for d in deps if d.status in ("failed", "skipped"))
+                        del pending[node.id]
+                        self._log_node(node)
+                        if on_update:
+                            on_update(node)
+                    elif all(d.status == "done" for d in deps):
+                        del pending[node.id]
+                        running[pool.submit(self._execute, node)] = node
+
+                if not running:
+                    continue
+                finished, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in finished:
+                    node = running.pop(future)
+                    if on_update:
+                        on_update(node)
+
+        return self.nodes
+
+    def _execute(self, node: JobNode) -> None:
+        with self._semaphores.setdefault(node.provider, threading.Semaphore(1)):
+            node.status = "running"
+            self._captured.record = None
+            start = time.perf_counter()
+            try:
+                node.output = getattr(self, f"_run_{node.op}")(node, self._resolve(node.params))
+                node.status = "done"
+            except Exception as e:
+                node.status = "failed"
+                node.error = str(e)
+            node.duration_ms = int((time.perf_counter() - start) * 1000)
+            node.work_run = self._captured.record
+        self._log_node(node)
+
+    def _capture(self, record) -> None:
+        # Nodes run one per pool thread, so the thread identifies the node
+        self._captured.record = record
+
+    def _resolve(self, params: dict) -> dict:
+        resolved = {}
+        for key, value in params.items():
+            if isinstance(value, str) and value.startswith("@"):
+                value = self.nodes[value[1:]].output
+            resolved[key] = value
+        return resolved
+
+    def _path(self, value) -> Path:
+        path = Path(value)
+        return path if path.is_absolute() else self.deck_path / path
+
+    # Operations
+
+    def _run_search(self, node: JobNode, p: dict):
+        results = self.exec_tools.search(
+            query=p["query"],
+            sources=p.get("sources"),
+            per_page=p.get("count", 10),
+            orientation=p.get("orientation", "landscape"),
+            rank=p.get("top"),
+            frame=p.get("frame"),
+        )
+        # Results are written for model review whether or not one is pre-selected
+        results_path = self.deck_path / "resources" / "materials" / "search-results" / f"{node.id}.json"
+        results_path.parent.mkdir(parents=True, exist_ok=True)
+        results_path.write_text(json.dumps([r.to_dict() for r in results], indent=2))
+        node.results_count = len(results)
+
+        if "select" in p:
+            index = int(p["select"])
+            if index >= len(results):
+                raise IndexError(f"select={index} but search returned {len(results)} results")
+            return results[index]
+        return str(results_path)
+
+    def _run_download(self, node: JobNode, p: dict) -> str:
+        output = self._path(p["output"])
+        result = p.get("result")
+        if result is not None and not isinstance(result, (str, Path)):
+            path = self.exec_tools.download_selected(
+                result, output, slide_number=node.slide,
+                reasoning=p.get("reasoning", ""), search_query=p.get("query", ""),
+            )
+        else:
+            path = self.exec_tools.download_url(
+                url=p.get("url") or str(result),
+                output_path=output,
+                source=p.get("source", "unknown"),
+                photographer=p.get("photographer", "Unknown"),
+                photo_url=p.get("photo_url"),
+                slide_number=node.slide,
+                reasoning=p.get("reasoning", ""),
+            )
+        return str(path)
+
+    def _run_generate(self, node: JobNode, p: dict) -> str:
+        output = self._path(p["output"])
+        self.exec_tools.generate(
+            prompt=p["prompt"],
+            output_path=output,
+            brand_context=p.get("brand", ""),
+            slide_number=node.slide,
+            reasoning=p.get("reasoning", ""),
+            temperature=float(p.get("temperature", 1.0)),
+            draft=self._is_draft(p),
+        )
+        return str(output)
+
+    def _run_edit(self, node: JobNode, p: dict) -> str:
+        output = self._path(p["output"])
+        self.exec_tools.edit_image(
+            prompt=p["prompt"],
+            input_path=self._path(p["input"]),
+            output_path=output,
+            brand_context=p.get("brand", ""),
+            slide_number=node.slide,
+            reasoning=p.get("reasoning", ""),
+            temperature=float(p.get("temperature", 0.2)),
+            draft=self._is_draft(p),
+        )
+        return str(output)
+
+    def _is_draft(self, p: dict) -> bool:
+        return bool(p.get("draft", self.draft))
+
+    def _draft_record(self, node: JobNode, p: dict) -> Optional[dict]:
+        """Draft info for a finished generate/edit node, matching ImageAcquisitionTools records."""
+        if node.op not in ("generate", "edit") or node.status != "done" or not self._is_draft(p):
+            return None
+        info = {
+            "model": self.exec_tools.generator.model_for(draft=True),
+            "temperature": float(p.get("temperature", 1.0 if node.op == "generate" else 0.2)),
+            "palette_threshold": None,
+        }
+        if node.op == "edit":
+            info["inputs"] = [str(self._path(self._resolve(node.params)["input"]))]
+        return info
+
+    def _run_video(self, node: JobNode, p: dict) -> str:
+        from .veo_queue import VeoJobQueue
+
+        # Through the deck's Veo queue so a crashed run resumes instead of repaying
+        job = VeoJobQueue.for_deck(self.deck_path).run(
+            self.veo_client,
+            p["prompt"],
+            self._path(p["output"]),
+            model=p.get("model", "veo3"),
+            aspect_ratio=p.get("aspect_ratio", "16:9"),
+            image_path=self._path(p["image"]) if p.get("image") else None,
+            timeout=int(p.get("timeout", 600)),
+        )
+        return job.output_path
+
+    # Logging
+
+    def _log_node(self, node: JobNode) -> None:
+        from .model_mediated import WorkRunRecord
+
+        p = node.params
+        output = node.output
+        tool_record = node.work_run
+        selected = None
+        if output is not None and not isinstance(output, str):
+            selected = {"id": output.id, "source": output.source,
+                        "description": output.description, "photographer": output.photographer}
+            output = None
+
+        self.log_tools._log_work_run(WorkRunRecord(
+            timestamp=datetime.now().isoformat(),
+            slide=node.slide,
+            action=OPS[node.op][1],
+            prompt=p.get("prompt") or (f"Search: {p['query']}" if p.get("query") else f"Download: {p.get('url', '')}"),
+            brand_context=p.get("brand", ""),
+            reasoning=p.get("reasoning", ""),
+            search_query=p.get("query"),
+            search_results_count=node.results_count,
+            selected_result=selected,
+            output_path=output,
+            node={
+                "id": node.id,
+                "op": node.op,
+                "provider": node.provider,
+                "needs": node.needs,
+                "status": node.status,
+                "error": node.error,
+                "duration_ms": node.duration_ms,
+            },
+            output_meta=tool_record.output_meta if tool_record else None,
+            duplicates=tool_record.duplicates if tool_record else None,
+            palette=tool_record.palette if tool_record else None,
+            draft=self._draft_record(node, p),
+        ))
+
+
+def run_deck_jobs(deck_path: Path | str, jobs_file: Optional[Path] = None, on_update=None) -> dict[str, JobNode]:
+    """Load a deck's media-jobs.json and run it."""
+    deck_path = Path(deck_path)
+    jobs_file = jobs_file or deck_path / "resources" / "materials" / JOBS_FILE
+    jobs = json.loads(Path(jobs_file).read_text())
+    scheduler = PipelineScheduler(deck_path, load_graph(jobs), limits=jobs.get("limits"))
+    return scheduler.run(on_update=on_update)
+
+
+def main(argv: Optional[list[str]] = None) -> int:
+    parser = argparse.ArgumentParser(
+        prog="python3 -m lib.media pipeline",
+        description="Run a deck's media job graph (search -> download -> edit -> video)",
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog=f"""
+Reads resources/materials/{JOBS_FILE} unless --jobs is given.
+
+Examples:
+  python3 -m lib.media pipeline decks/my-pitch
+  python3 -m lib.media pipeline decks/my-pitch --dry-run
+        """
+    )
+    parser.add_argument("deck", type=Path, help="Deck directory")
+    parser.add_argument("--jobs", type=Path, help="Job graph file")
+    parser.add_argument("--dry-run", action="store_true", help="Validate and print the graph")
+    parser.add_argument("--draft", action="store_true", help="Generate/edit nodes use the draft image model")
+    args = parser.parse_args(argv)
+
+    jobs_file = args.jobs or args.deck / "resources" / "materials" / JOBS_FILE
+    try:
+        jobs = json.loads(jobs_file.read_text())
+        nodes = load_graph(jobs)
+    except (OSError, ValueError, PipelineError) as e:
+        print(f"Error: {e}")
+        return 1
+
+    if args.dry_run:
+        for node in nodes.values():
+            needs = f" <- {', '.join(node.needs)}" if node.needs else ""
+            print(f"  [{node.provider}] {node.id} ({node.op}, slide {node.slide}){needs}")
+        print(f"{len(nodes)} nodes, limits {dict(DEFAULT_LIMITS, **jobs.get('limits', {}))}")
+        return 0
+
+    def report(node: JobNode) -> None:
+        detail = f" - {node.error}" if node.error else ""
+        timing = f" ({node.duration_ms}ms)" if node.duration_ms is not None else ""
+        print(f"  {node.status:8} {node.id}{timing}{detail}", flush=True)
+
+    scheduler = PipelineScheduler(args.deck, nodes, limits=jobs.get("limits"), draft=args.draft)
+    scheduler.run(on_update=report)
+
+    counts: dict[str, int] = {}
+    for node in nodes.values():
+        counts[node.status] = counts.get(node.status, 0) + 1
+    print("Pipeline complete: " + ", ".join(f"{n} {s}" for s, n in sorted(counts.items())))
+    return 0 if counts.get("done", 0) == len(nodes) else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
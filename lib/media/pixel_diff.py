@@ -0,0 +1,131 @@
+# ABOUTME: Vectorized pixel diff between two runs' slide screenshots.
+# ABOUTME: Reports which slides visually changed, by how much, and where (bounding box).
+
+from __future__ import annotations
+
+import argparse
+import json
+import sys
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Optional
+
+# Per-channel difference (0-255) below which a pixel counts as unchanged;
+# absorbs antialiasing and JPEG-in-PNG noise between otherwise identical renders
+DEFAULT_TOLERANCE = 16
+# Share of pixels that must change for the slide to count as changed
+DEFAULT_MIN_RATIO = 0.0005
+
+
+def _require_deps():
+    try:
+        import numpy as np
+        from PIL import Image
+    except ImportError as e:
+        raise ImportError("Pixel diffs need NumPy and Pillow: pip install numpy Pillow") from e
+    return np, Image
+
+
+@dataclass
+class PixelDiff:
+    id: str
+    changed: bool
+    changed_ratio: float
+    # [left, top, right, bottom] of the changed region, exclusive; None when unchanged
+    bbox: Optional[list[int]] = None
+    error: Optional[str] = None
+
+
+def _rgb(path: Path | str):
+    np, Image = _require_deps()
+    with Image.open(path) as img:
+        return np.asarray(img.convert("RGB"), dtype=np.int16)
+
+
+def diff_images(
+    before: Path | str,
+    after: Path | str,
+    tolerance: int = DEFAULT_TOLERANCE,
+    min_ratio: float = DEFAULT_MIN_RATIO,
+    id: str = "",
+) -> PixelDiff:
+    """Compare two screenshots; a size change counts as a full change."""
+    np, _ = _require_deps()
+    a, b = _rgb(before), _rgb(after)
+    if a.shape != b.shape:
+        height, width = b.shape[:2]
+        return PixelDiff(id, True, 1.0, [0, 0, width, height])
+
+    mask = (np.abs(a - b) > tolerance).any(axis=2)
+    ratio = float(mask.mean())
+    if not mask.any():
+        return PixelDiff(id, False, 0.0)
+
+    rows = np.flatnonzero(mask.any(axis=1))
+    cols = np.flatnonzero(mask.any(axis=0))
+    bbox = [int(cols[0]), int(rows[0]), int(cols[-1]) + 1, int(rows[-1]) + 1]
+    return PixelDiff(id, ratio >= min_ratio, round(ratio, 6), bbox)
+
+
+def diff_pairs(
+    pairs: list[dict],
+    tolerance: int = DEFAULT_TOLERANCE,
+    min_ratio: float = DEFAULT_MIN_RATIO,
+) -> list[PixelDiff]:
+    """Diff each {"id", "before", "after"} pair; unreadable images count as changed."""
+    results = []
+    for pair in pairs:
+        pair_id = str(pair.get("id", ""))
+        try:
+            results.append(diff_images(pair["before"], pair["after"], tolerance, min_ratio, pair_id))
+        except (OSError, KeyError, ValueError) as e:
+            results.append(PixelDiff(pair_id, True, 1.0, error=str(e)))
+    return results
+
+
+def main(argv: Optional[list[str]] = None) -> int:
+    parser = argparse.ArgumentParser(
+        prog="python3 -m lib.media diff",
+        description="Report which slide screenshots visually changed between two runs.",
+        epilog=(
+            "examples:\n"
+            "  python3 -m lib.media diff before.png after.png\n"
+            '  echo \'[{"id": "3", "before": "a.png", "after": "b.png"}]\' | python3 -m lib.media diff --pairs -'
+        ),
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+    )
+    parser.add_argument("images", nargs="*", type=Path, help="BEFORE AFTER screenshot pair")
+    parser.add_argument("--pairs", help='JSON list of {"id", "before", "after"} (file path, or - for stdin)')
+    parser.add_argument("--tolerance", type=int, default=DEFAULT_TOLERANCE,
+                        help=f"Per-channel difference ignored as noise (default: {DEFAULT_TOLERANCE})")
+    parser.add_argument("--min-ratio", type=float, default=DEFAULT_MIN_RATIO,
+                        help=f"Changed-pixel share that counts as a change (default: {DEFAULT_MIN_RATIO})")
+    parser.add_argument("--json", action="store_true", help="Print results as JSON")
+    args = parser.parse_args(argv)
+
+    if args.pairs:
+        text = sys.stdin.read() if args.pairs == "-" else Path(args.pairs).read_text()
+        pairs = json.loads(text)
+    elif len(args.images) == 2:
+        pairs = [{"id": args.images[1].name, "before": str(args.images[0]), "after": str(args.images[1])}]
+    else:
+        parser.error("give a BEFORE AFTER pair or --pairs")
+
+    try:
+        results = diff_pairs(pairs, args.tolerance, args.min_ratio)
+    except ImportError as e:
+        print(f"Error: {e}", file=sys.stderr)
+        return 1
+
+    if args.json:
+        print(json.dumps([asdict(r) for r in results]))
+    else:
+        for r in results:
+            status = "error" if r.error else ("changed" if r.changed else "unchanged")
+            detail = f" {r.changed_ratio:.2%} in {r.bbox}" if r.changed and r.bbox else ""
+            print(f"{r.id}: {status}{detail}{f' ({r.error})' if r.error else ''}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
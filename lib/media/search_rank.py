@@ -0,0 +1,142 @@
+# ABOUTME: Deterministic pre-ranker for image search results before the model reviews them.
+# ABOUTME: Scores frame fit, resolution headroom, license, query overlap, and source diversity.
+
+from __future__ import annotations
+
+from typing import Optional
+
+from .image_search import SearchResult
+from .local_library import tokenize
+
+# Slide frame the image has to fill; 1920 wide is the deck's export resolution
+DEFAULT_FRAME = "16:9"
+DEFAULT_TARGET_WIDTH = 1920
+ORIENTATION_FRAMES = {"landscape": "16:9", "portrait": "9:16", "square": "1:1"}
+
+WEIGHTS = {
+    "aspect": 0.25,
+    "resolution": 0.25,
+    "license": 0.15,
+    "relevance": 0.25,
+    "diversity": 0.10,
+}
+
+# First matching substring (case-insensitive) wins; anything needing verification ranks low
+LICENSE_SCORES = [
+    ("verify", 0.4),
+    ("generated", 1.0),
+    ("unsplash license", 1.0),
+    ("pexels license", 1.0),
+    ("creative commons", 0.6),
+]
+UNKNOWN_LICENSE_SCORE = 0.4
+# Score for candidates whose dimensions are unknown (probe failed)
+UNKNOWN_SIZE_SCORE = 0.5
+
+
+def parse_frame(frame: str) -> float:
+    """Width/height ratio from "16:9" or "1.78"."""
+    if ":" in frame:
+        width, height = frame.split(":", 1)
+        return float(width) / float(height)
+    return float(frame)
+
+
+def license_score(license_text: str) -> float:
+    text = license_text.lower()
+    for needle, score in LICENSE_SCORES:
+        if needle in text:
+            return score
+    return UNKNOWN_LICENSE_SCORE
+
+
+def base_scores(
+    results: list[SearchResult],
+    query: str,
+    frame: str = DEFAULT_FRAME,
+    target_width: int = DEFAULT_TARGET_WIDTH,
+) -> list[dict[str, float]]:
+    """
+    Per-candidate component scores (0-1), computed column by column.
+
+    aspect: share of the image kept when cropped to cover the frame
+    resolution: usable (post-crop) width relative to target_width, capped at 1
+    license: LICENSE_SCORES preference
+    relevance: share of query terms found in the description
+    """
+    target = parse_frame(frame)
+    query_terms = set(tokenize(query))
+
+    widths = [r.width for r in results]
+    heights = [r.height for r in results]
+    known = [w > 0 and h > 0 for w, h in zip(widths, heights)]
+    ratios = [w / h if ok else target for w, h, ok in zip(widths, heights, known)]
+
+    aspect = [min(r, target) / max(r, target) if ok else UNKNOWN_SIZE_SCORE for r, ok in zip(ratios, known)]
+    usable = [min(w, h * target) for w, h in zip(widths, heights)]
+    resolution = [min(1.0, u / target_width) if ok else UNKNOWN_SIZE_SCORE for u, ok in zip(usable, known)]
+    licenses = [license_score(r.license) for r in results]
+    relevance = [
+        len(query_terms & set(tokenize(r.description))) / len(query_terms) if query_terms else 0.0
+        for r in results
+    ]
+
+    return [
+        {"aspect": a, "resolution": s, "license": lic, "relevance": rel}
+        for a, s, lic, rel in zip(aspect, resolution, licenses, relevance)
+    ]
+
+
+def rank_results(
+    results: list[SearchResult],
+    query: str,
+    top_k: Optional[int] = None,
+    frame: str = DEFAULT_FRAME,
+    target_width: int = DEFAULT_TARGET_WIDTH,
+) -> list[SearchResult]:
+    """
+    Top-k results, best first, with rank_score and rank_breakdown filled in.
+
+    Selection is greedy: each pick adds a diversity term of 1 / (1 + picks
+    already taken from that source), so a strong source cannot fill the
+    whole review set. Ties keep the sources' original order.
+    """
+    top_k = len(results) if top_k is None else min(top_k, len(results))
+    scores = base_scores(results, query, frame, target_width)
+    static = [sum(WEIGHTS[name] * value for name, value in s.items()) for s in scores]
+
+    remaining = list(range(len(results)))
+    per_source: dict[str, int] = {}
+    ranked = []
+
+    def total(i: int) -> float:
+        return static[i] + WEIGHTS["diversity"] / (1 + per_source.get(results[i].source, 0))
+
+    while remaining and len(ranked) < top_k:
+        best = max(remaining, key=lambda i: (total(i), -i))
+        remaining.remove(best)
+
+        result = results[best]
+        breakdown = {name: round(value, 3) for name, value in scores[best].items()}
+        breakdown["diversity"] = round(1 / (1 + per_source.get(result.source, 0)), 3)
+        result.rank_score = round(total(best), 4)
+        result.rank_breakdown = breakdown
+        per_source[result.source] = per_source.get(result.source, 0) + 1
+        ranked.append(result)
+    return ranked
+
+
+def frame_for(orientation: Optional[str]) -> str:
+    return ORIENTATION_FRAMES.get(orientation or "", DEFAULT_FRAME)
+
+
+def _format_breakdown(breakdown: dict[str, float]) -> str:
+    return " ".join(f"{name}={value:.2f}" for name, value in breakdown.items())
+
+
+def describe(result: SearchResult) -> str:
+    """One-line score summary for CLI output."""
+    if result.rank_score is None:
+        return ""
+    return f"{result.rank_score:.3f} ({_format_breakdown(result.rank_breakdown or {})})"
+
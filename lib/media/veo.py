@@ -3,15 +3,21 @@
 
 from __future__ import annotations
 
+import argparse
 import base64
 import json
 import os
 import time
 import urllib.request
 import urllib.error
+from concurrent.futures import TimeoutError as FutureTimeoutError
 from dataclasses import dataclass
 from pathlib import Path
-from typing import Optional, Literal
+from typing import TYPE_CHECKING, Optional, Literal
+
+if TYPE_CHECKING:
+    from .asset_store import AssetStore
+    from .veo_callbacks import CallbackReceiver
 
 
 def _load_api_key() -> str:
@@ -34,16 +40,19 @@ class VideoResult:
     video_urls: list[str]
     error: Optional[str]
 
-    def download(self, path: Path | str) -> Path:
-        """Download video to file."""
+    def download(self, path: Path | str, store: Optional[AssetStore] = None) -> Path:
+        """Download video to file (streamed into the shared asset store when one is given)."""
         if not self.video_url:
             raise ValueError("No video URL available")
 
+        from .asset_store import replace_stream
+
         path = Path(path)
         req = urllib.request.Request(self.video_url)
         with urllib.request.urlopen(req, timeout=120) as response:
-            path.write_bytes(response.read())
-        return path
+            if store:
+                return store.write_stream(response, path)
+            return replace_stream(response, path)
 
 
 class VeoError(Exception):
@@ -52,13 +61,26 @@ class VeoError(Exception):
 
 
 class VeoClient:
-    """Client for Veo video generation via Kie.ai."""
+    """
+    Client for Veo video generation via Kie.ai.
 
-    BASE_URL = "https://api.kie.ai/api/v1"
+    Pass a started CallbackReceiver to learn about completion from Kie.ai's
+    callback instead of polling record-info; polling continues at the
+    receiver's fallback_interval (default: the wait's poll_interval) in case
+    a callback never arrives.
+    """
+
+    # Overridable so detached `resume` processes can reach a proxy or stand-in
+    BASE_URL = os.environ.get("KIE_API_BASE_URL", "https://api.kie.ai/api/v1")
     UPLOAD_URL = "https://kieai.redpandaai.co/api/file-base64-upload"
 
-    def __init__(self, api_key: Optional[str] = None):
+    def __init__(
+        self,
+        api_key: Optional[str] = None,
+        callback_receiver: Optional["CallbackReceiver"] = None,
+    ):
         self.api_key = api_key or _load_api_key()
+        self.callback_receiver = callback_receiver
 
     def generate_video(
         self,
@@ -170,9 +192,30 @@ class VeoClient:
 
         return self._parse_status(task_id, result)
 
+    def next_status(self, task_id: str, poll_interval: int, first: bool = False) -> VideoResult:
+        """
+        Wait for the task's next status update.
+
+        With a callback receiver this returns as soon as the callback lands,
+        or polls once after its fallback_interval (default poll_interval).
+        Without one it sleeps poll_interval (except on the first call) and polls.
+        """
+        if self.callback_receiver:
+            future = self.callback_receiver.future_for(task_id)
+            try:
+                return future.result(timeout=self.callback_receiver.fallback_interval or poll_interval)
+            except FutureTimeoutError:
+                return self.get_status(task_id)
+
+        if not first:
+            time.sleep(poll_interval)
+        return self.get_status(task_id)
+
     def _submit_task(self, payload: dict) -> str:
         """Submit generation task and return task ID."""
         url = f"{self.BASE_URL}/veo/generate"
+        if self.callback_receiver:
+            payload = {**payload, "callBackUrl": self.callback_receiver.callback_url}
         headers = {
             "Content-Type": "application/json",
             "Authorization": f"Bearer {self.api_key}",
@@ -244,19 +287,23 @@ class VeoClient:
         timeout: int,
         poll_interval: int,
     ) -> VideoResult:
-        """Poll until task completes or times out."""
+        """Wait (callback or poll) until task completes or times out."""
         start = time.time()
+        first = True
 
-        while time.time() - start < timeout:
-            result = self.get_status(task_id)
-
-            if result.status in ("completed", "success", "succeeded"):
-                return result
+        try:
+            while time.time() - start < timeout:
+                result = self.next_status(task_id, poll_interval, first=first)
+                first = False
 
-            if result.status in ("failed", "error"):
-                raise VeoError(f"Task failed: {result.error}")
+                if result.status in ("completed", "success", "succeeded"):
+                    return result
 
-            time.sleep(poll_interval)
+                if result.status in ("failed", "error"):
+                    raise VeoError(f"Task failed: {result.error}")
+        finally:
+            if self.callback_receiver:
+                self.callback_receiver.discard(task_id)
 
         raise VeoError(f"Task {task_id} timed out after {timeout}s")
 
@@ -357,19 +404,140 @@ def generate_video_from_image(
     return result
 
 
-if __name__ == "__main__":
-    import sys
+def build_parser() -> argparse.ArgumentParser:
+    """Build the video CLI argument parser."""
+    parser = argparse.ArgumentParser(
+        prog="python3 -m lib.media video",
+        description="Generate slide videos with Veo (via Kie.ai)",
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog="""
+Examples:
+  # Text-to-video
+  python3 -m lib.media video --prompt "Data flowing through nodes, camera tracks left" --output flow.mp4
 
-    if len(sys.argv) < 2:
-        print("Usage: python veo.py <prompt> [output_path]")
-        sys.exit(1)
+  # Image-to-video with the fast model
+  python3 -m lib.media video --prompt-file prompts/hero.txt --image hero.png --output hero.mp4 --model veo3_fast
 
-    prompt = sys.argv[1]
-    output = Path(sys.argv[2]) if len(sys.argv) > 2 else Path("output.mp4")
+  # Persist the task so `python3 -m lib.media resume decks/my-pitch` can recover it
+  python3 -m lib.media video --prompt "..." --output decks/my-pitch/resources/assets/flow.mp4 --deck decks/my-pitch
 
+  # veo3_fast preview now, veo3 final swapped in later by a background `resume`
+  python3 -m lib.media video --prompt "..." --output decks/my-pitch/resources/assets/flow.mp4 \
+      --deck decks/my-pitch --tiered --no-wait-final
+        """
+    )
+    parser.add_argument("--prompt", "-p", help="Inline prompt text")
+    parser.add_argument("--prompt-file", "-f", type=Path, help="Path to file containing prompt")
+    parser.add_argument("--output", "-o", type=Path, required=True, help="Output video path")
+    parser.add_argument("--image", type=Path, help="Reference image for image-to-video")
+    parser.add_argument("--model", choices=["veo3", "veo3_fast"], default="veo3", help="Veo model")
+    parser.add_argument("--aspect-ratio", choices=["16:9", "9:16", "1:1"], default="16:9", help="Aspect ratio")
+    parser.add_argument("--timeout", type=int, default=600, help="Max seconds to wait")
+    parser.add_argument("--deck", type=Path, help="Record the task in the deck's Veo queue (resumable)")
+    parser.add_argument("--tiered", action="store_true",
+                        help="With --deck: download a veo3_fast preview first, then swap in the veo3 final")
+    parser.add_argument("--no-wait-final", action="store_true",
+                        help="With --tiered: exit after the preview; a detached `resume DECK` swaps in the final")
+    parser.add_argument("--callback", action="store_true",
+                        help="Receive completion callbacks locally instead of polling "
+                             "(requires $KIE_CALLBACK_PUBLIC_URL, the receiver's public address)")
+    parser.add_argument("--callback-port", type=int, default=0, help="Port for --callback (default: any free port)")
+    return parser
+
+
+def main(argv: Optional[list[str]] = None) -> int:
+    args = build_parser().parse_args(argv)
+
+    if args.prompt_file:
+        if not args.prompt_file.exists():
+            print(f"Error: Prompt file not found: {args.prompt_file}")
+            return 1
+        prompt = args.prompt_file.read_text()
+    elif args.prompt:
+        prompt = args.prompt
+    else:
+        print("Error: Must provide --prompt or --prompt-file")
+        return 1
+
+    if args.tiered and not args.deck:
+        print("Error: --tiered needs --deck (the final is tracked in the deck's Veo queue)")
+        return 1
+
+    args.output.parent.mkdir(parents=True, exist_ok=True)
     print(f"Generating video for: {prompt[:50]}...")
-    result = generate_video(prompt, output)
-    print(f"Status: {result.status}")
-    if result.video_url:
-        print(f"Video URL: {result.video_url}")
-        print(f"Downloaded to: {output}")
+
+    receiver = None
+    if args.callback:
+        from .veo_callbacks import PUBLIC_URL_ENV, CallbackReceiver
+
+        receiver = CallbackReceiver(port=args.callback_port)
+        if not receiver.reachable:
+            print(f"Error: --callback needs ${PUBLIC_URL_ENV} pointing at a public tunnel to the receiver; "
+                  f"Kie.ai cannot reach {receiver.host}")
+            return 1
+        receiver.start()
+        print(f"Listening for callbacks at {receiver.callback_url}")
+
+    try:
+        client = VeoClient(callback_receiver=receiver)
+        if args.tiered:
+            from .veo_queue import VeoJobQueue
+
+            def report(job, error) -> None:
+                detail = f" - {error}" if error else ""
+                print(f"  {job.tier:7} {job.status:10} {job.model:9} (task {job.task_id}){detail}", flush=True)
+
+            preview, final = VeoJobQueue.for_deck(args.deck).run_tiered(
+                client, prompt, args.output, aspect_ratio=args.aspect_ratio,
+                image_path=args.image, timeout=args.timeout,
+                wait_final=not args.no_wait_final, on_update=report,
+            )
+            if final.status != "downloaded":
+                from .veo_queue import resume_in_background
+
+                print(f"  final   {final.status:10} {final.model:9} (task {final.task_id})")
+                log = resume_in_background(args.deck, timeout=args.timeout)
+                print(f"Final still rendering; a background `resume {args.deck}` swaps it in (log: {log})")
+            print(f"Output: {args.output}")
+            return 0 if "downloaded" in (preview.status, final.status) else 1
+
+        if args.deck:
+            from .veo_queue import VeoJobQueue
+
+            job = VeoJobQueue.for_deck(args.deck).run(
+                client, prompt, args.output, model=args.model,
+                aspect_ratio=args.aspect_ratio, image_path=args.image, timeout=args.timeout,
+            )
+            print(f"Status: {job.status} (task {job.task_id})")
+            print(f"Downloaded to: {job.output_path}")
+            return 0
+
+        if args.image:
+            result = client.generate_video_from_image(
+                prompt, args.image, model=args.model,
+                aspect_ratio=args.aspect_ratio, timeout=args.timeout,
+            )
+        else:
+            result = client.generate_video(
+                prompt, model=args.model,
+                aspect_ratio=args.aspect_ratio, timeout=args.timeout,
+            )
+        print(f"Status: {result.status}")
+        if result.video_url:
+            result.download(args.output)
+            print(f"Video URL: {result.video_url}")
+            print(f"Downloaded to: {args.output}")
+    except (VeoError, ValueError) as e:
+        print(f"Error: {e}")
+        return 1
+    finally:
+        if receiver:
+            receiver.stop()
+
+    return 0
+
+
+if __name__ == "__main__":
+    import sys
+
+    sys.exit(main())
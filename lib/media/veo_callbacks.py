@@ -0,0 +1,149 @@
+# ABOUTME: Local HTTP receiver for Kie.ai Veo completion callbacks.
+# ABOUTME: Resolves per-task futures as callbacks arrive so VeoClient need not poll record-info.
+
+from __future__ import annotations
+
+import json
+import os
+import secrets
+import threading
+import urllib.parse
+from concurrent.futures import Future
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Optional
+
+from .veo import VideoResult
+
+PUBLIC_URL_ENV = "KIE_CALLBACK_PUBLIC_URL"
+CALLBACK_PATH = "/veo-callback"
+
+
+def parse_callback(body: dict) -> VideoResult:
+    """
+    Parse a Kie.ai Veo callback body into a VideoResult.
+
+    Success: {"code": 200, "data": {"taskId": ..., "info": {"resultUrls": [...]}}}
+    Failure: any other code, with the reason in "msg".
+    """
+    data = body.get("data") or {}
+    task_id = data.get("taskId") or body.get("taskId")
+    if not task_id:
+        raise ValueError("Callback without taskId")
+
+    info = data.get("info") or {}
+    video_urls = info.get("resultUrls") or []
+    if isinstance(video_urls, str):
+        video_urls = json.loads(video_urls)
+
+    succeeded = body.get("code") == 200 and bool(video_urls)
+    return VideoResult(
+        task_id=task_id,
+        status="completed" if succeeded else "failed",
+        video_url=video_urls[0] if video_urls else None,
+        video_urls=video_urls,
+        error=None if succeeded else (body.get("msg") or "Callback reported failure"),
+    )
+
+
+class CallbackReceiver:
+    """
+    Small threaded HTTP server that receives Veo completion callbacks.
+
+    Kie.ai must be able to reach callback_url, so pass public_url (or set
+    $KIE_CALLBACK_PUBLIC_URL) when the receiver sits behind a tunnel. A
+    random token in the URL rejects callbacks that were not ours. Polling
+    stays as the fallback in case a callback is lost, every fallback_interval
+    seconds or, by default, at the waiter's own poll interval.
+    """
+
+    def __init__(
+        self,
+        host: str = "127.0.0.1",
+        port: int = 0,
+        public_url: Optional[str] = None,
+        fallback_interval: Optional[float] = None,
+    ):
+        self.host = host
+        self.port = port
+        self.public_url = (public_url or os.environ.get(PUBLIC_URL_ENV) or "").rstrip("/") or None
+        self.fallback_interval = fallback_interval
+        self.token = secrets.token_urlsafe(16)
+        self._futures: dict[str, Future] = {}
+        self._lock = threading.Lock()
+        self._server: Optional[ThreadingHTTPServer] = None
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def reachable(self) -> bool:
+        """Whether Kie.ai can reach callback_url (a loopback address never is)."""
+        return self.public_url is not None
+
+    @property
+    def callback_url(self) -> str:
+        base = self.public_url or f"http://{self.host}:{self.port}"
+        return f"{base}{CALLBACK_PATH}?{urllib.parse.urlencode({'token': self.token})}"
+
+    def start(self) -> "CallbackReceiver":
+        if self._server:
+            return self
+        receiver = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_POST(self):
+                url = urllib.parse.urlparse(self.path)
+                token = urllib.parse.parse_qs(url.query).get("token", [""])[0]
+                if url.path != CALLBACK_PATH or not secrets.compare_digest(token, receiver.token):
+                    self._reply(404, {"ok": False})
+                    return
+                try:
+                    length = int(self.headers.get("Content-Length", 0))
+                    result = parse_callback(json.loads(self.rfile.read(length).decode("utf-8")))
+                except (ValueError, json.JSONDecodeError) as e:
+                    self._reply(400, {"ok": False, "error": str(e)})
+                    return
+                receiver.deliver(result)
+                self._reply(200, {"ok": True})
+
+            def _reply(self, status: int, payload: dict) -> None:
+                body = json.dumps(payload).encode("utf-8")
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                pass  # Keep CLI output clean
+
+        self._server = ThreadingHTTPServer((self.host, self.port), Handler)
+        self.port = self._server.server_address[1]
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        if self._server:
+            self._server.shutdown()
+            self._server.server_close()
+            self._server = None
+
+    def __enter__(self) -> "CallbackReceiver":
+        return self.start()
+
+    def __exit__(self, *exc) -> None:
+        self.stop()
+
+    def future_for(self, task_id: str) -> Future:
+        """Future resolved with the task's VideoResult when its callback arrives."""
+        with self._lock:
+            # A callback can land before the submitter starts waiting
+            return self._futures.setdefault(task_id, Future())
+
+    def deliver(self, result: VideoResult) -> None:
+        future = self.future_for(result.task_id)
+        if not future.done():
+            future.set_result(result)
+
+    def discard(self, task_id: str) -> None:
+        with self._lock:
+            self._futures.pop(task_id, None)
@@ -0,0 +1,442 @@
+# ABOUTME: Persistent SQLite queue of submitted Veo tasks for a deck.
+# ABOUTME: Lets video batches survive restarts: resume re-attaches, polls, and downloads finished videos.
+# ABOUTME: Tiered runs pair a veo3_fast preview with a veo3 final that replaces it when ready.
+
+from __future__ import annotations
+
+import argparse
+import os
+import sqlite3
+import subprocess
+import sys
+import threading
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass
+from datetime import datetime
+from pathlib import Path
+from typing import TYPE_CHECKING, Iterator, Optional
+
+from .veo import VeoClient, VeoError
+
+if TYPE_CHECKING:
+    from .asset_store import AssetStore
+
+QUEUE_FILE = "veo-jobs.sqlite"
+RESUME_LOG = "veo-resume.log"
+
+# submitted -> completed -> downloaded, or failed. Only failed jobs are ever resubmitted.
+# A preview that completes after its final is marked superseded instead of downloaded.
+ACTIVE_STATUSES = ("submitted", "processing", "completed")
+
+# Tiered runs: a fast preview gives the slide motion now, the final replaces it
+PREVIEW_MODEL = "veo3_fast"
+FINAL_MODEL = "veo3"
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS veo_jobs (
+    task_id TEXT PRIMARY KEY,
+    prompt TEXT NOT NULL,
+    output_path TEXT NOT NULL,
+    model TEXT NOT NULL,
+    aspect_ratio TEXT NOT NULL,
+    image_path TEXT,
+    status TEXT NOT NULL,
+    video_url TEXT,
+    error TEXT,
+    submitted_at TEXT NOT NULL,
+    updated_at TEXT NOT NULL,
+    tier TEXT
+)
+"""
+
+
+@dataclass(frozen=True)
+class VeoJob:
+    """A submitted Veo task as recorded in the queue."""
+    task_id: str
+    prompt: str
+    output_path: str
+    model: str
+    aspect_ratio: str
+    image_path: Optional[str]
+    status: str
+    video_url: Optional[str]
+    error: Optional[str]
+    submitted_at: str
+    updated_at: str
+    tier: Optional[str] = None  # preview | final for tiered runs
+
+
+class VeoJobQueue:
+    """
+    Records every submitted Veo task before waiting on it.
+
+    If the process dies mid-wait, resume() picks the task back up by ID
+    instead of paying for a new generation. Submitting the same prompt,
+    model, image, and output again re-attaches to the existing task unless
+    it failed.
+
+    run_tiered() submits a veo3_fast preview and a veo3 final for the same
+    output. The preview is downloaded as soon as it lands; the final then
+    replaces it with an atomic rename, and a late preview never overwrites
+    a final that is already in place.
+    """
+
+    def __init__(self, db_path: Path | str, store: Optional[AssetStore] = None):
+        self.db_path = Path(db_path)
+        self.store = store
+        self._swap_lock = threading.Lock()
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        with self._connect() as conn:
+            conn.execute(_SCHEMA)
+            columns = {row["name"] for row in conn.execute("PRAGMA table_info(veo_jobs)")}
+            if "tier" not in columns:  # Queues created before tiered runs
+                conn.execute("ALTER TABLE veo_jobs ADD COLUMN tier TEXT")
+
+    @classmethod
+    def for_deck(cls, deck_path: Path | str) -> "VeoJobQueue":
+        from .asset_store import AssetStore
+
+        return cls(Path(deck_path) / "resources" / "materials" / QUEUE_FILE, AssetStore.for_deck(deck_path))
+
+    @contextmanager
+    def _connect(self) -> Iterator[sqlite3.Connection]:
+        # One short-lived connection per operation keeps the queue safe to use
+        # from scheduler threads and from concurrent CLI processes.
+        conn = sqlite3.connect(self.db_path, timeout=30)
+        conn.row_factory = sqlite3.Row
+        try:
+            with conn:
+                yield conn
+        finally:
+            conn.close()
+
+    # Queries
+
+    def get(self, task_id: str) -> Optional[VeoJob]:
+        with self._connect() as conn:
+            row = conn.execute("SELECT * FROM veo_jobs WHERE task_id = ?", (task_id,)).fetchone()
+        return VeoJob(**row) if row else None
+
+    def jobs(self, statuses: Optional[tuple[str, ...]] = None) -> list[VeoJob]:
+        query = "SELECT * FROM veo_jobs"
+        params: tuple = ()
+        if statuses:
+            query += f" WHERE status IN ({', '.join('?' for _ in statuses)})"
+            params = statuses
+        with self._connect() as conn:
+            rows = conn.execute(query + " ORDER BY submitted_at", params).fetchall()
+        return [VeoJob(**row) for row in rows]
+
+    def find_active(
+        self,
+        prompt: str,
+        output_path: Path | str,
+        model: str,
+        aspect_ratio: str = "16:9",
+        image_path: Optional[Path | str] = None,
+    ) -> Optional[VeoJob]:
+        """An unfinished or finished-but-not-failed task for the same request."""
+        with self._connect() as conn:
+            row = conn.execute(
+                "SELECT * FROM veo_jobs WHERE prompt = ? AND output_path = ? AND model = ? AND aspect_ratio = ?"
+                " AND image_path IS ? AND status != 'failed' ORDER BY submitted_at DESC LIMIT 1",
+                (prompt, str(output_path), model, aspect_ratio, str(image_path) if image_path else None),
+            ).fetchone()
+        return VeoJob(**row) if row else None
+
+    def _final_in_place(self, output_path: str) -> bool:
+        """Whether a tiered final has already been downloaded to output_path."""
+        with self._connect() as conn:
+            row = conn.execute(
+                "SELECT 1 FROM veo_jobs WHERE output_path = ? AND tier = 'final' AND status = 'downloaded'",
+                (output_path,),
+            ).fetchone()
+        return row is not None
+
+    def _record(self, **fields) -> None:
+        now = datetime.now().isoformat()
+        with self._connect() as conn:
+            conn.execute(
+                "INSERT INTO veo_jobs (task_id, prompt, output_path, model, aspect_ratio, image_path,"
+                " status, video_url, error, submitted_at, updated_at, tier)"
+                " VALUES (:task_id, :prompt, :output_path, :model, :aspect_ratio, :image_path,"
+                " 'submitted', NULL, NULL, :now, :now, :tier)",
+                {"tier": None, **fields, "now": now},
+            )
+
+    def _update(self, task_id: str, **fields) -> None:
+        fields["updated_at"] = datetime.now().isoformat()
+        assignments = ", ".join(f"{key} = :{key}" for key in fields)
+        with self._connect() as conn:
+            conn.execute(f"UPDATE veo_jobs SET {assignments} WHERE task_id = :task_id", {**fields, "task_id": task_id})
+
+    # Submit / wait / resume
+
+    def submit(
+        self,
+        client: VeoClient,
+        prompt: str,
+        output_path: Path | str,
+        model: str = "veo3",
+        aspect_ratio: str = "16:9",
+        image_path: Optional[Path | str] = None,
+        tier: Optional[str] = None,
+    ) -> VeoJob:
+        """Submit a task (or re-attach to an identical active one) and persist it."""
+        output_path = Path(output_path).resolve()
+        image_path = Path(image_path).resolve() if image_path else None
+
+        existing = self.find_active(prompt, output_path, model, aspect_ratio, image_path)
+        if existing:
+            return existing
+
+        if image_path:
+            result = client.generate_video_from_image(
+                prompt, image_path, model=model, aspect_ratio=aspect_ratio, wait=False)
+        else:
+            result = client.generate_video(prompt, model=model, aspect_ratio=aspect_ratio, wait=False)
+
+        self._record(
+            task_id=result.task_id,
+            prompt=prompt,
+            output_path=str(output_path),
+            model=model,
+            aspect_ratio=aspect_ratio,
+            image_path=str(image_path) if image_path else None,
+            tier=tier,
+        )
+        return self.get(result.task_id)
+
+    def wait(
+        self,
+        client: VeoClient,
+        task_id: str,
+        timeout: int = 600,
+        poll_interval: int = 10,
+    ) -> VeoJob:
+        """Wait for a queued task to complete (callback or poll), then download it to its output path."""
+        job = self.get(task_id)
+        if job is None:
+            raise VeoError(f"Task {task_id} is not in the queue")
+        if job.status == "superseded" or (job.status == "downloaded" and Path(job.output_path).exists()):
+            return job
+        if job.status == "failed":
+            raise VeoError(f"Task failed: {job.error}")
+
+        start = time.time()
+        first = True
+        try:
+            while job.status != "completed":
+                result = client.next_status(task_id, poll_interval, first=first)
+                first = False
+                if result.status == "completed":
+                    self._update(task_id, status="completed", video_url=result.video_url)
+                elif result.status == "failed":
+                    self._update(task_id, status="failed", error=result.error)
+                    raise VeoError(f"Task failed: {result.error}")
+                elif result.status != job.status and result.status in ("processing", "pending"):
+                    self._update(task_id, status="processing")
+                job = self.get(task_id)
+
+                if job.status != "completed" and time.time() - start >= timeout:
+                    raise VeoError(f"Task {task_id} timed out after {timeout}s (still queued; run resume later)")
+        finally:
+            if client.callback_receiver:
+                client.callback_receiver.discard(task_id)
+
+        return self.download(job)
+
+    def download(self, job: VeoJob) -> VeoJob:
+        """Download a completed job atomically to its output path."""
+        from .veo import VideoResult
+
+        if not job.video_url:
+            raise VeoError(f"Task {job.task_id} completed without a video URL")
+        if job.tier == "preview" and self._final_in_place(job.output_path):
+            self._update(job.task_id, status="superseded")
+            return self.get(job.task_id)
+
+        output_path = Path(job.output_path)
+        output_path.parent.mkdir(parents=True, exist_ok=True)
+        video = VideoResult(
+            task_id=job.task_id, status=job.status, video_url=job.video_url,
+            video_urls=[job.video_url], error=None,
+        )
+        tmp_path = output_path.with_name(f".{output_path.name}.{job.task_id}.part")
+        try:
+            video.download(tmp_path)
+            # Check-and-swap under the lock so a preview finishing alongside
+            # its final cannot rename over it
+            with self._swap_lock:
+                if job.tier == "preview" and self._final_in_place(job.output_path):
+                    self._update(job.task_id, status="superseded")
+                    return self.get(job.task_id)
+                if self.store:
+                    # The store links the finished blob into place atomically
+                    self.store.link(self.store.put_file(tmp_path), output_path)
+                else:
+                    os.replace(tmp_path, output_path)
+                self._update(job.task_id, status="downloaded")
+        finally:
+            if tmp_path.exists():
+                tmp_path.unlink()
+        return self.get(job.task_id)
+
+    def run(
+        self,
+        client: VeoClient,
+        prompt: str,
+        output_path: Path | str,
+        model: str = "veo3",
+        aspect_ratio: str = "16:9",
+        image_path: Optional[Path | str] = None,
+        timeout: int = 600,
+        poll_interval: int = 10,
+    ) -> VeoJob:
+        """Submit (or re-attach), wait, and download."""
+        job = self.submit(client, prompt, output_path, model, aspect_ratio, image_path)
+        return self.wait(client, job.task_id, timeout, poll_interval)
+
+    def run_tiered(
+        self,
+        client: VeoClient,
+        prompt: str,
+        output_path: Path | str,
+        aspect_ratio: str = "16:9",
+        image_path: Optional[Path | str] = None,
+        timeout: int = 600,
+        poll_interval: int = 10,
+        wait_final: bool = True,
+        on_update=None,
+    ) -> tuple[VeoJob, VeoJob]:
+        """
+        Preview with veo3_fast now, replace it with the veo3 final when that lands.
+
+        Both tasks are submitted up front so the final renders while the
+        preview is awaited. A failed or timed-out preview does not stop the
+        final. With wait_final=False the call returns once the preview is in
+        place and `resume` later downloads the final over it.
+
+        Args:
+            on_update: Called with (job, error) as each tier finishes
+
+        Returns:
+            (preview job, final job) as recorded in the queue
+        """
+        preview = self.submit(client, prompt, output_path, PREVIEW_MODEL, aspect_ratio, image_path, tier="preview")
+        final = self.submit(client, prompt, output_path, FINAL_MODEL, aspect_ratio, image_path, tier="final")
+
+        try:
+            preview = self.wait(client, preview.task_id, timeout, poll_interval)
+            error = None
+        except VeoError as e:
+            preview, error = self.get(preview.task_id), str(e)
+        if on_update:
+            on_update(preview, error)
+
+        if wait_final:
+            final = self.wait(client, final.task_id, timeout, poll_interval)
+            if on_update:
+                on_update(final, None)
+        return preview, self.get(final.task_id)
+
+    def resume(
+        self,
+        client: VeoClient,
+        timeout: int = 600,
+        poll_interval: int = 10,
+        on_update=None,
+    ) -> list[VeoJob]:
+        """Re-attach to every unfinished task; returns the jobs after the attempt."""
+        finished = []
+        for job in self.jobs(ACTIVE_STATUSES):
+            try:
+                job = self.wait(client, job.task_id, timeout, poll_interval)
+            except VeoError as e:
+                job = self.get(job.task_id)
+                if on_update:
+                    on_update(job, str(e))
+                finished.append(job)
+                continue
+            if on_update:
+                on_update(job, None)
+            finished.append(job)
+        return finished
+
+
+def resume_in_background(deck_path: Path | str, timeout: int = 600, poll_interval: int = 10) -> Path:
+    """
+    Start a detached `resume` for the deck so finals land after the caller exits.
+
+    The process outlives the caller's session and appends its report to
+    resources/materials/veo-resume.log, which is returned.
+    """
+    deck_path = Path(deck_path).resolve()
+    log_path = deck_path / "resources" / "materials" / RESUME_LOG
+    log_path.parent.mkdir(parents=True, exist_ok=True)
+    package_root = Path(__file__).resolve().parents[2]
+    with open(log_path, "ab") as log:
+        subprocess.Popen(
+            [sys.executable, "-m", "lib.media.veo_queue", str(deck_path),
+             "--timeout", str(timeout), "--poll-interval", str(poll_interval)],
+            cwd=package_root,
+            stdin=subprocess.DEVNULL,
+            stdout=log,
+            stderr=subprocess.STDOUT,
+            start_new_session=True,
+        )
+    return log_path
+
+
+def main(argv: Optional[list[str]] = None) -> int:
+    parser = argparse.ArgumentParser(
+        prog="python3 -m lib.media resume",
+        description="Re-attach to a deck's unfinished Veo tasks and download finished videos",
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog=f"""
+Tasks are recorded in resources/materials/{QUEUE_FILE} when videos are
+generated with --deck (python3 -m lib.media video ... --deck DECK).
+
+Examples:
+  python3 -m lib.media resume decks/my-pitch
+  python3 -m lib.media resume decks/my-pitch --list   # status, tier, model per task
+        """
+    )
+    parser.add_argument("deck", type=Path, help="Deck directory")
+    parser.add_argument("--list", action="store_true", help="Only list recorded tasks")
+    parser.add_argument("--timeout", type=int, default=600, help="Max seconds to wait per task")
+    parser.add_argument("--poll-interval", type=int, default=10, help="Seconds between status checks")
+    args = parser.parse_args(argv)
+
+    queue = VeoJobQueue.for_deck(args.deck)
+
+    if args.list:
+        jobs = queue.jobs()
+        for job in jobs:
+            tier = job.tier or "-"
+            print(f"  {job.status:10} {tier:7} {job.task_id}  {job.model:9} -> {job.output_path}")
+        print(f"{len(jobs)} task(s)")
+        return 0
+
+    pending = queue.jobs(ACTIVE_STATUSES)
+    if not pending:
+        print("No unfinished Veo tasks")
+        return 0
+
+    def report(job: VeoJob, error: Optional[str]) -> None:
+        detail = f" - {error}" if error else ""
+        print(f"  {job.status:10} {job.task_id} -> {job.output_path}{detail}", flush=True)
+
+    print(f"Resuming {len(pending)} task(s)...")
+    try:
+        jobs = queue.resume(VeoClient(), args.timeout, args.poll_interval, on_update=report)
+    except ValueError as e:
+        print(f"Error: {e}")
+        return 1
+    return 0 if all(job.status in ("downloaded", "superseded") for job in jobs) else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
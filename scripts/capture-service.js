@@ -0,0 +1,614 @@
+/**
+ * Slide Capture Service
+ *
+ * Captures a deck with one Chromium and several pages at once. Each page
+ * gets its own browser context and a contiguous range of slides. It jumps
+ * to each slide (deck-navigation.js) and collects any of: a screenshot,
+ * the DOM design metrics design-quality.js scores, and a caller-supplied
+ * inspect(page, index) result. Results come back in slide order however the
+ * ranges finish.
+ *
+ * Pass options.browser to reuse a running browser; otherwise one is
+ * launched for the call and closed afterwards.
+ *
+ * With options.cacheDir, each slide is keyed by a hash of its rendered DOM,
+ * the deck's styles and the content of the assets it references. On a key
+ * hit the previous PNG (and metrics) are reused instead of captured again.
+ * Each slide is also marked changed or not against the previous run. When
+ * a key differs, the old and new PNGs go through a pixel diff
+ * (python3 -m lib.media diff), so a DOM change that renders the same
+ * pixels does not count.
+ *
+ * capturePdfRanges() prints the deck as fixed ranges of slides on parallel
+ * pages. A range whose slides all hash the same as at the last export
+ * reuses its cached PDF. The ranges are merged in order, while later ones
+ * are still printing (pdf-merge.js).
+ *
+ * Library:
+ *   const { slideCount, slides } = await captureSlides(url, {
+ *     maxSlides: 20, screenshotDir: '/tmp/shots', metrics: true,
+ *   });
+ *   // slides: [{ index, title, screenshot, metrics, inspected, key, cached, changed, diff }]
+ *   await capturePdf(url, { path: 'deck.pdf' });
+ *   await capturePdfRanges(url, { path: 'deck.pdf', cacheDir });
+ */
+
+const crypto = require('crypto');
+const os = require('os');
+const path = require('path');
+const fs = require('fs');
+const { spawn } = require('child_process');
+const { fileURLToPath } = require('url');
+
+const { gotoSlide, openDeck } = require('./deck-navigation');
+const { createPdfMerger } = require('./pdf-merge');
+
+const DEFAULT_VIEWPORT = { width: 1280, height: 800 };
+// Parallel pages per capture; each one loads the deck once
+const DEFAULT_PAGES = Math.max(1, Math.min(4, os.cpus().length));
+// Below this many slides per page, another page costs more than it saves
+const MIN_SLIDES_PER_PAGE = 4;
+
+// Slides per PDF range: an edit re-prints only its own range, while each
+// range costs one page.pdf() call
+const PDF_RANGE_SIZE = 4;
+
+const CACHE_VERSION = 1;
+const CACHE_INDEX = 'index.json';
+const REPO_ROOT = path.resolve(__dirname, '..');
+
+function loadChromium() {
+  return require('playwright').chromium;
+}
+
+/**
+ * Split indices into at most `parts` contiguous ranges of near-equal size.
+ */
+function splitRanges(indices, parts) {
+  const count = Math.max(1, Math.min(parts, indices.length));
+  const ranges = [];
+  let start = 0;
+  for (let part = 0; part < count; part++) {
+    const size = Math.ceil((indices.length - start) / (count - part));
+    ranges.push(indices.slice(start, start + size));
+    start += size;
+  }
+  return ranges.filter((range) => range.length > 0);
+}
+
+async function withBrowser(options, fn) {
+  const browser = options.browser || await loadChromium().launch();
+  try {
+    return await fn(browser);
+  } finally {
+    if (!options.browser) await browser.close();
+  }
+}
+
+/**
+ * Design metrics for the active slide: element boxes, heading/body type
+ * sizes and text colors against the slide background.
+ */
+async function extractSlideMetrics(page) {
+  return await page.evaluate(() => {
+    const activeSlide = document.querySelector('.slide.is-active');
+    if (!activeSlide) return null;
+
+    const slideInner = activeSlide.querySelector('.slide-inner');
+    const theme = activeSlide.classList.contains('theme-ink') ? 'ink' : 'ivory';
+    const layout = [...(slideInner?.classList || [])].find((c) => c.startsWith('layout-'))?.replace('layout-', '') || 'unknown';
+
+    // Get all significant elements with their bounding boxes
+    const elements = [];
+    const significantSelectors = ['.title', '.section-title', '.subtitle', '.body-text', '.card', '.media-frame', '.quote', '.metric', '.chip-row'];
+
+    for (const selector of significantSelectors) {
+      const els = activeSlide.querySelectorAll(selector);
+      for (const el of els) {
+        const rect = el.getBoundingClientRect();
+        if (rect.width > 0 && rect.height > 0) {
+          elements.push({
+            type: selector.replace('.', ''),
+            x: rect.x,
+            y: rect.y,
+            width: rect.width,
+            height: rect.height,
+          });
+        }
+      }
+    }
+
+    // Typography analysis
+    const headings = activeSlide.querySelectorAll('.title, .section-title, .quote');
+    const bodyText = activeSlide.querySelectorAll('.subtitle, .body-text, .card-caption');
+
+    let headingSize = 0;
+    let bodySize = 0;
+
+    for (const h of headings) {
+      const size = parseFloat(window.getComputedStyle(h).fontSize);
+      if (size > headingSize) headingSize = size;
+    }
+
+    for (const b of bodyText) {
+      const size = parseFloat(window.getComputedStyle(b).fontSize);
+      if (size > bodySize) bodySize = size;
+    }
+
+    // Color contrast samples against the slide background
+    const textElements = activeSlide.querySelectorAll('.title, .section-title, .subtitle, .body-text, .quote');
+    const bgColor = window.getComputedStyle(slideInner).backgroundColor;
+    const contrastSamples = [];
+
+    for (const el of textElements) {
+      contrastSamples.push({
+        element: el.className,
+        color: window.getComputedStyle(el).color,
+        background: bgColor,
+      });
+    }
+
+    return {
+      theme,
+      layout,
+      elements,
+      typography: {
+        headingSize,
+        bodySize,
+        ratio: bodySize > 0 ? headingSize / bodySize : 0,
+      },
+      contrast: contrastSamples,
+    };
+  });
+}
+
+function sha1(data) {
+  return crypto.createHash('sha1').update(data).digest('hex');
+}
+
+/**
+ * Screenshot cache directory for one tool inside a local deck, or null when
+ * the deck is not on disk (remote-only reviews skip caching).
+ */
+function captureCacheDir(deckPath, name) {
+  if (!deckPath || !fs.existsSync(path.join(deckPath, 'index.html'))) return null;
+  return path.join(deckPath, 'resources', 'materials', 'capture-cache', name);
+}
+
+function loadCaptureCache(dir) {
+  let slides = {};
+  let metrics = {};
+  try {
+    const data = JSON.parse(fs.readFileSync(path.join(dir, CACHE_INDEX), 'utf-8'));
+    if (data.version === CACHE_VERSION) ({ slides, metrics } = data);
+  } catch (e) {
+    // Missing or unreadable index: every slide is captured fresh
+  }
+  return { dir, slides, metrics, assetHashes: new Map() };
+}
+
+// Content hash for an asset URL. Same-origin and file assets are read;
+// anything else (CDN fonts, data: URLs) is identified by its URL.
+async function hashAsset(assetUrl, deckUrl) {
+  try {
+    const parsed = new URL(assetUrl);
+    if (parsed.protocol === 'file:') {
+      return sha1(await fs.promises.readFile(fileURLToPath(parsed)));
+    }
+    if (/^https?:$/.test(parsed.protocol) && parsed.origin === new URL(deckUrl).origin) {
+      const response = await fetch(assetUrl);
+      if (response.ok) return sha1(Buffer.from(await response.arrayBuffer()));
+    }
+  } catch (e) {
+    // Unreadable asset: its URL still keys the slide
+  }
+  return sha1(assetUrl);
+}
+
+/**
+ * Cache key for the active slide (or slide `index`, whether shown or not):
+ * its rendered DOM, the deck chrome and styles around it, the viewport, and
+ * the content of every asset it uses.
+ */
+async function slideKey(page, deckUrl, viewport, cache, index = null) {
+  const rendered = await page.evaluate((index) => {
+    const slide = index === null ? document.querySelector('.slide.is-active') : document.querySelectorAll('.slide')[index];
+    let dom = slide ? slide.outerHTML : '';
+    if (slide && index !== null) {
+      // Print shows every slide, so which one is on screen does not matter
+      const clone = slide.cloneNode(true);
+      clone.classList.remove('is-active');
+      dom = clone.outerHTML;
+    }
+    const urls = new Set();
+    const add = (value) => {
+      if (value) urls.add(new URL(value, document.baseURI).href);
+    };
+    if (slide) {
+      slide.querySelectorAll('img').forEach((img) => add(img.currentSrc || img.getAttribute('src')));
+      slide.querySelectorAll('video[poster]').forEach((video) => add(video.getAttribute('poster')));
+      slide.querySelectorAll('video[src], source[src]').forEach((el) => add(el.getAttribute('src')));
+      [slide, ...slide.querySelectorAll('*')].forEach((el) => {
+        for (const match of getComputedStyle(el).backgroundImage.matchAll(/url\(["']?([^"')]+)["']?\)/g)) add(match[1]);
+      });
+    }
+    document.querySelectorAll('link[rel="stylesheet"]').forEach((link) => add(link.href));
+    return {
+      dom,
+      chrome: [
+        document.documentElement.getAttribute('style'),
+        document.body.className,
+        JSON.stringify(document.body.dataset),
+        // The counter is screen-only nav; in print keys it would tie every range to the slide count
+        index === null ? document.getElementById('progress-count')?.textContent : '',
+      ].join('|'),
+      styles: Array.from(document.querySelectorAll('style'), (style) => style.textContent).join('\n'),
+      assets: [...urls].sort(),
+    };
+  }, index);
+
+  const assets = await Promise.all(rendered.assets.map((assetUrl) => {
+    if (!cache.assetHashes.has(assetUrl)) cache.assetHashes.set(assetUrl, hashAsset(assetUrl, deckUrl));
+    return cache.assetHashes.get(assetUrl);
+  }));
+  return sha1(JSON.stringify([CACHE_VERSION, viewport, rendered.dom, rendered.chrome, sha1(rendered.styles), assets]));
+}
+
+// Copy into the cache through a temp file so readers never see a partial PNG
+async function storeFile(source, target) {
+  const tmpPath = `${target}.${process.pid}.tmp`;
+  await fs.promises.copyFile(source, tmpPath);
+  await fs.promises.rename(tmpPath, target);
+}
+
+/**
+ * Pixel-diff screenshot pairs with the Python helper. Resolves to
+ * { id: result }, or null when python3/NumPy/Pillow are unavailable.
+ */
+function diffScreenshots(pairs) {
+  if (pairs.length === 0) return Promise.resolve({});
+  return new Promise((resolve) => {
+    const child = spawn('python3', ['-m', 'lib.media', 'diff', '--pairs', '-', '--json'], {
+      cwd: REPO_ROOT,
+      stdio: ['pipe', 'pipe', 'ignore'],
+    });
+    const stdout = [];
+    child.stdout.on('data', (chunk) => stdout.push(chunk));
+    child.on('error', () => resolve(null));
+    child.on('close', (code) => {
+      try {
+        if (code !== 0) throw new Error(`exit ${code}`);
+        resolve(Object.fromEntries(JSON.parse(Buffer.concat(stdout).toString()).map((r) => [r.id, r])));
+      } catch (e) {
+        resolve(null);
+      }
+    });
+    child.stdin.on('error', () => {});
+    child.stdin.end(JSON.stringify(pairs));
+  });
+}
+
+/**
+ * Mark each captured slide changed or unchanged against the previous run,
+ * then record this run's keys and drop cache entries no slide uses.
+ */
+async function finishCaptureCache(cache, slides) {
+  const pairs = [];
+  for (const slide of slides) {
+    const previous = cache.slides[slide.index];
+    if (!previous) {
+      slide.changed = true;
+    } else if (previous === slide.key) {
+      slide.changed = false;
+    } else if (slide.screenshot && fs.existsSync(path.join(cache.dir, `${previous}.png`))) {
+      pairs.push({ id: String(slide.index), before: path.join(cache.dir, `${previous}.png`), after: slide.screenshot });
+    } else {
+      slide.changed = true;
+    }
+  }
+
+  const diffs = await diffScreenshots(pairs);
+  for (const pair of pairs) {
+    const slide = slides.find((s) => String(s.index) === pair.id);
+    const diff = diffs && diffs[pair.id];
+    // Without the helper, a new key is reported as a change
+    slide.changed = diff ? diff.changed : true;
+    if (diff) slide.diff = { ratio: diff.changed_ratio, bbox: diff.bbox };
+  }
+
+  for (const slide of slides) cache.slides[slide.index] = slide.key;
+  const live = new Set(Object.values(cache.slides));
+  for (const key of Object.keys(cache.metrics)) {
+    if (!live.has(key)) delete cache.metrics[key];
+  }
+
+  try {
+    for (const file of await fs.promises.readdir(cache.dir)) {
+      if (file.endsWith('.png') && !live.has(file.slice(0, -4))) {
+        await fs.promises.unlink(path.join(cache.dir, file));
+      }
+    }
+    const tmpPath = path.join(cache.dir, `.${CACHE_INDEX}.${process.pid}.tmp`);
+    await fs.promises.writeFile(tmpPath, JSON.stringify({ version: CACHE_VERSION, slides: cache.slides, metrics: cache.metrics }));
+    await fs.promises.rename(tmpPath, path.join(cache.dir, CACHE_INDEX));
+  } catch (e) {
+    // A read-only deck just captures everything next time
+  }
+}
+
+async function openCapturePage(browser, url, options) {
+  const context = await browser.newContext({ viewport: options.viewport || DEFAULT_VIEWPORT });
+  try {
+    const page = await context.newPage();
+    return { context, page, deck: await openDeck(page, url) };
+  } catch (error) {
+    await context.close();
+    throw error;
+  }
+}
+
+async function captureRange(capture, range, url, options, cache) {
+  const { page, deck } = capture;
+  const captured = [];
+
+  for (const i of range) {
+    await gotoSlide(deck, i);
+    const title = (await page.locator('.slide.is-active').getAttribute('data-title')) || `Slide ${i + 1}`;
+    const slide = { index: i + 1, title };
+    let hit = Boolean(cache);
+    if (cache) {
+      slide.key = await slideKey(page, url, options.viewport || DEFAULT_VIEWPORT, cache);
+    }
+
+    if (options.screenshotDir) {
+      slide.screenshot = path.join(options.screenshotDir, `slide-${i + 1}.png`);
+      const cachedPng = cache && path.join(cache.dir, `${slide.key}.png`);
+      if (cachedPng && fs.existsSync(cachedPng)) {
+        await fs.promises.copyFile(cachedPng, slide.screenshot);
+      } else {
+        hit = false;
+        await page.screenshot({ path: slide.screenshot });
+        if (cachedPng) await storeFile(slide.screenshot, cachedPng);
+      }
+    }
+    if (options.metrics) {
+      if (cache && cache.metrics[slide.key]) {
+        slide.metrics = cache.metrics[slide.key];
+      } else {
+        hit = false;
+        slide.metrics = await extractSlideMetrics(page);
+        if (cache) cache.metrics[slide.key] = slide.metrics;
+      }
+    }
+    if (cache) slide.cached = hit;
+    if (options.inspect) {
+      slide.inspected = await options.inspect(page, i);
+    }
+    captured.push(slide);
+  }
+  return captured;
+}
+
+/**
+ * Capture slides in parallel ranges. Options:
+ *   browser        reuse this browser instead of launching one
+ *   viewport       page size (default 1280x800)
+ *   pages          parallel pages (default: CPU count, at most 4)
+ *   slides         0-based slide indices to capture (default: all)
+ *   maxSlides      cap on how many slides are captured
+ *   screenshotDir  save slide-N.png here
+ *   metrics        collect extractSlideMetrics() per slide
+ *   inspect        async (page, index) => extra per-slide data
+ *   cacheDir       reuse PNGs/metrics by slide key and mark changed slides
+ */
+async function captureSlides(url, options = {}) {
+  return withBrowser(options, async (browser) => {
+    // The first page also counts the slides, then takes the first range
+    const first = await openCapturePage(browser, url, options);
+    const captures = [first];
+    try {
+      const slideCount = first.deck.count;
+      let indices = options.slides || Array.from({ length: slideCount }, (_, i) => i);
+      indices = indices.filter((i) => i >= 0 && i < slideCount).slice(0, options.maxSlides ?? slideCount);
+      if (options.screenshotDir) fs.mkdirSync(options.screenshotDir, { recursive: true });
+      const cache = options.cacheDir ? loadCaptureCache(options.cacheDir) : null;
+      if (cache) fs.mkdirSync(cache.dir, { recursive: true });
+
+      const pages = Math.min(options.pages || DEFAULT_PAGES, Math.ceil(indices.length / MIN_SLIDES_PER_PAGE));
+      const ranges = splitRanges(indices, pages);
+      // Settle every range before closing, so no page is still opening
+      const outcomes = await Promise.allSettled(ranges.map(async (range, n) => {
+        let capture = first;
+        if (n > 0) {
+          capture = await openCapturePage(browser, url, options);
+          captures.push(capture);
+        }
+        return captureRange(capture, range, url, options, cache);
+      }));
+      const failed = outcomes.find((outcome) => outcome.status === 'rejected');
+      if (failed) throw failed.reason;
+
+      const slides = outcomes.flatMap((outcome) => outcome.value);
+      if (cache) await finishCaptureCache(cache, slides);
+      return { slideCount, slides };
+    } finally {
+      await Promise.all(captures.map((capture) => capture.context.close()));
+    }
+  });
+}
+
+/**
+ * Print the deck to PDF once every image is decoded and fonts are loaded.
+ */
+async function capturePdf(url, options = {}) {
+  return withBrowser(options, async (browser) => {
+    const context = await browser.newContext({ viewport: options.viewport || DEFAULT_VIEWPORT });
+    try {
+      const page = await context.newPage();
+      await page.goto(url, { waitUntil: 'networkidle' });
+      await page.emulateMedia({ media: 'print' });
+      await page.evaluate(() => Promise.all([
+        ...Array.from(document.images).map((img) => img.decode().catch(() => {})),
+        document.fonts ? document.fonts.ready : null,
+      ]));
+
+      await page.pdf({
+        path: options.path,
+        printBackground: true,
+        preferCSSPageSize: true,
+      });
+    } finally {
+      await context.close();
+    }
+  });
+}
+
+// Switch a deck page to print media and wait for images and fonts
+async function preparePrint(page) {
+  await page.emulateMedia({ media: 'print' });
+  await page.evaluate(() => Promise.all([
+    ...Array.from(document.images).map((img) => img.decode().catch(() => {})),
+    document.fonts ? document.fonts.ready : null,
+  ]));
+}
+
+// Print only the range's slides; the last one gets no trailing page break
+async function printRange(page, slides, file) {
+  await page.evaluate((shown) => {
+    const keep = new Set(shown);
+    const last = shown[shown.length - 1];
+    document.querySelectorAll('.slide').forEach((slide, i) => {
+      slide.style.display = keep.has(i) ? '' : 'none';
+      slide.style.breakAfter = i === last ? 'auto' : '';
+    });
+  }, slides);
+  const tmpPath = `${file}.${process.pid}.tmp`;
+  await page.pdf({ path: tmpPath, printBackground: true, preferCSSPageSize: true });
+  await fs.promises.rename(tmpPath, file);
+}
+
+// Up to `size` print-ready pages; the first is the one that counted the slides
+function createPagePool(browser, url, options, first, size) {
+  const idle = [first];
+  const waiting = [];
+  const captures = [first];
+  let opened = 1;
+
+  return {
+    captures,
+    async acquire() {
+      if (idle.length > 0) return idle.pop();
+      if (opened < size) {
+        opened++;
+        const capture = await openCapturePage(browser, url, options);
+        captures.push(capture);
+        await preparePrint(capture.page);
+        return capture;
+      }
+      return new Promise((resolve) => waiting.push(resolve));
+    },
+    release(capture) {
+      const next = waiting.shift();
+      if (next) next(capture);
+      else idle.push(capture);
+    },
+  };
+}
+
+/**
+ * Print the deck to PDF in ranges of PDF_RANGE_SIZE slides on parallel
+ * pages, merging each range into options.path as soon as it and the ranges
+ * before it are done. Options:
+ *   browser   reuse this browser instead of launching one
+ *   viewport  page size (default 1280x800)
+ *   pages     parallel pages (default: CPU count, at most 4)
+ *   path      output PDF
+ *   cacheDir  keep range PDFs by content key; unchanged ranges are not
+ *             printed again
+ * Resolves to { slideCount, pages, ranges: [{ slides, key, cached }] },
+ * with 1-based slide numbers.
+ */
+async function capturePdfRanges(url, options = {}) {
+  return withBrowser(options, async (browser) => {
+    const viewport = options.viewport || DEFAULT_VIEWPORT;
+    const workDir = options.cacheDir || await fs.promises.mkdtemp(path.join(os.tmpdir(), 'keynote-pdf-'));
+    const first = await openCapturePage(browser, url, options);
+    let pool = null;
+    let merger = null;
+    let pending = [];
+    let stopped = false;
+    try {
+      await fs.promises.mkdir(workDir, { recursive: true });
+      await preparePrint(first.page);
+      const slideCount = first.deck.count;
+      if (slideCount === 0) throw new Error('Deck has no slides to export');
+
+      const keyCache = { assetHashes: new Map() };
+      const keys = [];
+      for (let i = 0; i < slideCount; i++) {
+        keys.push(await slideKey(first.page, url, viewport, keyCache, i));
+      }
+      const ranges = [];
+      for (let start = 0; start < slideCount; start += PDF_RANGE_SIZE) {
+        const slides = Array.from({ length: Math.min(PDF_RANGE_SIZE, slideCount - start) }, (_, n) => start + n);
+        const key = sha1(JSON.stringify([CACHE_VERSION, 'pdf', slides.map((i) => keys[i])]));
+        const file = path.join(workDir, `${key}.pdf`);
+        ranges.push({ slides, key, file, cached: Boolean(options.cacheDir) && fs.existsSync(file) });
+      }
+
+      const stale = ranges.filter((range) => !range.cached);
+      pool = createPagePool(browser, url, options, first, Math.min(options.pages || DEFAULT_PAGES, stale.length));
+      pending = ranges.map((range) => {
+        if (range.cached) return Promise.resolve();
+        return (async () => {
+          const capture = await pool.acquire();
+          try {
+            if (!stopped) await printRange(capture.page, range.slides, range.file);
+          } finally {
+            pool.release(capture);
+          }
+        })();
+      });
+      // Failures surface in slide order below; this just keeps them handled
+      pending.forEach((promise) => promise.catch(() => {}));
+
+      merger = await createPdfMerger(options.path);
+      for (let n = 0; n < ranges.length; n++) {
+        await pending[n];
+        await merger.append(ranges[n].file);
+      }
+      const { pages } = await merger.finish();
+      merger = null;
+
+      if (options.cacheDir) {
+        const live = new Set(ranges.map((range) => `${range.key}.pdf`));
+        for (const file of await fs.promises.readdir(workDir)) {
+          if (file.endsWith('.pdf') && !live.has(file)) await fs.promises.unlink(path.join(workDir, file)).catch(() => {});
+        }
+      }
+      return {
+        slideCount,
+        pages,
+        ranges: ranges.map(({ slides, key, cached }) => ({ slides: slides.map((i) => i + 1), key, cached })),
+      };
+    } finally {
+      if (merger) await merger.abort();
+      // Let in-flight ranges finish before their pages close; queued ones are skipped
+      stopped = true;
+      await Promise.allSettled(pending);
+      await Promise.all((pool ? pool.captures : [first]).map((capture) => capture.context.close()));
+      if (!options.cacheDir) await fs.promises.rm(workDir, { recursive: true, force: true });
+    }
+  });
+}
+
+module.exports = {
+  DEFAULT_PAGES,
+  DEFAULT_VIEWPORT,
+  captureCacheDir,
+  capturePdf,
+  capturePdfRanges,
+  captureSlides,
+  extractSlideMetrics,
+  splitRanges,
+};
@@ -0,0 +1,60 @@
+/**
+ * Deck Navigation for Playwright Analyzers
+ *
+ * Jumps straight to slide N and waits for the deck's navigation-settled
+ * signal (window.keynote in the template: transitions finished, images
+ * decoded, fonts loaded), so capture time follows actual render time.
+ *
+ * Decks built from an older template have no window.keynote. For those,
+ * navigation falls back to the previous fixed sleeps: one ArrowRight per
+ * slide, then a pause.
+ *
+ * Library:
+ *   const deck = await openDeck(page, url);
+ *   for (let i = 0; i < deck.count; i++) {
+ *     await gotoSlide(deck, i);
+ *     await page.screenshot({ path: `slide-${i + 1}.png` });
+ *   }
+ */
+
+// Used only for decks without the settled signal
+const LEGACY_LOAD_WAIT_MS = 2000;
+const LEGACY_STEP_WAIT_MS = 600;
+
+/**
+ * Load the deck and wait for the first slide to settle.
+ * Returns { page, count, settled, index } for gotoSlide.
+ */
+async function openDeck(page, url) {
+  await page.goto(url, { waitUntil: 'load' });
+
+  const settled = await page.evaluate(() => Boolean(window.keynote));
+  if (settled) {
+    const index = await page.evaluate(() => window.keynote.settled());
+    const count = await page.evaluate(() => window.keynote.count);
+    return { page, count, settled, index };
+  }
+
+  await page.waitForTimeout(LEGACY_LOAD_WAIT_MS);
+  const count = await page.locator('.slide').count();
+  return { page, count, settled, index: 0 };
+}
+
+/**
+ * Show slide index (0-based) and resolve once it has settled.
+ * Legacy decks only move forward, one ArrowRight per slide.
+ */
+async function gotoSlide(deck, index) {
+  if (deck.settled) {
+    deck.index = await deck.page.evaluate((i) => window.keynote.goTo(i), index);
+    return;
+  }
+
+  while (deck.index < index) {
+    await deck.page.keyboard.press('ArrowRight');
+    await deck.page.waitForTimeout(LEGACY_STEP_WAIT_MS);
+    deck.index++;
+  }
+}
+
+module.exports = { gotoSlide, openDeck };
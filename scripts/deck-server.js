@@ -0,0 +1,74 @@
+/**
+ * Deck Server Launcher
+ *
+ * Starts the threaded deck server (lib/media/deck_server.py, run as
+ * `python3 -m lib.media serve`) on a free port. Resolves once its /__ready
+ * endpoint answers, so callers never guess how long startup takes. The
+ * server sends ETags, byte ranges and gzip/br, so repeat page loads
+ * during a review revalidate instead of re-downloading assets.
+ *
+ * Library:
+ *   const server = await startDeckServer();            // serves the current directory
+ *   await page.goto(`${server.url}/decks/my-deck/index.html`);
+ *   server.close();
+ */
+
+const path = require('path');
+const { spawn } = require('child_process');
+
+const REPO_ROOT = path.resolve(__dirname, '..');
+const READY_TIMEOUT_MS = 10000;
+
+/**
+ * Options: root (directory to serve, default cwd), port (default 0: any
+ * free port). Resolves to { url, port, close() }.
+ */
+function startDeckServer(options = {}) {
+  const root = path.resolve(options.root || process.cwd());
+  const child = spawn('python3', ['-m', 'lib.media', 'serve', root, '--json', '--port', String(options.port || 0)], {
+    cwd: REPO_ROOT,
+    stdio: ['ignore', 'pipe', 'pipe'],
+  });
+
+  return new Promise((resolve, reject) => {
+    let stdout = '';
+    let stderr = '';
+    let settled = false;
+    let announced = false;
+
+    const fail = (message) => {
+      if (settled) return;
+      settled = true;
+      clearTimeout(timer);
+      child.kill();
+      reject(new Error(message));
+    };
+    const timer = setTimeout(() => fail(`Deck server not ready after ${READY_TIMEOUT_MS}ms`), READY_TIMEOUT_MS);
+
+    child.on('error', (error) => fail(`Deck server failed to start: ${error.message}`));
+    child.on('exit', (code) => fail(`Deck server exited (${code}): ${stderr.trim().split('\n').pop() || 'no output'}`));
+    child.stderr.on('data', (chunk) => {
+      stderr += chunk;
+    });
+    child.stdout.on('data', async (chunk) => {
+      stdout += chunk;
+      const newline = stdout.indexOf('\n');
+      if (settled || announced || newline < 0) return;
+      announced = true;
+
+      try {
+        const info = JSON.parse(stdout.slice(0, newline));
+        const response = await fetch(info.ready);
+        if (!response.ok) throw new Error(`${info.ready} answered ${response.status}`);
+        if (settled) return;
+        settled = true;
+        clearTimeout(timer);
+        resolve({ url: info.url, port: info.port, close: () => child.kill() });
+      } catch (error) {
+        fail(`Deck server not ready: ${error.message}`);
+      }
+    });
+  });
+}
+
+module.exports = { startDeckServer };
@@ -10,17 +10,23 @@
  * - Grid alignment
  *
  * Usage:
- *   node scripts/design-quality.js [deck-path] [--serve] [--json]
+ *   node scripts/design-quality.js [deck-path] [--serve] [--json] [--no-cache]
+ *
+ * Per-slide DOM metrics are cached in the deck's
+ * resources/materials/capture-cache/design-quality/, keyed by each slide's
+ * rendered content. changedSlides lists the slides that changed since the
+ * last run.
  *
  * Examples:
  *   node scripts/design-quality.js decks/skill-demo
  *   node scripts/design-quality.js decks/skill-demo --serve --json
  */
 
-const { chromium } = require('playwright');
 const path = require('path');
 const fs = require('fs');
-const { spawn } = require('child_process');
+
+const { captureCacheDir, captureSlides } = require('./capture-service');
+const { startDeckServer } = require('./deck-server');
 
 const VIEWPORT = { width: 1280, height: 800 };
 const OUTPUT_DIR = '/tmp/design-quality';
@@ -44,22 +50,6 @@ const CONTRAST_THRESHOLDS = {
   acceptable: 3,
 };
 
-async function startServer(port = 8922) {
-  return new Promise((resolve) => {
-    const server = spawn('python3', ['-m', 'http.server', port.toString()], {
-      cwd: process.cwd(),
-      stdio: ['ignore', 'pipe', 'pipe'],
-    });
-
-    server.stdout.on('data', () => resolve(server));
-    server.stderr.on('data', (data) => {
-      if (data.toString().includes('Serving')) resolve(server);
-    });
-
-    setTimeout(() => resolve(server), 1000);
-  });
-}
-
 /**
  * Calculate relative luminance for contrast ratio
  */
@@ -200,104 +190,6 @@ function classifyLayout(elements, viewport) {
   return 'asymmetric';
 }
 
-/**
- * Extract design metrics from a single slide
- */
-async function extractSlideMetrics(page, slideIndex) {
-  return await page.evaluate(
-    ({ viewport }) => {
-      const activeSlide = document.querySelector('.slide.is-active');
-      if (!activeSlide) return null;
-
-      const slideInner = activeSlide.querySelector('.slide-inner');
-      const theme = activeSlide.classList.contains('theme-ink') ? 'ink' : 'ivory';
-      const layout = [...(slideInner?.classList || [])].find((c) => c.startsWith('layout-'))?.replace('layout-', '') || 'unknown';
-
-      // Get all significant elements with their bounding boxes
-      const elements = [];
-      const significantSelectors = ['.title', '.section-title', '.subtitle', '.body-text', '.card', '.media-frame', '.quote', '.metric', '.chip-row'];
-
-      for (const selector of significantSelectors) {
-        const els = activeSlide.querySelectorAll(selector);
-        for (const el of els) {
-          const rect = el.getBoundingClientRect();
-          if (rect.width > 0 && rect.height > 0) {
-            elements.push({
-              type: selector.replace('.', ''),
-              x: rect.x,
-              y: rect.y,
-              width: rect.width,
-              height: rect.height,
-            });
-          }
-        }
-      }
-
-      // Typography analysis
-      const headings = activeSlide.querySelectorAll('.title, .section-title, .quote');
-      const bodyText = activeSlide.querySelectorAll('.subtitle, .body-text, .card-caption');
-
-      let headingSize = 0;
-      let bodySize = 0;
-
-      for (const h of headings) {
-        const computed = window.getComputedStyle(h);
-        const size = parseFloat(computed.fontSize);
-        if (size > headingSize) headingSize = size;
-      }
-
-      for (const b of bodyText) {
-        const computed = window.getComputedStyle(b);
-        const size = parseFloat(computed.fontSize);
-        if (size > bodySize) bodySize = size;
-      }
-
-      // Color contrast analysis
-      const textElements = activeSlide.querySelectorAll('.title, .section-title, .subtitle, .body-text, .quote');
-      const contrastSamples = [];
-
-      // Get slide background color
-      const slideStyle = window.getComputedStyle(slideInner);
-      const bgColor = slideStyle.backgroundColor;
-
-      for (const el of textElements) {
-        const computed = window.getComputedStyle(el);
-        contrastSamples.push({
-          element: el.className,
-          color: computed.color,
-          background: bgColor,
-        });
-      }
-
-      // Grid alignment check
-      const alignmentResults = [];
-      for (const el of elements) {
-        alignmentResults.push({
-          type: el.type,
-          xAligned: false, // Will be calculated in Node
-          yAligned: false,
-          x: el.x,
-          y: el.y,
-        });
-      }
-
-      return {
-        theme,
-        layout,
-        elements,
-        typography: {
-          headingSize,
-          bodySize,
-          ratio: bodySize > 0 ? headingSize / bodySize : 0,
-        },
-        contrast: contrastSamples,
-        alignmentResults,
-      };
-    },
-    { viewport: VIEWPORT }
-  );
-}
-
 /**
  * Calculate typography hierarchy score
  */
@@ -361,30 +253,28 @@ function analyzeConsistency(slideMetrics) {
 }
 
 /**
- * Main analysis function
+ * Main analysis function. Pass options.browser to reuse an already-launched
+ * browser (review-all --watch keeps one warm). Slides are captured in parallel
+ * pages by capture-service.js; options.cacheDir reuses metrics of unchanged
+ * slides.
  */
-async function analyzeDesignQuality(url, maxSlides = 20) {
-  const browser = await chromium.launch();
-  const page = await browser.newPage({ viewport: VIEWPORT });
-
-  await page.goto(url);
-  await page.waitForTimeout(2000);
-
-  const slideCount = await page.locator('.slide').count();
+async function analyzeDesignQuality(url, maxSlides = 20, options = {}) {
+  const capture = await captureSlides(url, {
+    browser: options.browser,
+    viewport: VIEWPORT,
+    maxSlides,
+    metrics: true,
+    cacheDir: options.cacheDir,
+  });
+  const slideCount = capture.slideCount;
   const slideMetrics = [];
   const flags = [];
 
   fs.mkdirSync(OUTPUT_DIR, { recursive: true });
 
-  for (let i = 0; i < Math.min(slideCount, maxSlides); i++) {
-    const title = (await page.locator('.slide.is-active').getAttribute('data-title')) || `Slide ${i + 1}`;
-
-    const metrics = await extractSlideMetrics(page, i);
-    if (!metrics) {
-      await page.keyboard.press('ArrowRight');
-      await page.waitForTimeout(600);
-      continue;
-    }
+  for (const { index, title, metrics } of capture.slides) {
+    if (!metrics) continue;
+    const i = index - 1;
 
     // Calculate additional metrics in Node
     const weightDistribution = calculateWeightDistribution(metrics.elements, VIEWPORT);
@@ -480,13 +370,8 @@ async function analyzeDesignQuality(url, maxSlides = 20) {
         severity: 'low',
       });
     }
-
-    await page.keyboard.press('ArrowRight');
-    await page.waitForTimeout(600);
   }
 
-  await browser.close();
-
   // Analyze consistency across slides
   const consistency = analyzeConsistency(slideMetrics);
   flags.push(...consistency.issues.map((issue) => ({ ...issue, slide: 'global' })));
@@ -495,6 +380,7 @@ async function analyzeDesignQuality(url, maxSlides = 20) {
     deckUrl: url,
     slideCount,
     analyzedSlides: slideMetrics.length,
+    ...(options.cacheDir && { changedSlides: capture.slides.filter((s) => s.changed).map((s) => s.index) }),
     slides: slideMetrics,
     consistency: {
       layoutDistribution: Object.fromEntries(Object.entries(consistency.byLayout).map(([k, v]) => [k, v.length])),
@@ -520,15 +406,15 @@ async function main() {
   const deckPath = args.find((a) => !a.startsWith('--')) || 'decks/skill-demo';
   const shouldServe = args.includes('--serve');
   const outputJson = args.includes('--json');
+  const cacheDir = args.includes('--no-cache') ? null : captureCacheDir(deckPath, 'design-quality');
 
   let server = null;
   let url;
 
   if (shouldServe) {
-    const port = 8922;
-    server = await startServer(port);
-    url = `http://localhost:${port}/${deckPath}/index.html`;
-    console.log(`Started local server on port ${port}`);
+    server = await startDeckServer();
+    url = `${server.url}/${deckPath}/index.html`;
+    console.log(`Started local server on port ${server.port}`);
   } else {
     url = `https://dbmcco.github.io/keynote-slides-skill/${deckPath}/index.html`;
   }
@@ -536,7 +422,7 @@ async function main() {
   console.log(`Analyzing design quality: ${url}\n`);
 
   try {
-    const result = await analyzeDesignQuality(url);
+    const result = await analyzeDesignQuality(url, 20, { cacheDir });
 
     if (outputJson) {
       console.log(JSON.stringify(result, null, 2));
@@ -547,6 +433,9 @@ async function main() {
     console.log(`Design Quality Report: ${deckPath}`);
     console.log('='.repeat(60));
     console.log(`\nSlides Analyzed: ${result.analyzedSlides}/${result.slideCount}`);
+    if (result.changedSlides) {
+      console.log(`Changed Since Last Run: ${result.changedSlides.length ? result.changedSlides.join(', ') : 'none'}`);
+    }
 
     console.log('\n--- Layout Distribution ---');
     for (const [layout, count] of Object.entries(result.consistency.layoutDistribution)) {
@@ -596,9 +485,13 @@ async function main() {
     console.log(`\nFull report saved to: ${outputPath}`);
   } finally {
     if (server) {
-      server.kill();
+      server.close();
     }
   }
 }
 
-main().catch(console.error);
+module.exports = { VIEWPORT, analyzeDesignQuality };
+
+if (require.main === module) {
+  main().catch(console.error);
+}
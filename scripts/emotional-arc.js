@@ -11,10 +11,12 @@
  * Usage:
  *   node scripts/emotional-arc.js decks/my-deck
  *   node scripts/emotional-arc.js decks/my-deck --json
+ *
+ * Library:
+ *   require('./emotional-arc').analyze(loadSlideModel(deckPath))
  */
 
-const fs = require('fs');
-const path = require('path');
+const { loadSlideModel } = require('./slide-model');
 
 // ============================================================================
 // HOOK ANALYSIS
@@ -38,7 +40,7 @@ const HOOK_INDICATORS = {
 };
 
 function analyzeHook(slide, slideIndex) {
-  const text = `${slide.headline} ${slide.content}`.toLowerCase();
+  const text = `${slide.headline} ${slide.text}`.toLowerCase();
   const headline = slide.headline.toLowerCase();
 
   const analysis = {
@@ -138,11 +140,10 @@ const EMOTIONAL_WORDS = {
   },
 };
 
-function analyzeEmotionalContent(slide, slideIndex) {
-  const text = `${slide.headline} ${slide.content}`;
+function analyzeEmotionalContent(slide) {
+  const text = `${slide.headline} ${slide.text}`;
 
   const analysis = {
-    slideIndex: slideIndex + 1,
     title: slide.title,
     tension: { score: 0, words: [] },
     resolution: { score: 0, words: [] },
@@ -262,12 +263,12 @@ function classifyArcShape(emotionalAnalysis) {
 // "SO WHAT?" CHAIN ANALYSIS
 // ============================================================================
 
-function analyzeFlowChain(slides) {
+function analyzeFlowChain(slides, types) {
   const gaps = [];
 
   // Key concepts per slide for tracking flow
   const extractKeyConcepts = (slide) => {
-    const text = `${slide.headline} ${slide.content}`.toLowerCase();
+    const text = `${slide.headline} ${slide.text}`.toLowerCase();
     // Extract nouns and key phrases
     const words = text.split(/\s+/).filter(w => w.length > 4);
     return new Set(words);
@@ -285,7 +286,7 @@ function analyzeFlowChain(slides) {
     const overlapRatio = overlap / Math.max(prevConcepts.size, 1);
 
     // Transition indicators
-    const hasTransition = /therefore|so|because|thus|as a result|this means|which|building on|next|however|but|instead|alternatively/i.test(currSlide.content);
+    const hasTransition = /therefore|so|because|thus|as a result|this means|which|building on|next|however|but|instead|alternatively/i.test(currSlide.text);
 
     // Detect potential disconnects
     if (overlapRatio < 0.1 && !hasTransition) {
@@ -300,8 +301,8 @@ function analyzeFlowChain(slides) {
     }
 
     // Check for abrupt topic shifts
-    const prevType = classifySlideType(prevSlide);
-    const currType = classifySlideType(currSlide);
+    const prevType = types[i - 1];
+    const currType = types[i];
 
     if (prevType === 'problem' && currType !== 'solution' && currType !== 'problem') {
       gaps.push({
@@ -319,7 +320,7 @@ function analyzeFlowChain(slides) {
 }
 
 function classifySlideType(slide) {
-  const text = `${slide.headline} ${slide.content}`.toLowerCase();
+  const text = `${slide.headline} ${slide.text}`.toLowerCase();
 
   if (/problem|challenge|pain|cost|risk|threat|struggle|failing|broken/i.test(text)) return 'problem';
   if (/solution|approach|how we|introducing|meet|our (platform|product|service)/i.test(text)) return 'solution';
@@ -329,60 +330,30 @@ function classifySlideType(slide) {
   return 'content';
 }
 
-// ============================================================================
-// DECK EXTRACTION (shared pattern from narrative-review.js)
-// ============================================================================
-
-function extractSlideContent(html) {
-  const slides = [];
-  const slideRegex = /<section[^>]*class="slide[^"]*"[^>]*data-title="([^"]*)"[^>]*>([\s\S]*?)<\/section>/g;
-
-  let match;
-  while ((match = slideRegex.exec(html)) !== null) {
-    const title = match[1];
-    const content = match[2];
-
-    const textContent = content
-      .replace(/<script[^>]*>[\s\S]*?<\/script>/g, '')
-      .replace(/<style[^>]*>[\s\S]*?<\/style>/g, '')
-      .replace(/<[^>]+>/g, ' ')
-      .replace(/\s+/g, ' ')
-      .trim();
-
-    const headlineMatch = content.match(/<h[12][^>]*class="[^"]*title[^"]*"[^>]*>([\s\S]*?)<\/h[12]>/);
-    const headline = headlineMatch
-      ? headlineMatch[1].replace(/<[^>]+>/g, '').trim()
-      : title;
-
-    slides.push({
-      title,
-      headline,
-      content: textContent,
-      rawHtml: content,
-    });
-  }
-
-  return slides;
-}
-
 // ============================================================================
 // MAIN ANALYSIS
 // ============================================================================
 
-function generateReport(deckPath, outputJson = false) {
-  const htmlPath = path.join(deckPath, 'index.html');
-
-  if (!fs.existsSync(htmlPath)) {
-    console.error(`Deck not found: ${htmlPath}`);
-    process.exit(1);
-  }
+/**
+ * Emotional content and type of one slide. Uses nothing but the slide
+ * itself, so review-all can cache the result by slide hash.
+ */
+function analyzeSlide(slide) {
+  return {
+    emotion: analyzeEmotionalContent(slide),
+    type: classifySlideType(slide),
+  };
+}
 
-  const html = fs.readFileSync(htmlPath, 'utf-8');
-  const slides = extractSlideContent(html);
+/**
+ * Emotional arc report from per-slide results (analyzeSlide, in slide order).
+ * Hooks only look at the first two slides, so they are graded here.
+ */
+function aggregate(model, slideResults) {
+  const { deckPath, slides } = model;
 
   if (slides.length === 0) {
-    console.error('No slides found in deck');
-    process.exit(1);
+    throw new Error('No slides found in deck');
   }
 
   // Analyze opening slides for hooks (first 2)
@@ -395,13 +366,13 @@ function generateReport(deckPath, outputJson = false) {
     hookGrades[h.grade] > hookGrades[best] ? h.grade : best, 'weak');
 
   // Analyze emotional content per slide
-  const emotionalAnalysis = slides.map((slide, i) => analyzeEmotionalContent(slide, i));
+  const emotionalAnalysis = slides.map((slide, i) => ({ slideIndex: slide.index, ...slideResults[i].emotion }));
 
   // Classify arc shape
   const arcShape = classifyArcShape(emotionalAnalysis);
 
   // Analyze flow/connection chain
-  const flowGaps = analyzeFlowChain(slides);
+  const flowGaps = analyzeFlowChain(slides, slideResults.map((r) => r.type));
 
   // Build report
   const report = {
@@ -459,15 +430,25 @@ function generateReport(deckPath, outputJson = false) {
     report.summary.recommendations.push('Add more stakes indicators (numbers, impact, consequences)');
   }
 
-  if (outputJson) {
-    console.log(JSON.stringify(report, null, 2));
-    return report;
-  }
+  return report;
+}
+
+/**
+ * Emotional arc report for a slide model (see slide-model.js).
+ */
+function analyze(model) {
+  return aggregate(model, model.slides.map(analyzeSlide));
+}
 
-  // Pretty print
-  console.log(`\nEmotional Arc Analysis: ${deckPath}`);
+function printReport(report) {
+  const bestHookGrade = report.hookAnalysis.overallGrade;
+  const hookAnalysis = report.hookAnalysis.openingSlides;
+  const { perSlide: emotionalAnalysis, arcShape } = report.emotionalArc;
+  const flowGaps = report.flowChain.gaps;
+
+  console.log(`\nEmotional Arc Analysis: ${report.deckPath}`);
   console.log('='.repeat(50));
-  console.log(`\nSlides: ${slides.length}`);
+  console.log(`\nSlides: ${report.slideCount}`);
 
   // Hook Analysis
   console.log('\n--- HOOK ANALYSIS ---');
@@ -525,13 +506,26 @@ function generateReport(deckPath, outputJson = false) {
   }
 
   console.log('\n' + '='.repeat(50));
-
-  return report;
 }
 
-// Main
-const args = process.argv.slice(2);
-const deckPath = args.find(a => !a.startsWith('--')) || 'decks/skill-demo';
-const outputJson = args.includes('--json');
+module.exports = { aggregate, analyze, analyzeSlide, classifyArcShape, analyzeFlowChain, printReport };
 
-generateReport(deckPath, outputJson);
+// Main
+if (require.main === module) {
+  const args = process.argv.slice(2);
+  const deckPath = args.find(a => !a.startsWith('--')) || 'decks/skill-demo';
+  const outputJson = args.includes('--json');
+
+  try {
+    const report = analyze(loadSlideModel(deckPath));
+
+    if (outputJson) {
+      console.log(JSON.stringify(report, null, 2));
+    } else {
+      printReport(report);
+    }
+  } catch (error) {
+    console.error(error.message);
+    process.exit(1);
+  }
+}
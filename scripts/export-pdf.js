@@ -1,21 +1,27 @@
 #!/usr/bin/env node
 /**
  * ABOUTME: Export a Keynote-style deck to PDF using Playwright print styles.
- * ABOUTME: Supports local deck paths or http(s) URLs.
+ * ABOUTME: Supports local deck paths or http(s) URLs, in one pass or as parallel cached ranges.
  */
 
-const { chromium } = require('playwright');
 const path = require('path');
 const fs = require('fs');
 const { pathToFileURL } = require('url');
 
+const { captureCacheDir, capturePdf, capturePdfRanges } = require('./capture-service');
+
 const VIEWPORT = { width: 1600, height: 900 };
 
 const usage = () => {
-  console.log(`\nUsage: node scripts/export-pdf.js <deck-path|url> [--out PATH]\n\n` +
+  console.log(`\nUsage: node scripts/export-pdf.js <deck-path|url> [--out PATH] [--parallel [--pages N] [--no-cache]]\n\n` +
+    `  --parallel  Print ranges of slides on parallel pages and merge them; with a\n` +
+    `              local deck, ranges unchanged since the last export are reused\n` +
+    `  --pages N   Parallel pages for --parallel (default: CPU count, at most 4)\n` +
+    `  --no-cache  Print every range again\n\n` +
     `Examples:\n` +
     `  node scripts/export-pdf.js decks/my-pitch\n` +
     `  node scripts/export-pdf.js decks/my-pitch --out /tmp/my-pitch.pdf\n` +
+    `  node scripts/export-pdf.js decks/my-pitch --parallel\n` +
     `  node scripts/export-pdf.js https://example.com/decks/my-pitch/index.html --out my-pitch.pdf\n`);
 };
 
@@ -40,6 +46,9 @@ const resolveDeckPath = (deckArg) => {
 const parseArgs = (args) => {
   let deckArg = null;
   let outputPath = null;
+  let parallel = false;
+  let pages = null;
+  let cache = true;
 
   for (let i = 0; i < args.length; i += 1) {
     const arg = args[i];
@@ -48,13 +57,26 @@ const parseArgs = (args) => {
       i += 1;
       continue;
     }
+    if (arg === '--parallel') {
+      parallel = true;
+      continue;
+    }
+    if (arg === '--pages') {
+      pages = parseInt(args[i + 1], 10) || null;
+      i += 1;
+      continue;
+    }
+    if (arg === '--no-cache') {
+      cache = false;
+      continue;
+    }
     if (!arg.startsWith('-') && !deckArg) {
       deckArg = arg;
     }
   }
 
   if (!deckArg) return null;
-  return { deckArg, outputPath };
+  return { deckArg, outputPath, parallel, pages, cache };
 };
 
 const main = async () => {
@@ -70,10 +92,11 @@ const main = async () => {
     process.exit(1);
   }
 
-  const { deckArg } = parsed;
+  const { deckArg, parallel } = parsed;
   let { outputPath } = parsed;
   let url;
   let deckId = 'deck';
+  let deckDir = null;
 
   if (isHttpUrl(deckArg) || isFileUrl(deckArg)) {
     url = deckArg;
@@ -82,7 +105,7 @@ const main = async () => {
     }
   } else {
     const indexPath = resolveDeckPath(deckArg);
-    const deckDir = path.dirname(indexPath);
+    deckDir = path.dirname(indexPath);
     deckId = path.basename(deckDir);
     url = pathToFileURL(indexPath).href;
     if (!outputPath) {
@@ -90,22 +113,16 @@ const main = async () => {
     }
   }
 
-  const browser = await chromium.launch();
-  const page = await browser.newPage({ viewport: VIEWPORT });
-
   console.log(`Loading deck: ${url}`);
-  await page.goto(url, { waitUntil: 'networkidle' });
-  await page.emulateMedia({ media: 'print' });
-  await page.waitForTimeout(1000);
-
   console.log(`Exporting PDF to: ${outputPath}`);
-  await page.pdf({
-    path: outputPath,
-    printBackground: true,
-    preferCSSPageSize: true,
-  });
-
-  await browser.close();
+  if (parallel) {
+    const cacheDir = parsed.cache ? captureCacheDir(deckDir, 'export-pdf') : null;
+    const { pages, ranges } = await capturePdfRanges(url, { viewport: VIEWPORT, path: outputPath, pages: parsed.pages, cacheDir });
+    const reused = ranges.filter((range) => range.cached).length;
+    console.log(`Printed ${ranges.length - reused} of ${ranges.length} slide ranges (${reused} unchanged, reused); ${pages} pages.`);
+  } else {
+    await capturePdf(url, { viewport: VIEWPORT, path: outputPath });
+  }
   console.log('PDF export complete.');
 };
 
@@ -6,99 +6,78 @@
  * Can be run manually or as a Claude Code hook after deck changes.
  *
  * Usage:
- *   node scripts/layout-review.js [deck-path] [--serve]
+ *   node scripts/layout-review.js [deck-path] [--serve] [--no-cache]
+ *
+ * Screenshots are cached per slide in the deck's
+ * resources/materials/capture-cache/layout-review/. Unchanged slides reuse
+ * their PNG, and the report marks which slides visually changed since the
+ * last run.
  *
  * Examples:
  *   node scripts/layout-review.js decks/skill-demo
  *   node scripts/layout-review.js decks/skill-demo --serve
  */
 
-const { chromium } = require('playwright');
-const path = require('path');
-const fs = require('fs');
-const { spawn } = require('child_process');
+const { captureCacheDir, captureSlides } = require('./capture-service');
+const { startDeckServer } = require('./deck-server');
 
 const VIEWPORT = { width: 1280, height: 800 };
 const SCREENSHOT_DIR = '/tmp/layout-review';
 
-async function startServer(port = 8921) {
-  return new Promise((resolve, reject) => {
-    const server = spawn('python3', ['-m', 'http.server', port.toString()], {
-      cwd: process.cwd(),
-      stdio: ['ignore', 'pipe', 'pipe']
-    });
-
-    server.stdout.on('data', () => resolve(server));
-    server.stderr.on('data', (data) => {
-      if (data.toString().includes('Serving')) resolve(server);
-    });
-
-    setTimeout(() => resolve(server), 1000);
-  });
-}
-
-async function captureSlides(url, maxSlides = 6) {
-  const browser = await chromium.launch();
-  const page = await browser.newPage({ viewport: VIEWPORT });
-
-  await page.goto(url);
-  await page.waitForTimeout(2000);
-
-  const slideCount = await page.locator('.slide').count();
-  const screenshots = [];
-
-  fs.mkdirSync(SCREENSHOT_DIR, { recursive: true });
-
-  for (let i = 0; i < Math.min(slideCount, maxSlides); i++) {
-    const filepath = path.join(SCREENSHOT_DIR, `slide-${i + 1}.png`);
-    await page.screenshot({ path: filepath });
-    screenshots.push({ index: i + 1, path: filepath });
+// Check the active slide for common layout issues
+async function findLayoutIssues(page) {
+  const issues = [];
 
-    // Get slide title
-    const title = await page.locator('.slide.is-active').getAttribute('data-title') || `Slide ${i + 1}`;
-    screenshots[i].title = title;
-
-    // Check for common layout issues
-    const issues = [];
-
-    // Check if images are cropped (overflow hidden)
-    const images = await page.locator('.slide.is-active img').all();
-    for (const img of images) {
-      const box = await img.boundingBox();
-      if (box && (box.y < 0 || box.y + box.height > VIEWPORT.height)) {
-        issues.push('Image may be cropped vertically');
-      }
+  // Check if images are cropped (overflow hidden)
+  const images = await page.locator('.slide.is-active img').all();
+  for (const img of images) {
+    const box = await img.boundingBox();
+    if (box && (box.y < 0 || box.y + box.height > VIEWPORT.height)) {
+      issues.push('Image may be cropped vertically');
     }
+  }
 
-    // Check for empty media frames
-    const emptyFrames = await page.locator('.slide.is-active .media-placeholder').count();
-    if (emptyFrames > 0) {
-      issues.push('Contains empty media placeholder');
-    }
+  // Check for empty media frames
+  const emptyFrames = await page.locator('.slide.is-active .media-placeholder').count();
+  if (emptyFrames > 0) {
+    issues.push('Contains empty media placeholder');
+  }
 
-    screenshots[i].issues = issues;
+  return issues;
+}
 
-    await page.keyboard.press('ArrowRight');
-    await page.waitForTimeout(600);
-  }
+async function reviewSlides(url, maxSlides = 6, cacheDir = null) {
+  const capture = await captureSlides(url, {
+    viewport: VIEWPORT,
+    maxSlides,
+    screenshotDir: SCREENSHOT_DIR,
+    inspect: findLayoutIssues,
+    cacheDir,
+  });
 
-  await browser.close();
-  return { slideCount, screenshots };
+  const screenshots = capture.slides.map((slide) => ({
+    index: slide.index,
+    path: slide.screenshot,
+    title: slide.title,
+    issues: slide.inspected,
+    changed: slide.changed,
+  }));
+  return { slideCount: capture.slideCount, screenshots };
 }
 
 async function main() {
   const args = process.argv.slice(2);
   const deckPath = args.find(a => !a.startsWith('--')) || 'decks/skill-demo';
   const shouldServe = args.includes('--serve');
+  const cacheDir = args.includes('--no-cache') ? null : captureCacheDir(deckPath, 'layout-review');
 
   let server = null;
   let url;
 
   if (shouldServe) {
-    const port = 8921;
-    server = await startServer(port);
-    url = `http://localhost:${port}/${deckPath}/index.html`;
-    console.log(`Started local server on port ${port}`);
+    server = await startDeckServer();
+    url = `${server.url}/${deckPath}/index.html`;
+    console.log(`Started local server on port ${server.port}`);
   } else {
     // Try GitHub Pages URL first
     url = `https://dbmcco.github.io/keynote-slides-skill/${deckPath}/index.html`;
@@ -107,14 +86,15 @@ async function main() {
   console.log(`Reviewing: ${url}\n`);
 
   try {
-    const result = await captureSlides(url);
+    const result = await reviewSlides(url, 6, cacheDir);
 
     console.log(`Found ${result.slideCount} slides\n`);
     console.log('Layout Review Results:');
     console.log('======================\n');
 
     for (const slide of result.screenshots) {
-      console.log(`Slide ${slide.index}: ${slide.title}`);
+      const status = slide.changed === undefined ? '' : slide.changed ? ' (changed)' : ' (unchanged)';
+      console.log(`Slide ${slide.index}: ${slide.title}${status}`);
       console.log(`  Screenshot: ${slide.path}`);
       if (slide.issues.length > 0) {
         console.log(`  ⚠️  Issues:`);
@@ -125,10 +105,14 @@ async function main() {
       console.log('');
     }
 
+    if (cacheDir) {
+      const changed = result.screenshots.filter((slide) => slide.changed).map((slide) => slide.index);
+      console.log(`Visually changed since last run: ${changed.length ? changed.join(', ') : 'none'}`);
+    }
     console.log(`\nScreenshots saved to: ${SCREENSHOT_DIR}`);
   } finally {
     if (server) {
-      server.kill();
+      server.close();
     }
   }
 }
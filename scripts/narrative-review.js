@@ -12,10 +12,15 @@
  * Usage:
  *   node scripts/narrative-review.js decks/my-deck
  *   node scripts/narrative-review.js decks/my-deck --json
+ *
+ * Library:
+ *   require('./narrative-review').analyze(loadSlideModel(deckPath))
  */
 
-const fs = require('fs');
-const path = require('path');
+const { findSimilarPairs, jaccard, keyWords } = require('./redundancy-index');
+const { loadSlideModel } = require('./slide-model');
+
+const REDUNDANCY_THRESHOLD = 0.5;
 
 // Slide type detection patterns
 const SLIDE_PATTERNS = {
@@ -38,42 +43,8 @@ const ANTI_PATTERNS = {
   labelHeadline: (headline) => headline.length < 20 && /^[A-Z][a-z]+ ?[A-Z]?[a-z]*$/.test(headline) && !/\b(is|are|will|can|do|get|make)\b/i.test(headline),
 };
 
-function extractSlideContent(html) {
-  const slides = [];
-  const slideRegex = /<section[^>]*class="slide[^"]*"[^>]*data-title="([^"]*)"[^>]*>([\s\S]*?)<\/section>/g;
-
-  let match;
-  while ((match = slideRegex.exec(html)) !== null) {
-    const title = match[1];
-    const content = match[2];
-
-    // Extract text content
-    const textContent = content
-      .replace(/<script[^>]*>[\s\S]*?<\/script>/g, '')
-      .replace(/<style[^>]*>[\s\S]*?<\/style>/g, '')
-      .replace(/<[^>]+>/g, ' ')
-      .replace(/\s+/g, ' ')
-      .trim();
-
-    // Extract headlines
-    const headlineMatch = content.match(/<h[12][^>]*class="[^"]*title[^"]*"[^>]*>([\s\S]*?)<\/h[12]>/);
-    const headline = headlineMatch
-      ? headlineMatch[1].replace(/<[^>]+>/g, '').trim()
-      : title;
-
-    slides.push({
-      title,
-      headline,
-      content: textContent,
-      rawHtml: content,
-    });
-  }
-
-  return slides;
-}
-
 function classifySlide(slide) {
-  const text = `${slide.headline} ${slide.content}`.toLowerCase();
+  const text = `${slide.headline} ${slide.text}`.toLowerCase();
 
   for (const [type, pattern] of Object.entries(SLIDE_PATTERNS)) {
     if (pattern.test(text)) {
@@ -87,11 +58,11 @@ function classifySlide(slide) {
 function detectAntiPatterns(slide) {
   const issues = [];
 
-  if (ANTI_PATTERNS.wallOfText(slide.content)) {
+  if (ANTI_PATTERNS.wallOfText(slide.text)) {
     issues.push('Wall of text - too much content for one slide');
   }
 
-  if (ANTI_PATTERNS.tooManyBullets(slide.content)) {
+  if (ANTI_PATTERNS.tooManyBullets(slide.text)) {
     issues.push('Too many bullets - consider splitting into multiple slides');
   }
 
@@ -99,7 +70,7 @@ function detectAntiPatterns(slide) {
     issues.push(`Weak headline "${slide.headline}" - use a complete thought instead`);
   }
 
-  if (ANTI_PATTERNS.jargon(slide.content)) {
+  if (ANTI_PATTERNS.jargon(slide.text)) {
     issues.push('Contains jargon - consider simpler language');
   }
 
@@ -111,39 +82,25 @@ function detectAntiPatterns(slide) {
 }
 
 function findRedundancy(slides) {
-  const redundancies = [];
-
-  for (let i = 0; i < slides.length; i++) {
-    for (let j = i + 1; j < slides.length; j++) {
-      const similarity = calculateSimilarity(slides[i].content, slides[j].content);
-      if (similarity > 0.5) {
-        redundancies.push({
-          slides: [i + 1, j + 1],
-          titles: [slides[i].title, slides[j].title],
-          similarity: Math.round(similarity * 100),
-        });
-      }
-    }
-  }
+  // Word sets are built once per slide; long decks only compare LSH candidates
+  const words = slides.map(s => keyWords(s.tokens));
 
-  return redundancies;
+  return findSimilarPairs(words, REDUNDANCY_THRESHOLD, { strict: true }).map(({ a, b, similarity }) => ({
+    slides: [a + 1, b + 1],
+    titles: [slides[a].title, slides[b].title],
+    similarity: Math.round(similarity * 100),
+  }));
 }
 
-function calculateSimilarity(text1, text2) {
-  const words1 = new Set(text1.toLowerCase().split(/\s+/).filter(w => w.length > 3));
-  const words2 = new Set(text2.toLowerCase().split(/\s+/).filter(w => w.length > 3));
-
-  const intersection = [...words1].filter(w => words2.has(w)).length;
-  const union = new Set([...words1, ...words2]).size;
-
-  return union > 0 ? intersection / union : 0;
+function calculateSimilarity(tokens1, tokens2) {
+  return jaccard(keyWords(tokens1), keyWords(tokens2));
 }
 
-function analyzeNarrativeArc(slides) {
-  const arc = slides.map((slide, i) => ({
-    index: i + 1,
+function analyzeNarrativeArc(slideAnalysis) {
+  const arc = slideAnalysis.map((slide) => ({
+    index: slide.index,
     title: slide.title,
-    type: classifySlide(slide),
+    type: slide.type,
   }));
 
   const issues = [];
@@ -165,19 +122,19 @@ function analyzeNarrativeArc(slides) {
   }
 
   // Check for proof/evidence
-  if (!types.includes('proof') && slides.length > 5) {
+  if (!types.includes('proof') && arc.length > 5) {
     issues.push('No proof/evidence slides detected - add metrics or case studies');
   }
 
   // Check for CTA at end
-  if (slides.length > 3 && !types.slice(-2).includes('cta')) {
+  if (arc.length > 3 && !types.slice(-2).includes('cta')) {
     issues.push('No clear call-to-action in final slides');
   }
 
   return { arc, issues };
 }
 
-function analyzeFlow(slides) {
+function analyzeFlow(slides, types) {
   const issues = [];
 
   for (let i = 1; i < slides.length; i++) {
@@ -185,11 +142,11 @@ function analyzeFlow(slides) {
     const curr = slides[i];
 
     // Check for topic jumps (very different content)
-    const similarity = calculateSimilarity(prev.content, curr.content);
+    const similarity = calculateSimilarity(prev.tokens, curr.tokens);
     if (similarity < 0.1 && i < slides.length - 1) {
       // Low similarity might indicate a topic jump
-      const prevType = classifySlide(prev);
-      const currType = classifySlide(curr);
+      const prevType = types[i - 1];
+      const currType = types[i];
       if (prevType === currType) {
         // Same type but different content - might be okay
       } else if (Math.abs(i - slides.length) > 2) {
@@ -202,36 +159,36 @@ function analyzeFlow(slides) {
   return issues;
 }
 
-function generateReport(deckPath, outputJson = false) {
-  const htmlPath = path.join(deckPath, 'index.html');
-
-  if (!fs.existsSync(htmlPath)) {
-    console.error(`Deck not found: ${htmlPath}`);
-    process.exit(1);
-  }
+/**
+ * Type and issues for one slide. Uses nothing but the slide itself, so
+ * review-all can cache the result by slide hash.
+ */
+function analyzeSlide(slide) {
+  return {
+    title: slide.title,
+    headline: slide.headline,
+    type: classifySlide(slide),
+    contentLength: slide.text.length,
+    issues: detectAntiPatterns(slide),
+  };
+}
 
-  const html = fs.readFileSync(htmlPath, 'utf-8');
-  const slides = extractSlideContent(html);
+/**
+ * Narrative report from per-slide results (analyzeSlide, in slide order).
+ * Arc and flow reuse the per-slide types; redundancy compares slide tokens.
+ */
+function aggregate(model, slideResults) {
+  const { deckPath, slides } = model;
 
   if (slides.length === 0) {
-    console.error('No slides found in deck');
-    process.exit(1);
+    throw new Error('No slides found in deck');
   }
 
-  // Analysis
-  const narrativeAnalysis = analyzeNarrativeArc(slides);
-  const flowIssues = analyzeFlow(slides);
+  const slideAnalysis = slides.map((slide, i) => ({ index: slide.index, ...slideResults[i] }));
+  const narrativeAnalysis = analyzeNarrativeArc(slideAnalysis);
+  const flowIssues = analyzeFlow(slides, slideAnalysis.map((s) => s.type));
   const redundancies = findRedundancy(slides);
 
-  const slideAnalysis = slides.map((slide, i) => ({
-    index: i + 1,
-    title: slide.title,
-    headline: slide.headline,
-    type: classifySlide(slide),
-    contentLength: slide.content.length,
-    issues: detectAntiPatterns(slide),
-  }));
-
   const report = {
     deckPath,
     slideCount: slides.length,
@@ -250,24 +207,31 @@ function generateReport(deckPath, outputJson = false) {
     },
   };
 
-  if (outputJson) {
-    console.log(JSON.stringify(report, null, 2));
-    return;
-  }
+  return report;
+}
 
-  // Pretty print
-  console.log(`\nNarrative Review: ${deckPath}`);
+/**
+ * Narrative report for a slide model (see slide-model.js).
+ */
+function analyze(model) {
+  return aggregate(model, model.slides.map(analyzeSlide));
+}
+
+function printReport(report) {
+  const { flowIssues, redundancies, slides: slideAnalysis } = report;
+
+  console.log(`\nNarrative Review: ${report.deckPath}`);
   console.log('='.repeat(50));
-  console.log(`\nSlides: ${slides.length}`);
+  console.log(`\nSlides: ${report.slideCount}`);
 
   console.log('\n📊 Narrative Arc:');
-  narrativeAnalysis.arc.forEach(s => {
+  report.narrativeArc.forEach(s => {
     console.log(`  ${s.index}. [${s.type.toUpperCase()}] ${s.title}`);
   });
 
-  if (narrativeAnalysis.issues.length > 0) {
+  if (report.narrativeIssues.length > 0) {
     console.log('\n⚠️  Narrative Issues:');
-    narrativeAnalysis.issues.forEach(issue => console.log(`  - ${issue}`));
+    report.narrativeIssues.forEach(issue => console.log(`  - ${issue}`));
   }
 
   if (flowIssues.length > 0) {
@@ -300,9 +264,24 @@ function generateReport(deckPath, outputJson = false) {
   }
 }
 
-// Main
-const args = process.argv.slice(2);
-const deckPath = args.find(a => !a.startsWith('--')) || 'decks/skill-demo';
-const outputJson = args.includes('--json');
+module.exports = { aggregate, analyze, analyzeSlide, calculateSimilarity, classifySlide, printReport };
 
-generateReport(deckPath, outputJson);
+// Main
+if (require.main === module) {
+  const args = process.argv.slice(2);
+  const deckPath = args.find(a => !a.startsWith('--')) || 'decks/skill-demo';
+  const outputJson = args.includes('--json');
+
+  try {
+    const report = analyze(loadSlideModel(deckPath));
+
+    if (outputJson) {
+      console.log(JSON.stringify(report, null, 2));
+    } else {
+      printReport(report);
+    }
+  } catch (error) {
+    console.error(error.message);
+    process.exit(1);
+  }
+}
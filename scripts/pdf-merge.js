@@ -0,0 +1,262 @@
+#!/usr/bin/env node
+/**
+ * Streaming PDF Merge
+ *
+ * Concatenates PDFs that Chromium's page.pdf() wrote, one input at a time,
+ * into a single output file. Objects are renumbered and written out as each
+ * input is appended, so memory holds one input, not the whole deck. Stream
+ * data is copied byte for byte and never re-encoded.
+ *
+ * Each input keeps its own page tree. That tree becomes one kid of the
+ * merged root /Pages node, so inherited page attributes (MediaBox,
+ * Resources) stay valid without flattening. Catalog-level extras of the
+ * inputs (outlines, named destinations, structure trees) are dropped.
+ *
+ * Only classic cross-reference tables without incremental updates are
+ * read. That is what Chromium writes. Other PDFs are rejected, not
+ * misread.
+ *
+ * Usage:
+ *   node scripts/pdf-merge.js <output.pdf> <input.pdf>...
+ *
+ * Library:
+ *   const merger = await createPdfMerger('deck.pdf');
+ *   await merger.append('part-1.pdf');
+ *   await merger.append(bufferOfPart2);
+ *   const { pages } = await merger.finish();     // merger.abort() on failure
+ */
+
+const fs = require('fs');
+
+// Output objects 1 and 2 are the merged catalog and root page tree
+const CATALOG = 1;
+const ROOT_PAGES = 2;
+
+const REFERENCE = /(\d+)\s+(\d+)\s+R\b/g;
+
+/**
+ * Parse one PDF into { version, objects: Map(num -> offset), root, info }.
+ * `text` is the file as latin1, so string indices are byte offsets.
+ */
+function readPdf(buffer) {
+  const text = buffer.toString('latin1');
+  const version = (text.match(/^%PDF-(\d\.\d)/) || [])[1];
+  if (!version) throw new Error('Not a PDF (missing %PDF header)');
+
+  const startxref = text.lastIndexOf('startxref');
+  if (startxref < 0) throw new Error('PDF has no startxref');
+  const xrefOffset = parseInt(text.slice(startxref + 9).trim(), 10);
+  if (!text.startsWith('xref', xrefOffset)) {
+    throw new Error('Unsupported PDF: cross-reference streams are not read (expected Chromium output)');
+  }
+
+  const trailerAt = text.indexOf('trailer', xrefOffset);
+  if (trailerAt < 0) throw new Error('PDF has no trailer');
+  const objects = new Map();
+  const lines = text.slice(xrefOffset + 4, trailerAt).trim().split(/\r\n|\r|\n/);
+  for (let i = 0; i < lines.length;) {
+    const [start, count] = lines[i].trim().split(/\s+/).map(Number);
+    for (let n = 0; n < count; n++) {
+      const [offset, , type] = lines[i + 1 + n].trim().split(/\s+/);
+      if (type === 'n') objects.set(start + n, Number(offset));
+    }
+    i += 1 + count;
+  }
+
+  const trailer = dictionaryAt(text, trailerAt + 7);
+  if (/\/Prev\s/.test(trailer)) throw new Error('Unsupported PDF: incremental updates are not read');
+  const root = referenceIn(trailer, 'Root');
+  if (root === null) throw new Error('PDF trailer has no /Root');
+  return { text, buffer, version, objects, root, info: referenceIn(trailer, 'Info') };
+}
+
+// Balanced << ... >> starting at or after `from`
+function dictionaryAt(text, from) {
+  const start = text.indexOf('<<', from);
+  let depth = 0;
+  for (let i = start; i < text.length - 1; i++) {
+    if (text[i] === '<' && text[i + 1] === '<') {
+      depth++;
+      i++;
+    } else if (text[i] === '>' && text[i + 1] === '>') {
+      depth--;
+      i++;
+      if (depth === 0) return text.slice(start, i + 1);
+    }
+  }
+  throw new Error('Unterminated PDF dictionary');
+}
+
+function referenceIn(dictionary, key) {
+  const match = dictionary.match(new RegExp(`/${key}\\s+(\\d+)\\s+\\d+\\s+R`));
+  return match ? Number(match[1]) : null;
+}
+
+/**
+ * One indirect object: { body, stream } where body is the text between
+ * "obj" and "stream"/"endobj", and stream the raw stream bytes (or null).
+ */
+function objectAt(pdf, num) {
+  const { text, buffer } = pdf;
+  const offset = pdf.objects.get(num);
+  const header = text.slice(offset, offset + 32).match(/^\s*(\d+)\s+(\d+)\s+obj/);
+  if (!header || Number(header[1]) !== num) throw new Error(`Broken cross-reference for object ${num}`);
+  const bodyStart = offset + header[0].length;
+
+  const endobj = text.indexOf('endobj', bodyStart);
+  const streamAt = text.indexOf('stream', bodyStart);
+  if (streamAt < 0 || (endobj >= 0 && endobj < streamAt)) {
+    if (endobj < 0) throw new Error(`Object ${num} has no endobj`);
+    return { body: text.slice(bodyStart, endobj).trim(), stream: null };
+  }
+
+  const body = text.slice(bodyStart, streamAt).trim();
+  let dataStart = streamAt + 6;
+  if (text[dataStart] === '\r') dataStart++;
+  if (text[dataStart] === '\n') dataStart++;
+  const direct = body.match(/\/Length\s+(\d+)\b(?!\s+\d+\s+R)/);
+  const length = direct ? Number(direct[1]) : Number(objectAt(pdf, referenceIn(body, 'Length')).body);
+  if (!Number.isFinite(length)) throw new Error(`Object ${num} has no stream /Length`);
+  return { body, stream: buffer.subarray(dataStart, dataStart + length) };
+}
+
+/**
+ * Start a merged PDF at outputPath. It is written to a temp file and
+ * renamed on finish(), so readers never see a partial PDF.
+ */
+async function createPdfMerger(outputPath) {
+  const tmpPath = `${outputPath}.${process.pid}.tmp`;
+  const handle = await fs.promises.open(tmpPath, 'w');
+  const offsets = [];   // offsets[n] = byte offset of output object n
+  const kids = [];      // each input's root page tree, renumbered
+  let position = 0;
+  let nextNumber = ROOT_PAGES + 1;
+  let pageCount = 0;
+  let started = false;
+
+  const write = async (chunks) => {
+    const data = Buffer.concat(chunks.map((chunk) => (typeof chunk === 'string' ? Buffer.from(chunk, 'latin1') : chunk)));
+    await handle.write(data);
+    position += data.length;
+  };
+
+  async function append(input) {
+    const pdf = readPdf(Buffer.isBuffer(input) ? input : await fs.promises.readFile(input));
+    const catalog = objectAt(pdf, pdf.root).body;
+    const pagesRoot = referenceIn(catalog, 'Pages');
+    if (pagesRoot === null) throw new Error('PDF catalog has no /Pages');
+
+    // Renumber everything except the input's own catalog and info
+    const renumber = new Map();
+    for (const num of [...pdf.objects.keys()].sort((a, b) => a - b)) {
+      if (num !== pdf.root && num !== pdf.info) renumber.set(num, nextNumber++);
+    }
+    const rewrite = (body) => body.replace(REFERENCE, (_, num) => (renumber.has(Number(num)) ? `${renumber.get(Number(num))} 0 R` : 'null'));
+
+    const chunks = [];
+    let at = position;
+    const push = (chunk) => {
+      chunks.push(chunk);
+      at += Buffer.byteLength(chunk, typeof chunk === 'string' ? 'latin1' : undefined);
+    };
+    if (!started) {
+      // Binary comment marks the file as binary for transfer tools
+      push(`%PDF-${pdf.version}\n%\xE2\xE3\xCF\xD3\n`);
+      started = true;
+    }
+
+    for (const [num, outNum] of renumber) {
+      const object = objectAt(pdf, num);
+      let body = rewrite(object.body);
+      if (num === pagesRoot) {
+        pageCount += Number((body.match(/\/Count\s+(\d+)/) || [])[1] || 0);
+        body = body.replace(/\/Parent\s+(\d+\s+\d+\s+R|null)/, '').replace('<<', `<< /Parent ${ROOT_PAGES} 0 R`);
+      }
+      offsets[outNum] = at;
+      push(`${outNum} 0 obj\n${body}\n`);
+      if (object.stream) {
+        push('stream\n');
+        push(object.stream);
+        push('\nendstream\n');
+      }
+      push('endobj\n');
+    }
+
+    kids.push(renumber.get(pagesRoot));
+    await write(chunks);
+  }
+
+  async function finish() {
+    if (!started) throw new Error('Nothing to merge');
+    const chunks = [];
+    let at = position;
+    const push = (chunk) => {
+      chunks.push(chunk);
+      at += Buffer.byteLength(chunk, 'latin1');
+    };
+    offsets[CATALOG] = at;
+    push(`${CATALOG} 0 obj\n<< /Type /Catalog /Pages ${ROOT_PAGES} 0 R >>\nendobj\n`);
+    offsets[ROOT_PAGES] = at;
+    push(`${ROOT_PAGES} 0 obj\n<< /Type /Pages /Kids [${kids.map((kid) => `${kid} 0 R`).join(' ')}] /Count ${pageCount} >>\nendobj\n`);
+
+    const xrefAt = at;
+    push(`xref\n0 ${nextNumber}\n0000000000 65535 f \n`);
+    for (let n = 1; n < nextNumber; n++) {
+      push(`${String(offsets[n]).padStart(10, '0')} 00000 n \n`);
+    }
+    push(`trailer\n<< /Size ${nextNumber} /Root ${CATALOG} 0 R >>\nstartxref\n${xrefAt}\n%%EOF\n`);
+    await write(chunks);
+    await handle.close();
+    await fs.promises.rename(tmpPath, outputPath);
+    return { path: outputPath, pages: pageCount, inputs: kids.length };
+  }
+
+  async function abort() {
+    await handle.close().catch(() => {});
+    await fs.promises.unlink(tmpPath).catch(() => {});
+  }
+
+  return { append, finish, abort };
+}
+
+/**
+ * Merge input PDFs (paths or buffers) into outputPath, in order.
+ */
+async function mergePdfs(inputs, outputPath) {
+  const merger = await createPdfMerger(outputPath);
+  try {
+    for (const input of inputs) await merger.append(input);
+    return await merger.finish();
+  } catch (error) {
+    await merger.abort();
+    throw error;
+  }
+}
+
+/**
+ * Page count of a PDF, read from its root page tree.
+ */
+function countPages(buffer) {
+  const pdf = readPdf(buffer);
+  const pages = referenceIn(objectAt(pdf, pdf.root).body, 'Pages');
+  return Number((objectAt(pdf, pages).body.match(/\/Count\s+(\d+)/) || [])[1] || 0);
+}
+
+async function main() {
+  const [outputPath, ...inputs] = process.argv.slice(2);
+  if (!outputPath || inputs.length === 0) {
+    console.log('Usage: node scripts/pdf-merge.js <output.pdf> <input.pdf>...');
+    process.exit(outputPath === '--help' || outputPath === '-h' ? 0 : 1);
+  }
+  const { pages } = await mergePdfs(inputs, outputPath);
+  console.log(`Merged ${inputs.length} PDFs (${pages} pages) into ${outputPath}`);
+}
+
+if (require.main === module) {
+  main().catch((error) => {
+    console.error(error.message || error);
+    process.exit(1);
+  });
+}
+
+module.exports = { countPages, createPdfMerger, mergePdfs };
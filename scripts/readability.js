@@ -11,10 +11,12 @@
  * Usage:
  *   node scripts/readability.js decks/my-deck
  *   node scripts/readability.js decks/my-deck --json
+ *
+ * Library:
+ *   require('./readability').analyze(loadSlideModel(deckPath))
  */
 
-const fs = require('fs');
-const path = require('path');
+const { loadSlideModel } = require('./slide-model');
 
 // ============================================================================
 // SYLLABLE COUNTING (Heuristic)
@@ -132,68 +134,34 @@ function findJargon(text) {
   return jargon;
 }
 
-// ============================================================================
-// TEXT EXTRACTION
-// ============================================================================
-
-function extractSlideContent(html) {
-  const slides = [];
-  const slideRegex = /<section[^>]*class="slide[^"]*"[^>]*data-title="([^"]*)"[^>]*>([\s\S]*?)<\/section>/g;
-
-  let match;
-  while ((match = slideRegex.exec(html)) !== null) {
-    const title = match[1];
-    const content = match[2];
-
-    // Extract text content
-    const textContent = content
-      .replace(/<script[^>]*>[\s\S]*?<\/script>/g, '')
-      .replace(/<style[^>]*>[\s\S]*?<\/style>/g, '')
-      .replace(/<[^>]+>/g, ' ')
-      .replace(/&nbsp;/g, ' ')
-      .replace(/&amp;/g, '&')
-      .replace(/&lt;/g, '<')
-      .replace(/&gt;/g, '>')
-      .replace(/&#?\w+;/g, ' ')
-      .replace(/\s+/g, ' ')
-      .trim();
-
-    slides.push({
-      title,
-      content: textContent,
-    });
-  }
-
-  return slides;
-}
-
 // ============================================================================
 // READABILITY ANALYSIS
 // ============================================================================
 
-function tokenize(text) {
+function tokenize(slide) {
   // Split into sentences (simple heuristic)
-  const sentences = text
+  const sentences = slide.text
     .split(/[.!?]+/)
     .map(s => s.trim())
     .filter(s => s.length > 0);
 
-  // Split into words
-  const words = text
-    .toLowerCase()
-    .split(/\s+/)
-    .filter(w => /^[a-z]+$/i.test(w) && w.length > 0);
+  // Alphabetic words only
+  const words = slide.tokens.filter(w => /^[a-z]+$/.test(w));
 
   return { sentences, words };
 }
 
+/**
+ * Readability metrics for one slide. Uses nothing but the slide itself, so
+ * review-all can cache the result by slide hash.
+ */
 function analyzeSlide(slide) {
-  const { sentences, words } = tokenize(slide.content);
+  const { sentences, words } = tokenize(slide);
 
   if (words.length === 0) {
     return {
       title: slide.title,
-      content: slide.content,
+      content: slide.text,
       wordCount: 0,
       sentenceCount: 0,
       fleschKincaidGrade: null,
@@ -226,13 +194,13 @@ function analyzeSlide(slide) {
     : null;
 
   // Passive voice detection
-  const passiveMatches = findPassiveVoice(slide.content);
+  const passiveMatches = findPassiveVoice(slide.text);
   const passiveVoicePercent = sentences.length > 0
     ? (passiveMatches.length / sentences.length) * 100
     : 0;
 
   // Jargon detection
-  const jargonMatches = findJargon(slide.content);
+  const jargonMatches = findJargon(slide.text);
   const jargonDensity = words.length > 0
     ? (jargonMatches.length / words.length) * 100
     : 0;
@@ -271,7 +239,7 @@ function analyzeSlide(slide) {
 
   return {
     title: slide.title,
-    content: slide.content,
+    content: slide.text,
     wordCount: words.length,
     sentenceCount: sentences.length,
     fleschKincaidGrade: fleschKincaidGrade !== null ? parseFloat(fleschKincaidGrade.toFixed(2)) : null,
@@ -287,24 +255,19 @@ function analyzeSlide(slide) {
   };
 }
 
-function analyzeDeck(deckPath) {
-  const htmlPath = path.join(deckPath, 'index.html');
-
-  if (!fs.existsSync(htmlPath)) {
-    throw new Error(`Deck not found: ${htmlPath}`);
-  }
-
-  const html = fs.readFileSync(htmlPath, 'utf-8');
-  const slides = extractSlideContent(html);
+/**
+ * Readability report from per-slide results (analyzeSlide, in slide order).
+ */
+function aggregate(model, slideResults) {
+  const { deckPath, slides } = model;
 
   if (slides.length === 0) {
     throw new Error('No slides found in deck');
   }
 
-  // Analyze each slide
   const slideAnalysis = slides.map((slide, i) => ({
-    index: i + 1,
-    ...analyzeSlide(slide),
+    index: slide.index,
+    ...slideResults[i],
   }));
 
   // Calculate deck averages
@@ -434,23 +397,38 @@ function printReport(report) {
   }
 }
 
+/**
+ * Readability report for a slide model (see slide-model.js).
+ */
+function analyze(model) {
+  return aggregate(model, model.slides.map(analyzeSlide));
+}
+
+function analyzeDeck(deckPath) {
+  return analyze(loadSlideModel(deckPath));
+}
+
+module.exports = { aggregate, analyze, analyzeDeck, analyzeSlide, countSyllables, findJargon, findPassiveVoice, printReport };
+
 // ============================================================================
 // MAIN
 // ============================================================================
 
-const args = process.argv.slice(2);
-const deckPath = args.find(a => !a.startsWith('--')) || 'decks/skill-demo';
-const outputJson = args.includes('--json');
+if (require.main === module) {
+  const args = process.argv.slice(2);
+  const deckPath = args.find(a => !a.startsWith('--')) || 'decks/skill-demo';
+  const outputJson = args.includes('--json');
 
-try {
-  const report = analyzeDeck(deckPath);
+  try {
+    const report = analyzeDeck(deckPath);
 
-  if (outputJson) {
-    console.log(JSON.stringify(report, null, 2));
-  } else {
-    printReport(report);
+    if (outputJson) {
+      console.log(JSON.stringify(report, null, 2));
+    } else {
+      printReport(report);
+    }
+  } catch (error) {
+    console.error(`Error: ${error.message}`);
+    process.exit(1);
   }
-} catch (error) {
-  console.error(`Error: ${error.message}`);
-  process.exit(1);
 }
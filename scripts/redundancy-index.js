@@ -0,0 +1,213 @@
+#!/usr/bin/env node
+/**
+ * Slide Redundancy Index (MinHash + LSH)
+ *
+ * Finds near-duplicate slides by Jaccard similarity of their key words
+ * (tokens longer than 3 characters, as in narrative-review.js), within one
+ * deck or across every deck in a library.
+ *
+ * Each slide's word set gets a 126-value MinHash signature. Locality-
+ * sensitive hashing splits the signature into 42 bands of 3 rows, and only
+ * slides that share a band bucket are compared exactly. A pair at the 0.5
+ * threshold collides in some band with probability 1 - (1 - 0.5^3)^42,
+ * about 99.6%. The cost is near-linear in the number of slides, not one
+ * comparison per pair.
+ *
+ * Usage:
+ *   node scripts/redundancy-index.js                    (all decks under decks/)
+ *   node scripts/redundancy-index.js decks --deck decks/my-deck
+ *   node scripts/redundancy-index.js decks --threshold 0.6 --json
+ *
+ * Library:
+ *   const { keyWords, findSimilarPairs } = require('./redundancy-index');
+ *   findSimilarPairs(slides.map((s) => keyWords(s.tokens)), 0.5); // [{ a, b, similarity }]
+ */
+
+const fs = require('fs');
+const path = require('path');
+
+const { loadSlideModel } = require('./slide-model');
+
+const BANDS = 42;
+const ROWS = 3;
+const NUM_HASHES = BANDS * ROWS;
+const DEFAULT_THRESHOLD = 0.5;
+
+// Below this many pairs an exact all-pairs pass is cheaper than hashing
+const EXACT_MAX_PAIRS = 2000;
+
+// murmur3 finalizer: a cheap, well-mixed 32-bit hash
+function fmix32(h) {
+  h ^= h >>> 16;
+  h = Math.imul(h, 0x85ebca6b);
+  h ^= h >>> 13;
+  h = Math.imul(h, 0xc2b2ae35);
+  h ^= h >>> 16;
+  return h >>> 0;
+}
+
+// One seed per MinHash function; fixed so signatures are reproducible
+const SEEDS = Uint32Array.from({ length: NUM_HASHES }, (_, i) => fmix32(Math.imul(i + 1, 0x9e3779b9)));
+
+// FNV-1a over UTF-16 code units
+function hashToken(token) {
+  let h = 0x811c9dc5;
+  for (let i = 0; i < token.length; i++) {
+    h ^= token.charCodeAt(i);
+    h = Math.imul(h, 0x01000193);
+  }
+  return h >>> 0;
+}
+
+function keyWords(tokens) {
+  return new Set(tokens.filter((w) => w.length > 3));
+}
+
+function jaccard(words1, words2) {
+  let intersection = 0;
+  for (const w of words1) {
+    if (words2.has(w)) intersection++;
+  }
+  const union = words1.size + words2.size - intersection;
+
+  return union > 0 ? intersection / union : 0;
+}
+
+function minhash(words) {
+  const signature = new Uint32Array(NUM_HASHES).fill(0xffffffff);
+  for (const word of words) {
+    const base = hashToken(word);
+    for (let i = 0; i < NUM_HASHES; i++) {
+      const value = fmix32(base ^ SEEDS[i]);
+      if (value < signature[i]) signature[i] = value;
+    }
+  }
+  return signature;
+}
+
+/**
+ * LSH index over word sets. add() returns the ids already indexed that share
+ * a band bucket with the new set, so building the index and collecting
+ * candidate pairs is one pass.
+ */
+function createLshIndex() {
+  const buckets = new Map();
+
+  const bandKeys = (signature) => {
+    const keys = [];
+    for (let band = 0; band < BANDS; band++) {
+      const start = band * ROWS;
+      keys.push(`${band}:${signature.subarray(start, start + ROWS).join(',')}`);
+    }
+    return keys;
+  };
+
+  return {
+    add(id, words) {
+      const candidates = new Set();
+      if (words.size === 0) return candidates;
+      for (const key of bandKeys(minhash(words))) {
+        const bucket = buckets.get(key);
+        if (bucket) {
+          bucket.forEach((other) => candidates.add(other));
+          bucket.push(id);
+        } else {
+          buckets.set(key, [id]);
+        }
+      }
+      return candidates;
+    },
+  };
+}
+
+/**
+ * Pairs of word sets at or above threshold (Jaccard), sorted by a then b.
+ * Small inputs are compared exactly; larger ones go through LSH.
+ * With strict, a pair must be above the threshold rather than equal to it.
+ */
+function findSimilarPairs(wordSets, threshold = DEFAULT_THRESHOLD, options = {}) {
+  const pairs = [];
+  const keep = (a, b) => {
+    const similarity = jaccard(wordSets[a], wordSets[b]);
+    if (options.strict ? similarity > threshold : similarity >= threshold) {
+      pairs.push({ a, b, similarity });
+    }
+  };
+
+  const n = wordSets.length;
+  if (!options.lsh && (n * (n - 1)) / 2 <= EXACT_MAX_PAIRS) {
+    for (let a = 0; a < n; a++) {
+      for (let b = a + 1; b < n; b++) keep(a, b);
+    }
+    return pairs;
+  }
+
+  const index = createLshIndex();
+  for (let b = 0; b < n; b++) {
+    for (const a of index.add(b, wordSets[b])) keep(a, b);
+  }
+  return pairs.sort((x, y) => x.a - y.a || x.b - y.b);
+}
+
+/**
+ * Similar slides across every deck under decksRoot (or only pairs touching
+ * onlyDeck). Pairs within one deck are included too.
+ */
+function findLibraryRedundancy(decksRoot, threshold = DEFAULT_THRESHOLD, onlyDeck = null) {
+  const slides = [];
+  const decks = fs.readdirSync(decksRoot, { withFileTypes: true })
+    .filter((entry) => entry.isDirectory() && fs.existsSync(path.join(decksRoot, entry.name, 'index.html')))
+    .map((entry) => entry.name)
+    .sort();
+
+  for (const deck of decks) {
+    for (const slide of loadSlideModel(path.join(decksRoot, deck)).slides) {
+      slides.push({ deck, index: slide.index, title: slide.title, words: keyWords(slide.tokens) });
+    }
+  }
+
+  const target = onlyDeck ? path.basename(path.resolve(onlyDeck)) : null;
+  return findSimilarPairs(slides.map((s) => s.words), threshold, { lsh: true })
+    .filter(({ a, b }) => !target || slides[a].deck === target || slides[b].deck === target)
+    .map(({ a, b, similarity }) => ({
+      similarity: Math.round(similarity * 100),
+      slides: [a, b].map((i) => ({ deck: slides[i].deck, index: slides[i].index, title: slides[i].title })),
+    }));
+}
+
+module.exports = {
+  DEFAULT_THRESHOLD,
+  createLshIndex,
+  findLibraryRedundancy,
+  findSimilarPairs,
+  jaccard,
+  keyWords,
+  minhash,
+};
+
+// Main
+if (require.main === module) {
+  const args = process.argv.slice(2);
+  const valueOf = (flag) => (args.indexOf(flag) >= 0 ? args[args.indexOf(flag) + 1] : null);
+  const decksRoot = args.find((a, i) => !a.startsWith('--') && !['--deck', '--threshold'].includes(args[i - 1])) || 'decks';
+  const threshold = parseFloat(valueOf('--threshold')) || DEFAULT_THRESHOLD;
+
+  try {
+    const pairs = findLibraryRedundancy(decksRoot, threshold, valueOf('--deck'));
+
+    if (args.includes('--json')) {
+      console.log(JSON.stringify({ decksRoot, threshold, pairs }, null, 2));
+    } else {
+      console.log(`\nSlide Redundancy: ${decksRoot} (threshold ${Math.round(threshold * 100)}%)`);
+      console.log('='.repeat(50));
+      for (const pair of pairs) {
+        const [a, b] = pair.slides;
+        console.log(`  ${pair.similarity}%  ${a.deck} #${a.index} "${a.title}"  ~  ${b.deck} #${b.index} "${b.title}"`);
+      }
+      console.log(`\n${pairs.length} similar slide pair(s)`);
+    }
+  } catch (error) {
+    console.error(`Error: ${error.message}`);
+    process.exit(1);
+  }
+}
@@ -13,71 +13,222 @@
  * - readability.js: FK grade, passive voice, jargon
  * - narrative-review.js: Arc, flow, redundancy
  *
+ * The deck is parsed once into the shared slide model (slide-model.js,
+ * cached in resources/materials/slide-model.json) and the static analyzers
+ * run in-process against it, one after another. Spawned analyzers (the
+ * Playwright pass) start first and run in a pool sized to the available
+ * cores, so they overlap the static work. --jobs N sizes only that pool.
+ *
+ * Static results are cached per slide by content hash (review-cache.js), so
+ * after editing one slide only that slide is re-analyzed; deck-level results
+ * are rebuilt from the cached parts. --no-cache forces a full pass.
+ *
+ * --watch keeps running: it watches index.html, deck-config.js and
+ * resources/, keeps the slide model, review cache, local server and
+ * Chromium warm, and re-runs only the analyzers whose inputs changed.
+ * Static results are written first; the design pass updates the report
+ * again when it finishes.
+ *
  * Usage:
  *   node scripts/review-all.js decks/my-deck
  *   node scripts/review-all.js decks/my-deck --json
  *   node scripts/review-all.js decks/my-deck --serve (for design-quality Playwright)
+ *   node scripts/review-all.js decks/my-deck --serve --jobs 2 (cap spawned analyzers)
+ *   node scripts/review-all.js decks/my-deck --no-cache
+ *   node scripts/review-all.js decks/my-deck --watch --serve
  *
  * Outputs:
  *   - Console summary (default)
- *   - JSON to resources/materials/full-analysis.json (always)
+ *   - JSON to resources/materials/full-analysis.json (always), including
+ *     per-analyzer wall times under `timings`
  *   - Feeds deck-review.js agent prompts with real data
  */
 
-const { execSync, spawnSync } = require('child_process');
+const { spawn } = require('child_process');
 const fs = require('fs');
+const os = require('os');
 const path = require('path');
 
-const SCRIPTS_DIR = __dirname;
+const { captureCacheDir } = require('./capture-service');
+const { startDeckServer } = require('./deck-server');
+const { analyzeWithCache, loadReviewCache, saveReviewCache } = require('./review-cache');
+const { loadSlideModel } = require('./slide-model');
 
-// Analysis scripts to run (order matters for dependencies)
+const SCRIPTS_DIR = __dirname;
+const ANALYZER_TIMEOUT_MS = 60000;
+const MAX_OUTPUT_BYTES = 10 * 1024 * 1024;
+const WATCH_DEBOUNCE_MS = 100;
+
+// Deck-relative inputs each analyzer reads (a trailing / covers a folder).
+// Static analyzers only parse index.html; the rendered pass also depends
+// on the deck config and assets.
+const STATIC_INPUTS = ['index.html'];
+const RENDER_INPUTS = ['index.html', 'deck-config.js', 'resources/'];
+
+// Analysis scripts to run (none depends on another's output). Static
+// analyzers export analyze(model); the rest run as child processes.
 const ANALYZERS = [
-  { name: 'visual-density', script: 'visual-density.js', type: 'static' },
-  { name: 'image-analysis', script: 'image-analysis.js', type: 'static' },
-  { name: 'narrative-review', script: 'narrative-review.js', type: 'static' },
-  { name: 'emotional-arc', script: 'emotional-arc.js', type: 'static' },
-  { name: 'readability', script: 'readability.js', type: 'static' },
-  { name: 'design-quality', script: 'design-quality.js', type: 'playwright', needsServe: true },
+  { name: 'visual-density', script: 'visual-density.js', type: 'static', inputs: STATIC_INPUTS },
+  { name: 'image-analysis', script: 'image-analysis.js', type: 'static', inputs: STATIC_INPUTS },
+  { name: 'narrative-review', script: 'narrative-review.js', type: 'static', inputs: STATIC_INPUTS },
+  { name: 'emotional-arc', script: 'emotional-arc.js', type: 'static', inputs: STATIC_INPUTS },
+  { name: 'readability', script: 'readability.js', type: 'static', inputs: STATIC_INPUTS },
+  { name: 'design-quality', script: 'design-quality.js', type: 'playwright', needsServe: true, inputs: RENDER_INPUTS },
 ];
 
+function defaultConcurrency() {
+  return typeof os.availableParallelism === 'function' ? os.availableParallelism() : os.cpus().length;
+}
+
 function runAnalyzer(analyzer, deckPath, options = {}) {
   const scriptPath = path.join(SCRIPTS_DIR, analyzer.script);
 
   if (!fs.existsSync(scriptPath)) {
-    return { error: `Script not found: ${analyzer.script}` };
+    return Promise.resolve({ error: `Script not found: ${analyzer.script}` });
   }
 
   const args = [scriptPath, deckPath, '--json'];
   if (options.serve && analyzer.needsServe) {
     args.push('--serve');
   }
+  if (options.cache === false) {
+    args.push('--no-cache');
+  }
 
-  try {
-    const result = spawnSync('node', args, {
-      encoding: 'utf-8',
-      timeout: 60000, // 60 second timeout
-      maxBuffer: 10 * 1024 * 1024, // 10MB buffer
-    });
+  return new Promise((resolve) => {
+    const child = spawn(process.execPath, args, { stdio: ['ignore', 'pipe', 'pipe'] });
+    const stdout = [];
+    const stderr = [];
+    let outputBytes = 0;
+    let failure = null;
 
-    if (result.error) {
-      return { error: result.error.message };
-    }
+    const fail = (message) => {
+      if (!failure) failure = message;
+      child.kill('SIGKILL');
+    };
+    const timer = setTimeout(() => fail(`Timed out after ${ANALYZER_TIMEOUT_MS / 1000}s`), ANALYZER_TIMEOUT_MS);
 
-    if (result.status !== 0) {
-      return { error: result.stderr || `Exit code ${result.status}` };
-    }
+    child.stdout.on('data', (chunk) => {
+      outputBytes += chunk.length;
+      if (outputBytes > MAX_OUTPUT_BYTES) fail('Output exceeded 10MB');
+      else stdout.push(chunk);
+    });
+    child.stderr.on('data', (chunk) => stderr.push(chunk));
+    child.on('error', (e) => fail(e.message));
+
+    child.on('close', (code) => {
+      clearTimeout(timer);
+      const out = Buffer.concat(stdout).toString('utf-8');
+      if (failure) return resolve({ error: failure });
+      if (code !== 0) {
+        return resolve({ error: Buffer.concat(stderr).toString('utf-8') || `Exit code ${code}` });
+      }
+
+      // Parse JSON output
+      try {
+        resolve(JSON.parse(out));
+      } catch (e) {
+        resolve({ error: `JSON parse error: ${e.message}`, raw: out });
+      }
+    });
+  });
+}
 
-    // Parse JSON output
-    try {
-      return JSON.parse(result.stdout);
-    } catch (e) {
-      return { error: `JSON parse error: ${e.message}`, raw: result.stdout };
+/**
+ * Run a static analyzer against the shared slide model, reusing cached
+ * per-slide results when a review cache is given. The report is
+ * round-tripped through JSON so it matches the analyzer's --json output.
+ */
+function runInProcess(analyzer, model, cache) {
+  const scriptPath = path.join(SCRIPTS_DIR, analyzer.script);
+  try {
+    if (!cache) {
+      return { result: JSON.parse(JSON.stringify(require(scriptPath).analyze(model))) };
     }
+    const { report, reused, analyzed } = analyzeWithCache(cache, analyzer.name, scriptPath, model);
+    return { result: JSON.parse(JSON.stringify(report)), slides: { reused, analyzed } };
+  } catch (e) {
+    return { result: { error: e.message } };
+  }
+}
+
+/**
+ * Run the design pass on the watch session's warm server and browser.
+ */
+async function runWarm(analyzer, deckPath, session) {
+  try {
+    const url = `${session.url}/${deckPath}/index.html`;
+    const cacheDir = session.cache ? captureCacheDir(deckPath, analyzer.name) : null;
+    const result = await session.analyzeDesignQuality(url, 20, { browser: session.browser, cacheDir });
+    return JSON.parse(JSON.stringify(result));
   } catch (e) {
     return { error: e.message };
   }
 }
 
+/**
+ * Run analyzers: spawned ones start first, at most `concurrency` at once,
+ * then the static ones run serially in-process on one parsed slide model
+ * while the children work, so `concurrency` (--jobs) sizes only the
+ * spawned pool. With options.cache the static ones go through the
+ * per-slide review cache (pass a loaded cache to keep it across runs).
+ * With options.session the Playwright pass uses that warm server and
+ * browser instead of a child.
+ *
+ * Calls onDone(analyzer, result, ms) as each finishes and resolves to
+ * { name: { result, ms } }.
+ */
+async function runAnalyzers(analyzers, deckPath, options = {}, onDone = () => {}) {
+  const concurrency = Math.max(1, options.concurrency || defaultConcurrency());
+  const outcomes = {};
+
+  const record = (analyzer, outcome, start) => {
+    const ms = Number(process.hrtime.bigint() - start) / 1e6;
+    outcomes[analyzer.name] = { ...outcome, ms };
+    onDone(analyzer, outcome.result, ms);
+  };
+
+  const queue = analyzers.filter((a) => a.type !== 'static');
+  const worker = async () => {
+    while (queue.length > 0) {
+      const analyzer = queue.shift();
+      const start = process.hrtime.bigint();
+      const result = options.session
+        ? await runWarm(analyzer, deckPath, options.session)
+        : await runAnalyzer(analyzer, deckPath, options);
+      record(analyzer, { result }, start);
+    }
+  };
+  const workers = Array.from({ length: Math.min(concurrency, queue.length) }, worker);
+
+  const staticAnalyzers = analyzers.filter((a) => a.type === 'static');
+  if (staticAnalyzers.length > 0) {
+    let model = options.model;
+    let modelError = null;
+    if (!model) {
+      try {
+        model = loadSlideModel(deckPath);
+      } catch (e) {
+        modelError = e.message;
+      }
+    }
+    let cache = null;
+    if (options.cache && !modelError) {
+      cache = options.cache === true ? loadReviewCache(deckPath) : options.cache;
+    }
+    for (const analyzer of staticAnalyzers) {
+      const start = process.hrtime.bigint();
+      record(analyzer, modelError ? { result: { error: modelError } } : runInProcess(analyzer, model, cache), start);
+      // Let child process output drain between analyzers
+      await new Promise((resolve) => setImmediate(resolve));
+    }
+    if (cache) saveReviewCache(cache, model);
+  }
+
+  await Promise.all(workers);
+  return outcomes;
+}
+
 function summarizeFindings(results) {
   const summary = {
     overall: {
@@ -214,6 +365,7 @@ function summarizeFindings(results) {
       totalFlags: dq.summary?.totalFlags || 0,
       byType: dq.summary?.byType || {},
       bySeverity: dq.summary?.bySeverity || {},
+      ...(dq.changedSlides && { changedSlides: dq.changedSlides }),
     };
 
     // Score design based on flags
@@ -302,72 +454,277 @@ function formatScore(score) {
   return `${bar} ${score}% (${grade})`;
 }
 
-async function main() {
-  const args = process.argv.slice(2);
-  const deckPath = args.find((a) => !a.startsWith('--')) || 'decks/skill-demo';
-  const outputJson = args.includes('--json');
-  const serve = args.includes('--serve');
-
-  // Validate deck exists
-  const htmlPath = path.join(deckPath, 'index.html');
-  if (!fs.existsSync(htmlPath)) {
-    console.error(`Deck not found: ${htmlPath}`);
-    process.exit(1);
-  }
-
-  console.log(`\nRunning comprehensive deck analysis: ${deckPath}`);
-  console.log('='.repeat(50));
-
+/**
+ * Assemble full-analysis.json from per-analyzer outcomes ({ result, ms,
+ * slides } or { skipped: true }), in ANALYZERS order so the report is
+ * stable regardless of finish order.
+ */
+function buildReport(deckPath, outcomes, runTimings) {
   const results = {};
   const errors = [];
+  const timings = {};
 
-  // Run each analyzer
   for (const analyzer of ANALYZERS) {
-    process.stdout.write(`  ${analyzer.name}... `);
-
-    // Skip Playwright scripts if not serving
-    if (analyzer.type === 'playwright' && !serve) {
-      console.log('SKIPPED (use --serve)');
+    const outcome = outcomes[analyzer.name];
+    if (!outcome) continue;
+    if (outcome.skipped) {
+      timings[analyzer.name] = { ms: null, status: 'skipped' };
       continue;
     }
-
-    const result = runAnalyzer(analyzer, deckPath, { serve });
-
+    const { result, ms, slides } = outcome;
+    timings[analyzer.name] = { ms: Math.round(ms), status: result.error ? 'error' : 'ok' };
+    if (slides) timings[analyzer.name].slides = slides;
     if (result.error) {
-      console.log(`ERROR: ${result.error}`);
       errors.push({ analyzer: analyzer.name, error: result.error });
     } else {
-      console.log('OK');
       results[analyzer.name] = result;
     }
   }
 
-  // Summarize findings
-  const summary = summarizeFindings(results);
-
-  // Full report
-  const fullReport = {
+  return {
     deckPath,
     analyzedAt: new Date().toISOString(),
-    summary,
+    summary: summarizeFindings(results),
     rawResults: results,
     errors,
+    timings: { ...runTimings, analyzers: timings },
   };
+}
 
-  // Save to file
+/**
+ * Write full-analysis.json atomically, so a reader polling it during
+ * --watch never sees a half-written file.
+ */
+function writeReport(deckPath, report) {
   const outputDir = path.join(deckPath, 'resources', 'materials');
   fs.mkdirSync(outputDir, { recursive: true });
   const outputPath = path.join(outputDir, 'full-analysis.json');
-  fs.writeFileSync(outputPath, JSON.stringify(fullReport, null, 2));
+  const tmpPath = path.join(outputDir, `.full-analysis.json.${process.pid}.tmp`);
+  fs.writeFileSync(tmpPath, JSON.stringify(report, null, 2));
+  fs.renameSync(tmpPath, outputPath);
+  return outputPath;
+}
+
+function elapsedMs(start) {
+  return Number(process.hrtime.bigint() - start) / 1e6;
+}
+
+function affectedBy(analyzer, changed) {
+  return changed.some((rel) =>
+    analyzer.inputs.some((input) => (input.endsWith('/') ? rel.startsWith(input) : rel === input))
+  );
+}
+
+// Only analyzer inputs count; our own outputs (full-analysis.json, caches)
+// live in resources/materials and editors' temp files start with a dot
+function isWatchedPath(rel) {
+  if (rel.startsWith('resources/materials/') || path.basename(rel).startsWith('.')) return false;
+  return ANALYZERS.some((analyzer) => affectedBy(analyzer, [rel]));
+}
+
+/**
+ * Serialize passes: changes that arrive while a pass runs are coalesced
+ * into a single follow-up pass.
+ */
+function createLane(run) {
+  const pending = new Set();
+  let requested = false;
+  let running = false;
+
+  const drain = async () => {
+    if (running || !requested) return;
+    requested = false;
+    running = true;
+    const changed = [...pending];
+    pending.clear();
+    try {
+      await run(changed);
+    } catch (e) {
+      console.error(`  Review pass failed: ${e.message}`);
+    }
+    running = false;
+    drain();
+  };
+
+  return (changed) => {
+    changed.forEach((rel) => pending.add(rel));
+    requested = true;
+    drain();
+  };
+}
+
+async function openRenderSession(cache) {
+  const { chromium } = require('playwright');
+  const { analyzeDesignQuality } = require('./design-quality');
+  const server = await startDeckServer();
+  let browser;
+  try {
+    browser = await chromium.launch();
+  } catch (e) {
+    server.close();
+    throw e;
+  }
+  return {
+    analyzeDesignQuality,
+    browser,
+    cache,
+    url: server.url,
+    close: async () => {
+      await browser.close();
+      server.close();
+    },
+  };
+}
+
+async function watchDeck(deckPath, options) {
+  const outcomes = {};
+  const reviewCache = options.cache ? loadReviewCache(deckPath) : false;
+  let model = null;
+  let session = null;
+
+  if (options.serve) {
+    try {
+      session = await openRenderSession(options.cache);
+    } catch (e) {
+      console.error(`  design-quality... unavailable (${e.message.split('\n')[0]})`);
+    }
+  }
+  const staticAnalyzers = ANALYZERS.filter((a) => a.type === 'static');
+  const renderAnalyzers = session ? ANALYZERS.filter((a) => a.type === 'playwright') : [];
+  for (const analyzer of ANALYZERS.filter((a) => a.type === 'playwright' && !session)) {
+    outcomes[analyzer.name] = { skipped: true };
+  }
+
+  const publish = (changed, rerun, start, slideModel) => {
+    const report = buildReport(deckPath, outcomes, {
+      wallMs: Math.round(elapsedMs(start)),
+      ...(slideModel && { slideModel }),
+      changed,
+      rerun: rerun.map((a) => a.name),
+    });
+    writeReport(deckPath, report);
+    const grade = report.summary.overall.heuristicGrade || 'N/A';
+    const what = changed.length > 0 ? changed.join(', ') : 'initial review';
+    console.log(`[${new Date().toLocaleTimeString()}] ${what}: ${rerun.map((a) => a.name).join(', ')} ` +
+      `(${report.timings.wallMs}ms) -> grade ${grade}, ${report.summary.overall.totalFlags} signal(s)`);
+  };
+
+  const staticLane = createLane(async (changed) => {
+    const start = process.hrtime.bigint();
+    model = loadSlideModel(deckPath, { previous: model });
+    const slideModel = { ms: Math.round(elapsedMs(start)), cached: model.cached };
+    Object.assign(outcomes, await runAnalyzers(staticAnalyzers, deckPath, { model, cache: reviewCache }));
+    publish(changed, staticAnalyzers, start, slideModel);
+  });
+  const renderLane = createLane(async (changed) => {
+    const start = process.hrtime.bigint();
+    Object.assign(outcomes, await runAnalyzers(renderAnalyzers, deckPath, { session }));
+    publish(changed, renderAnalyzers, start, null);
+  });
+
+  const dispatch = (changed) => {
+    if (staticAnalyzers.some((a) => affectedBy(a, changed))) staticLane(changed);
+    if (renderAnalyzers.some((a) => affectedBy(a, changed))) renderLane(changed);
+  };
+
+  console.log(`\nWatching ${deckPath} (index.html, deck-config.js, resources/); Ctrl+C to stop`);
+  staticLane([]);
+  if (renderAnalyzers.length > 0) renderLane([]);
+
+  const changes = new Set();
+  let timer = null;
+  const onChange = (prefix) => (event, filename) => {
+    if (!filename) return;
+    const rel = prefix + filename.split(path.sep).join('/');
+    if (!isWatchedPath(rel)) return;
+    changes.add(rel);
+    clearTimeout(timer);
+    timer = setTimeout(() => {
+      const changed = [...changes];
+      changes.clear();
+      dispatch(changed);
+    }, WATCH_DEBOUNCE_MS);
+  };
+
+  // Editors often save by replacing the file, which a file watch loses
+  // track of, so watch the deck folder itself plus resources/ recursively
+  const watchers = [fs.watch(deckPath, onChange(''))];
+  const resourcesDir = path.join(deckPath, 'resources');
+  if (fs.existsSync(resourcesDir)) {
+    watchers.push(fs.watch(resourcesDir, { recursive: true }, onChange('resources/')));
+  }
+
+  const stop = async () => {
+    watchers.forEach((w) => w.close());
+    if (session) await session.close();
+    process.exit(0);
+  };
+  process.on('SIGINT', stop);
+  process.on('SIGTERM', stop);
+}
+
+async function main() {
+  const args = process.argv.slice(2);
+  const deckPath = args.find((a, i) => !a.startsWith('--') && args[i - 1] !== '--jobs') || 'decks/skill-demo';
+  const outputJson = args.includes('--json');
+  const serve = args.includes('--serve');
+  const cache = !args.includes('--no-cache');
+  const jobsIndex = args.indexOf('--jobs');
+  const concurrency = (jobsIndex >= 0 && parseInt(args[jobsIndex + 1], 10)) || defaultConcurrency();
+
+  // Validate deck exists
+  const htmlPath = path.join(deckPath, 'index.html');
+  if (!fs.existsSync(htmlPath)) {
+    console.error(`Deck not found: ${htmlPath}`);
+    process.exit(1);
+  }
+
+  if (args.includes('--watch')) {
+    await watchDeck(deckPath, { serve, cache });
+    return;
+  }
+
+  console.log(`\nRunning comprehensive deck analysis: ${deckPath}`);
+  console.log('='.repeat(50));
+
+  const outcomes = {};
+
+  // Skip Playwright scripts if not serving
+  const selected = ANALYZERS.filter((analyzer) => {
+    if (analyzer.type === 'playwright' && !serve) {
+      console.log(`  ${analyzer.name}... SKIPPED (use --serve)`);
+      outcomes[analyzer.name] = { skipped: true };
+      return false;
+    }
+    return true;
+  });
+
+  // Parse the deck once for every static analyzer, then run them all;
+  // report each as it finishes
+  const wallStart = process.hrtime.bigint();
+  const model = loadSlideModel(deckPath);
+  const modelMs = elapsedMs(wallStart);
+  const ran = await runAnalyzers(selected, deckPath, { serve, concurrency, model, cache }, (analyzer, result, ms) => {
+    const status = result.error ? `ERROR: ${result.error}` : 'OK';
+    console.log(`  ${analyzer.name}... ${status} (${Math.round(ms)}ms)`);
+  });
+  Object.assign(outcomes, ran);
+
+  const fullReport = buildReport(deckPath, outcomes, {
+    wallMs: Math.round(elapsedMs(wallStart)),
+    concurrency,
+    slideModel: { ms: Math.round(modelMs), cached: model.cached },
+  });
+
+  const outputPath = writeReport(deckPath, fullReport);
   console.log(`\nFull analysis saved to: ${outputPath}`);
 
   // Output
   if (outputJson) {
     console.log(JSON.stringify(fullReport, null, 2));
   } else {
-    printSummary(summary, deckPath);
+    printSummary(fullReport.summary, deckPath);
   }
-
 }
 
 main().catch(console.error);
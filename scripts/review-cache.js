@@ -0,0 +1,114 @@
+/**
+ * Per-Slide Review Cache
+ *
+ * Stores each static analyzer's per-slide result (its analyzeSlide output),
+ * keyed by slide hash, in resources/materials/review-cache.json. After a
+ * one-slide edit, only that slide is analyzed again. Deck-level results
+ * (arc shape, flow chain, redundancy, averages) are rebuilt from the
+ * per-slide results by the analyzer's aggregate().
+ *
+ * Entries are scoped per analyzer by a hash of its source plus
+ * slide-model.js. Editing one analyzer therefore invalidates only its own
+ * entries. Slides no longer in the deck are dropped on save.
+ *
+ * Library:
+ *   const cache = loadReviewCache(deckPath);
+ *   const { report, reused, analyzed } = analyzeWithCache(cache, name, scriptPath, model);
+ *   saveReviewCache(cache, model);
+ */
+
+const crypto = require('crypto');
+const fs = require('fs');
+const path = require('path');
+
+const CACHE_VERSION = 1;
+const CACHE_FILE = 'review-cache.json';
+const SLIDE_MODEL_SCRIPT = path.join(__dirname, 'slide-model.js');
+
+const codeHashes = new Map();
+
+function codeHash(scriptPath) {
+  if (!codeHashes.has(scriptPath)) {
+    const hash = crypto.createHash('sha1');
+    hash.update(fs.readFileSync(scriptPath));
+    hash.update(fs.readFileSync(SLIDE_MODEL_SCRIPT));
+    codeHashes.set(scriptPath, hash.digest('hex'));
+  }
+  return codeHashes.get(scriptPath);
+}
+
+function cachePath(deckPath) {
+  return path.join(deckPath, 'resources', 'materials', CACHE_FILE);
+}
+
+function loadReviewCache(deckPath) {
+  const file = cachePath(deckPath);
+  let analyzers = {};
+  try {
+    const data = JSON.parse(fs.readFileSync(file, 'utf-8'));
+    if (data.version === CACHE_VERSION) analyzers = data.analyzers;
+  } catch (e) {
+    // Missing or unreadable cache: start empty
+  }
+  return { file, analyzers, dirty: false };
+}
+
+/**
+ * Analyzer report for a slide model, reusing cached per-slide results.
+ * Fresh results go through JSON like cached ones, so both paths aggregate
+ * identical data.
+ */
+function analyzeWithCache(cache, name, scriptPath, model) {
+  const analyzer = require(scriptPath);
+  const hash = codeHash(scriptPath);
+
+  let entry = cache.analyzers[name];
+  if (!entry || entry.codeHash !== hash) {
+    entry = cache.analyzers[name] = { codeHash: hash, slides: {} };
+    cache.dirty = true;
+  }
+
+  let reused = 0;
+  let analyzed = 0;
+  const slideResults = model.slides.map((slide) => {
+    if (Object.prototype.hasOwnProperty.call(entry.slides, slide.hash)) {
+      reused++;
+      return entry.slides[slide.hash];
+    }
+    analyzed++;
+    const result = JSON.parse(JSON.stringify(analyzer.analyzeSlide(slide)));
+    entry.slides[slide.hash] = result;
+    cache.dirty = true;
+    return result;
+  });
+
+  return { report: analyzer.aggregate(model, slideResults), reused, analyzed };
+}
+
+/**
+ * Write the cache if anything changed, keeping only slides still in the deck.
+ */
+function saveReviewCache(cache, model) {
+  const live = new Set(model.slides.map((s) => s.hash));
+  for (const entry of Object.values(cache.analyzers)) {
+    for (const hash of Object.keys(entry.slides)) {
+      if (!live.has(hash)) {
+        delete entry.slides[hash];
+        cache.dirty = true;
+      }
+    }
+  }
+  if (!cache.dirty) return;
+
+  try {
+    fs.mkdirSync(path.dirname(cache.file), { recursive: true });
+    const tmpPath = path.join(path.dirname(cache.file), `.${CACHE_FILE}.${process.pid}.tmp`);
+    fs.writeFileSync(tmpPath, JSON.stringify({ version: CACHE_VERSION, analyzers: cache.analyzers }));
+    fs.renameSync(tmpPath, cache.file);
+    cache.dirty = false;
+  } catch (e) {
+    // A read-only deck just re-analyzes next time
+  }
+}
+
+module.exports = { analyzeWithCache, cachePath, loadReviewCache, saveReviewCache };
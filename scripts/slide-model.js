@@ -0,0 +1,340 @@
+#!/usr/bin/env node
+/**
+ * Shared Slide Model
+ *
+ * Parses a deck's index.html once into a per-slide model that every static
+ * analyzer consumes, so they all agree on what a slide, its text, and its
+ * images are. This is the CODE LAYER - it extracts structure, not judgments.
+ *
+ * Per slide:
+ * - title, classes, theme (ink/ivory), layout (title/quote/metrics/split/grid/content)
+ * - headline, entity-decoded text, lowercase tokens
+ * - images (src, alt, prompt, size, placeholder, in media frame), SVG diagrams, media frames
+ * - list/chip/card counts and the text context around images
+ * - hash of the slide's HTML
+ *
+ * The model is cached in resources/materials/slide-model.json, keyed by a
+ * hash of index.html and the model version, and rebuilt only when either
+ * changes.
+ *
+ * Usage:
+ *   node scripts/slide-model.js decks/my-deck
+ *   node scripts/slide-model.js decks/my-deck --json
+ *   node scripts/slide-model.js decks/my-deck --rebuild
+ *
+ * Library:
+ *   const { loadSlideModel } = require('./slide-model');
+ *   const model = loadSlideModel('decks/my-deck'); // { deckPath, htmlHash, slides }
+ */
+
+const crypto = require('crypto');
+const fs = require('fs');
+const path = require('path');
+
+// Bump when the parsed shape changes so cached models are rebuilt
+const MODEL_VERSION = 1;
+const MODEL_FILE = 'slide-model.json';
+
+// Layout classes used in slide markup (first match wins)
+const LAYOUT_PATTERNS = {
+  title: /layout-title/,
+  quote: /layout-quote/,
+  metrics: /layout-metrics/,
+  split: /layout-split/,
+  grid: /layout-grid/,
+};
+
+const NAMED_ENTITIES = {
+  nbsp: ' ',
+  amp: '&',
+  lt: '<',
+  gt: '>',
+  quot: '"',
+  apos: "'",
+};
+
+function sha1(text) {
+  return crypto.createHash('sha1').update(text).digest('hex');
+}
+
+function getAttr(tag, name) {
+  const match = tag.match(new RegExp(`(?:^|\\s)${name}\\s*=\\s*(?:"([^"]*)"|'([^']*)'|([^\\s"'>]+))`, 'i'));
+  if (!match) return null;
+  return match[1] ?? match[2] ?? match[3];
+}
+
+/**
+ * Decode entities: the common named ones and numeric references become
+ * their characters; any other named entity (arrows, symbols) becomes a space.
+ */
+function decodeEntities(text) {
+  return text.replace(/&(#x[0-9a-f]+|#\d+|[a-z][a-z0-9]*);/gi, (entity, code) => {
+    if (code[0] === '#') {
+      const point = code[1] === 'x' || code[1] === 'X' ? parseInt(code.slice(2), 16) : parseInt(code.slice(1), 10);
+      return point > 0 && point <= 0x10ffff ? String.fromCodePoint(point) : ' ';
+    }
+    return NAMED_ENTITIES[code.toLowerCase()] ?? ' ';
+  });
+}
+
+/**
+ * Visible text of an HTML fragment: scripts and styles dropped, tags become
+ * spaces, entities decoded, whitespace collapsed.
+ */
+function textOf(html) {
+  return decodeEntities(
+    html
+      .replace(/<script[^>]*>[\s\S]*?<\/script>/gi, '')
+      .replace(/<style[^>]*>[\s\S]*?<\/style>/gi, '')
+      .replace(/<[^>]+>/g, ' ')
+  )
+    .replace(/\s+/g, ' ')
+    .trim();
+}
+
+function tokenize(text) {
+  return text.toLowerCase().split(/\s+/).filter((w) => w.length > 0);
+}
+
+function extractImages(html) {
+  const images = [];
+  const imgRegex = /<img[^>]*>/gi;
+  let match;
+
+  while ((match = imgRegex.exec(html)) !== null) {
+    const tag = match[0];
+    const src = getAttr(tag, 'src') || null;
+    const alt = getAttr(tag, 'alt');
+    const width = parseInt(getAttr(tag, 'width'), 10) || null;
+    const height = parseInt(getAttr(tag, 'height'), 10) || null;
+
+    // Inside a media frame when the nearest preceding media-frame opened after the last </div>
+    const before = html.substring(0, match.index);
+    const inMediaFrame = before.lastIndexOf('media-frame') > before.lastIndexOf('</div>');
+
+    images.push({
+      src,
+      alt,
+      filename: src ? src.split('/').pop() : null,
+      dataPrompt: getAttr(tag, 'data-prompt'),
+      dataGen: getAttr(tag, 'data-gen'),
+      width,
+      height,
+      area: width && height ? width * height : null,
+      isPlaceholder: /placeholder/i.test(tag) || !src || src.startsWith('data:image/svg'),
+      inMediaFrame,
+      hasAlt: alt !== null && alt.trim().length > 0,
+    });
+  }
+
+  return images;
+}
+
+function extractSvgs(html) {
+  const svgs = [];
+  const svgRegex = /<svg[^>]*>[\s\S]*?<\/svg>/gi;
+  let match;
+
+  while ((match = svgRegex.exec(html)) !== null) {
+    const viewBox = getAttr(match[0].match(/<svg[^>]*>/i)[0], 'viewBox');
+    const parts = viewBox ? viewBox.trim().split(/[\s,]+/) : [];
+    const width = parts.length >= 4 ? parseInt(parts[2], 10) : null;
+    const height = parts.length >= 4 ? parseInt(parts[3], 10) : null;
+
+    svgs.push({
+      viewBox,
+      width,
+      height,
+      area: width && height ? width * height : null,
+    });
+  }
+
+  return svgs;
+}
+
+function extractMediaFrames(html) {
+  const frames = [];
+  const frameRegex = /<div[^>]*class="[^"]*media-frame[^"]*"[^>]*>([\s\S]*?)<\/div>/gi;
+  let match;
+
+  while ((match = frameRegex.exec(html)) !== null) {
+    const content = match[1];
+    const hasPlaceholder = /media-placeholder/.test(content);
+    const hasImage = /<img[^>]*class="[^"]*gen-media[^"]*"/.test(content);
+    const hasVideo = /<video/.test(content);
+
+    frames.push({
+      hasPlaceholder,
+      hasImage,
+      hasVideo,
+      isReady: /data-ready="true"/.test(match[0]),
+      isEmpty: hasPlaceholder && !hasImage && !hasVideo,
+    });
+  }
+
+  return frames;
+}
+
+function countItems(html) {
+  const listItems = (html.match(/<li[^>]*>/gi) || []).length;
+  const chips = (html.match(/class="[^"]*chip[^"]*"/gi) || []).length;
+  const cards = (html.match(/class="[^"]*card[^"]*"/gi) || []).length;
+  return { listItems, chips, cards, total: listItems + chips + cards };
+}
+
+function allText(html, regex) {
+  return [...html.matchAll(regex)].map((m) => textOf(m[1])).filter((t) => t.length > 0);
+}
+
+function firstText(html, regex) {
+  const match = html.match(regex);
+  return match ? textOf(match[1]) : null;
+}
+
+/**
+ * Text around the slide's images: headline, eyebrow, body copy, quote, chips, card titles.
+ */
+function extractContext(html) {
+  return {
+    headline: firstText(html, /<h1[^>]*class="[^"]*title[^"]*"[^>]*>([\s\S]*?)<\/h1>/i)
+      ?? firstText(html, /<h2[^>]*class="[^"]*(?:section-title|title)[^"]*"[^>]*>([\s\S]*?)<\/h2>/i),
+    eyebrow: firstText(html, /<div[^>]*class="[^"]*eyebrow[^"]*"[^>]*>([\s\S]*?)<\/div>/i),
+    bodyText: allText(html, /<p[^>]*class="[^"]*(?:body-text|subtitle)[^"]*"[^>]*>([\s\S]*?)<\/p>/gi),
+    quote: firstText(html, /<p[^>]*class="[^"]*quote[^"]*"[^>]*>([\s\S]*?)<\/p>/i),
+    chips: allText(html, /<div[^>]*class="[^"]*chip[^"]*"[^>]*>([\s\S]*?)<\/div>/gi),
+    cardTitles: allText(html, /<div[^>]*class="[^"]*card-title[^"]*"[^>]*>([\s\S]*?)<\/div>/gi),
+  };
+}
+
+/**
+ * Parse deck HTML into slides. A slide is any <section> whose class list
+ * contains "slide", whatever the attribute order.
+ */
+function parseSlides(html) {
+  const slides = [];
+  const sectionRegex = /<section\b([^>]*)>([\s\S]*?)<\/section>/gi;
+  let match;
+
+  while ((match = sectionRegex.exec(html)) !== null) {
+    const classes = (getAttr(match[1], 'class') || '').split(/\s+/).filter(Boolean);
+    if (!classes.includes('slide')) continue;
+
+    const content = match[2];
+    const index = slides.length + 1;
+    const title = decodeEntities(getAttr(match[1], 'data-title') ?? `Slide ${index}`);
+    const text = textOf(content);
+    const layout = Object.keys(LAYOUT_PATTERNS).find((type) => LAYOUT_PATTERNS[type].test(content)) || 'content';
+
+    slides.push({
+      index,
+      title,
+      classes,
+      theme: classes.includes('theme-ink') ? 'ink' : 'ivory',
+      layout,
+      headline: firstText(content, /<h[12][^>]*class="[^"]*title[^"]*"[^>]*>([\s\S]*?)<\/h[12]>/) || title,
+      text,
+      tokens: tokenize(text),
+      images: extractImages(content),
+      svgs: extractSvgs(content),
+      mediaFrames: extractMediaFrames(content),
+      hasEmptyMediaFrame: content.includes('media-placeholder') && !content.includes('data-ready="true"'),
+      items: countItems(content),
+      context: extractContext(content),
+      hash: sha1(match[0]),
+    });
+  }
+
+  return slides;
+}
+
+function modelPath(deckPath) {
+  return path.join(deckPath, 'resources', 'materials', MODEL_FILE);
+}
+
+function readCachedModel(cachePath, htmlHash) {
+  try {
+    const cached = JSON.parse(fs.readFileSync(cachePath, 'utf-8'));
+    if (cached.version === MODEL_VERSION && cached.htmlHash === htmlHash) return cached;
+  } catch (e) {
+    // Missing or unreadable cache: rebuild
+  }
+  return null;
+}
+
+function writeModel(cachePath, model) {
+  const { deckPath, ...serialized } = model;
+  try {
+    fs.mkdirSync(path.dirname(cachePath), { recursive: true });
+    const tmpPath = path.join(path.dirname(cachePath), `.${MODEL_FILE}.${process.pid}.tmp`);
+    fs.writeFileSync(tmpPath, JSON.stringify(serialized));
+    fs.renameSync(tmpPath, cachePath);
+  } catch (e) {
+    // Read-only decks still get a model, just not a cached one
+  }
+}
+
+/**
+ * Slide model for a deck, from the cache when index.html is unchanged.
+ * Options: rebuild (ignore caches), write (false to skip the cache file),
+ * previous (an earlier model to reuse when the hash still matches).
+ * Throws if the deck has no index.html.
+ */
+function loadSlideModel(deckPath, options = {}) {
+  const htmlPath = path.join(deckPath, 'index.html');
+  if (!fs.existsSync(htmlPath)) {
+    throw new Error(`Deck not found: ${htmlPath}`);
+  }
+
+  const html = fs.readFileSync(htmlPath, 'utf-8');
+  const htmlHash = crypto.createHash('sha256').update(html).digest('hex');
+  const cachePath = modelPath(deckPath);
+
+  // A long-running caller (review-all --watch) passes its last model to skip the disk cache
+  if (!options.rebuild && options.previous?.htmlHash === htmlHash) {
+    return { ...options.previous, cached: true };
+  }
+
+  const cached = options.rebuild ? null : readCachedModel(cachePath, htmlHash);
+  if (cached) {
+    return { ...cached, deckPath, cached: true };
+  }
+
+  const model = { version: MODEL_VERSION, htmlHash, deckPath, slides: parseSlides(html) };
+  if (options.write !== false) writeModel(cachePath, model);
+  return { ...model, cached: false };
+}
+
+module.exports = {
+  MODEL_VERSION,
+  decodeEntities,
+  loadSlideModel,
+  modelPath,
+  parseSlides,
+  textOf,
+  tokenize,
+};
+
+// Main
+if (require.main === module) {
+  const args = process.argv.slice(2);
+  const deckPath = args.find((a) => !a.startsWith('--')) || 'decks/skill-demo';
+
+  try {
+    const model = loadSlideModel(deckPath, { rebuild: args.includes('--rebuild') });
+
+    if (args.includes('--json')) {
+      console.log(JSON.stringify(model, null, 2));
+    } else {
+      console.log(`\nSlide Model: ${deckPath} (${model.cached ? 'cached' : 'parsed'})`);
+      console.log('='.repeat(50));
+      for (const slide of model.slides) {
+        console.log(`  ${slide.index}. ${slide.title} [${slide.layout}, ${slide.theme}] ` +
+          `${slide.tokens.length} words, ${slide.images.length} images`);
+      }
+      console.log(`\nSaved to: ${modelPath(deckPath)}`);
+    }
+  } catch (error) {
+    console.error(`Error: ${error.message}`);
+    process.exit(1);
+  }
+}
@@ -15,10 +15,12 @@
  * Usage:
  *   node scripts/visual-density.js decks/my-deck
  *   node scripts/visual-density.js decks/my-deck --json
+ *
+ * Library:
+ *   require('./visual-density').analyze(loadSlideModel(deckPath))
  */
 
-const fs = require('fs');
-const path = require('path');
+const { loadSlideModel } = require('./slide-model');
 
 // Thresholds for flagging (factual boundaries, not judgments)
 const THRESHOLDS = {
@@ -29,176 +31,18 @@ const THRESHOLDS = {
   manyBullets: 5,
 };
 
-// Slide type patterns (to identify content slides vs title/quote slides)
-const SLIDE_TYPE_PATTERNS = {
-  title: /layout-title/,
-  quote: /layout-quote/,
-  metrics: /layout-metrics/,
-  split: /layout-split/,
-  grid: /layout-grid/,
-};
-
-function extractSlides(html) {
-  const slides = [];
-  const slideRegex = /<section[^>]*class="slide([^"]*)"[^>]*data-title="([^"]*)"[^>]*>([\s\S]*?)<\/section>/g;
-
-  let match;
-  while ((match = slideRegex.exec(html)) !== null) {
-    const classAttr = match[1];
-    const title = match[2];
-    const content = match[3];
-
-    // Detect slide type from class
-    let slideType = 'content';
-    for (const [type, pattern] of Object.entries(SLIDE_TYPE_PATTERNS)) {
-      if (pattern.test(content)) {
-        slideType = type;
-        break;
-      }
-    }
-
-    // Detect theme
-    const theme = /theme-ink/.test(classAttr) ? 'ink' : 'ivory';
-
-    slides.push({
-      title,
-      rawHtml: content,
-      slideType,
-      theme,
-    });
-  }
-
-  return slides;
-}
-
-function extractTextContent(html) {
-  return html
-    .replace(/<script[^>]*>[\s\S]*?<\/script>/g, '')
-    .replace(/<style[^>]*>[\s\S]*?<\/style>/g, '')
-    .replace(/<[^>]+>/g, ' ')
-    .replace(/&nbsp;/g, ' ')
-    .replace(/&[a-z]+;/gi, ' ')
-    .replace(/\s+/g, ' ')
-    .trim();
-}
-
-function countWords(text) {
-  if (!text) return 0;
-  return text.split(/\s+/).filter(w => w.length > 0).length;
-}
-
-function countBullets(html) {
-  // Count bullet list items
-  const liCount = (html.match(/<li[^>]*>/gi) || []).length;
-  // Count chip elements (used as tags/labels)
-  const chipCount = (html.match(/class="[^"]*chip[^"]*"/gi) || []).length;
-  // Count card elements
-  const cardCount = (html.match(/class="[^"]*card[^"]*"/gi) || []).length;
-
-  return { liCount, chipCount, cardCount, total: liCount + chipCount + cardCount };
-}
-
-function extractImages(html) {
-  const images = [];
-  const imgRegex = /<img[^>]*>/gi;
-  let match;
-
-  while ((match = imgRegex.exec(html)) !== null) {
-    const imgTag = match[0];
-
-    // Extract src
-    const srcMatch = imgTag.match(/src="([^"]*)"/);
-    const src = srcMatch ? srcMatch[1] : null;
-
-    // Extract alt text
-    const altMatch = imgTag.match(/alt="([^"]*)"/);
-    const alt = altMatch ? altMatch[1] : null;
-
-    // Extract dimensions if available
-    const widthMatch = imgTag.match(/width="?(\d+)"?/);
-    const heightMatch = imgTag.match(/height="?(\d+)"?/);
-    const width = widthMatch ? parseInt(widthMatch[1], 10) : null;
-    const height = heightMatch ? parseInt(heightMatch[1], 10) : null;
-
-    // Check if it's a placeholder
-    const isPlaceholder = /placeholder/i.test(imgTag) || !src || src.startsWith('data:image/svg');
-
-    images.push({
-      src,
-      alt,
-      width,
-      height,
-      area: width && height ? width * height : null,
-      isPlaceholder,
-    });
-  }
-
-  return images;
-}
-
-function extractSvgDiagrams(html) {
-  const svgs = [];
-  const svgRegex = /<svg[^>]*>([\s\S]*?)<\/svg>/gi;
-  let match;
-
-  while ((match = svgRegex.exec(html)) !== null) {
-    const svgTag = match[0];
-    const viewBoxMatch = svgTag.match(/viewBox="([^"]*)"/);
-    const viewBox = viewBoxMatch ? viewBoxMatch[1] : null;
-
-    let width = null;
-    let height = null;
-    if (viewBox) {
-      const parts = viewBox.split(/\s+/);
-      if (parts.length >= 4) {
-        width = parseInt(parts[2], 10);
-        height = parseInt(parts[3], 10);
-      }
-    }
-
-    svgs.push({
-      viewBox,
-      width,
-      height,
-      area: width && height ? width * height : null,
-    });
-  }
-
-  return svgs;
-}
-
-function extractMediaFrames(html) {
-  const frames = [];
-  const frameRegex = /<div[^>]*class="[^"]*media-frame[^"]*"[^>]*>([\s\S]*?)<\/div>/gi;
-  let match;
-
-  while ((match = frameRegex.exec(html)) !== null) {
-    const frameContent = match[1];
-    const hasPlaceholder = /media-placeholder/.test(frameContent);
-    const hasImage = /<img[^>]*class="[^"]*gen-media[^"]*"/.test(frameContent);
-    const hasVideo = /<video/.test(frameContent);
-    const isReady = /data-ready="true"/.test(match[0]);
-
-    frames.push({
-      hasPlaceholder,
-      hasImage,
-      hasVideo,
-      isReady,
-      isEmpty: hasPlaceholder && !hasImage && !hasVideo,
-    });
-  }
-
-  return frames;
-}
-
-function analyzeSlide(slide, index) {
-  const textContent = extractTextContent(slide.rawHtml);
-  const wordCount = countWords(textContent);
-  const charCount = textContent.length;
-  const bullets = countBullets(slide.rawHtml);
-  const images = extractImages(slide.rawHtml);
-  const svgs = extractSvgDiagrams(slide.rawHtml);
-  const mediaFrames = extractMediaFrames(slide.rawHtml);
+/**
+ * Metrics and flags for one slide. Uses nothing but the slide itself, so
+ * review-all can cache the result by slide hash.
+ */
+function analyzeSlide(slide) {
+  const wordCount = slide.tokens.length;
+  const charCount = slide.text.length;
+  const bullets = slide.items;
+  const images = slide.images;
+  const svgs = slide.svgs;
+  const mediaFrames = slide.mediaFrames;
+  const slideType = slide.layout;
 
   // Calculate image metrics
   const realImages = images.filter(img => !img.isPlaceholder);
@@ -243,11 +87,11 @@ function analyzeSlide(slide, index) {
   }
 
   // Only flag missing visuals on content slides (not title/quote/metrics)
-  const isContentSlide = ['split', 'grid', 'content'].includes(slide.slideType);
+  const isContentSlide = ['split', 'grid', 'content'].includes(slideType);
   if (isContentSlide && visualCount === 0 && wordCount > 20) {
     flags.push({
       type: 'no_visuals_on_content_slide',
-      slideType: slide.slideType,
+      slideType,
     });
   }
 
@@ -268,18 +112,17 @@ function analyzeSlide(slide, index) {
   }
 
   return {
-    index: index + 1,
     title: slide.title,
-    slideType: slide.slideType,
+    slideType,
     theme: slide.theme,
     metrics: {
       wordCount,
       charCount,
       bulletCount: bullets.total,
       bulletBreakdown: {
-        listItems: bullets.liCount,
-        chips: bullets.chipCount,
-        cards: bullets.cardCount,
+        listItems: bullets.listItems,
+        chips: bullets.chips,
+        cards: bullets.cards,
       },
       imageCount: realImages.length,
       svgCount: svgs.length,
@@ -332,23 +175,17 @@ function calculateDeckAverages(slideAnalyses) {
   };
 }
 
-function generateReport(deckPath, outputJson = false) {
-  const htmlPath = path.join(deckPath, 'index.html');
-
-  if (!fs.existsSync(htmlPath)) {
-    console.error(`Deck not found: ${htmlPath}`);
-    process.exit(1);
-  }
-
-  const html = fs.readFileSync(htmlPath, 'utf-8');
-  const slides = extractSlides(html);
+/**
+ * Density report from per-slide results (analyzeSlide, in slide order).
+ */
+function aggregate(model, slideResults) {
+  const { deckPath, slides } = model;
 
   if (slides.length === 0) {
-    console.error('No slides found in deck');
-    process.exit(1);
+    throw new Error('No slides found in deck');
   }
 
-  const slideAnalyses = slides.map((slide, i) => analyzeSlide(slide, i));
+  const slideAnalyses = slides.map((slide, i) => ({ index: slide.index, ...slideResults[i] }));
   const deckAverages = calculateDeckAverages(slideAnalyses);
 
   // Collect all flags
@@ -376,15 +213,22 @@ function generateReport(deckPath, outputJson = false) {
     },
   };
 
-  if (outputJson) {
-    console.log(JSON.stringify(report, null, 2));
-    return report;
-  }
+  return report;
+}
+
+/**
+ * Density report for a slide model (see slide-model.js).
+ */
+function analyze(model) {
+  return aggregate(model, model.slides.map(analyzeSlide));
+}
+
+function printReport(report) {
+  const { deckAverages, slides: slideAnalyses } = report;
 
-  // Pretty print CLI output
-  console.log(`\nVisual Density Analysis: ${deckPath}`);
+  console.log(`\nVisual Density Analysis: ${report.deckPath}`);
   console.log('='.repeat(50));
-  console.log(`\nSlides: ${slides.length}`);
+  console.log(`\nSlides: ${report.slideCount}`);
 
   console.log('\nDeck Averages:');
   console.log(`  Words per slide: ${deckAverages.avgWordCount}`);
@@ -422,18 +266,31 @@ function generateReport(deckPath, outputJson = false) {
   }
 
   console.log('\n' + '='.repeat(50));
-  console.log(`Summary: ${allFlags.length} flags across ${report.flagSummary.slidesWithFlags} slides`);
+  console.log(`Summary: ${report.flagSummary.totalFlags} flags across ${report.flagSummary.slidesWithFlags} slides`);
 
-  if (allFlags.length === 0) {
+  if (report.flagSummary.totalFlags === 0) {
     console.log('No density flags detected.');
   }
-
-  return report;
 }
 
-// Main
-const args = process.argv.slice(2);
-const deckPath = args.find(a => !a.startsWith('--')) || 'decks/skill-demo';
-const outputJson = args.includes('--json');
+module.exports = { THRESHOLDS, aggregate, analyze, analyzeSlide, calculateDeckAverages, printReport };
 
-generateReport(deckPath, outputJson);
+// Main
+if (require.main === module) {
+  const args = process.argv.slice(2);
+  const deckPath = args.find(a => !a.startsWith('--')) || 'decks/skill-demo';
+  const outputJson = args.includes('--json');
+
+  try {
+    const report = analyze(loadSlideModel(deckPath));
+
+    if (outputJson) {
+      console.log(JSON.stringify(report, null, 2));
+    } else {
+      printReport(report);
+    }
+  } catch (error) {
+    console.error(error.message);
+    process.exit(1);
+  }
+}
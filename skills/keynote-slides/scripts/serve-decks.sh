@@ -1,5 +1,5 @@
 #!/usr/bin/env bash
-# ABOUTME: Serve the decks directory with a local static web server.
+# ABOUTME: Serve the decks directory with the threaded deck server (ETag, Range, gzip).
 # ABOUTME: Useful for previewing and printing decks to PDF.
 set -euo pipefail
 
@@ -9,4 +9,5 @@ script_dir="$(cd "$(dirname "${BASH_SOURCE[0]}")" && pwd)"
 repo_root="$(cd "${script_dir}/../../.." && pwd)"
 
 echo "Serving decks at http://${host}:${port}/decks/"
-python3 -m http.server "$port" --bind "$host" --directory "$repo_root"
+cd "$repo_root"
+exec python3 -m lib.media serve "$repo_root" --port "$port" --host "$host"
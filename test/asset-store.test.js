@@ -0,0 +1,30 @@
+// ABOUTME: Exercises regenerating an asset in one deck after two decks were adopted into the shared store.
+// ABOUTME: Checks image and video writers replace the deck file instead of writing through the hardlinked blob.
+const test = require('node:test');
+const assert = require('node:assert/strict');
+
+const { runFixture, skipWithoutPython } = require('./helpers/python');
+
+test('regenerating one deck leaves the blob and sibling decks unchanged', { skip: skipWithoutPython }, () => {
+  const { before, blobs, alpha, beta, leftovers } = runFixture('asset_store_rewrite');
+
+  // Both decks and the blob share one inode after adoption
+  assert.deepEqual(before, {
+    image: { content: 'shared image', links: 3 },
+    video: { content: 'shared video', links: 3 },
+  });
+
+  assert.deepEqual(alpha, {
+    'hero.png': { content: 'regenerated image', links: 1 },
+    'intro.mp4': { content: 'regenerated video', links: 1 },
+  });
+  assert.deepEqual(beta, {
+    'hero.png': { content: 'shared image', links: 2 },
+    'intro.mp4': { content: 'shared video', links: 2 },
+  });
+  assert.deepEqual(blobs, {
+    image: { content: 'shared image', links: 2 },
+    video: { content: 'shared video', links: 2 },
+  });
+  assert.deepEqual(leftovers, []);
+});
@@ -0,0 +1,92 @@
+// ABOUTME: Exercises the shared capture service against a stand-in browser with the deck's keynote API.
+// ABOUTME: Checks parallel ranges, slide order, context cleanup, and the content-keyed screenshot cache.
+const test = require('node:test');
+const assert = require('node:assert/strict');
+const fs = require('node:fs');
+const os = require('node:os');
+const path = require('node:path');
+const { spawnSync } = require('node:child_process');
+
+const repoRoot = path.resolve(__dirname, '..');
+const { captureSlides, splitRanges } = require(path.join(repoRoot, 'scripts', 'capture-service.js'));
+const { solidPng, standInBrowser } = require('./helpers/stand-in-browser');
+
+const pixelDiff = spawnSync('python3', ['-c', 'import numpy, PIL'], { cwd: repoRoot });
+const noPixelDiff = pixelDiff.status !== 0 ? 'python3 with NumPy and Pillow not available' : false;
+
+test('splitRanges keeps contiguous, near-equal ranges', () => {
+  assert.deepEqual(splitRanges([0, 1, 2, 3, 4, 5, 6, 7, 8, 9], 3), [[0, 1, 2, 3], [4, 5, 6], [7, 8, 9]]);
+  assert.deepEqual(splitRanges([7, 8], 4), [[7], [8]]);
+  assert.deepEqual(splitRanges([], 3), []);
+});
+
+test('captures slide ranges on parallel contexts of one browser', async () => {
+  const titles = Array.from({ length: 12 }, (_, i) => `T${i + 1}`);
+  const browser = standInBrowser(titles);
+
+  const { slideCount, slides } = await captureSlides('http://deck', {
+    browser,
+    pages: 3,
+    inspect: async (page, index) => ({ context: page.contextId, index }),
+  });
+
+  assert.equal(slideCount, 12);
+  assert.deepEqual(slides.map((s) => s.title), titles);
+  assert.deepEqual(slides.map((s) => s.inspected.index), titles.map((_, i) => i));
+  // Three contexts, each owning one contiguous range of four slides
+  assert.equal(browser.state.contexts.length, 3);
+  for (let i = 0; i < 12; i++) {
+    assert.equal(slides[i].inspected.context, Math.floor(i / 4));
+  }
+  assert.ok(browser.state.maxInFlight > 1);
+  assert.equal(browser.state.openContexts, 0);
+});
+
+test('small captures and explicit slide lists use fewer pages', async () => {
+  const titles = Array.from({ length: 12 }, (_, i) => `T${i + 1}`);
+  const browser = standInBrowser(titles);
+
+  const { slides } = await captureSlides('http://deck', { browser, pages: 4, slides: [7, 8, 9, 10, 40] });
+
+  assert.deepEqual(slides.map((s) => s.index), [8, 9, 10, 11]);
+  assert.equal(browser.state.contexts.length, 1);
+  assert.equal(browser.state.openContexts, 0);
+});
+
+test('screenshot cache reuses PNGs and reports only visual changes', { skip: noPixelDiff }, async () => {
+  const tmp = fs.mkdtempSync(path.join(os.tmpdir(), 'keynote-capture-cache-'));
+  const options = { pages: 1, screenshotDir: path.join(tmp, 'shots'), cacheDir: path.join(tmp, 'cache') };
+  const white = solidPng([255, 255, 255]);
+  const deck = [
+    { title: 'One', html: '<section>One</section>', png: white },
+    { title: 'Two', html: '<section>Two</section>', png: white },
+    { title: 'Three', html: '<section>Three</section>', png: white },
+  ];
+
+  const first = standInBrowser(deck);
+  const initial = await captureSlides('http://deck/index.html', { ...options, browser: first });
+  assert.equal(first.state.screenshots, 3);
+  assert.deepEqual(initial.slides.map((s) => s.changed), [true, true, true]);
+
+  const second = standInBrowser(deck);
+  const rerun = await captureSlides('http://deck/index.html', { ...options, browser: second });
+  assert.equal(second.state.screenshots, 0);
+  assert.deepEqual(rerun.slides.map((s) => [s.cached, s.changed]), [[true, false], [true, false], [true, false]]);
+  assert.deepEqual(fs.readFileSync(rerun.slides[0].screenshot), white);
+
+  // Slide 2: new DOM, same pixels. Slide 3: new DOM and a visible change.
+  const edited = [
+    deck[0],
+    { ...deck[1], html: '<section data-note="x">Two</section>' },
+    { ...deck[2], html: '<section>Three!</section>', png: solidPng([255, 255, 255], [0, 0, 0]) },
+  ];
+  const third = standInBrowser(edited);
+  const after = await captureSlides('http://deck/index.html', { ...options, browser: third });
+  assert.equal(third.state.screenshots, 2);
+  assert.deepEqual(after.slides.map((s) => s.changed), [false, false, true]);
+  assert.deepEqual(after.slides[2].diff.bbox, [0, 0, 4, 4]);
+
+  // Only the keys of the latest run stay in the cache
+  const pngs = fs.readdirSync(options.cacheDir).filter((f) => f.endsWith('.png'));
+  assert.equal(pngs.length, 3);
+});
@@ -0,0 +1,73 @@
+// ABOUTME: Exercises the threaded deck server through its Node launcher on an ephemeral port.
+// ABOUTME: Checks readiness, ETag revalidation, byte ranges, gzip, and precompressed siblings.
+const test = require('node:test');
+const assert = require('node:assert/strict');
+const fs = require('node:fs');
+const os = require('node:os');
+const path = require('node:path');
+const zlib = require('node:zlib');
+const { spawnSync } = require('node:child_process');
+
+const repoRoot = path.resolve(__dirname, '..');
+const { startDeckServer } = require(path.join(repoRoot, 'scripts', 'deck-server.js'));
+
+const python = spawnSync('python3', ['--version']);
+const skip = python.error ? 'python3 not available' : false;
+
+function makeDeckRoot() {
+  const root = fs.mkdtempSync(path.join(os.tmpdir(), 'keynote-deck-server-'));
+  const deck = path.join(root, 'decks', 'demo');
+  fs.mkdirSync(path.join(deck, 'resources', 'assets'), { recursive: true });
+  fs.writeFileSync(path.join(deck, 'index.html'), '<section class="slide">Hello</section>\n'.repeat(200));
+  fs.writeFileSync(path.join(deck, 'resources', 'assets', 'clip.mp4'), Buffer.from(Array.from({ length: 1000 }, (_, i) => i % 256)));
+  fs.writeFileSync(path.join(deck, 'deck.css'), 'body { color: red; }\n');
+  fs.writeFileSync(path.join(deck, 'deck.css.br'), zlib.brotliCompressSync(Buffer.from('body { color: red; }\n')));
+  return root;
+}
+
+test('serves decks with ETags, ranges and compression on a free port', { skip }, async () => {
+  const server = await startDeckServer({ root: makeDeckRoot() });
+  try {
+    assert.ok(server.port > 0);
+    assert.equal((await fetch(`${server.url}/__ready`)).status, 200);
+
+    const indexUrl = `${server.url}/decks/demo/index.html`;
+    const plain = await fetch(indexUrl, { headers: { 'Accept-Encoding': 'identity' } });
+    const etag = plain.headers.get('etag');
+    assert.equal(plain.status, 200);
+    assert.ok(etag);
+    assert.equal((await plain.text()).length, 39 * 200);
+
+    const revalidated = await fetch(indexUrl, { headers: { 'Accept-Encoding': 'identity', 'If-None-Match': etag } });
+    assert.equal(revalidated.status, 304);
+
+    // fetch() decodes gzip itself, so the header shows what was sent
+    const gzipped = await fetch(indexUrl, { headers: { 'Accept-Encoding': 'gzip' } });
+    assert.equal(gzipped.headers.get('content-encoding'), 'gzip');
+    assert.equal((await gzipped.text()).length, 39 * 200);
+    // q=0 refuses a coding even when its name appears in the header
+    const refused = await fetch(indexUrl, { headers: { 'Accept-Encoding': 'gzip;q=0, identity' } });
+    assert.equal(refused.headers.get('content-encoding'), null);
+    assert.equal(refused.headers.get('etag'), etag);
+
+    const clipUrl = `${server.url}/decks/demo/resources/assets/clip.mp4`;
+    const partial = await fetch(clipUrl, { headers: { Range: 'bytes=10-19' } });
+    assert.equal(partial.status, 206);
+    assert.equal(partial.headers.get('content-range'), 'bytes 10-19/1000');
+    assert.deepEqual([...new Uint8Array(await partial.arrayBuffer())], [10, 11, 12, 13, 14, 15, 16, 17, 18, 19]);
+    assert.equal((await fetch(clipUrl, { headers: { Range: 'bytes=5000-' } })).status, 416);
+
+    const css = await fetch(`${server.url}/decks/demo/deck.css`, { headers: { 'Accept-Encoding': 'br, gzip' } });
+    assert.equal(css.headers.get('content-encoding'), 'br');
+    assert.equal(await css.text(), 'body { color: red; }\n');
+    const noBrotli = await fetch(`${server.url}/decks/demo/deck.css`, { headers: { 'Accept-Encoding': 'br;q=0, gzip' } });
+    assert.notEqual(noBrotli.headers.get('content-encoding'), 'br');
+    assert.equal(await noBrotli.text(), 'body { color: red; }\n');
+  } finally {
+    server.close();
+  }
+});
+
+test('launcher rejects when the server cannot start', { skip }, async () => {
+  await assert.rejects(startDeckServer({ root: path.join(os.tmpdir(), 'keynote-no-such-root') }), /not a directory/);
+});
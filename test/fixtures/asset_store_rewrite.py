@@ -0,0 +1,72 @@
+# ABOUTME: Adopts two decks sharing an image and a video into the asset store, then regenerates one deck's copies.
+# ABOUTME: Prints each deck file's and blob's content and link count as JSON for test/asset-store.test.js.
+
+import hashlib
+import http.server
+import json
+import sys
+import tempfile
+import threading
+from pathlib import Path
+
+from lib.media.asset_store import STORE_DIR, AssetStore
+from lib.media.nano_banana import ImageResult
+from lib.media.veo import VideoResult
+
+
+class _VideoHandler(http.server.BaseHTTPRequestHandler):
+    def do_GET(self):
+        body = b"regenerated video"
+        self.send_response(200)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+def _describe(path: Path) -> dict:
+    return {"content": path.read_bytes().decode(), "links": path.stat().st_nlink}
+
+
+def main() -> int:
+    decks = Path(tempfile.mkdtemp(prefix="keynote-store-"))
+    for deck in ("alpha", "beta"):
+        assets = decks / deck / "resources" / "assets"
+        assets.mkdir(parents=True)
+        (assets / "hero.png").write_bytes(b"shared image")
+        (assets / "intro.mp4").write_bytes(b"shared video")
+
+    store = AssetStore(decks / STORE_DIR)
+    for deck in ("alpha", "beta"):
+        store.adopt(decks / deck)
+    blobs = {
+        "image": store.blob_path(hashlib.sha256(b"shared image").hexdigest(), ".png"),
+        "video": store.blob_path(hashlib.sha256(b"shared video").hexdigest(), ".mp4"),
+    }
+    before = {name: _describe(blob) for name, blob in blobs.items()}
+
+    server = http.server.ThreadingHTTPServer(("127.0.0.1", 0), _VideoHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    try:
+        alpha = decks / "alpha" / "resources" / "assets"
+        # Writers outside the store, as a regeneration without the store would run
+        ImageResult(b"regenerated image", "image/png").save(alpha / "hero.png")
+        VideoResult("task-1", "success", f"http://127.0.0.1:{server.server_port}/video", [], None).download(
+            alpha / "intro.mp4")
+    finally:
+        server.shutdown()
+
+    print(json.dumps({
+        "before": before,
+        "blobs": {name: _describe(blob) for name, blob in blobs.items()},
+        "alpha": {name: _describe(alpha / name) for name in ("hero.png", "intro.mp4")},
+        "beta": {name: _describe(decks / "beta" / "resources" / "assets" / name) for name in ("hero.png", "intro.mp4")},
+        "leftovers": sorted(p.name for p in alpha.iterdir() if p.name.startswith(".")),
+    }))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,125 @@
+# ABOUTME: Starts the media daemon on a throwaway socket and routes model_mediated commands through it.
+# ABOUTME: Prints routing, fallback, warning-relay, and per-request tools results as JSON for test/media-daemon.test.js.
+
+import json
+import os
+import struct
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+import urllib.request
+import warnings
+import zlib
+from pathlib import Path
+
+from lib.media import daemon
+
+BRANDS = """window.KEYNOTE_BRANDS = {
+  acme: {
+    tokens: {
+      "brand-ink": "%s",
+    },
+  },
+};
+"""
+
+
+def _png() -> bytes:
+    """A complete 1x1 PNG, built without Pillow."""
+    def chunk(kind: bytes, data: bytes) -> bytes:
+        return struct.pack(">I", len(data)) + kind + data + struct.pack(">I", zlib.crc32(kind + data))
+
+    ihdr = struct.pack(">IIBBBBB", 1, 1, 8, 2, 0, 0, 0)
+    return b"\x89PNG\r\n\x1a\n" + chunk(b"IHDR", ihdr) + chunk(b"IDAT", zlib.compress(b"\x00\x10\x20\x30")) + chunk(b"IEND", b"")
+
+
+def _cli(argv: list[str]) -> dict:
+    """Run `python3 -m lib.media.model_mediated` in a separate process, as a user would."""
+    result = subprocess.run(
+        [sys.executable, "-m", "lib.media.model_mediated", *argv],
+        capture_output=True, text=True, timeout=30,
+    )
+    return {"exit_code": result.returncode, "stdout": result.stdout, "stderr": result.stderr}
+
+
+def _download(root: Path, name: str) -> list[str]:
+    # Relative paths: they must resolve against the caller's directory, not the daemon's
+    return ["download", (root / "source.png").as_uri(), f"decks/demo/resources/assets/{name}",
+            "--deck", "decks/demo", "--source", "local", "--photographer", "Test"]
+
+
+def _wait(socket_path: Path, running: bool) -> None:
+    for _ in range(100):
+        if daemon.is_running(socket_path) == running:
+            return
+        time.sleep(0.05)
+
+
+def main() -> int:
+    root = Path(tempfile.mkdtemp(prefix="keynote-daemon-"))
+    deck = root / "decks" / "demo"
+    (deck / "resources" / "assets").mkdir(parents=True)
+    (deck / "deck.json").write_text(json.dumps({"entity": "acme"}))
+    (root / "decks" / "brands.js").write_text(BRANDS % "#102030")
+    (root / "source.png").write_bytes(_png())
+    socket_path = root / "media.sock"
+    os.environ[daemon.SOCKET_ENV] = str(socket_path)
+    os.environ.pop(daemon.DISABLE_ENV, None)
+    os.chdir(root)
+
+    # No daemon: the CLI runs the command itself
+    fallback = {"forwarded": daemon.forward(_download(root, "a.png")) is not None, **_cli(_download(root, "a.png"))}
+
+    # A detached daemon serves the same command
+    started = daemon.start(socket_path)
+    try:
+        routed = _cli(_download(root, "b.png"))
+        status = daemon.request({"op": "ping"}, socket_path, timeout=5)
+    finally:
+        daemon.request({"op": "shutdown"}, socket_path, timeout=5)
+    _wait(socket_path, running=False)
+
+    # Warnings raised inside a request reach that request's client
+    urlopen = urllib.request.urlopen
+
+    def noisy(*args, **kwargs):
+        warnings.warn("mirror is slow")
+        return urlopen(*args, **kwargs)
+
+    urllib.request.urlopen = noisy
+    relay_socket = root / "relay.sock"
+    threading.Thread(target=daemon.serve, args=(relay_socket,), daemon=True).start()
+    _wait(relay_socket, running=True)
+    relayed = daemon.forward(_download(root, "c.png"), relay_socket)
+    daemon.request({"op": "shutdown"}, relay_socket, timeout=5)
+    urllib.request.urlopen = urlopen
+
+    # Each request gets fresh tools: brand edits apply without a restart
+    media = daemon.MediaDaemon()
+    first = media.tools_for(Path("decks/demo"))
+    (root / "decks" / "brands.js").write_text(BRANDS % "#405060")
+    second = media.tools_for(Path("decks/demo"))
+
+    assets = deck / "resources" / "assets"
+    print(json.dumps({
+        "fallback": fallback,
+        "started_pid": started["pid"],
+        "own_pid": os.getpid(),
+        "routed": routed,
+        "status": status,
+        "log_exists": daemon.log_path(socket_path).exists(),
+        "socket_removed": not socket_path.exists(),
+        "relayed": relayed,
+        "written": sorted(p.name for p in assets.iterdir() if p.read_bytes() == _png()),
+        "palettes": [first.palette, second.palette],
+        "shared_tools": first is second,
+        "decks": media.status()["decks"],
+        "deck": str(deck.resolve()),
+    }))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
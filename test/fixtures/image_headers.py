@@ -0,0 +1,64 @@
+# ABOUTME: Writes PNG, progressive JPEG, WebP (VP8, VP8L, VP8X), and GIF files with Pillow.
+# ABOUTME: Prints what the header-only readers report for each as JSON for test/image-meta.test.js.
+
+import io
+import json
+import sys
+import tempfile
+from pathlib import Path
+
+from PIL import Image
+
+from lib.media.image_meta import ImageMetaError, read_bytes, read_file
+
+
+def _chunk(data: bytes) -> str:
+    return data[12:16].decode("latin1")
+
+
+def main() -> int:
+    folder = Path(tempfile.mkdtemp(prefix="keynote-image-meta-"))
+    rgb = Image.new("RGB", (317, 203), (200, 80, 40))
+    rgba = Image.new("RGBA", (317, 203), (200, 80, 40, 128))
+
+    # A large EXIF block pushes the start-of-frame marker well past the first read
+    exif = Image.Exif()
+    exif[0x010E] = "x" * 20000  # ImageDescription
+    files = {
+        "png": (rgb, {"format": "PNG"}),
+        "progressive.jpg": (rgb, {"format": "JPEG", "progressive": True, "exif": exif.tobytes()}),
+        "lossy.webp": (rgb, {"format": "WEBP", "quality": 80}),
+        "lossless.webp": (rgb, {"format": "WEBP", "lossless": True}),
+        "alpha.webp": (rgba, {"format": "WEBP", "quality": 80}),
+        "gif": (rgb.convert("P"), {"format": "GIF"}),
+    }
+
+    results = {}
+    for name, (image, options) in files.items():
+        path = folder / f"image.{name}"
+        image.save(path, **options)
+        data = path.read_bytes()
+        from_file = read_file(path)
+        from_bytes = read_bytes(data)
+        results[name] = {
+            **from_file.to_dict(),
+            "matches_bytes": from_file == from_bytes,
+            "actual_size": len(data),
+            "webp_chunk": _chunk(data) if options["format"] == "WEBP" else None,
+        }
+
+    errors = {}
+    png = (folder / "image.png").read_bytes()
+    for name, data in {"truncated": png[:20], "text": b"<html></html>" + b" " * 32}.items():
+        try:
+            read_bytes(data)
+            errors[name] = None
+        except ImageMetaError as e:
+            errors[name] = str(e)
+
+    print(json.dumps({"results": results, "errors": errors}))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,100 @@
+# ABOUTME: Local stand-in for the Kie.ai Veo API shared by the Veo test fixtures.
+# ABOUTME: Serves generate, record-info and video downloads, with optional completion callbacks.
+
+from __future__ import annotations
+
+import json
+import threading
+import time
+import urllib.request
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Optional
+
+from lib.media.veo import VeoClient
+
+
+class KieStandIn:
+    """
+    POST /veo/generate returns task-<model>-<n>. record-info reports
+    "processing" until the model's delay has passed, then success with a
+    video URL on this server whose body is the model name (so a downloaded
+    file shows which tier it came from). finish=False keeps every task
+    processing. callback_delay, when set, POSTs the completion to the
+    task's callBackUrl that long after submission.
+    """
+
+    def __init__(
+        self,
+        delays: Optional[dict[str, float]] = None,
+        finish: bool = True,
+        callback_delay: Optional[float] = None,
+    ):
+        self.delays = delays or {}
+        self.finish = finish
+        self.callback_delay = callback_delay
+        self.tasks: dict[str, tuple[str, float]] = {}  # task id -> (model, submitted at)
+        self.polls = 0
+        self._lock = threading.Lock()
+        self._server = ThreadingHTTPServer(("127.0.0.1", 0), self._handler())
+        self.url = "http://127.0.0.1:%d" % self._server.server_address[1]
+
+    def __enter__(self) -> "KieStandIn":
+        threading.Thread(target=self._server.serve_forever, daemon=True).start()
+        VeoClient.BASE_URL = self.url
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self._server.shutdown()
+        self._server.server_close()
+
+    def video_url(self, task_id: str) -> str:
+        return f"{self.url}/video/{task_id}"
+
+    def _submit(self, body: dict) -> str:
+        with self._lock:
+            task_id = "task-%s-%d" % (body.get("model", "veo3"), len(self.tasks) + 1)
+            self.tasks[task_id] = (body.get("model", "veo3"), time.time())
+        if self.callback_delay is not None and body.get("callBackUrl"):
+            threading.Thread(target=self._callback, args=(task_id, body["callBackUrl"]), daemon=True).start()
+        return task_id
+
+    def _callback(self, task_id: str, callback_url: str) -> None:
+        time.sleep(self.callback_delay)
+        data = json.dumps({"code": 200, "msg": "ok", "data": {
+            "taskId": task_id, "info": {"resultUrls": [self.video_url(task_id)]}}}).encode()
+        urllib.request.urlopen(urllib.request.Request(callback_url, data=data))
+
+    def _status(self, task_id: str) -> dict:
+        with self._lock:
+            self.polls += 1
+        model, started = self.tasks[task_id]
+        if not self.finish or time.time() - started < self.delays.get(model, 0):
+            return {"state": "processing"}
+        return {"state": "success", "resultJson": json.dumps({"resultUrls": [self.video_url(task_id)]})}
+
+    def _handler(self):
+        stand_in = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def log_message(self, *args):
+                pass
+
+            def _send(self, body: bytes) -> None:
+                self.send_response(200)
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def do_POST(self):
+                body = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+                task_id = stand_in._submit(body)
+                self._send(json.dumps({"code": 200, "data": {"taskId": task_id}}).encode())
+
+            def do_GET(self):
+                if self.path.startswith("/video/"):
+                    self._send(stand_in.tasks[self.path.rsplit("/", 1)[1]][0].encode())
+                    return
+                task_id = self.path.split("taskId=")[1]
+                self._send(json.dumps({"data": stand_in._status(task_id)}).encode())
+
+        return Handler
@@ -0,0 +1,51 @@
+# ABOUTME: Searches a throwaway deck's 1024px square assets through ImageSearchClient with no stock API keys.
+# ABOUTME: Prints local hits, setup diagnostics, and the default decks root seen from another directory as JSON for test/local-search.test.js.
+
+import io
+import json
+import os
+import sys
+import tempfile
+from contextlib import redirect_stderr
+from pathlib import Path
+
+from PIL import Image
+
+from lib.media.image_search import ImageSearchClient
+from lib.media.local_library import DECKS_ROOT_ENV, default_decks_root
+
+
+def main() -> int:
+    for key in ("UNSPLASH_ACCESS_KEY", "PEXELS_API_KEY", "GOOGLE_CUSTOM_SEARCH_KEY", DECKS_ROOT_ENV):
+        os.environ.pop(key, None)
+
+    decks = Path(tempfile.mkdtemp(prefix="keynote-local-"))
+    assets = decks / "demo" / "resources" / "assets"
+    assets.mkdir(parents=True)
+    Image.new("RGB", (1024, 1024), (30, 60, 90)).save(assets / "brand-system.png")
+    Image.new("RGB", (1024, 1024), (90, 60, 30)).save(assets / "workflow-diagram.png")
+
+    warnings = io.StringIO()
+    with redirect_stderr(warnings):
+        client = ImageSearchClient(decks_root=decks)
+    try:
+        ImageSearchClient(decks_root=decks / "missing")
+        unconfigured = None
+    except ValueError as e:
+        unconfigured = str(e)
+    # Defaults a stock search would use: landscape, at least 1600px wide
+    hits = client.search("brand system", orientation="landscape")
+
+    os.chdir(tempfile.mkdtemp(prefix="keynote-cwd-"))
+    print(json.dumps({
+        "sources": client.available_sources,
+        "warning": warnings.getvalue(),
+        "unconfigured": unconfigured,
+        "hits": [{"id": r.id, "source": r.source, "width": r.width} for r in hits],
+        "default_root": str(default_decks_root()),
+    }))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
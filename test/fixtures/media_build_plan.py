@@ -0,0 +1,52 @@
+# ABOUTME: Plans a throwaway deck's media build through first run, no-op, prompt edit and deleted output.
+# ABOUTME: Prints each step's stale/fresh/adopted names as JSON for test/media-build.test.js.
+
+import json
+import sys
+import tempfile
+from pathlib import Path
+
+from lib.media.build import DeckMediaBuild
+
+
+def summary(builder: DeckMediaBuild) -> dict:
+    plan = builder.plan()
+    builder.adopt(plan)
+    builder.save_manifest()
+    return {
+        "stale": {spec.name: reason for spec, _, reason in plan.stale},
+        "fresh": sorted(spec.name for spec in plan.fresh),
+        "adopted": sorted(spec.name for spec, _ in plan.adopted),
+    }
+
+
+def main() -> int:
+    deck = Path(tempfile.mkdtemp(prefix="keynote-build-"))
+    prompts = deck / "resources" / "prompts"
+    assets = deck / "resources" / "assets"
+    prompts.mkdir(parents=True)
+    assets.mkdir(parents=True)
+    # Explicit defaults keep planning offline: no brands.js or client lookup
+    (prompts / "build.json").write_text(json.dumps({"defaults": {"model": "test-model", "brand": "Ink on ivory"}}))
+    for name in ("hero", "chart", "team"):
+        (prompts / f"{name}.txt").write_text(f"A {name} illustration")
+    (assets / "hero.png").write_bytes(b"existing hero")
+    (assets / "chart.png").write_bytes(b"existing chart")
+
+    steps = {"first": summary(DeckMediaBuild(deck)), "unchanged": summary(DeckMediaBuild(deck))}
+
+    (prompts / "hero.txt").write_text("A bolder hero illustration")
+    steps["prompt_changed"] = summary(DeckMediaBuild(deck))
+
+    (assets / "chart.png").unlink()
+    steps["output_missing"] = summary(DeckMediaBuild(deck))
+
+    manifest = json.loads((deck / "resources" / "materials" / "media-build-manifest.json").read_text())
+    steps["recorded"] = sorted(manifest["assets"])
+    steps["adopted_flag"] = manifest["assets"]["resources/assets/chart.png"].get("adopted", False)
+    print(json.dumps(steps))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,42 @@
+# ABOUTME: Normalizes two images in a throwaway deck and applies the variants to its index.html.
+# ABOUTME: Prints the rewritten HTML and tag count as JSON for test/normalize-apply.test.js.
+
+import json
+import sys
+import tempfile
+from pathlib import Path
+
+from PIL import Image
+
+from lib.media.normalize import DeckImageNormalizer
+
+HTML = """<div class="media-frame">
+  <img
+    class="gen-media"
+    data-gen="text-to-image"
+    src="resources/assets/generated.png"
+    alt="Generated"
+  />
+</div>
+<div class="media-frame"><img class="gen-media" src="resources/assets/generated.png" alt="Regenerable" /></div>
+<img class="photo" src="resources/assets/photo.png" alt="Photo" />
+"""
+
+
+def main() -> int:
+    deck = Path(tempfile.mkdtemp(prefix="keynote-normalize-"))
+    assets = deck / "resources" / "assets"
+    assets.mkdir(parents=True)
+    for name in ("generated", "photo"):
+        Image.new("RGB", (1000, 600), (200, 120, 40)).save(assets / f"{name}.png")
+    (deck / "index.html").write_text(HTML)
+
+    normalizer = DeckImageNormalizer(deck, (400,), ["webp"])
+    normalizer.run(out=sys.stderr)
+    count = normalizer.apply(deck / "index.html")
+    print(json.dumps({"count": count, "html": (deck / "index.html").read_text()}))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,75 @@
+# ABOUTME: Scores palette, bilevel, 16-bit, and alpha images against a brand palette, directly and via generate().
+# ABOUTME: Prints scores and the generate() palette fields as JSON for test/palette.test.js.
+
+import contextlib
+import io
+import json
+import sys
+import tempfile
+from pathlib import Path
+
+from PIL import Image
+
+from lib.media import palette as palette_module
+from lib.media.model_mediated import ImageAcquisitionTools
+from lib.media.nano_banana import ImageResult
+
+PALETTE = {"ink": (20, 24, 40), "accent": (230, 90, 40)}
+
+
+def _png(mode: str) -> bytes:
+    # Large enough that sampling takes the reduce() path
+    image = Image.new("RGB", (1200, 800), PALETTE["accent"])
+    if mode == "P":
+        image = image.quantize(4)
+    elif mode != "RGB":
+        image = image.convert(mode)
+    buffer = io.BytesIO()
+    image.save(buffer, format="PNG")
+    return buffer.getvalue()
+
+
+class StandInGenerator:
+    """Returns a palette-mode PNG, as some image models do."""
+
+    def generate_image(self, prompt, temperature=1.0, draft=False):
+        return ImageResult(_png("P"), "image/png")
+
+
+def _generate(folder: Path, name: str) -> dict:
+    tools = ImageAcquisitionTools(work_runs_dir=folder / "runs", generator=StandInGenerator(), palette=PALETTE)
+    tools.generate("hero", folder / f"{name}.png", palette_threshold=0.5)
+    record = json.loads(next((folder / "runs").glob("*.json")).read_text())
+    return {"palette": record["palette"], "saved": (folder / f"{name}.png").exists()}
+
+
+def main() -> int:
+    scores = {}
+    for mode in ("P", "1", "I;16", "LA", "RGBA"):
+        scores[mode] = palette_module.check_palette(_png(mode), PALETTE).score
+
+    # The CLI reports what it could score and warns about the rest
+    folder = Path(tempfile.mkdtemp(prefix="keynote-palette-"))
+    (folder / "good.png").write_bytes(_png("P"))
+    (folder / "bad.png").write_bytes(b"not an image")
+    stdout, stderr = io.StringIO(), io.StringIO()
+    with contextlib.redirect_stdout(stdout), contextlib.redirect_stderr(stderr):
+        status = palette_module.main(["--deck", "decks/skill-demo", "--json", str(folder / "good.png"), str(folder / "bad.png")])
+    cli = {"status": status, "scored": sorted(Path(p).name for p in json.loads(stdout.getvalue())),
+           "warning": stderr.getvalue()}
+
+    scored = _generate(Path(tempfile.mkdtemp(prefix="keynote-palette-")), "scored")
+
+    # A scoring failure skips the score, not the generation
+    def broken(*args, **kwargs):
+        raise ValueError("image has wrong mode")
+
+    palette_module.check_palette = broken
+    unscored = _generate(Path(tempfile.mkdtemp(prefix="keynote-palette-")), "unscored")
+
+    print(json.dumps({"scores": scores, "cli": cli, "scored": scored, "unscored": unscored}))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
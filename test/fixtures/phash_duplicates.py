@@ -0,0 +1,63 @@
+# ABOUTME: Builds two throwaway decks with an image, its resized JPEG copy, and an unrelated image.
+# ABOUTME: Prints perceptual-index lookups, clusters, and refresh counts as JSON for test/phash-index.test.js.
+
+import io
+import json
+import sys
+import tempfile
+from pathlib import Path
+
+import numpy as np
+from PIL import Image, ImageEnhance
+
+from lib.media.phash_index import PerceptualIndex
+
+
+def _scene(seed: int) -> Image.Image:
+    """Smooth random shapes: a coarse random grid upscaled to photo size."""
+    rng = np.random.default_rng(seed)
+    coarse = (rng.random((6, 8, 3)) * 255).astype(np.uint8)
+    return Image.fromarray(coarse).resize((800, 600), Image.BICUBIC)
+
+
+def main() -> int:
+    decks = Path(tempfile.mkdtemp(prefix="keynote-phash-"))
+    for deck in ("alpha", "beta"):
+        (decks / deck / "resources" / "assets").mkdir(parents=True)
+
+    original = _scene(1)
+    original.save(decks / "alpha" / "resources" / "assets" / "hero.png")
+    original.resize((400, 300), Image.LANCZOS).save(
+        decks / "beta" / "resources" / "assets" / "hero-small.jpg", quality=70)
+    _scene(2).save(decks / "beta" / "resources" / "assets" / "other.png")
+
+    index = PerceptualIndex(decks)
+    first = index.refresh()
+    second = index.refresh()
+
+    # A brightened re-encode that was never indexed
+    buffer = io.BytesIO()
+    ImageEnhance.Brightness(original).enhance(1.1).save(buffer, format="JPEG", quality=85)
+    lookup = [m.to_dict() for m in index.lookup(buffer.getvalue())]
+    excluded = [m.path for m in index.lookup(
+        decks / "alpha" / "resources" / "assets" / "hero.png",
+        exclude=decks / "alpha" / "resources" / "assets" / "hero.png",
+    )]
+    clusters = [[m.path for m in group] for group in index.clusters()]
+
+    # A fresh index loads the saved hashes instead of re-hashing
+    reloaded = PerceptualIndex(decks)
+    print(json.dumps({
+        "first": first,
+        "second": second,
+        "lookup": lookup,
+        "excluded": excluded,
+        "clusters": clusters,
+        "reloaded": reloaded.refresh(),
+        "entries": sorted(reloaded.entries),
+    }))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,62 @@
+# ABOUTME: Runs one generate node through PipelineScheduler with a stand-in generator, palette, and perceptual index.
+# ABOUTME: Prints the node's work-run records as JSON for test/pipeline-image-node.test.js.
+
+import io
+import json
+import sys
+import tempfile
+from pathlib import Path
+
+from PIL import Image
+
+from lib.media.model_mediated import ImageAcquisitionTools
+from lib.media.nano_banana import ImageResult
+from lib.media.phash_index import PerceptualIndex
+from lib.media.pipeline import PipelineScheduler, load_graph
+
+PALETTE = {"ink": (20, 24, 40), "accent": (230, 90, 40)}
+
+
+def _hero() -> Image.Image:
+    image = Image.new("RGB", (640, 360), PALETTE["ink"])
+    image.paste(PALETTE["accent"], (0, 0, 320, 360))
+    return image
+
+
+class StandInGenerator:
+    """Returns the same hero image every time."""
+
+    def generate_image(self, prompt, temperature=1.0, draft=False):
+        buffer = io.BytesIO()
+        _hero().save(buffer, format="PNG")
+        return ImageResult(buffer.getvalue(), "image/png")
+
+
+def main() -> int:
+    decks = Path(tempfile.mkdtemp(prefix="keynote-pipeline-"))
+    deck = decks / "demo"
+    (deck / "resources" / "assets").mkdir(parents=True)
+    # Another deck already has this image
+    (decks / "other" / "resources" / "assets").mkdir(parents=True)
+    _hero().save(decks / "other" / "resources" / "assets" / "hero.png")
+
+    runs = deck / "resources" / "materials" / "work-runs"
+    tools = ImageAcquisitionTools(
+        work_runs_dir=runs,
+        generator=StandInGenerator(),
+        phash_index=PerceptualIndex(decks),
+        palette=PALETTE,
+    )
+    graph = load_graph({"slides": {"2": [
+        {"id": "hero", "op": "generate", "prompt": "Split ink and accent", "output": "resources/assets/hero.png"},
+    ]}})
+    scheduler = PipelineScheduler(deck, graph, tools=tools)
+    scheduler.run()
+
+    records = [json.loads(p.read_text()) for p in sorted(runs.glob("*.json"))]
+    print(json.dumps({"status": graph["hero"].status, "error": graph["hero"].error, "records": records}))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,79 @@
+# ABOUTME: Runs a small job graph through PipelineScheduler with stand-in generate/edit operations.
+# ABOUTME: Prints start/finish order, peak concurrency, node states and work-run records as JSON.
+
+import json
+import sys
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+from lib.media.model_mediated import ImageAcquisitionTools
+from lib.media.pipeline import PipelineScheduler, load_graph
+
+JOBS = {
+    "limits": {"gemini": 2},
+    "slides": {
+        "1": [
+            {"id": "base", "op": "generate", "prompt": "base", "output": "resources/assets/base.png"},
+            {"id": "brand", "op": "edit", "input": "@base", "prompt": "brand", "output": "resources/assets/brand.png"},
+            {"id": "final", "op": "edit", "input": "@brand", "prompt": "final", "output": "resources/assets/final.png"},
+            {"id": "side", "op": "generate", "prompt": "side", "output": "resources/assets/side.png", "needs": ["base"]},
+        ],
+        "2": [
+            {"id": "broken", "op": "generate", "prompt": "fail", "output": "resources/assets/broken.png"},
+            {"id": "after-broken", "op": "edit", "input": "@broken", "prompt": "x", "output": "resources/assets/a.png"},
+            {"id": "after-after", "op": "edit", "input": "@after-broken", "prompt": "y", "output": "resources/assets/b.png"},
+            {"id": "solo", "op": "generate", "prompt": "solo", "output": "resources/assets/solo.png"},
+        ],
+    },
+}
+
+
+class StandInScheduler(PipelineScheduler):
+    """Generate/edit just record timing; a "fail" prompt raises."""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.events = []
+        self.in_flight = 0
+        self.peak = 0
+        self._events_lock = threading.Lock()
+
+    def _step(self, node, p):
+        with self._events_lock:
+            self.events.append(("start", node.id))
+            self.in_flight += 1
+            self.peak = max(self.peak, self.in_flight)
+        time.sleep(0.05)
+        with self._events_lock:
+            self.in_flight -= 1
+            self.events.append(("end", node.id))
+        if p["prompt"] == "fail":
+            raise RuntimeError("generation refused")
+        return str(self._path(p["output"]))
+
+    _run_generate = _step
+    _run_edit = _step
+
+
+def main() -> int:
+    deck = Path(tempfile.mkdtemp(prefix="keynote-pipeline-"))
+    work_runs = deck / "resources" / "materials" / "work-runs"
+    tools = ImageAcquisitionTools(work_runs_dir=work_runs)
+    scheduler = StandInScheduler(deck, load_graph(JOBS), limits=JOBS["limits"], tools=tools)
+    nodes = scheduler.run()
+
+    records = [json.loads(p.read_text()) for p in sorted(work_runs.glob("image-*.json"))]
+    print(json.dumps({
+        "events": scheduler.events,
+        "peak": scheduler.peak,
+        "status": {node.id: node.status for node in nodes.values()},
+        "errors": {node.id: node.error for node in nodes.values() if node.error},
+        "records": {r["node"]["id"]: r["node"]["status"] for r in records},
+    }))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,82 @@
+# ABOUTME: Drafts a generated and an edited image with a stand-in generator, then promotes them to final quality.
+# ABOUTME: Prints generator calls, pending drafts, and output contents per step as JSON for test/promote.test.js.
+
+import json
+import struct
+import sys
+import tempfile
+import zlib
+from pathlib import Path
+
+from lib.media.model_mediated import ImageAcquisitionTools
+from lib.media.nano_banana import ImageResult
+
+
+def _png(tag: str) -> bytes:
+    """A PNG header (all the readers look at) followed by a tag naming what produced it."""
+    ihdr = struct.pack(">IIBBBBB", 64, 36, 8, 2, 0, 0, 0)
+    chunk = struct.pack(">I", len(ihdr)) + b"IHDR" + ihdr + struct.pack(">I", zlib.crc32(b"IHDR" + ihdr))
+    return b"\x89PNG\r\n\x1a\n" + chunk + tag.encode()
+
+
+class StandInGenerator:
+    """Records each request; the output names the tier and prompt."""
+
+    def __init__(self):
+        self.calls = []
+
+    def model_for(self, draft=False):
+        return "draft-model" if draft else "final-model"
+
+    def _result(self, op, prompt, temperature, draft, inputs=0):
+        model = self.model_for(draft)
+        self.calls.append({"op": op, "prompt": prompt, "temperature": temperature, "model": model, "inputs": inputs})
+        return ImageResult(_png(f"{model}:{prompt}"), "image/png", model=model)
+
+    def generate_image(self, prompt, temperature=1.0, draft=False):
+        return self._result("generate", prompt, temperature, draft)
+
+    def edit_image(self, prompt, inputs, temperature=0.2, draft=False):
+        return self._result("edit", prompt, temperature, draft, inputs=len(inputs))
+
+
+def main() -> int:
+    deck = Path(tempfile.mkdtemp(prefix="keynote-promote-"))
+    assets = deck / "resources" / "assets"
+    generator = StandInGenerator()
+    tools = ImageAcquisitionTools(work_runs_dir=deck / "resources" / "materials" / "work-runs", generator=generator)
+
+    def tag(name):
+        return (assets / name).read_bytes()[len(_png("")):].decode()
+
+    def pending():
+        return sorted(path.name for path in tools.pending_drafts())
+
+    tools.generate("Hero skyline", assets / "hero.png", brand_context="Ink on ivory",
+                   slide_number=1, temperature=0.7, draft=True)
+    tools.edit_image("Add brand frame", assets / "hero.png", assets / "framed.png", slide_number=2, draft=True)
+    tools.generate("Closing", assets / "closing.png", slide_number=3)
+
+    steps = {"drafted": {"pending": pending(), "hero": tag("hero.png"), "framed": tag("framed.png")}}
+    drafted_calls = len(generator.calls)
+
+    by_output = tools.promote(outputs=[assets / "hero.png"])
+    steps["by_output"] = {"promoted": [p.name for p in by_output], "pending": pending(), "hero": tag("hero.png")}
+
+    by_slide = tools.promote(slides=[2])
+    steps["by_slide"] = {"promoted": [p.name for p in by_slide], "pending": pending(), "framed": tag("framed.png")}
+
+    steps["again"] = {"promoted": [p.name for p in tools.promote(slides=[1, 2, 3])]}
+
+    records = [json.loads(p.read_text()) for p in (deck / "resources" / "materials" / "work-runs").glob("*.json")]
+    print(json.dumps({
+        "steps": steps,
+        "promote_calls": generator.calls[drafted_calls:],
+        "promoted_from": sorted(bool(r["promoted_from"]) for r in records),
+        "final_drafts": [r["draft"] for r in records if r["promoted_from"]],
+    }))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
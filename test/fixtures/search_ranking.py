@@ -0,0 +1,56 @@
+# ABOUTME: Pre-ranks hand-made search results for frame fit, resolution, license, relevance, and source diversity.
+# ABOUTME: Prints the ranked ids and scores per scenario as JSON for test/search-rank.test.js.
+
+import json
+import sys
+
+from lib.media.image_search import SearchResult
+from lib.media.search_rank import rank_results
+
+
+def _result(id, source, width, height, description, license):
+    return SearchResult(
+        id=id, source=source, url=f"https://example.test/{id}.jpg", thumbnail_url="",
+        description=description, photographer="", photographer_url="",
+        width=width, height=height, license=license, photo_page_url="",
+    )
+
+
+def _ids(results):
+    return [r.id for r in results]
+
+
+def main() -> int:
+    def candidates():
+        return [
+            _result("small", "unsplash", 800, 450, "Mountain lake at sunrise", "Unsplash License"),
+            _result("portrait", "pexels", 2160, 3840, "Mountain lake at sunrise", "Pexels License"),
+            _result("offtopic", "pexels", 3840, 2160, "Office desk with laptop", "Pexels License"),
+            _result("unknown", "google", 0, 0, "Mountain lake", "Verify license on source"),
+            _result("best", "unsplash", 3840, 2160, "Mountain lake at sunrise", "Unsplash License"),
+        ]
+
+    landscape = rank_results(candidates(), "mountain lake sunrise")
+    portrait = rank_results(candidates(), "mountain lake sunrise", frame="9:16")
+    top_two = rank_results(candidates(), "mountain lake sunrise", top_k=2)
+
+    # Three equally strong Unsplash results and a slightly weaker Pexels one
+    crowded = [
+        _result(f"u{i}", "unsplash", 3840, 2160, "Mountain lake at sunrise", "Unsplash License") for i in range(3)
+    ] + [_result("p0", "pexels", 3000, 2000, "Mountain lake at sunrise", "Pexels License")]
+    diverse = rank_results(crowded, "mountain lake sunrise", top_k=3)
+
+    print(json.dumps({
+        "landscape": _ids(landscape),
+        "scores": [r.rank_score for r in landscape],
+        "best_breakdown": landscape[0].rank_breakdown,
+        "portrait": _ids(portrait),
+        "top_two": _ids(top_two),
+        "diverse": _ids(diverse),
+        "diverse_breakdowns": [r.rank_breakdown["diversity"] for r in diverse],
+    }))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,68 @@
+# ABOUTME: Waits on one Veo task in callback mode against the Kie.ai stand-in.
+# ABOUTME: Modes: "callback", "lost" (polling must cover it), "queue" (queued wait), "unreachable" (CLI refusal).
+
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+from kie_standin import KieStandIn
+from lib.media.veo import VeoClient, VeoError
+from lib.media.veo_callbacks import PUBLIC_URL_ENV, CallbackReceiver
+from lib.media.veo_queue import VeoJobQueue
+
+
+def wait_direct(mode: str) -> dict:
+    callback = mode == "callback"
+    # record-info never reports success, so only a callback can finish the wait
+    with KieStandIn(finish=False, callback_delay=0.2 if callback else None) as kie:
+        # No fallback_interval: a lost callback is covered at the client's poll interval
+        with CallbackReceiver() as receiver:
+            client = VeoClient(api_key="test", callback_receiver=receiver)
+            start = time.time()
+            try:
+                result = client.generate_video("prompt", timeout=1, poll_interval=10 if callback else 0.2)
+                outcome = {"status": result.status, "url": result.video_url, "expected_url": kie.video_url(result.task_id)}
+            except VeoError as e:
+                outcome = {"error": str(e)}
+            outcome.update(polls=kie.polls, seconds=time.time() - start)
+    return outcome
+
+
+def wait_queued() -> dict:
+    deck = Path(tempfile.mkdtemp(prefix="keynote-veo-callbacks-"))
+    output = deck / "resources" / "assets" / "clip.mp4"
+    with KieStandIn(finish=False, callback_delay=0.2) as kie:
+        with CallbackReceiver() as receiver:
+            client = VeoClient(api_key="test", callback_receiver=receiver)
+            job = VeoJobQueue.for_deck(deck).run(client, "prompt", output, timeout=5)
+            return {"status": job.status, "video": output.read_text(), "polls": kie.polls,
+                    "futures": len(receiver._futures)}
+
+
+def refuse_unreachable() -> dict:
+    env = {key: value for key, value in os.environ.items() if key != PUBLIC_URL_ENV}
+    result = subprocess.run(
+        [sys.executable, "-m", "lib.media.veo", "--prompt", "prompt", "--callback",
+         "--output", str(Path(tempfile.mkdtemp()) / "clip.mp4")],
+        capture_output=True, text=True, timeout=30, env={**env, "KIE_API_KEY": "test"},
+    )
+    return {"exit_code": result.returncode, "stdout": result.stdout}
+
+
+def main(mode: str) -> int:
+    if mode == "queue":
+        outcome = wait_queued()
+    elif mode == "unreachable":
+        outcome = refuse_unreachable()
+    else:
+        outcome = wait_direct(mode)
+    print(json.dumps(outcome))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1]))
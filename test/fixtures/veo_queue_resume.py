@@ -0,0 +1,62 @@
+# ABOUTME: Kills a process mid-wait on a queued Veo task, then resumes the deck's queue in a fresh one.
+# ABOUTME: Prints submissions, job states and the downloaded video as JSON for test/veo-queue.test.js.
+
+import json
+import os
+import subprocess
+import sys
+import tempfile
+from pathlib import Path
+
+from kie_standin import KieStandIn
+from lib.media.veo import VeoClient
+from lib.media.veo_queue import VeoJobQueue
+
+
+def interrupted_run(base_url: str, deck: str) -> None:
+    """Child process: submit, start waiting, and die before the video lands."""
+    VeoClient.BASE_URL = base_url
+    queue = VeoJobQueue.for_deck(deck)
+    client = VeoClient(api_key="test")
+    job = queue.submit(client, "slow push in", Path(deck) / "resources" / "assets" / "clip.mp4")
+    client.get_status(job.task_id)  # First poll of the wait
+    os._exit(9)  # No cleanup, like a killed agent
+
+
+def main() -> int:
+    deck = Path(tempfile.mkdtemp(prefix="keynote-veo-queue-"))
+    output = deck / "resources" / "assets" / "clip.mp4"
+
+    with KieStandIn(delays={"veo3": 0.5}) as kie:
+        child = subprocess.run(
+            [sys.executable, __file__, "child", kie.url, str(deck)],
+            env={**os.environ, "PYTHONPATH": os.pathsep.join(sys.path)},
+        )
+        after_crash = [job.status for job in VeoJobQueue.for_deck(deck).jobs()]
+
+        # A fresh process: new queue object, new client, same deck
+        queue = VeoJobQueue.for_deck(deck)
+        client = VeoClient(api_key="test")
+        resumed = queue.resume(client, timeout=5, poll_interval=0)
+        # Asking for the same video again re-attaches instead of paying twice
+        again = queue.run(client, "slow push in", output, timeout=5, poll_interval=0)
+        # A different frame is a different video, so it gets its own task
+        portrait = queue.run(client, "slow push in", output, aspect_ratio="9:16", timeout=5, poll_interval=0)
+
+        print(json.dumps({
+            "child_exit": child.returncode,
+            "after_crash": after_crash,
+            "resumed": [job.status for job in resumed],
+            "again": [again.status, again.task_id == resumed[0].task_id],
+            "portrait": [portrait.status, portrait.task_id == resumed[0].task_id],
+            "submissions": len(kie.tasks),
+            "video": output.read_text(),
+            "pending": [job.task_id for job in queue.jobs(("submitted", "processing", "completed"))],
+        }))
+    return 0
+
+
+if __name__ == "__main__":
+    if sys.argv[1:2] == ["child"]:
+        interrupted_run(sys.argv[2], sys.argv[3])
+    sys.exit(main())
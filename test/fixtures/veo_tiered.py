@@ -0,0 +1,72 @@
+# ABOUTME: Runs a tiered Veo job (veo3_fast preview, veo3 final) against the Kie.ai stand-in.
+# ABOUTME: Modes: "in-order" (preview lands first), "late-preview" (collected after the final), "detached" (CLI --no-wait-final).
+
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+from kie_standin import KieStandIn
+from lib.media.veo import VeoClient
+from lib.media.veo_queue import VeoJobQueue
+
+
+def detached(deck: Path, output: Path) -> dict:
+    """The CLI exits after the preview; its background resume brings the final."""
+    with KieStandIn() as kie:
+        cli = subprocess.run(
+            [sys.executable, "-m", "lib.media.veo", "--prompt", "prompt", "--output", str(output),
+             "--deck", str(deck), "--tiered", "--no-wait-final"],
+            capture_output=True, text=True, timeout=30,
+            env={**os.environ, "KIE_API_KEY": "test", "KIE_API_BASE_URL": kie.url},
+        )
+        queue = VeoJobQueue.for_deck(deck)
+        deadline = time.time() + 15
+        while time.time() < deadline and any(job.status != "downloaded" for job in queue.jobs()):
+            time.sleep(0.1)
+        return {
+            "exit_code": cli.returncode,
+            "stdout": cli.stdout,
+            "statuses": [[job.tier, job.status] for job in queue.jobs()],
+            "final": output.read_text(),
+            "log": (deck / "resources" / "materials" / "veo-resume.log").read_text(),
+        }
+
+
+def main(mode: str) -> int:
+    delays = {"veo3_fast": 0.1, "veo3": 0.6} if mode == "in-order" else {}
+    deck = Path(tempfile.mkdtemp(prefix="keynote-veo-"))
+    output = deck / "resources" / "assets" / "clip.mp4"
+    seen = []
+    if mode == "detached":
+        print(json.dumps(detached(deck, output)))
+        return 0
+
+    with KieStandIn(delays=delays):
+        queue = VeoJobQueue.for_deck(deck)
+        client = VeoClient(api_key="test")
+        if mode == "in-order":
+            def report(job, error):
+                seen.append([job.tier, job.status, output.read_text()])
+            queue.run_tiered(client, "prompt", output, timeout=5, poll_interval=0, on_update=report)
+        else:
+            # The final finishes and lands before the preview is collected
+            preview = queue.submit(client, "prompt", output, "veo3_fast", tier="preview")
+            final = queue.submit(client, "prompt", output, "veo3", tier="final")
+            for job in (final, preview):
+                job = queue.wait(client, job.task_id, timeout=5, poll_interval=0)
+                seen.append([job.tier, job.status, output.read_text()])
+
+    print(json.dumps({
+        "seen": seen,
+        "final": output.read_text(),
+        "leftovers": sorted(p.name for p in output.parent.iterdir() if p.name.startswith(".")),
+    }))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1]))
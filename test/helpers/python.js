@@ -0,0 +1,36 @@
+// ABOUTME: Shared runner for tests that drive lib.media through Python fixture scripts.
+// ABOUTME: Runs test/fixtures/<name>.py from the repo root and parses its JSON output.
+const assert = require('node:assert/strict');
+const path = require('node:path');
+const { spawnSync } = require('node:child_process');
+
+const repoRoot = path.resolve(__dirname, '..', '..');
+const fixturesDir = path.join(repoRoot, 'test', 'fixtures');
+
+const python = spawnSync('python3', ['--version']);
+const skipWithoutPython = python.error ? 'python3 not available' : false;
+
+/**
+ * True when python3 can import every module, e.g. hasPythonModules('numpy', 'PIL').
+ */
+function hasPythonModules(...modules) {
+  if (python.error) return false;
+  return spawnSync('python3', ['-c', modules.map((m) => `import ${m}`).join('\n')], { cwd: repoRoot }).status === 0;
+}
+
+/**
+ * Run a fixture script with args and return the JSON on its last stdout line.
+ */
+function runFixture(name, args = [], options = {}) {
+  const result = spawnSync('python3', [path.join(fixturesDir, `${name}.py`), ...args.map(String)], {
+    cwd: repoRoot,
+    encoding: 'utf-8',
+    timeout: options.timeout || 30000,
+    env: { ...process.env, PYTHONPATH: repoRoot, KEYNOTE_MEDIA_NO_DAEMON: '1', ...options.env },
+  });
+  assert.equal(result.status, 0, result.stderr || result.error?.message);
+  const lines = result.stdout.trim().split('\n');
+  return JSON.parse(lines[lines.length - 1]);
+}
+
+module.exports = { hasPythonModules, repoRoot, runFixture, skipWithoutPython };
@@ -0,0 +1,127 @@
+// ABOUTME: Stand-in Chromium for capture tests: pages run evaluate() against a fake window.keynote and DOM.
+// ABOUTME: Also builds solid PNGs for its screenshots without an image library.
+const fs = require('node:fs');
+const zlib = require('node:zlib');
+
+const CRC_TABLE = Array.from({ length: 256 }, (_, n) => {
+  let c = n;
+  for (let k = 0; k < 8; k++) c = c & 1 ? 0xedb88320 ^ (c >>> 1) : c >>> 1;
+  return c >>> 0;
+});
+
+function crc32(buffer) {
+  let c = 0xffffffff;
+  for (const byte of buffer) c = CRC_TABLE[(c ^ byte) & 0xff] ^ (c >>> 8);
+  return (c ^ 0xffffffff) >>> 0;
+}
+
+// Solid 16x10 RGB PNG with an optional 4x4 block of another color
+function solidPng([r, g, b], block = null) {
+  const width = 16;
+  const height = 10;
+  const rows = [];
+  for (let y = 0; y < height; y++) {
+    const row = [0];
+    for (let x = 0; x < width; x++) row.push(...(block && x < 4 && y < 4 ? block : [r, g, b]));
+    rows.push(...row);
+  }
+  const chunk = (type, data) => {
+    const length = Buffer.alloc(4);
+    length.writeUInt32BE(data.length);
+    const body = Buffer.concat([Buffer.from(type), data]);
+    const crc = Buffer.alloc(4);
+    crc.writeUInt32BE(crc32(body));
+    return Buffer.concat([length, body, crc]);
+  };
+  const header = Buffer.alloc(13);
+  header.writeUInt32BE(width, 0);
+  header.writeUInt32BE(height, 4);
+  header.set([8, 2, 0, 0, 0], 8);
+  return Buffer.concat([
+    Buffer.from([0x89, 0x50, 0x4e, 0x47, 0x0d, 0x0a, 0x1a, 0x0a]),
+    chunk('IHDR', header),
+    chunk('IDAT', zlib.deflateSync(Buffer.from(rows))),
+    chunk('IEND', Buffer.alloc(0)),
+  ]);
+}
+
+// Minimal DOM for the capture cache's fingerprint of the active slide
+function standInDocument(slide) {
+  const element = {
+    outerHTML: slide ? slide.html : '',
+    classList: { contains: () => false },
+    querySelector: () => null,
+    querySelectorAll: () => [],
+  };
+  return {
+    baseURI: 'http://deck/index.html',
+    body: { className: '', dataset: {} },
+    documentElement: { getAttribute: () => null },
+    getElementById: () => null,
+    querySelector: () => (slide ? element : null),
+    querySelectorAll: () => [],
+  };
+}
+
+// Stand-in browser: each page runs evaluate() callbacks against its own
+// window.keynote, and goTo settles on a later tick like a real transition.
+// Slides are { title, html, png } (or plain titles); screenshots write png.
+function standInBrowser(deckSlides) {
+  const slides = deckSlides.map((slide) => (typeof slide === 'string' ? { title: slide, html: slide } : slide));
+  const titles = slides.map((slide) => slide.title);
+  const state = { contexts: [], openContexts: 0, inFlight: 0, maxInFlight: 0, screenshots: 0 };
+
+  const newPage = (contextId) => {
+    let current = 0;
+    const window = {
+      getComputedStyle: () => ({ backgroundImage: 'none', backgroundColor: 'rgb(255, 255, 255)' }),
+      keynote: {
+        count: titles.length,
+        settled: async () => current,
+        goTo: async (index) => {
+          current = index;
+          state.inFlight++;
+          state.maxInFlight = Math.max(state.maxInFlight, state.inFlight);
+          await new Promise((resolve) => setTimeout(resolve, 5));
+          state.inFlight--;
+          return current;
+        },
+      },
+    };
+    return {
+      contextId,
+      goto: async () => {},
+      evaluate: (fn, arg) => {
+        const saved = [globalThis.window, globalThis.document, globalThis.getComputedStyle];
+        globalThis.window = window;
+        globalThis.document = standInDocument(slides[current]);
+        globalThis.getComputedStyle = () => ({ backgroundImage: 'none' });
+        try {
+          return Promise.resolve(fn(arg));
+        } finally {
+          [globalThis.window, globalThis.document, globalThis.getComputedStyle] = saved;
+        }
+      },
+      locator: () => ({ getAttribute: async () => titles[current] }),
+      screenshot: async ({ path: file }) => {
+        state.screenshots++;
+        fs.writeFileSync(file, slides[current].png);
+      },
+    };
+  };
+
+  return {
+    state,
+    newContext: async () => {
+      const id = state.contexts.length;
+      state.contexts.push(id);
+      state.openContexts++;
+      return {
+        newPage: async () => newPage(id),
+        close: async () => { state.openContexts--; },
+      };
+    },
+  };
+}
+
+module.exports = { solidPng, standInBrowser };
@@ -0,0 +1,30 @@
+// ABOUTME: Preload (node --require) that answers require('playwright') with the stand-in browser.
+// ABOUTME: Logs launches and the browser behind each new context to $STAND_IN_BROWSER_LOG as JSON.
+const fs = require('node:fs');
+const Module = require('node:module');
+
+const { solidPng, standInBrowser } = require('./stand-in-browser');
+
+const log = { launches: 0, contexts: [] };
+const save = () => fs.writeFileSync(process.env.STAND_IN_BROWSER_LOG, JSON.stringify(log));
+
+const chromium = {
+  launch: async () => {
+    const id = ++log.launches;
+    save();
+    const browser = standInBrowser([{ title: 'Intro', html: '<section>Intro</section>', png: solidPng([255, 255, 255]) }]);
+    return {
+      newContext: async (...args) => {
+        log.contexts.push(id);
+        save();
+        return browser.newContext(...args);
+      },
+      close: async () => {},
+    };
+  },
+};
+
+const load = Module._load;
+Module._load = function (request, ...rest) {
+  return request === 'playwright' ? { chromium } : load.call(this, request, ...rest);
+};
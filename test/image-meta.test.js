@@ -0,0 +1,39 @@
+// ABOUTME: Exercises the header-only image readers on PNG, progressive JPEG, WebP, and GIF files.
+// ABOUTME: Covers all three WebP chunk layouts and a JPEG whose frame header sits behind a large EXIF block.
+const test = require('node:test');
+const assert = require('node:assert/strict');
+
+const { hasPythonModules, runFixture } = require('./helpers/python');
+
+const skip = hasPythonModules('PIL') ? false : 'python3 with Pillow not available';
+
+test('reads format and dimensions from every supported header', { skip }, () => {
+  const { results } = runFixture('image_headers');
+
+  const expected = {
+    png: ['png', 'image/png', null],
+    'progressive.jpg': ['jpeg', 'image/jpeg', null],
+    'lossy.webp': ['webp', 'image/webp', 'VP8 '],
+    'lossless.webp': ['webp', 'image/webp', 'VP8L'],
+    'alpha.webp': ['webp', 'image/webp', 'VP8X'],
+    gif: ['gif', 'image/gif', null],
+  };
+  for (const [name, [format, mime, chunk]] of Object.entries(expected)) {
+    const result = results[name];
+    assert.equal(result.format, format, name);
+    assert.equal(result.mime_type, mime, name);
+    assert.equal(result.width, 317, name);
+    assert.equal(result.height, 203, name);
+    assert.equal(result.size, result.actual_size, name);
+    assert.equal(result.webp_chunk, chunk, name);
+    assert.ok(result.matches_bytes, name);
+  }
+  assert.ok(results['progressive.jpg'].actual_size > 20000);
+});
+
+test('rejects truncated headers and non-images', { skip }, () => {
+  const { errors } = runFixture('image_headers');
+
+  assert.match(errors.truncated, /Truncated/);
+  assert.match(errors.text, /Not a PNG, JPEG, WebP, or GIF/);
+});
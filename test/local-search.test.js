@@ -0,0 +1,21 @@
+// ABOUTME: Exercises the local asset library through the unified image search client.
+// ABOUTME: Checks 1024px square deck assets pass the stock filters and the decks root ignores the working directory.
+const test = require('node:test');
+const assert = require('node:assert/strict');
+const path = require('node:path');
+
+const { hasPythonModules, repoRoot, runFixture } = require('./helpers/python');
+
+const skip = hasPythonModules('PIL') ? false : 'python3 with Pillow not available';
+
+test('local hits skip the stock width and orientation filters', { skip }, () => {
+  const { sources, warning, unconfigured, hits, default_root: defaultRoot } = runFixture('local_search');
+
+  // Local-only search works but says the stock APIs are missing
+  assert.deepEqual(sources, ['local']);
+  assert.match(warning, /no stock image APIs configured; searching only the local deck library/);
+  assert.match(unconfigured, /no local deck library and no APIs configured/);
+  assert.equal(hits[0].id, 'demo/resources/assets/brand-system.png');
+  assert.ok(hits.every((hit) => hit.source === 'local' && hit.width === 1024));
+  assert.equal(defaultRoot, path.join(repoRoot, 'decks'));
+});
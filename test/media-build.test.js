@@ -0,0 +1,24 @@
+// ABOUTME: Exercises incremental media build planning on a throwaway deck, without generating anything.
+// ABOUTME: Checks first-run adoption, no-op rebuilds, prompt edits and missing outputs.
+const test = require('node:test');
+const assert = require('node:assert/strict');
+
+const { runFixture, skipWithoutPython } = require('./helpers/python');
+
+test('build plans adopt, skip, and rebuild the right assets', { skip: skipWithoutPython }, () => {
+  const steps = runFixture('media_build_plan');
+
+  // Existing outputs are adopted on the first build; only the missing one is stale
+  assert.deepEqual(steps.first, { stale: { 'team.txt': 'output missing' }, fresh: [], adopted: ['chart.txt', 'hero.txt'] });
+  // Nothing changed: the adopted outputs stay fresh and are not regenerated
+  assert.deepEqual(steps.unchanged, { stale: { 'team.txt': 'output missing' }, fresh: ['chart.txt', 'hero.txt'], adopted: [] });
+  assert.deepEqual(steps.prompt_changed.stale, { 'hero.txt': 'inputs changed', 'team.txt': 'output missing' });
+  assert.deepEqual(steps.prompt_changed.fresh, ['chart.txt']);
+  assert.deepEqual(steps.output_missing.stale, {
+    'chart.txt': 'output missing',
+    'hero.txt': 'inputs changed',
+    'team.txt': 'output missing',
+  });
+  assert.deepEqual(steps.recorded, ['resources/assets/chart.png', 'resources/assets/hero.png']);
+  assert.equal(steps.adopted_flag, true);
+});
@@ -0,0 +1,70 @@
+// ABOUTME: Startup benchmark for the unified python media CLI (python3 -m lib.media).
+// ABOUTME: Ensures each command imports only its own subsystem and starts quickly.
+const test = require('node:test');
+const assert = require('node:assert/strict');
+const path = require('node:path');
+const { spawnSync } = require('node:child_process');
+
+const repoRoot = path.resolve(__dirname, '..');
+
+// Generous ceiling for a cold `--help`; regressions to eager imports show up in the module checks.
+const STARTUP_BUDGET_MS = 1500;
+const RUNS = 3;
+
+const python = spawnSync('python3', ['--version']);
+const skip = python.error ? 'python3 not available' : false;
+
+// Runs the CLI in-process via runpy and reports which lib.media submodules were imported.
+const MODULE_PROBE = [
+  'import atexit, json, runpy, sys',
+  'atexit.register(lambda: print(json.dumps(sorted(m for m in sys.modules if m.startswith("lib.media.")))))',
+  'sys.argv = ["lib.media", *sys.argv[1:]]',
+  'runpy.run_module("lib.media", run_name="__main__") if len(sys.argv) > 1 else __import__("lib.media")',
+].join('\n');
+
+function importedMediaModules(args) {
+  const result = spawnSync('python3', ['-c', MODULE_PROBE, ...args], {
+    cwd: repoRoot,
+    encoding: 'utf-8',
+    env: { ...process.env, KEYNOTE_MEDIA_NO_DAEMON: '1' },
+  });
+  assert.equal(result.status, 0, result.stderr);
+  const lines = result.stdout.trim().split('\n');
+  return JSON.parse(lines[lines.length - 1]);
+}
+
+function bestWallTimeMs(args) {
+  let best = Infinity;
+  for (let i = 0; i < RUNS; i++) {
+    const start = process.hrtime.bigint();
+    const result = spawnSync('python3', args, { cwd: repoRoot, stdio: 'ignore' });
+    const elapsed = Number(process.hrtime.bigint() - start) / 1e6;
+    assert.equal(result.status, 0);
+    best = Math.min(best, elapsed);
+  }
+  return best;
+}
+
+test('importing lib.media loads no subsystem modules', { skip }, () => {
+  assert.deepEqual(importedMediaModules([]), []);
+});
+
+test('search does not load video or generation clients', { skip }, () => {
+  const modules = importedMediaModules(['search', '--help']);
+  assert.ok(modules.includes('lib.media.model_mediated'));
+  assert.ok(!modules.includes('lib.media.veo'), 'veo should not be imported');
+  assert.ok(!modules.includes('lib.media.nano_banana'), 'nano_banana should not be imported');
+});
+
+test('video does not load search or acquisition modules', { skip }, () => {
+  const modules = importedMediaModules(['video', '--help']);
+  assert.deepEqual(modules, ['lib.media.veo']);
+});
+
+test('media CLI startup stays within budget', { skip }, (t) => {
+  for (const command of ['search', 'video', 'generate']) {
+    const ms = bestWallTimeMs(['-m', 'lib.media', command, '--help']);
+    t.diagnostic(`${command} --help: ${ms.toFixed(1)}ms`);
+    assert.ok(ms < STARTUP_BUDGET_MS, `${command} startup ${ms.toFixed(1)}ms exceeds ${STARTUP_BUDGET_MS}ms`);
+  }
+});
@@ -0,0 +1,33 @@
+// ABOUTME: Exercises the warm media daemon: start, CLI forwarding, in-process fallback, and warning relay.
+// ABOUTME: Also checks each request gets fresh per-deck tools so brand edits apply without a restart.
+const test = require('node:test');
+const assert = require('node:assert/strict');
+
+const { runFixture, skipWithoutPython } = require('./helpers/python');
+
+test('daemon serves CLI commands and relays their warnings', { skip: skipWithoutPython }, () => {
+  const result = runFixture('daemon_roundtrip', [], { timeout: 60000 });
+  const downloaded = (name) => `Downloaded to: ${result.deck}/resources/assets/${name}`;
+
+  // Without a daemon the CLI runs the command itself
+  assert.equal(result.fallback.forwarded, false);
+  assert.equal(result.fallback.exit_code, 0, result.fallback.stderr);
+  assert.match(result.fallback.stdout, /Downloaded to: decks\/demo\/resources\/assets\/a\.png/);
+
+  // A detached daemon answers, and the thin client's command ran there against the caller's cwd
+  assert.notEqual(result.started_pid, result.own_pid);
+  assert.equal(result.status.pid, result.started_pid);
+  assert.equal(result.status.requests, 1);
+  assert.equal(result.routed.exit_code, 0, result.routed.stderr);
+  assert.ok(result.routed.stdout.includes(downloaded('b.png')), result.routed.stdout);
+  assert.ok(result.log_exists);
+  assert.ok(result.socket_removed);
+
+  assert.equal(result.relayed.exit_code, 0, result.relayed.stderr);
+  assert.match(result.relayed.stderr, /UserWarning: mirror is slow/);
+  assert.deepEqual(result.written, ['a.png', 'b.png', 'c.png']);
+
+  assert.deepEqual(result.palettes, [{ 'brand-ink': [16, 32, 48] }, { 'brand-ink': [64, 80, 96] }]);
+  assert.equal(result.shared_tools, false);
+  assert.deepEqual(result.decks, [result.deck]);
+});
@@ -0,0 +1,19 @@
+// ABOUTME: Exercises normalize --apply on a throwaway deck with generated and static images.
+// ABOUTME: Checks static images become <picture> elements while generated media keeps a plain <img>.
+const test = require('node:test');
+const assert = require('node:assert/strict');
+
+const { hasPythonModules, runFixture } = require('./helpers/python');
+
+const skip = hasPythonModules('PIL') ? false : 'python3 with Pillow not available';
+
+test('apply rewrites static images and leaves generated media alone', { skip }, () => {
+  const { count, html } = runFixture('normalize_apply');
+
+  assert.equal(count, 1);
+  assert.equal((html.match(/<picture\b/g) || []).length, 1);
+  assert.match(html, /<picture\b[\s\S]*photo-400w\.webp[\s\S]*alt="Photo"[\s\S]*<\/picture>/);
+  // The template sets img.src and marks the .media-frame parent ready; a <picture> would break both
+  assert.match(html, /<div class="media-frame">\n  <img\n    class="gen-media"\n    data-gen="text-to-image"/);
+  assert.match(html, /<div class="media-frame"><img class="gen-media" src="resources\/assets\/generated.png"/);
+});
@@ -0,0 +1,25 @@
+// ABOUTME: Exercises brand-palette scoring on palette, bilevel, 16-bit, and alpha PNGs.
+// ABOUTME: Checks a scoring failure skips only the score, in generate() and in the palette CLI.
+const test = require('node:test');
+const assert = require('node:assert/strict');
+
+const { hasPythonModules, runFixture } = require('./helpers/python');
+
+const skip = hasPythonModules('numpy', 'PIL') ? false : 'python3 with NumPy and Pillow not available';
+
+test('scores images in every mode and survives scoring failures', { skip }, () => {
+  const { scores, cli, scored, unscored } = runFixture('palette_modes');
+
+  assert.deepEqual(Object.keys(scores).sort(), ['1', 'I;16', 'LA', 'P', 'RGBA']);
+  for (const [mode, score] of Object.entries(scores)) assert.equal(score, 1, mode);
+
+  assert.equal(cli.status, 0);
+  assert.deepEqual(cli.scored, ['good.png']);
+  assert.match(cli.warning, /bad\.png not scored/);
+
+  assert.ok(scored.saved);
+  assert.equal(scored.palette.score, 1);
+  assert.deepEqual(scored.palette.attempts, [1]);
+  assert.ok(unscored.saved);
+  assert.equal(unscored.palette, null);
+});
@@ -0,0 +1,212 @@
+// ABOUTME: Exercises the streaming PDF merge and the parallel, range-cached PDF export.
+// ABOUTME: Uses tiny hand-built PDFs and a stand-in browser whose page.pdf prints the visible slides.
+const test = require('node:test');
+const assert = require('node:assert/strict');
+const fs = require('node:fs');
+const os = require('node:os');
+const path = require('node:path');
+
+const repoRoot = path.resolve(__dirname, '..');
+const { countPages, mergePdfs } = require(path.join(repoRoot, 'scripts', 'pdf-merge.js'));
+const { capturePdfRanges } = require(path.join(repoRoot, 'scripts', 'capture-service.js'));
+
+// Classic-xref PDF with one page per title, like Chromium writes. `nested`
+// puts the pages under an intermediate /Pages node; `indirectLength` moves
+// each content stream's /Length into its own object.
+function tinyPdf(titles, { nested = false, indirectLength = false } = {}) {
+  const objects = [];
+  const add = (body) => objects.push(body) && objects.length;
+  const catalog = add(null);
+  const root = add(null);
+  const parent = nested ? add(null) : root;
+  const pages = titles.map((title) => {
+    const data = `BT /F1 12 Tf 10 40 Td (${title}) Tj ET`;
+    const length = indirectLength ? add(`${data.length}`) : null;
+    const contents = add(`<< /Length ${length ? `${length} 0 R` : data.length} >>\nstream\n${data}\nendstream`);
+    return add(`<< /Type /Page /Parent ${parent} 0 R /Contents ${contents} 0 R >>`);
+  });
+  const kids = (refs) => refs.map((ref) => `${ref} 0 R`).join(' ');
+  objects[catalog - 1] = `<< /Type /Catalog /Pages ${root} 0 R >>`;
+  objects[root - 1] = nested
+    ? `<< /Type /Pages /Kids [${parent} 0 R] /Count ${pages.length} /MediaBox [0 0 160 90] >>`
+    : `<< /Type /Pages /Kids [${kids(pages)}] /Count ${pages.length} /MediaBox [0 0 160 90] >>`;
+  if (nested) objects[parent - 1] = `<< /Type /Pages /Parent ${root} 0 R /Kids [${kids(pages)}] /Count ${pages.length} >>`;
+  const info = add('<< /Producer (tiny) >>');
+
+  let out = '%PDF-1.4\n';
+  const offsets = objects.map((body, i) => {
+    const offset = out.length;
+    out += `${i + 1} 0 obj\n${body}\nendobj\n`;
+    return offset;
+  });
+  const xref = out.length;
+  out += `xref\n0 ${objects.length + 1}\n0000000000 65535 f \n`;
+  out += offsets.map((offset) => `${String(offset).padStart(10, '0')} 00000 n \n`).join('');
+  out += `trailer\n<< /Size ${objects.length + 1} /Root ${catalog} 0 R /Info ${info} 0 R >>\nstartxref\n${xref}\n%%EOF\n`;
+  return Buffer.from(out, 'latin1');
+}
+
+// Titles in page order, read from the content streams
+function pageTitles(buffer) {
+  return [...buffer.toString('latin1').matchAll(/\((\w+)\) Tj/g)].map((match) => match[1]);
+}
+
+// Every xref entry must point at its own "N 0 obj"
+function assertXrefValid(buffer) {
+  const text = buffer.toString('latin1');
+  const xref = Number(text.slice(text.lastIndexOf('startxref') + 9).trim());
+  const lines = text.slice(xref).split('\n');
+  const count = Number(lines[1].split(' ')[1]);
+  for (let n = 1; n < count; n++) {
+    const offset = Number(lines[2 + n].slice(0, 10));
+    assert.ok(text.startsWith(`${n} 0 obj`, offset), `object ${n} at ${offset}`);
+  }
+}
+
+function tmpDir(name) {
+  return fs.mkdtempSync(path.join(os.tmpdir(), `keynote-${name}-`));
+}
+
+test('merges PDFs in order with renumbered objects and one page tree', async () => {
+  const dir = tmpDir('pdf-merge');
+  const first = path.join(dir, 'a.pdf');
+  fs.writeFileSync(first, tinyPdf(['One', 'Two']));
+  const out = path.join(dir, 'out.pdf');
+
+  const result = await mergePdfs([first, tinyPdf(['Three'], { nested: true, indirectLength: true }), tinyPdf(['Four', 'Five'])], out);
+
+  const merged = fs.readFileSync(out);
+  assert.equal(result.pages, 5);
+  assert.equal(countPages(merged), 5);
+  assert.deepEqual(pageTitles(merged), ['One', 'Two', 'Three', 'Four', 'Five']);
+  assertXrefValid(merged);
+  // Each input's page tree hangs off the merged root; input catalogs and info are dropped
+  assert.equal((merged.toString('latin1').match(/\/Type \/Catalog/g) || []).length, 1);
+  assert.equal((merged.toString('latin1').match(/\/Producer/g) || []).length, 0);
+  assert.deepEqual(fs.readdirSync(dir).sort(), ['a.pdf', 'out.pdf']);
+});
+
+test('rejects cross-reference streams instead of misreading them', async () => {
+  const dir = tmpDir('pdf-merge');
+  const xrefStream = Buffer.from('%PDF-1.5\n1 0 obj\n<< /Type /XRef /Size 1 /Root 1 0 R >>\nstream\n\nendstream\nendobj\nstartxref\n9\n%%EOF\n', 'latin1');
+  await assert.rejects(mergePdfs([xrefStream], path.join(dir, 'out.pdf')), /cross-reference streams/);
+  assert.deepEqual(fs.readdirSync(dir), []);
+});
+
+// Stand-in browser for print: each page has its own slide elements, and
+// page.pdf() writes one PDF page per slide not hidden by display:none.
+function standInPrintBrowser(slideHtml) {
+  const state = { contexts: 0, openContexts: 0, pdfs: [], printMedia: 0 };
+
+  const newPage = () => {
+    const slides = slideHtml.map((html) => {
+      const classes = new Set(['slide']);
+      const element = {
+        style: {},
+        classList: { remove: (name) => classes.delete(name) },
+        get outerHTML() {
+          return `<section class="${[...classes].join(' ')}">${html}</section>`;
+        },
+        cloneNode: () => ({ ...element, classList: element.classList, outerHTML: element.outerHTML.replace(' is-active', '') }),
+        querySelectorAll: () => [],
+      };
+      return element;
+    });
+    const document = {
+      baseURI: 'http://deck/index.html',
+      body: { className: '', dataset: {} },
+      documentElement: { getAttribute: () => null },
+      images: [],
+      getElementById: () => null,
+      querySelector: () => null,
+      querySelectorAll: (selector) => (selector === '.slide' ? slides : []),
+    };
+    const window = { keynote: { count: slides.length, settled: async () => 0 } };
+
+    return {
+      goto: async () => {},
+      emulateMedia: async ({ media }) => { if (media === 'print') state.printMedia++; },
+      evaluate: (fn, arg) => {
+        const saved = [globalThis.window, globalThis.document, globalThis.getComputedStyle];
+        globalThis.window = window;
+        globalThis.document = document;
+        globalThis.getComputedStyle = () => ({ backgroundImage: 'none' });
+        try {
+          return Promise.resolve(fn(arg));
+        } finally {
+          [globalThis.window, globalThis.document, globalThis.getComputedStyle] = saved;
+        }
+      },
+      pdf: async ({ path: file }) => {
+        const shown = slideHtml.filter((_, i) => slides[i].style.display !== 'none');
+        state.pdfs.push(shown);
+        await new Promise((resolve) => setTimeout(resolve, 5));
+        fs.writeFileSync(file, tinyPdf(shown));
+      },
+    };
+  };
+
+  return {
+    state,
+    newContext: async () => {
+      state.contexts++;
+      state.openContexts++;
+      return { newPage: async () => newPage(), close: async () => { state.openContexts--; } };
+    },
+  };
+}
+
+test('exports ranges on parallel pages and re-prints only edited ranges', async () => {
+  const dir = tmpDir('pdf-export');
+  const out = path.join(dir, 'deck.pdf');
+  const cacheDir = path.join(dir, 'cache');
+  const deck = Array.from({ length: 10 }, (_, i) => `S${i + 1}`);
+
+  const first = standInPrintBrowser(deck);
+  const initial = await capturePdfRanges('http://deck/index.html', { browser: first, pages: 2, path: out, cacheDir });
+  assert.equal(initial.pages, 10);
+  assert.deepEqual(initial.ranges.map((r) => r.slides), [[1, 2, 3, 4], [5, 6, 7, 8], [9, 10]]);
+  assert.deepEqual(initial.ranges.map((r) => r.cached), [false, false, false]);
+  assert.deepEqual(pageTitles(fs.readFileSync(out)), deck);
+  assert.deepEqual(first.state.pdfs.map((shown) => shown.length).sort(), [2, 4, 4]);
+  assert.equal(first.state.contexts, 2);
+  assert.equal(first.state.openContexts, 0);
+
+  const second = standInPrintBrowser(deck);
+  const rerun = await capturePdfRanges('http://deck/index.html', { browser: second, pages: 2, path: out, cacheDir });
+  assert.deepEqual(rerun.ranges.map((r) => r.cached), [true, true, true]);
+  assert.equal(second.state.pdfs.length, 0);
+  assert.equal(second.state.contexts, 1);
+  assert.deepEqual(pageTitles(fs.readFileSync(out)), deck);
+
+  const edited = deck.map((title) => (title === 'S6' ? 'Six' : title));
+  const third = standInPrintBrowser(edited);
+  const after = await capturePdfRanges('http://deck/index.html', { browser: third, pages: 2, path: out, cacheDir });
+  assert.deepEqual(after.ranges.map((r) => r.cached), [true, false, true]);
+  assert.deepEqual(third.state.pdfs, [['S5', 'Six', 'S7', 'S8']]);
+  assert.deepEqual(pageTitles(fs.readFileSync(out)), edited);
+  assertXrefValid(fs.readFileSync(out));
+  // Only the latest run's ranges stay cached
+  assert.equal(fs.readdirSync(cacheDir).filter((f) => f.endsWith('.pdf')).length, 3);
+});
+
+test('a failed range leaves no partial PDF and closes every page', async () => {
+  const dir = tmpDir('pdf-export');
+  const out = path.join(dir, 'deck.pdf');
+  const browser = standInPrintBrowser(Array.from({ length: 8 }, (_, i) => `S${i + 1}`));
+  const newContext = browser.newContext;
+  browser.newContext = async () => {
+    const context = await newContext();
+    const newPage = context.newPage;
+    context.newPage = async () => {
+      const page = await newPage();
+      page.pdf = async () => { throw new Error('print failed'); };
+      return page;
+    };
+    return context;
+  };
+
+  await assert.rejects(capturePdfRanges('http://deck/index.html', { browser, pages: 2, path: out }), /print failed/);
+  assert.deepEqual(fs.readdirSync(dir), []);
+  assert.equal(browser.state.openContexts, 0);
+});
@@ -0,0 +1,31 @@
+// ABOUTME: Exercises the perceptual-hash index on a resized JPEG copy and an unrelated image across two decks.
+// ABOUTME: Checks near-duplicate lookup, exclusion of the query file, clustering, and incremental refresh.
+const test = require('node:test');
+const assert = require('node:assert/strict');
+
+const { hasPythonModules, runFixture } = require('./helpers/python');
+
+const skip = hasPythonModules('numpy', 'PIL') ? false : 'python3 with NumPy and Pillow not available';
+
+test('finds near-duplicates across decks and skips unrelated images', { skip }, () => {
+  const { first, second, lookup, excluded, clusters, reloaded, entries } = runFixture('phash_duplicates');
+
+  assert.deepEqual(entries, [
+    'alpha/resources/assets/hero.png',
+    'beta/resources/assets/hero-small.jpg',
+    'beta/resources/assets/other.png',
+  ]);
+  // A brightened re-encode matches the original and its resized copy, never the other image
+  assert.deepEqual(lookup.map((match) => match.path).sort(), [
+    'alpha/resources/assets/hero.png',
+    'beta/resources/assets/hero-small.jpg',
+  ]);
+  for (const match of lookup) assert.ok(match.distance <= 6, `${match.path} at ${match.distance}`);
+  assert.deepEqual(excluded, ['beta/resources/assets/hero-small.jpg']);
+  assert.deepEqual(clusters, [['alpha/resources/assets/hero.png', 'beta/resources/assets/hero-small.jpg']]);
+
+  // Only new or changed files are hashed; the saved index is reused
+  assert.deepEqual(first, [3, 0]);
+  assert.deepEqual(second, [0, 0]);
+  assert.deepEqual(reloaded, [0, 0]);
+});
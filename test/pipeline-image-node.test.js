@@ -0,0 +1,25 @@
+// ABOUTME: Runs one image generate node through the pipeline scheduler with a stand-in generator.
+// ABOUTME: Checks the node's single work run keeps output metadata, duplicates, and the palette score.
+const test = require('node:test');
+const assert = require('node:assert/strict');
+
+const { hasPythonModules, runFixture } = require('./helpers/python');
+
+const skip = hasPythonModules('numpy', 'PIL') ? false : 'python3 with NumPy and Pillow not available';
+
+test('pipeline image nodes record what the tools computed', { skip }, () => {
+  const { status, error, records } = runFixture('pipeline_image_node');
+
+  assert.equal(status, 'done', error);
+  assert.equal(records.length, 1);
+  const [record] = records;
+  assert.equal(record.action, 'GENERATE');
+  assert.equal(record.node.id, 'hero');
+  assert.deepEqual(
+    { format: record.output_meta.format, width: record.output_meta.width, height: record.output_meta.height },
+    { format: 'png', width: 640, height: 360 },
+  );
+  assert.deepEqual(record.duplicates.map((d) => d.path), ['other/resources/assets/hero.png']);
+  assert.equal(record.palette.score, 1);
+  assert.deepEqual(record.palette.dominant.slice(0, 2).map((c) => c.nearest).sort(), ['accent', 'ink']);
+});
@@ -0,0 +1,35 @@
+// ABOUTME: Exercises the media job-graph scheduler with stand-in operations and no API calls.
+// ABOUTME: Checks dependency order, per-provider limits, and that failures skip their dependents.
+const test = require('node:test');
+const assert = require('node:assert/strict');
+
+const { runFixture, skipWithoutPython } = require('./helpers/python');
+
+test('nodes start only after their dependencies finish', { skip: skipWithoutPython }, () => {
+  const { events, peak, status } = runFixture('pipeline_scheduler');
+  const at = (kind, id) => events.findIndex(([k, n]) => k === kind && n === id);
+
+  for (const [node, dep] of [['brand', 'base'], ['final', 'brand'], ['side', 'base']]) {
+    assert.ok(at('start', node) > at('end', dep), `${node} started before ${dep} finished`);
+  }
+  // Independent branches overlap, but never past the gemini limit of 2
+  assert.equal(peak, 2);
+  assert.deepEqual(
+    Object.entries(status).filter(([, s]) => s === 'done').map(([id]) => id).sort(),
+    ['base', 'brand', 'final', 'side', 'solo'],
+  );
+});
+
+test('a failed node skips everything downstream and is still logged', { skip: skipWithoutPython }, () => {
+  const { events, status, errors, records } = runFixture('pipeline_scheduler');
+
+  assert.equal(status.broken, 'failed');
+  assert.equal(errors.broken, 'generation refused');
+  assert.equal(status['after-broken'], 'skipped');
+  assert.equal(status['after-after'], 'skipped');
+  assert.match(errors['after-after'], /after-broken/);
+  assert.ok(!events.some(([, id]) => id === 'after-broken'), 'skipped node ran');
+  assert.equal(status.solo, 'done');
+  // One work-run record per node, skipped ones included
+  assert.deepEqual(records, status);
+});
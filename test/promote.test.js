@@ -0,0 +1,30 @@
+// ABOUTME: Exercises promoting draft images to final quality with a stand-in generator.
+// ABOUTME: Checks drafts replay their prompt, brand, temperature, and inputs on the final model, once.
+const test = require('node:test');
+const assert = require('node:assert/strict');
+
+const { runFixture, skipWithoutPython } = require('./helpers/python');
+
+test('promote replays drafts on the final model and clears them', { skip: skipWithoutPython }, () => {
+  const { steps, promote_calls: calls, promoted_from: promotedFrom, final_drafts: finalDrafts } = runFixture('promote_drafts');
+
+  // Only draft outputs are pending; the final closing image never is
+  assert.deepEqual(steps.drafted.pending, ['framed.png', 'hero.png']);
+  assert.equal(steps.drafted.hero, 'draft-model:Ink on ivory\n\nHero skyline');
+
+  assert.deepEqual(steps.by_output, {
+    promoted: ['hero.png'],
+    pending: ['framed.png'],
+    hero: 'final-model:Ink on ivory\n\nHero skyline',
+  });
+  assert.deepEqual(steps.by_slide, { promoted: ['framed.png'], pending: [], framed: 'final-model:Add brand frame' });
+  assert.deepEqual(steps.again, { promoted: [] });
+
+  assert.deepEqual(calls, [
+    { op: 'generate', prompt: 'Ink on ivory\n\nHero skyline', temperature: 0.7, model: 'final-model', inputs: 0 },
+    { op: 'edit', prompt: 'Add brand frame', temperature: 0.2, model: 'final-model', inputs: 1 },
+  ]);
+  // Three original runs plus two promotions that point back at their drafts
+  assert.deepEqual(promotedFrom, [false, false, false, true, true]);
+  assert.deepEqual(finalDrafts, [null, null]);
+});
@@ -0,0 +1,87 @@
+// ABOUTME: Tests MinHash/LSH redundancy detection within a deck and across a deck library.
+// ABOUTME: Checks LSH finds the same pairs as exact comparison and that cross-deck queries work.
+const test = require('node:test');
+const assert = require('node:assert/strict');
+const fs = require('node:fs');
+const path = require('node:path');
+const os = require('node:os');
+
+const repoRoot = path.resolve(__dirname, '..');
+const { findLibraryRedundancy, findSimilarPairs, keyWords } = require(path.join(repoRoot, 'scripts', 'redundancy-index.js'));
+const narrativeReview = require(path.join(repoRoot, 'scripts', 'narrative-review.js'));
+const { parseSlides } = require(path.join(repoRoot, 'scripts', 'slide-model.js'));
+
+// Deterministic word sets: every tenth set is a near copy of the one before it
+function syntheticSets(count) {
+  const sets = [];
+  for (let i = 0; i < count; i++) {
+    const words = [];
+    for (let w = 0; w < 12; w++) words.push(`word${(i * 37 + w * 101) % 5000}x`);
+    if (i % 10 === 9) {
+      const copy = [...sets[i - 1]];
+      copy[0] = `edit${i}x`;
+      sets.push(new Set(copy));
+    } else {
+      sets.push(new Set(words));
+    }
+  }
+  return sets;
+}
+
+test('LSH finds the same pairs as exact all-pairs comparison', () => {
+  const sets = syntheticSets(300);
+
+  const exact = [];
+  for (let a = 0; a < sets.length; a++) {
+    for (let b = a + 1; b < sets.length; b++) {
+      let shared = 0;
+      sets[a].forEach((w) => { if (sets[b].has(w)) shared++; });
+      const similarity = shared / (sets[a].size + sets[b].size - shared);
+      if (similarity >= 0.5) exact.push(`${a}-${b}`);
+    }
+  }
+
+  const viaLsh = findSimilarPairs(sets, 0.5, { lsh: true }).map(({ a, b }) => `${a}-${b}`);
+  assert.ok(exact.length >= 30);
+  assert.deepEqual(viaLsh, exact);
+});
+
+test('narrative review flags near-duplicate slides and ignores empty ones', () => {
+  const body = 'Customers abandon checkout because shipping costs appear late in the process';
+  const html = [
+    `<section class="slide" data-title="One"><p>${body}</p></section>`,
+    '<section class="slide" data-title="Two"><p>Quarterly revenue grew across every region</p></section>',
+    `<section class="slide" data-title="Three"><p>${body} again</p></section>`,
+    '<section class="slide" data-title="Empty"></section>',
+    '<section class="slide" data-title="Blank"></section>',
+  ].join('\n');
+
+  const report = narrativeReview.analyze({ deckPath: 'unit', slides: parseSlides(html) });
+
+  assert.deepEqual(report.redundancies.map((r) => r.slides), [[1, 3]]);
+  assert.equal(findSimilarPairs([keyWords([]), keyWords([])], 0.5, { lsh: true }).length, 0);
+});
+
+test('library query finds similar slides across decks', () => {
+  const decksRoot = fs.mkdtempSync(path.join(os.tmpdir(), 'keynote-redundancy-'));
+  const shared = 'Onboarding takes three weeks because every team configures laptops manually';
+  const decks = {
+    alpha: [`<section class="slide" data-title="Setup pain"><p>${shared}</p></section>`],
+    beta: [
+      '<section class="slide" data-title="Intro"><p>Welcome to the quarterly planning review</p></section>',
+      `<section class="slide" data-title="Laptops"><p>${shared} today</p></section>`,
+    ],
+    gamma: ['<section class="slide" data-title="Other"><p>Marketing budget allocation by channel</p></section>'],
+  };
+  for (const [name, sections] of Object.entries(decks)) {
+    fs.mkdirSync(path.join(decksRoot, name));
+    fs.writeFileSync(path.join(decksRoot, name, 'index.html'), sections.join('\n'));
+  }
+
+  const pairs = findLibraryRedundancy(decksRoot, 0.5);
+  assert.equal(pairs.length, 1);
+  assert.deepEqual(pairs[0].slides.map((s) => `${s.deck}#${s.index}`), ['alpha#1', 'beta#2']);
+
+  assert.equal(findLibraryRedundancy(decksRoot, 0.5, path.join(decksRoot, 'gamma')).length, 0);
+  assert.equal(findLibraryRedundancy(decksRoot, 0.5, path.join(decksRoot, 'beta')).length, 1);
+});
@@ -1,11 +1,13 @@
 // ABOUTME: Tests review-all emits model-mediated signal summary fields.
-// ABOUTME: Ensures summary uses heuristic fields and flags instead of severity buckets.
+// ABOUTME: Ensures summary uses heuristic fields and flags instead of severity buckets, records analyzer timings, reuses cached slides, and re-runs on save in --watch (design pass on one warm browser).
 const test = require('node:test');
 const assert = require('node:assert/strict');
 const fs = require('node:fs');
 const path = require('node:path');
 const os = require('node:os');
-const { execFileSync } = require('node:child_process');
+const { execFileSync, spawn } = require('node:child_process');
+
+const { skipWithoutPython } = require('./helpers/python');
 
 const repoRoot = path.resolve(__dirname, '..');
 const scriptPath = path.join(repoRoot, 'scripts', 'review-all.js');
@@ -40,3 +42,144 @@ test('review-all summary uses heuristic fields', () => {
   assert.equal(report.summary.overall.criticalIssues, undefined);
   assert.equal(report.summary.overall.importantIssues, undefined);
 });
+
+test('review-all records per-analyzer wall times from the concurrent run', () => {
+  const tempDir = fs.mkdtempSync(path.join(os.tmpdir(), 'keynote-review-all-'));
+  const deckPath = path.join(tempDir, 'decks', 'unit-timings');
+
+  writeFile(
+    path.join(deckPath, 'index.html'),
+    '<section class="slide" data-title="Intro"><h1 class="title">Intro</h1><p>Short intro text.</p></section>'
+  );
+
+  execFileSync('node', [scriptPath, deckPath, '--json', '--jobs', '3'], {
+    cwd: repoRoot,
+    stdio: 'ignore',
+  });
+
+  const reportPath = path.join(deckPath, 'resources', 'materials', 'full-analysis.json');
+  const { timings, rawResults } = JSON.parse(fs.readFileSync(reportPath, 'utf-8'));
+  assert.equal(timings.concurrency, 3);
+  assert.ok(timings.wallMs >= 0);
+  assert.equal(timings.analyzers['design-quality'].status, 'skipped');
+  for (const name of ['visual-density', 'image-analysis', 'narrative-review', 'emotional-arc', 'readability']) {
+    assert.equal(timings.analyzers[name].status, 'ok', name);
+    assert.ok(timings.analyzers[name].ms >= 0, name);
+    assert.ok(rawResults[name], name);
+  }
+});
+
+test('review-all re-analyzes only edited slides and matches a full pass', () => {
+  const tempDir = fs.mkdtempSync(path.join(os.tmpdir(), 'keynote-review-all-'));
+  const deckPath = path.join(tempDir, 'decks', 'unit-cache');
+  const htmlPath = path.join(deckPath, 'index.html');
+  const reportPath = path.join(deckPath, 'resources', 'materials', 'full-analysis.json');
+  const slides = ['Intro', 'Problem', 'Solution'].map((title) =>
+    `<section class="slide" data-title="${title}"><h1 class="title">${title}</h1><p>${title} text for the cache.</p></section>`
+  );
+  const run = (...extra) => {
+    execFileSync('node', [scriptPath, deckPath, '--json', ...extra], { cwd: repoRoot, stdio: 'ignore' });
+    return JSON.parse(fs.readFileSync(reportPath, 'utf-8'));
+  };
+
+  writeFile(htmlPath, slides.join('\n'));
+  const first = run();
+  assert.deepEqual(first.timings.analyzers.readability.slides, { reused: 0, analyzed: 3 });
+
+  slides[1] = slides[1].replace('Problem text', 'The costly problem text');
+  writeFile(htmlPath, slides.join('\n'));
+  const incremental = run();
+  for (const name of ['visual-density', 'image-analysis', 'narrative-review', 'emotional-arc', 'readability']) {
+    assert.deepEqual(incremental.timings.analyzers[name].slides, { reused: 2, analyzed: 1 }, name);
+  }
+
+  const full = run('--no-cache');
+  assert.equal(full.timings.analyzers.readability.slides, undefined);
+  assert.deepEqual(incremental.rawResults, full.rawResults);
+  assert.deepEqual(incremental.summary, full.summary);
+});
+
+test('review-all --watch rewrites the report after index.html changes', async () => {
+  const tempDir = fs.mkdtempSync(path.join(os.tmpdir(), 'keynote-review-all-'));
+  const deckPath = path.join(tempDir, 'decks', 'unit-watch');
+  const htmlPath = path.join(deckPath, 'index.html');
+  const reportPath = path.join(deckPath, 'resources', 'materials', 'full-analysis.json');
+  writeFile(htmlPath, '<section class="slide" data-title="Intro"><h1 class="title">Intro</h1></section>');
+
+  const readReport = () => {
+    try {
+      return JSON.parse(fs.readFileSync(reportPath, 'utf-8'));
+    } catch (e) {
+      return null;
+    }
+  };
+  const waitFor = async (predicate) => {
+    const deadline = Date.now() + 10000;
+    while (Date.now() < deadline) {
+      const report = readReport();
+      if (report && predicate(report)) return report;
+      await new Promise((resolve) => setTimeout(resolve, 50));
+    }
+    throw new Error('timed out waiting for full-analysis.json');
+  };
+
+  const child = spawn('node', [scriptPath, deckPath, '--watch'], { cwd: repoRoot, stdio: 'ignore' });
+  try {
+    await waitFor((report) => Array.isArray(report.timings.changed));
+    fs.writeFileSync(htmlPath, '<section class="slide" data-title="Hello"><h1 class="title">Hello</h1></section>');
+
+    const report = await waitFor((r) => r.rawResults['visual-density'].slides[0].title === 'Hello');
+    assert.deepEqual(report.timings.changed, ['index.html']);
+    assert.ok(report.timings.rerun.includes('readability'));
+    assert.equal(report.timings.analyzers['design-quality'].status, 'skipped');
+  } finally {
+    child.kill('SIGTERM');
+  }
+});
+
+test('review-all --watch --serve re-runs the design pass on asset changes with one browser', { skip: skipWithoutPython }, async () => {
+  const tempDir = fs.mkdtempSync(path.join(os.tmpdir(), 'keynote-review-all-'));
+  const deckPath = path.join(tempDir, 'decks', 'unit-watch-serve');
+  const reportPath = path.join(deckPath, 'resources', 'materials', 'full-analysis.json');
+  const browserLog = path.join(tempDir, 'browser.json');
+  writeFile(path.join(deckPath, 'index.html'), '<section class="slide" data-title="Intro"><h1 class="title">Intro</h1></section>');
+  writeFile(path.join(deckPath, 'resources', 'assets', 'hero.svg'), '<svg xmlns="http://www.w3.org/2000/svg"/>');
+
+  const waitFor = async (predicate) => {
+    const deadline = Date.now() + 15000;
+    while (Date.now() < deadline) {
+      try {
+        const report = JSON.parse(fs.readFileSync(reportPath, 'utf-8'));
+        if (predicate(report)) return report;
+      } catch (e) {
+        // Not written yet
+      }
+      await new Promise((resolve) => setTimeout(resolve, 50));
+    }
+    throw new Error('timed out waiting for full-analysis.json');
+  };
+
+  const child = spawn(
+    'node',
+    ['--require', path.join(__dirname, 'helpers', 'stand-in-playwright.js'), scriptPath, deckPath, '--watch', '--serve'],
+    { cwd: repoRoot, stdio: 'ignore', env: { ...process.env, STAND_IN_BROWSER_LOG: browserLog } }
+  );
+  try {
+    await waitFor((r) => r.timings.rerun.includes('design-quality'));
+    fs.writeFileSync(path.join(deckPath, 'resources', 'assets', 'hero.svg'), '<svg xmlns="http://www.w3.org/2000/svg" width="2"/>');
+
+    const report = await waitFor((r) => r.timings.changed.includes('resources/assets/hero.svg'));
+    // Only the rendered pass depends on assets
+    assert.deepEqual(report.timings.rerun, ['design-quality']);
+    assert.deepEqual(report.errors, []);
+    assert.equal(report.rawResults['design-quality'].slideCount, 1);
+
+    // Both passes ran on the one warm browser
+    const { launches, contexts } = JSON.parse(fs.readFileSync(browserLog, 'utf-8'));
+    assert.equal(launches, 1);
+    assert.ok(contexts.length >= 2, `expected a context per pass, got ${contexts.length}`);
+    assert.ok(contexts.every((id) => id === 1));
+  } finally {
+    child.kill('SIGTERM');
+  }
+});
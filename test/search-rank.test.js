@@ -0,0 +1,23 @@
+// ABOUTME: Exercises the deterministic search pre-ranker on hand-made results.
+// ABOUTME: Checks ordering by frame fit, resolution, license, and relevance, top-k cuts, and source diversity.
+const test = require('node:test');
+const assert = require('node:assert/strict');
+
+const { runFixture, skipWithoutPython } = require('./helpers/python');
+
+test('ranks candidates best first and spreads picks across sources', { skip: skipWithoutPython }, () => {
+  const result = runFixture('search_ranking');
+
+  // Full-size, on-topic, licensed, 16:9 first; unknown size and license last
+  assert.deepEqual(result.landscape, ['best', 'portrait', 'small', 'offtopic', 'unknown']);
+  assert.deepEqual([...result.scores].sort((a, b) => b - a), result.scores);
+  assert.deepEqual(result.best_breakdown, { aspect: 1, resolution: 1, license: 1, relevance: 1, diversity: 1 });
+
+  // A portrait frame moves the portrait image to the top
+  assert.equal(result.portrait[0], 'portrait');
+  assert.deepEqual(result.top_two, ['best', 'portrait']);
+
+  // A second pick from one source loses to a slightly weaker image from another source
+  assert.deepEqual(result.diverse, ['u0', 'p0', 'u1']);
+  assert.deepEqual(result.diverse_breakdowns, [1, 1, 0.5]);
+});
@@ -0,0 +1,81 @@
+// ABOUTME: Tests the shared slide model every static analyzer consumes.
+// ABOUTME: Covers attribute order, entity decoding, image attributes, and the index.html-keyed cache.
+const test = require('node:test');
+const assert = require('node:assert/strict');
+const fs = require('node:fs');
+const path = require('node:path');
+const os = require('node:os');
+
+const repoRoot = path.resolve(__dirname, '..');
+const { loadSlideModel, parseSlides } = require(path.join(repoRoot, 'scripts', 'slide-model.js'));
+const readability = require(path.join(repoRoot, 'scripts', 'readability.js'));
+const visualDensity = require(path.join(repoRoot, 'scripts', 'visual-density.js'));
+
+const DECK_HTML = [
+  '<section data-title="Costs &amp; Risks" class="slide theme-ink">',
+  '<div class="layout-split"><h2 class="title">Costs &amp; risks</h2>',
+  '<p class="body-text">Teams lose 40% of their week&nbsp;to rework &rarr; fast.</p>',
+  '<div class="media-frame"><img src="resources/assets/chart.png" alt="Chart" ',
+  'data-prompt="A \'clean\' chart" width="800" height="450"></div></div>',
+  '</section>',
+  '<section class="slideshow" data-title="Not a slide"><p>Ignored</p></section>',
+  '<section class="slide" data-title="Next"><h1 class="title">What now?</h1></section>',
+].join('\n');
+
+test('parses slides regardless of attribute order and decodes entities once', () => {
+  const slides = parseSlides(DECK_HTML);
+
+  assert.equal(slides.length, 2);
+  const [first, second] = slides;
+  assert.equal(first.title, 'Costs & Risks');
+  assert.equal(first.theme, 'ink');
+  assert.equal(first.layout, 'split');
+  assert.equal(first.headline, 'Costs & risks');
+  assert.match(first.text, /40% of their week to rework fast\./);
+  assert.ok(first.tokens.includes('rework'));
+  assert.equal(second.index, 2);
+  assert.equal(second.headline, 'What now?');
+});
+
+test('image attributes keep quotes of the other kind', () => {
+  const [image] = parseSlides(DECK_HTML)[0].images;
+
+  assert.equal(image.dataPrompt, "A 'clean' chart");
+  assert.equal(image.filename, 'chart.png');
+  assert.equal(image.area, 800 * 450);
+  assert.equal(image.inMediaFrame, true);
+  assert.equal(image.hasAlt, true);
+});
+
+test('model is cached next to the deck and rebuilt when index.html changes', () => {
+  const deckPath = fs.mkdtempSync(path.join(os.tmpdir(), 'keynote-slide-model-'));
+  fs.writeFileSync(path.join(deckPath, 'index.html'), DECK_HTML);
+
+  const parsed = loadSlideModel(deckPath);
+  assert.equal(parsed.cached, false);
+  assert.ok(fs.existsSync(path.join(deckPath, 'resources', 'materials', 'slide-model.json')));
+
+  const cached = loadSlideModel(deckPath);
+  assert.equal(cached.cached, true);
+  assert.deepEqual(cached.slides, parsed.slides);
+
+  fs.writeFileSync(path.join(deckPath, 'index.html'), DECK_HTML.replace('What now?', 'What next?'));
+  const rebuilt = loadSlideModel(deckPath);
+  assert.equal(rebuilt.cached, false);
+  assert.equal(rebuilt.slides[1].headline, 'What next?');
+  assert.equal(rebuilt.slides[0].hash, parsed.slides[0].hash);
+  assert.notEqual(rebuilt.slides[1].hash, parsed.slides[1].hash);
+});
+
+test('analyzers consume the model in-process', () => {
+  const model = { deckPath: 'unit', slides: parseSlides(DECK_HTML) };
+
+  const density = visualDensity.analyze(model);
+  const reading = readability.analyze(model);
+
+  assert.equal(density.slideCount, 2);
+  assert.equal(reading.slideCount, 2);
+  assert.equal(density.slides[0].metrics.wordCount, model.slides[0].tokens.length);
+  assert.equal(density.slides[0].metrics.imageCount, 1);
+  assert.throws(() => readability.analyze({ deckPath: 'empty', slides: [] }), /No slides found/);
+});
@@ -0,0 +1,35 @@
+// ABOUTME: Exercises Veo callback mode against the shared local stand-in for the Kie.ai API.
+// ABOUTME: Checks that callbacks replace polling and that polling still covers lost callbacks.
+const test = require('node:test');
+const assert = require('node:assert/strict');
+
+const { runFixture, skipWithoutPython } = require('./helpers/python');
+
+test('callback completes the wait without polling record-info', { skip: skipWithoutPython }, () => {
+  const outcome = runFixture('veo_callbacks', ['callback']);
+  assert.equal(outcome.status, 'completed');
+  assert.equal(outcome.url, outcome.expected_url);
+  assert.equal(outcome.polls, 0);
+  assert.ok(outcome.seconds < 5, `took ${outcome.seconds}s`);
+});
+
+test('lost callbacks fall back to polling', { skip: skipWithoutPython }, () => {
+  const outcome = runFixture('veo_callbacks', ['lost']);
+  assert.match(outcome.error, /timed out/);
+  assert.ok(outcome.polls >= 2, `expected fallback polls, got ${outcome.polls}`);
+});
+
+test('queued waits resolve by callback and release the task future', { skip: skipWithoutPython }, () => {
+  const outcome = runFixture('veo_callbacks', ['queue']);
+  assert.equal(outcome.status, 'downloaded');
+  assert.equal(outcome.video, 'veo3');
+  assert.equal(outcome.polls, 0);
+  assert.equal(outcome.futures, 0);
+});
+
+test('--callback refuses to start without a public URL', { skip: skipWithoutPython }, () => {
+  const outcome = runFixture('veo_callbacks', ['unreachable']);
+  assert.equal(outcome.exit_code, 1);
+  assert.match(outcome.stdout, /KIE_CALLBACK_PUBLIC_URL/);
+  assert.doesNotMatch(outcome.stdout, /Listening for callbacks/);
+});
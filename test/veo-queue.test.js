@@ -0,0 +1,19 @@
+// ABOUTME: Exercises the persistent Veo task queue across a killed process and a fresh one.
+// ABOUTME: Checks resume downloads the recorded task and never submits (pays for) it twice.
+const test = require('node:test');
+const assert = require('node:assert/strict');
+
+const { runFixture, skipWithoutPython } = require('./helpers/python');
+
+test('resume picks up a task submitted by a process that died mid-wait', { skip: skipWithoutPython }, () => {
+  const outcome = runFixture('veo_queue_resume');
+
+  assert.equal(outcome.child_exit, 9);
+  assert.deepEqual(outcome.after_crash, ['submitted']);
+  assert.deepEqual(outcome.resumed, ['downloaded']);
+  assert.deepEqual(outcome.again, ['downloaded', true]);
+  assert.deepEqual(outcome.portrait, ['downloaded', false]);
+  assert.equal(outcome.submissions, 2);
+  assert.equal(outcome.video, 'veo3');
+  assert.deepEqual(outcome.pending, []);
+});
@@ -0,0 +1,35 @@
+// ABOUTME: Exercises tiered Veo runs (veo3_fast preview, veo3 final) against the shared Kie.ai stand-in.
+// ABOUTME: Checks the preview lands first, the final replaces it, and a late preview never overwrites the final.
+const test = require('node:test');
+const assert = require('node:assert/strict');
+
+const { runFixture, skipWithoutPython } = require('./helpers/python');
+
+test('tiered run shows the preview first, then swaps in the final', { skip: skipWithoutPython }, () => {
+  const outcome = runFixture('veo_tiered', ['in-order']);
+  assert.deepEqual(outcome.seen, [
+    ['preview', 'downloaded', 'veo3_fast'],
+    ['final', 'downloaded', 'veo3'],
+  ]);
+  assert.equal(outcome.final, 'veo3');
+  assert.deepEqual(outcome.leftovers, []);
+});
+
+test('a preview collected after its final is superseded', { skip: skipWithoutPython }, () => {
+  const outcome = runFixture('veo_tiered', ['late-preview']);
+  assert.deepEqual(outcome.seen, [
+    ['final', 'downloaded', 'veo3'],
+    ['preview', 'superseded', 'veo3'],
+  ]);
+  assert.equal(outcome.final, 'veo3');
+});
+
+test('--no-wait-final leaves a detached resume that swaps in the final', { skip: skipWithoutPython }, () => {
+  const outcome = runFixture('veo_tiered', ['detached'], { timeout: 60000 });
+  assert.equal(outcome.exit_code, 0, outcome.stdout);
+  assert.match(outcome.stdout, /final +submitted/);
+  assert.match(outcome.stdout, /background `resume/);
+  assert.deepEqual(outcome.statuses, [['preview', 'downloaded'], ['final', 'downloaded']]);
+  assert.equal(outcome.final, 'veo3');
+  assert.match(outcome.log, /downloaded +task-veo3-2/);
+});